@@ -1,15 +1,16 @@
 from pathlib import Path
 import json
 import os
-from typing import Any, Dict, List, Literal
+from typing import Any, Callable, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.client.llm_client import GeminiLLMClient
 from app.cli.git_code_parsing import (
     _get_preferred_author_email,
-    run_git_parsing_from_files,
+    run_incremental_git_parsing_from_files,
 )
 from app.utils.analysis_merger_utils import merge_analysis_results
 from app.utils.code_analysis.code_analysis_utils import (
@@ -38,10 +39,28 @@ from app.utils.scan_utils import (
     _normalize_user_exclude_ext,
     persist_analyzed_file_signatures,
 )
-from app.utils.git_utils import detect_git, extract_all_contributors
+from app.utils.git_utils import (
+    build_git_history_index,
+    detect_git,
+    extract_all_contributors,
+)
 from app.utils.clean_up import cleanup_upload
+from app.utils.analysis_jobs import (
+    TERMINAL_JOB_STATUSES,
+    AnalysisJobContext,
+    get_analysis_job_manager,
+    public_job_view,
+)
 from app.utils.analysis_clear_utils import clear_project_analysis_when_skipped_no_files
-from app.data.db import get_connection
+from app.utils.project_scheduler import (
+    DatabaseWriter,
+    parse_workers_per_project,
+    resolve_project_concurrency,
+    run_projects,
+    write_through,
+)
+from app.utils.stage_timing import StageTimer, merge_breakdowns, span
+from app.data.db import get_connection, shared_connection
 
 router = APIRouter()
 
@@ -56,65 +75,6 @@ def _invalidate_upload_extract_cache(upload_id: str) -> None:
     _upload_extract_cache.pop(upload_id, None)
 
 
-def _persist_git_history(
-    project_signature: str, git_commits: List[Dict[str, Any]]
-) -> None:
-    """Replace stored git history only when there is valid parsed commit data."""
-    if not project_signature:
-        return
-
-    valid_commits: List[Dict[str, str]] = []
-    for commit in git_commits:
-        commit_hash = commit.get("hash") or commit.get("commit_hash")
-        commit_date = commit.get("authored_datetime") or commit.get(
-            "committed_datetime"
-        )
-        if not commit_hash or not commit_date:
-            continue
-        valid_commits.append(
-            {
-                "commit_hash": str(commit_hash),
-                "commit_date": str(commit_date),
-                "author_name": str(commit.get("author_name") or ""),
-                "author_email": str(commit.get("author_email") or ""),
-                "message": str(
-                    commit.get("message_summary") or commit.get("message") or ""
-                ),
-            }
-        )
-
-    if not valid_commits:
-        return
-
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "DELETE FROM GIT_HISTORY WHERE project_id = ?", (project_signature,)
-        )
-
-        for commit in valid_commits:
-            cur.execute(
-                """
-                INSERT INTO GIT_HISTORY (project_id, commit_hash, author_name, author_email, commit_date, message)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    project_signature,
-                    commit["commit_hash"],
-                    commit["author_name"],
-                    commit["author_email"],
-                    commit["commit_date"],
-                    commit["message"],
-                ),
-            )
-
-        conn.commit()
-    finally:
-        cur.close()
-        conn.close()
-
-
 def _persist_collaborators(project_signature: str, contributors: List[Dict[str, Any]]) -> None:
     """Store the collaborator list for a project as a DASHBOARD_DATA metric."""
     if not project_signature or not contributors:
@@ -149,6 +109,8 @@ class AnalyzeUploadRequest(BaseModel):
     cleanup_zip: bool = False
     cleanup_extracted: bool = False
     scan_only: bool = False
+    # Worker processes for non-git code parsing; None defers to PARSE_CODE_WORKERS.
+    parse_workers: int | None = Field(default=None, ge=1)
 
 
 class ProjectAnalysisResult(BaseModel):
@@ -159,11 +121,17 @@ class ProjectAnalysisResult(BaseModel):
     effective_analysis_type: Literal["local", "ai"]
     status: Literal["analyzed", "skipped", "failed"]
     reason: str | None = None
+    # Seconds and item counts per stage (see stage_timing).
+    timings: Dict[str, Any] | None = None
 
 
-def _load_projects_from_upload(upload_id: str) -> Dict[str, Any]:
+def _upload_zip_path(upload_id: str) -> str:
     upload_dir = os.getenv("UPLOAD_DIR", "app/uploads")
-    zip_path = os.path.join(upload_dir, f"{upload_id}.zip")
+    return os.path.join(upload_dir, f"{upload_id}.zip")
+
+
+def _load_projects_from_upload(upload_id: str) -> Dict[str, Any]:
+    zip_path = _upload_zip_path(upload_id)
 
     if not os.path.exists(zip_path):
         _invalidate_upload_extract_cache(upload_id)
@@ -255,134 +223,165 @@ def _resolve_project_user_exclusions(
     return exclude_exts, exclude_prefixes
 
 
-@router.post("/analysis/run")
-def run_analysis_for_upload(payload: AnalyzeUploadRequest) -> Dict[str, Any]:
-    upload_context = _load_projects_from_upload(payload.upload_id)
-    project_paths = upload_context["project_paths"]
-    extracted_dir = upload_context["extracted_dir"]
-
-    api_available, _ = check_gemini_api_key()
-    api_key = os.getenv("GEMINI_API_KEY")
-    llm_client = GeminiLLMClient(api_key=api_key) if api_available and api_key else None
+def _report_stage(progress: Optional[Callable[[str], None]], stage: str) -> None:
+    if progress is not None:
+        progress(stage)
 
-    results: List[ProjectAnalysisResult] = []
 
-    for project_path in project_paths:
-        project_name = Path(project_path).name
-        requested_analysis_type = _resolve_requested_analysis_type(
-            project_path=project_path,
-            default_analysis_type=payload.default_analysis_type,
-            project_analysis_types=payload.project_analysis_types,
-        )
-        requested_similarity_action = _resolve_requested_similarity_action(
-            project_path=project_path,
-            default_similarity_action=payload.similarity_action,
-            project_similarity_actions=payload.project_similarity_actions,
-        )
-        similarity_decision = requested_similarity_action == "update_existing"
-        exclude_exts, exclude_prefixes = _resolve_project_user_exclusions(
-            payload, project_path, project_name
-        )
+def _analyze_project(
+    payload: AnalyzeUploadRequest,
+    project_path: str,
+    llm_client: Optional[GeminiLLMClient],
+    progress: Optional[Callable[[str], None]] = None,
+    writer: Optional[DatabaseWriter] = None,
+    parse_workers: Optional[int] = None,
+) -> ProjectAnalysisResult:
+    """
+    Scan, parse, analyse and persist one project of an upload.
+
+    `progress(stage)` is called as the project enters "scanning", "parsing" and
+    "analyzing"; it is only called between stages, so it may raise to stop the run.
+    When projects run concurrently, scanning (which stores PROJECT rows) and every
+    write of the results go through `writer`, and `parse_workers` is this
+    project's share of the parse process pool. The result's `timings` break the
+    run down by stage.
+    """
+    timer = StageTimer()
+    with timer.activate():
+        result = _run_project_stages(payload, project_path, llm_client, progress, writer, parse_workers)
+    result.timings = timer.finish(result.status)
+    return result
+
+
+def _run_project_stages(
+    payload: AnalyzeUploadRequest,
+    project_path: str,
+    llm_client: Optional[GeminiLLMClient],
+    progress: Optional[Callable[[str], None]],
+    writer: Optional[DatabaseWriter],
+    parse_workers: Optional[int],
+) -> ProjectAnalysisResult:
+    project_name = Path(project_path).name
+    requested_analysis_type = _resolve_requested_analysis_type(
+        project_path=project_path,
+        default_analysis_type=payload.default_analysis_type,
+        project_analysis_types=payload.project_analysis_types,
+    )
+    requested_similarity_action = _resolve_requested_similarity_action(
+        project_path=project_path,
+        default_similarity_action=payload.similarity_action,
+        project_similarity_actions=payload.project_similarity_actions,
+    )
+    similarity_decision = requested_similarity_action == "update_existing"
+    exclude_exts, exclude_prefixes = _resolve_project_user_exclusions(
+        payload, project_path, project_name
+    )
 
-        try:
+    _report_stage(progress, "scanning")
+    try:
+        with span("scan") as counts:
             scan_result = run_scan_flow(
                 project_path,
                 similarity_decision=similarity_decision,
                 exclude_extensions=sorted(exclude_exts) if exclude_exts else None,
                 exclude_name_prefixes=exclude_prefixes if exclude_prefixes else None,
+                writer=writer,
             )
-        except Exception as exc:
-            results.append(
-                ProjectAnalysisResult(
-                    project_name=project_name,
-                    project_path=project_path,
-                    requested_analysis_type=requested_analysis_type,
-                    effective_analysis_type="local",
-                    status="failed",
-                    reason=f"scan_failed: {exc}",
-                )
-            )
-            continue
-
-        project_signature = scan_result.get("signature")
-        if scan_result.get("skip_analysis"):
-            skip_reason = scan_result.get("reason", "skipped")
-            if skip_reason in ("all_files_excluded", "no_files"):
-                clear_project_analysis_when_skipped_no_files(
-                    project_path,
-                    project_name,
-                    project_signature,
-                )
-            results.append(
-                ProjectAnalysisResult(
-                    project_name=project_name,
-                    project_path=project_path,
-                    project_signature=project_signature,
-                    requested_analysis_type=requested_analysis_type,
-                    effective_analysis_type="local",
-                    status="skipped",
-                    reason=skip_reason,
-                )
-            )
-            continue
-
-        if payload.scan_only:
-            results.append(
-                ProjectAnalysisResult(
-                    project_name=project_name,
-                    project_path=project_path,
-                    project_signature=project_signature,
-                    requested_analysis_type=requested_analysis_type,
-                    effective_analysis_type="local",
-                    status="analyzed",
-                    reason=None,
-                )
-            )
-            continue
-
-        files = scan_result.get("files", [])
-        top_level_dirs = get_project_top_level_dirs(project_path)
+            counts["files"] = len(scan_result.get("files", []))
+    except Exception as exc:
+        return ProjectAnalysisResult(
+            project_name=project_name,
+            project_path=project_path,
+            requested_analysis_type=requested_analysis_type,
+            effective_analysis_type="local",
+            status="failed",
+            reason=f"scan_failed: {exc}",
+        )
 
-        if not files:
-            clear_project_analysis_when_skipped_no_files(
+    project_signature = scan_result.get("signature")
+    if scan_result.get("skip_analysis"):
+        skip_reason = scan_result.get("reason", "skipped")
+        if skip_reason in ("all_files_excluded", "no_files"):
+            write_through(
+                writer,
+                clear_project_analysis_when_skipped_no_files,
                 project_path,
                 project_name,
                 project_signature,
             )
-            results.append(
-                ProjectAnalysisResult(
-                    project_name=project_name,
-                    project_path=project_path,
-                    project_signature=project_signature,
-                    requested_analysis_type=requested_analysis_type,
-                    effective_analysis_type="local",
-                    status="skipped",
-                    reason="all_files_excluded",
-                )
-            )
-            continue
+        return ProjectAnalysisResult(
+            project_name=project_name,
+            project_path=project_path,
+            project_signature=project_signature,
+            requested_analysis_type=requested_analysis_type,
+            effective_analysis_type="local",
+            status="skipped",
+            reason=skip_reason,
+        )
+
+    if payload.scan_only:
+        return ProjectAnalysisResult(
+            project_name=project_name,
+            project_path=project_path,
+            project_signature=project_signature,
+            requested_analysis_type=requested_analysis_type,
+            effective_analysis_type="local",
+            status="analyzed",
+            reason=None,
+        )
+
+    files = scan_result.get("files", [])
+    top_level_dirs = get_project_top_level_dirs(project_path)
+
+    if not files:
+        write_through(
+            writer,
+            clear_project_analysis_when_skipped_no_files,
+            project_path,
+            project_name,
+            project_signature,
+        )
+        return ProjectAnalysisResult(
+            project_name=project_name,
+            project_path=project_path,
+            project_signature=project_signature,
+            requested_analysis_type=requested_analysis_type,
+            effective_analysis_type="local",
+            status="skipped",
+            reason="all_files_excluded",
+        )
 
-        username, email = _get_preferred_author_email()
+    _report_stage(progress, "parsing")
+    is_git_repo = detect_git(project_path)
+    # Walk git history once per project; every git-derived stage below queries this index.
+    git_history = None
+    if is_git_repo:
+        with span("git_extraction"):
+            git_history = build_git_history_index(project_path)
+
+    username, email = _get_preferred_author_email()
+    with span("parse"):
         non_code_result = classify_non_code_files_with_user_verification(
-            project_path, email, username
+            project_path, email, username, history=git_history
         )
 
-        # Apply the same extension and prefix exclusions to non-code file lists
-        if exclude_exts or exclude_prefixes:
-            for key in ("collaborative", "non_collaborative"):
-                filtered = []
-                for p in non_code_result.get(key, []):
-                    p_path = Path(p)
-                    if exclude_exts and p_path.suffix.lower() in exclude_exts:
-                        continue
-                    if exclude_prefixes and any(
-                        p_path.stem.lower().startswith(pfx.lower()) for pfx in exclude_prefixes
-                    ):
-                        continue
-                    filtered.append(p)
-                non_code_result[key] = filtered
+    # Apply the same extension and prefix exclusions to non-code file lists
+    if exclude_exts or exclude_prefixes:
+        for key in ("collaborative", "non_collaborative"):
+            filtered = []
+            for p in non_code_result.get(key, []):
+                p_path = Path(p)
+                if exclude_exts and p_path.suffix.lower() in exclude_exts:
+                    continue
+                if exclude_prefixes and any(
+                    p_path.stem.lower().startswith(pfx.lower()) for pfx in exclude_prefixes
+                ):
+                    continue
+                filtered.append(p)
+            non_code_result[key] = filtered
 
-        try:
+    try:
+        with span("parse") as counts:
             parsed_non_code = parsed_input_text(
                 file_paths_dict={
                     "collaborative": non_code_result.get("collaborative", []),
@@ -390,41 +389,50 @@ def run_analysis_for_upload(payload: AnalyzeUploadRequest) -> Dict[str, Any]:
                 },
                 repo_path=project_path if non_code_result.get("is_git_repo") else None,
                 author=(non_code_result.get("user_identity") or {}).get("email"),
+                history=git_history,
             )
-        except Exception:
-            parsed_non_code = {"parsed_files": []}
+            counts["documents"] = len(parsed_non_code.get("parsed_files", []))
+    except Exception:
+        parsed_non_code = {"parsed_files": []}
 
-        is_git_repo = detect_git(project_path)
-        git_commits: List[Dict[str, Any]] = []
-        parsed_code_files: List[Dict[str, Any]] = []
+    git_commits: List[Dict[str, Any]] = []
+    git_aggregates: Optional[Dict[str, Any]] = None
+    parsed_code_files: List[Dict[str, Any]] = []
 
-        if is_git_repo:
-            try:
-                code_git_history_json = run_git_parsing_from_files(
+    if is_git_repo:
+        try:
+            # Re-uploads only extract commits added since the stored ref tips.
+            with span("git_extraction") as counts:
+                git_commits, git_aggregates = run_incremental_git_parsing_from_files(
                     file_paths=files,
                     include_merges=False,
-                    max_commits=None,
+                    history=git_history,
                 )
-                parsed_history = (
-                    json.loads(code_git_history_json) if code_git_history_json else []
+                counts["commits"] = len(git_commits)
+        except Exception:
+            git_commits = []
+            git_aggregates = None
+    else:
+        try:
+            # Unchanged files from earlier uploads come from the parse cache.
+            with span("parse", files=len(files)):
+                parsed_code_files = parse_code_flow(
+                    files,
+                    top_level_dirs,
+                    workers=payload.parse_workers if payload.parse_workers is not None else parse_workers,
+                    use_cache=True,
                 )
-                if isinstance(parsed_history, list):
-                    git_commits = parsed_history
-
-            except Exception:
-                git_commits = []
-        else:
-            try:
-                parsed_code_files = parse_code_flow(files, top_level_dirs)
-            except Exception:
-                parsed_code_files = []
+        except Exception:
+            parsed_code_files = []
 
-        effective_analysis_type: Literal["local", "ai"] = requested_analysis_type
-        if requested_analysis_type == "ai" and not llm_client:
-            effective_analysis_type = "local"
+    _report_stage(progress, "analyzing")
+    effective_analysis_type: Literal["local", "ai"] = requested_analysis_type
+    if requested_analysis_type == "ai" and not llm_client:
+        effective_analysis_type = "local"
 
-        try:
-            if effective_analysis_type == "ai":
+    try:
+        if effective_analysis_type == "ai":
+            with span("nlp"):
                 try:
                     non_code_analysis_results = analyze_non_code_files(
                         parsed_non_code=parsed_non_code
@@ -432,10 +440,11 @@ def run_analysis_for_upload(payload: AnalyzeUploadRequest) -> Dict[str, Any]:
                 except Exception:
                     non_code_analysis_results = analyze_project_clean(parsed_non_code)
 
+            with span("analysis"):
                 try:
                     if is_git_repo:
                         code_analysis_results = analyze_github_project(
-                            git_commits, llm_client
+                            git_commits, llm_client, aggregates=git_aggregates
                         )
                     else:
                         code_analysis_results = analyze_parsed_project(
@@ -443,80 +452,93 @@ def run_analysis_for_upload(payload: AnalyzeUploadRequest) -> Dict[str, Any]:
                         )
                 except Exception:
                     if is_git_repo:
-                        code_analysis_results = analyze_github_project(git_commits)
+                        code_analysis_results = analyze_github_project(
+                            git_commits, aggregates=git_aggregates
+                        )
                     else:
                         code_analysis_results = analyze_parsed_project(
                             parsed_code_files
                         )
-            else:
+        else:
+            with span("nlp"):
                 try:
                     non_code_analysis_results = analyze_project_clean(parsed_non_code)
                 except Exception:
                     non_code_analysis_results = {}
 
+            with span("analysis"):
                 if is_git_repo:
-                    code_analysis_results = analyze_github_project(git_commits)
+                    code_analysis_results = analyze_github_project(
+                        git_commits, aggregates=git_aggregates
+                    )
                 else:
                     code_analysis_results = analyze_parsed_project(parsed_code_files)
 
-            merge_analysis_results(
+        with span("merge"):
+            write_through(
+                writer,
+                merge_analysis_results,
                 non_code_analysis_results=non_code_analysis_results,
                 code_analysis_results=code_analysis_results,
                 project_name=project_name,
                 project_signature=project_signature,
+                history=git_history,
+                # Stored in GIT_HISTORY in the same transaction as the merged results
+                git_commits=git_commits if is_git_repo else None,
             )
-            persist_analyzed_file_signatures(project_signature, project_path, files)
+        with span("persist", files=len(files)):
+            write_through(writer, persist_analyzed_file_signatures, project_signature, project_path, files)
 
-            # Persist git history AFTER merge
-            # (merge_analysis_results wipes GIT_HISTORY, so this must come after)
-            if is_git_repo and git_commits:
-                try:
-                    _persist_git_history(project_signature, git_commits)
-                except Exception:
-                    pass
+        # Extract and persist collaborator data AFTER merge
+        # (merge_analysis_results wipes DASHBOARD_DATA, so this must come after)
+        if is_git_repo:
+            try:
+                github_user, user_email = _get_preferred_author_email()
+                author_aliases: List[str] = [a for a in [github_user, user_email] if a]
+                print(f"[collab] Extracting contributors from {project_path} with aliases {author_aliases}")
+                with span("git_extraction"):
+                    contributors = extract_all_contributors(
+                        project_path, author_aliases, history=git_history
+                    )
+                print(f"[collab] Found {len(contributors)} contributor(s): "
+                      f"{[c.get('name') for c in contributors]}")
+                if contributors:
+                    with span("persist"):
+                        write_through(writer, _persist_collaborators, project_signature, contributors)
+                    print(f"[collab] Persisted {len(contributors)} contributor(s) for {project_signature[:12]}...")
+                else:
+                    print("[collab] No contributors found — nothing to persist")
+            except Exception as collab_exc:
+                print(f"[collab] Error extracting contributors: {collab_exc}")
 
-            # Extract and persist collaborator data AFTER merge
-            # (merge_analysis_results wipes DASHBOARD_DATA, so this must come after)
-            if is_git_repo:
-                try:
-                    github_user, user_email = _get_preferred_author_email()
-                    author_aliases: List[str] = [a for a in [github_user, user_email] if a]
-                    print(f"[collab] Extracting contributors from {project_path} with aliases {author_aliases}")
-                    contributors = extract_all_contributors(project_path, author_aliases)
-                    print(f"[collab] Found {len(contributors)} contributor(s): "
-                          f"{[c.get('name') for c in contributors]}")
-                    if contributors:
-                        _persist_collaborators(project_signature, contributors)
-                        print(f"[collab] Persisted {len(contributors)} contributor(s) for {project_signature[:12]}...")
-                    else:
-                        print("[collab] No contributors found — nothing to persist")
-                except Exception as collab_exc:
-                    print(f"[collab] Error extracting contributors: {collab_exc}")
-
-            results.append(
-                ProjectAnalysisResult(
-                    project_name=project_name,
-                    project_path=project_path,
-                    project_signature=project_signature,
-                    requested_analysis_type=requested_analysis_type,
-                    effective_analysis_type=effective_analysis_type,
-                    status="analyzed",
-                    reason=None,
-                )
-            )
-        except Exception as exc:
-            results.append(
-                ProjectAnalysisResult(
-                    project_name=project_name,
-                    project_path=project_path,
-                    project_signature=project_signature,
-                    requested_analysis_type=requested_analysis_type,
-                    effective_analysis_type=effective_analysis_type,
-                    status="failed",
-                    reason=f"analysis_failed: {exc}",
-                )
-            )
+        return ProjectAnalysisResult(
+            project_name=project_name,
+            project_path=project_path,
+            project_signature=project_signature,
+            requested_analysis_type=requested_analysis_type,
+            effective_analysis_type=effective_analysis_type,
+            status="analyzed",
+            reason=None,
+        )
+    except Exception as exc:
+        return ProjectAnalysisResult(
+            project_name=project_name,
+            project_path=project_path,
+            project_signature=project_signature,
+            requested_analysis_type=requested_analysis_type,
+            effective_analysis_type=effective_analysis_type,
+            status="failed",
+            reason=f"analysis_failed: {exc}",
+        )
 
+
+def _finish_upload_analysis(
+    payload: AnalyzeUploadRequest,
+    project_paths: List[str],
+    extracted_dir: Optional[str],
+    results: List[ProjectAnalysisResult],
+) -> Dict[str, Any]:
+    """Clean up the upload and build the response for a finished analysis run."""
     cleanup_result = None
     if not payload.scan_only:
         cleanup_result = cleanup_upload(
@@ -547,10 +569,150 @@ def run_analysis_for_upload(payload: AnalyzeUploadRequest) -> Dict[str, Any]:
         "skipped_projects": skipped,
         "failed_projects": failed,
         "results": [item.model_dump() for item in results],
+        # Stage seconds summed over the projects; with concurrent projects the
+        # total exceeds the run's wall time.
+        "timings": merge_breakdowns(*(item.timings for item in results)),
         "cleanup": cleanup_result,
     }
 
 
+@router.post("/analysis/run")
+def run_analysis_for_upload(payload: AnalyzeUploadRequest) -> Dict[str, Any]:
+    upload_context = _load_projects_from_upload(payload.upload_id)
+    project_paths = upload_context["project_paths"]
+    extracted_dir = upload_context["extracted_dir"]
+
+    api_available, _ = check_gemini_api_key()
+    api_key = os.getenv("GEMINI_API_KEY")
+    llm_client = GeminiLLMClient(api_key=api_key) if api_available and api_key else None
+
+    concurrency = min(resolve_project_concurrency(), max(1, len(project_paths)))
+    parse_workers = parse_workers_per_project(concurrency)
+
+    def analyze(project_path: str, writer: Optional[DatabaseWriter]) -> ProjectAnalysisResult:
+        # One pooled connection for the project's reads (and its writes when sequential).
+        with shared_connection():
+            return _analyze_project(
+                payload, project_path, llm_client, writer=writer, parse_workers=parse_workers
+            )
+
+    results: List[ProjectAnalysisResult] = run_projects(
+        project_paths, analyze, max_concurrency=concurrency
+    )
+    return _finish_upload_analysis(payload, project_paths, extracted_dir, results)
+
+
+def _run_analysis_job(job: AnalysisJobContext) -> Dict[str, Any]:
+    """Job runner: the /analysis/run flow with per-project progress and resume."""
+    payload = AnalyzeUploadRequest(**job.payload)
+    upload_context = _load_projects_from_upload(payload.upload_id)
+    project_paths = upload_context["project_paths"]
+    job.set_projects(project_paths)
+
+    api_available, _ = check_gemini_api_key()
+    api_key = os.getenv("GEMINI_API_KEY")
+    llm_client = GeminiLLMClient(api_key=api_key) if api_available and api_key else None
+
+    # Projects that completed before a server restart are not analysed again.
+    finished = {path: job.finished_result(path) for path in project_paths}
+    pending = [path for path in project_paths if finished[path] is None]
+
+    def analyze(project_path: str, writer: Optional[DatabaseWriter]) -> ProjectAnalysisResult:
+        job.check_cancelled()
+        with shared_connection():
+            result = _analyze_project(
+                payload,
+                project_path,
+                llm_client,
+                progress=lambda stage: job.stage(project_path, stage),
+                writer=writer,
+                parse_workers=parse_workers,
+            )
+        job.project_finished(project_path, result.model_dump())
+        return result
+
+    concurrency = min(resolve_project_concurrency(), max(1, len(pending)))
+    parse_workers = parse_workers_per_project(concurrency)
+    analyzed = dict(zip(pending, run_projects(pending, analyze, max_concurrency=concurrency)))
+    results: List[ProjectAnalysisResult] = [
+        analyzed[path] if finished[path] is None else ProjectAnalysisResult(**finished[path])
+        for path in project_paths
+    ]
+
+    return _finish_upload_analysis(
+        payload, project_paths, upload_context["extracted_dir"], results
+    )
+
+
+def resume_analysis_jobs() -> List[str]:
+    """Re-queue analysis jobs a previous server process left unfinished (run at startup)."""
+    try:
+        return get_analysis_job_manager().resume(_run_analysis_job)
+    except Exception as exc:
+        print(f"[jobs] Could not resume analysis jobs: {exc}")
+        return []
+
+
+@router.post("/analysis/jobs", status_code=202)
+def create_analysis_job(payload: AnalyzeUploadRequest) -> Dict[str, Any]:
+    if not os.path.exists(_upload_zip_path(payload.upload_id)):
+        raise HTTPException(
+            status_code=404, detail="Upload not found for provided upload_id"
+        )
+    job = get_analysis_job_manager().submit(payload.model_dump(), _run_analysis_job)
+    return public_job_view(job)
+
+
+def _get_job_or_404(job_id: str) -> Dict[str, Any]:
+    job = get_analysis_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return job
+
+
+@router.get("/analysis/jobs/{job_id}")
+def get_analysis_job(job_id: str) -> Dict[str, Any]:
+    return public_job_view(_get_job_or_404(job_id))
+
+
+@router.post("/analysis/jobs/{job_id}/cancel")
+def cancel_analysis_job(job_id: str) -> Dict[str, Any]:
+    _get_job_or_404(job_id)
+    return public_job_view(get_analysis_job_manager().cancel(job_id))
+
+
+# Seconds between keep-alive comments while a job has no new progress.
+JOB_EVENTS_HEARTBEAT_SECONDS = 15.0
+
+
+def _job_event_stream(job_id: str):
+    manager = get_analysis_job_manager()
+    job = manager.get(job_id)
+    last_version = None
+    while job is not None:
+        version = job.get("version", 0)
+        if job["status"] in TERMINAL_JOB_STATUSES:
+            yield f"event: end\ndata: {json.dumps(public_job_view(job))}\n\n"
+            return
+        if version != last_version:
+            last_version = version
+            yield f"event: progress\ndata: {json.dumps(public_job_view(job))}\n\n"
+        else:
+            yield ": keep-alive\n\n"
+        job = manager.wait_for_change(job_id, version, timeout=JOB_EVENTS_HEARTBEAT_SECONDS)
+
+
+@router.get("/analysis/jobs/{job_id}/events")
+def stream_analysis_job_events(job_id: str) -> StreamingResponse:
+    """Server-sent events: one `progress` event per job update, then a final `end` event."""
+    _get_job_or_404(job_id)
+    return StreamingResponse(
+        _job_event_stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/analysis/uploads/{upload_id}/projects")
 def list_upload_projects(upload_id: str) -> Dict[str, Any]:
     try:
@@ -624,9 +786,14 @@ def scan_single_project(upload_id: str, payload: ScanProjectRequest) -> Dict[str
                 "reason": "all_files_excluded",
             }
 
-        file_signatures = [extract_file_signature(f, project_path) for f in files]
-        project_signature = get_project_signature(file_signatures)
+        # Hash each scanned file once; `files` is a subset of `raw_files`.
         raw_file_signatures = [extract_file_signature(f, project_path) for f in raw_files]
+        signature_by_file = dict(zip(raw_files, raw_file_signatures))
+        file_signatures = [
+            signature_by_file[f] if f in signature_by_file else extract_file_signature(f, project_path)
+            for f in files
+        ]
+        project_signature = get_project_signature(file_signatures)
         full_project_signature = get_project_signature(raw_file_signatures)
         file_count = eligible_file_count
 
@@ -147,9 +147,9 @@ def _gemini_extract_jd_keywords(jd: str) -> List[str]:
         return _extract_jd_keywords_fallback(jd)
 
     try:
-        import google.generativeai as genai  # type: ignore
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
+        # Repeat scoring of the same JD is answered from the LLM response cache.
+        from app.client.llm_client import GeminiLLMClient
+        client = GeminiLLMClient(api_key=api_key)
 
         prompt = (
             "You are an expert ATS keyword extractor for technical job postings.\n"
@@ -172,8 +172,8 @@ def _gemini_extract_jd_keywords(jd: str) -> List[str]:
             f"Job description:\n{jd}"
         )
 
-        response = model.generate_content(prompt)
-        raw = response.text.strip()
+        # API errors come back as text, fail to parse and fall through to the fallback.
+        raw = client.generate(prompt).strip()
 
         # Strip markdown code fences if present
         raw = re.sub(r"^```(?:json)?\s*", "", raw)
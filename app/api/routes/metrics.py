@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+# Imported for its metrics: they are registered (and exposed, at zero) from startup.
+import app.utils.stage_timing  # noqa: F401
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics():
+    """Analysis stage timings and counts in the Prometheus text format."""
+    return Response(content=render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -5,6 +5,7 @@ from fastapi.responses import HTMLResponse, Response
 from app.utils.generate_resume import build_resume_model, load_saved_resume, resume_exists, save_resume_edits, save_personal_summary, create_resume, attach_projects_to_resume, add_projects_to_resume, remove_project_from_resume, list_resumes, duplicate_resume, rename_resume, ResumeNotFoundError, ResumeServiceError, ResumePersistenceError
 from app.utils.generate_resume_tex import generate_resume_tex
 from app.utils.pdflatex_path import resolve_pdflatex_executable
+from app.utils import pdf_cache
 from app.data.db import get_connection
 from pydantic import BaseModel, Field
 import subprocess
@@ -342,29 +343,15 @@ def get_or_compile_pdf(tex: str) -> bytes:
     if os.path.commonpath([base, target]) != base:
         raise HTTPException(400, "Invalid cache path")
 
-    # Return cached PDF if it already exists and is not a symlink
-    if os.path.exists(pdf_path) and not os.path.islink(pdf_path):
-        with open(pdf_path, "rb") as f:
-            return f.read()
+    # Served from the bounded LRU cache; concurrent exports of one resume share a compile
+    return pdf_cache.get_or_compile(pdf_path, lambda: compile_pdf(tex))
 
-    # Compile the PDF since it is not cached
-    pdf_bytes = compile_pdf(tex)
 
-    # Atomic write to avoid partial files; avoid writing through symlinks
-    tmp_path = pdf_path + ".tmp"
-    with open(tmp_path, "wb") as f:
-        f.write(pdf_bytes)
+@router.get("/resume/export/pdf/cache-stats")
+def resume_pdf_cache_stats():
+    """Hit/miss counters and current size of the compiled PDF cache."""
+    return pdf_cache.pdf_cache_stats(PDF_CACHE_DIR)
 
-    # If a symlink exists at the final path, remove it before replace
-    if os.path.islink(pdf_path):
-        try:
-            os.unlink(pdf_path)
-        except OSError:
-            pass
-
-    os.replace(tmp_path, pdf_path)
-    return pdf_bytes
-        
 @router.get("/resume/export/pdf")
 # Make the endpoint async to allow awaiting background tasks
 async def resume_pdf_export(
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import HTMLResponse
+import json
 import uuid, os
 from pathlib import Path
-import shutil
+
+from app.utils.zip_upload import NotAZipUpload, UploadRejected, check_zip_archive, receive_zip_upload
 
 router = APIRouter()
 
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "app/uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+NOT_A_ZIP_MESSAGE = "Please upload a ZIP file. Only .zip files are allowed."
+
 @router.get("/upload-file", response_class=HTMLResponse)
 def upload_page():
     # Show a frontend page for uploading file
@@ -24,26 +28,44 @@ def upload_page():
     </html>
     """
 
-@router.post("/upload-file")
-async def upload_file(file: UploadFile = File(None)):
-    # Validate presence and extension
-    if file is None or not file.filename or not file.filename.lower().endswith(".zip"):
-        # Return an HTML page that alerts then redirects back to the upload form
-        return HTMLResponse(
-            """
-            <script>
-            alert('Please upload a ZIP file. Only .zip files are allowed.');
-            window.location.href = '/upload-file';
-            </script>
-            """,
-            status_code=400,
-        )
+def _alert_redirect(message: str, status_code: int) -> HTMLResponse:
+    """An HTML page that alerts `message`, then redirects back to the upload form."""
+    # JSON string escaping, as a single-quoted JS literal that cannot close the <script>
+    escaped = json.dumps(message)[1:-1].replace("'", "\\'").replace("<", "\\u003c")
+    return HTMLResponse(
+        f"""
+        <script>
+        alert('{escaped}');
+        window.location.href = '/upload-file';
+        </script>
+        """,
+        status_code=status_code,
+    )
 
+
+@router.post("/upload-file")
+async def upload_file(request: Request):
     # get the upload id
     upload_id = str(uuid.uuid4())
     dest = Path(UPLOAD_DIR) / f"{upload_id}.zip"
+    # Written under a temporary name; only a validated archive becomes {upload_id}.zip
+    partial = dest.with_name(f"{upload_id}.zip.part")
 
-    with open(dest, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    try:
+        # Streamed to disk chunk by chunk, stopping at the configured byte limit
+        filename = await receive_zip_upload(request, partial)
+        if filename is None:
+            raise NotAZipUpload("no file uploaded")
+        check_zip_archive(partial)
+        os.replace(partial, dest)
+    except NotAZipUpload:
+        partial.unlink(missing_ok=True)
+        return _alert_redirect(NOT_A_ZIP_MESSAGE, 400)
+    except UploadRejected as exc:
+        partial.unlink(missing_ok=True)
+        return _alert_redirect(f"Upload rejected: {exc}.", exc.status_code)
+    except Exception:
+        partial.unlink(missing_ok=True)
+        raise
 
     return {"status": "ok", "upload_id": upload_id}
@@ -1,6 +1,7 @@
 """FastAPI app wiring (routers, static files, CORS). Import this for ASGI or the sidecar."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 import sys
 
@@ -22,8 +23,9 @@ from app.api.routes.user_preferences import router as user_preferences_router
 from app.api.routes.skills import router as skills_router
 from app.api.routes.projects import router as projects_router
 from app.api.routes.portfolio import router as portfolio_router
-from app.api.routes.analysis import router as analysis_router
+from app.api.routes.analysis import router as analysis_router, resume_analysis_jobs
 from app.api.routes.health import router as health_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.post_thumbnail import router as thumbnail_router
 from app.api.routes.chronological import router as chronological_router
 from app.api.routes.ats import router as ats_router
@@ -40,7 +42,14 @@ def _resolve_static_dir() -> Path:
     return Path(__file__).resolve().parent / "static"
 
 
-app = FastAPI(title="Big Picture API")
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Jobs that were queued or running when the server last stopped.
+    resume_analysis_jobs()
+    yield
+
+
+app = FastAPI(title="Big Picture API", lifespan=_lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -63,6 +72,7 @@ app.include_router(projects_router, prefix="/api")
 app.include_router(portfolio_router, prefix="/api")
 app.include_router(analysis_router, prefix="/api")
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(thumbnail_router, prefix="/api")
 app.include_router(chronological_router, prefix="/api")
 app.include_router(ats_router, prefix="/api")
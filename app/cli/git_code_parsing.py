@@ -5,16 +5,37 @@ Flow:
 1. Accept an array of file paths belonging to a single project.
 2. Pick one file and use it to locate the repo.
 3. Look up the Git user email from .git config.
-4. Call extract_code_commit_content_by_author()
+4. Call iter_code_commit_records()
    to pull commit-level data for that author across the repo.
-5. Return the JSON output (later can be stored into GIT_HISTORY, etc.).
+5. Yield the commit records (iter_git_commit_records) for the analysis stage,
+   or return them as JSON (run_git_parsing_from_files) for export.
 """
 
 from __future__ import annotations
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from app.utils.git_utils import extract_code_commit_content_by_author, get_repo, is_collaborative
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.utils.git_utils import (
+    GitHistoryIndex,
+    build_git_history_index,
+    extract_code_commit_content_by_author,
+    get_repo,
+    is_collaborative,
+    iter_code_commit_records,
+)
+from app.utils.git_budget import GitBudget, merge_reports
+from app.utils.git_aggregate_cache import (
+    author_cache_key,
+    get_ref_tips,
+    get_repo_identity,
+    list_new_commits,
+    load_git_aggregates,
+    save_git_aggregates,
+)
+from app.utils.code_analysis.code_analysis_utils import (
+    accumulate_github_development_patterns,
+    accumulate_github_individual_metrics,
+)
 from app.data.db import get_connection
 
 def _get_first_existing_path(file_paths: List[str]) -> Path:
@@ -79,18 +100,84 @@ def _group_paths_by_repo(file_paths: List[str]) -> Dict[Path, List[Path]]:
         repo_map.setdefault(repo_root, []).append(candidate)
     return repo_map
 
+def iter_git_commit_records(
+    file_paths: List[str],
+    include_merges: bool = False,
+    max_commits: Optional[int] = None,
+    history: Optional[GitHistoryIndex] = None,
+    budget: Optional[GitBudget] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the preferred author's commit records from every repository the
+    files belong to, without patch text, as iter_code_commit_records()
+    produces them. Same arguments as run_git_parsing_from_files; yields
+    nothing when no author is configured or no repository is found.
+    One `budget` bounds the extraction across all the repositories; pass
+    one to read its report() afterwards.
+    """
+    if budget is None:
+        budget = GitBudget()
+    github_user, author_email = _get_preferred_author_email()
+    if not author_email and not github_user:
+        print(
+            "[git-analysis] No user email or username found in USER_PREFERENCES. "
+            "Skipping Git analysis."
+        )
+        return
+
+    author_identifiers = []
+    for ident in (author_email, github_user):
+        if ident and ident not in author_identifiers:
+            author_identifiers.append(ident)
+    print(f"[git-analysis] Using author identifiers: {', '.join(author_identifiers)}")
+
+    repo_map = _group_paths_by_repo(file_paths)
+    if not repo_map:
+        print("[git-analysis] No Git repositories detected in provided paths.")
+        return
+
+    for repo_root in sorted(repo_map.keys()):
+        if history is not None and history.repo_root.resolve() == repo_root:
+            repo_history = history
+        else:
+            repo_history = build_git_history_index(repo_root)
+
+        try:
+            collaborative = is_collaborative(
+                repo_root, author_aliases=author_identifiers, history=repo_history
+            )
+            kind = "COLLABORATIVE" if collaborative else "SOLO"
+            print(f"[git-analysis] {kind} repo detected: {repo_root}")
+        except Exception as e:
+            print(f"[git-analysis] Could not determine collaboration status for {repo_root}: {e}")
+
+        yield from iter_code_commit_records(
+            repo_root,
+            author_identifiers,
+            include_merges=include_merges,
+            max_commits=max_commits,
+            history=repo_history,
+            budget=budget,
+        )
+
+
 def run_git_parsing_from_files(
     file_paths: List[str],
     include_merges: bool = False,
     max_commits: Optional[int] = None,
+    history: Optional[GitHistoryIndex] = None,
 ) -> str:
     """
-    Core function to call from main.py for Git-based parsing.
+    Git-based parsing as one JSON document, patch text included, for export.
+    The analysis pipeline uses iter_git_commit_records() instead.
 
     Args:
         file_paths: List of file paths inside the project.
         include_merges: Whether to include merge commits when extracting history.
         max_commits: Optional cap on number of commits to return.
+        history: Prebuilt GitHistoryIndex for the project's repository. Repos it
+            does not cover (e.g. nested repositories) get their own index, built
+            once and shared by the collaboration check and commit extraction.
 
     Returns:
         JSON string produced by extract_code_commit_content_by_author()
@@ -126,9 +213,16 @@ def run_git_parsing_from_files(
 
     all_commits: List[Dict] = []
     for repo_root in sorted(repo_map.keys()):
+        if history is not None and history.repo_root.resolve() == repo_root:
+            repo_history = history
+        else:
+            repo_history = build_git_history_index(repo_root)
+
         # 3) Check if repository is collaborative (for logging only)
         try:
-            collaborative = is_collaborative(repo_root, author_aliases=selected_identifiers)
+            collaborative = is_collaborative(
+                repo_root, author_aliases=selected_identifiers, history=repo_history
+            )
             if collaborative:
                 print(f"[git-analysis] COLLABORATIVE repo detected: {repo_root}")
             else:
@@ -142,6 +236,7 @@ def run_git_parsing_from_files(
             author=selected_identifiers,
             include_merges=include_merges,
             max_commits=max_commits,
+            history=repo_history,
         )
         try:
             repo_commits = json.loads(repo_json)
@@ -151,3 +246,151 @@ def run_git_parsing_from_files(
             all_commits.extend(repo_commits)
 
     return json.dumps(all_commits, indent=2)
+
+
+def _update_repo_aggregates(
+    repo_root: Path,
+    author_identifiers: List[str],
+    include_merges: bool,
+    history: Optional[GitHistoryIndex],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Extract one repository's commits for the author, reusing stored aggregates.
+
+    Only commits reachable from the current ref tips but not from the stored
+    ones are extracted; they are merged ahead of the stored commits (git log
+    order) and the result is written back. Any mismatch (unknown repo, rewritten
+    history) falls back to a full extraction.
+    """
+    try:
+        repo = get_repo(repo_root)
+        repo_key = get_repo_identity(repo)
+        ref_tips = get_ref_tips(repo)
+    except Exception:
+        repo, repo_key, ref_tips = None, None, []
+
+    author_key = author_cache_key(author_identifiers, include_merges)
+    stored = load_git_aggregates(repo_key, author_key) if repo_key else None
+    new_hashes = (
+        list_new_commits(repo, ref_tips, stored["ref_tips"]) if stored else None
+    )
+    if new_hashes is None:
+        stored = None
+
+    if stored is not None and not new_hashes:
+        print(f"[git-analysis] No new commits since last analysis: {repo_root}")
+        return stored["commits"], {
+            "metrics": stored["metrics"],
+            "patterns": stored["patterns"],
+            "extraction": stored.get("extraction"),
+        }
+
+    budget = GitBudget()
+    delta = list(iter_code_commit_records(
+        repo_root,
+        author_identifiers,
+        include_merges=include_merges,
+        history=history,
+        only_commits=new_hashes,
+        budget=budget,
+    ))
+
+    if stored is not None:
+        print(
+            f"[git-analysis] Incremental update: {len(delta)} new commit(s) merged "
+            f"into {len(stored['commits'])} stored for {repo_root}"
+        )
+        commits = delta + stored["commits"]
+        aggregates = {
+            "metrics": accumulate_github_individual_metrics(delta, stored["metrics"]),
+            "patterns": accumulate_github_development_patterns(delta, stored["patterns"]),
+            "extraction": merge_reports(stored.get("extraction"), budget.counters),
+        }
+    else:
+        commits = delta
+        aggregates = {
+            "metrics": accumulate_github_individual_metrics(delta),
+            "patterns": accumulate_github_development_patterns(delta),
+            "extraction": budget.report(),
+        }
+
+    if repo_key:
+        try:
+            save_git_aggregates(
+                repo_key,
+                author_key,
+                ref_tips,
+                delta if stored is not None else commits,
+                aggregates["metrics"],
+                aggregates["patterns"],
+                extraction=aggregates["extraction"],
+                append=stored is not None,
+            )
+        except Exception as e:
+            print(f"[git-analysis] Could not store git aggregates for {repo_root}: {e}")
+
+    return commits, aggregates
+
+
+def run_incremental_git_parsing_from_files(
+    file_paths: List[str],
+    include_merges: bool = False,
+    history: Optional[GitHistoryIndex] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Incremental variant of run_git_parsing_from_files for re-analysis.
+
+    Per-repo commit aggregates are persisted in GIT_AGGREGATE_CACHE keyed by the
+    repository's root commits, the author identifiers and the ref tips, so a
+    re-upload only extracts `git rev-list <new tips> ^<old tips>`.
+
+    Returns:
+        (commits, aggregates) where commits are the records iter_git_commit_records
+        would yield and aggregates is
+        {"metrics": ..., "patterns": ..., "extraction": ...} ready for
+        analyze_github_project, or None when no Git analysis was possible.
+        "extraction" is the GitBudget report (None unless something was limited).
+    """
+    github_user, author_email = _get_preferred_author_email()
+    if not author_email and not github_user:
+        print(
+            "[git-analysis] No user email or username found in USER_PREFERENCES. "
+            "Skipping Git analysis."
+        )
+        return [], None
+
+    author_identifiers: List[str] = []
+    for ident in (author_email, github_user):
+        if ident and ident not in author_identifiers:
+            author_identifiers.append(ident)
+
+    repo_map = _group_paths_by_repo(file_paths)
+    if not repo_map:
+        print("[git-analysis] No Git repositories detected in provided paths.")
+        return [], None
+
+    all_commits: List[Dict[str, Any]] = []
+    aggregates: Optional[Dict[str, Any]] = None
+    reports: List[Optional[Dict[str, Any]]] = []
+    for repo_root in sorted(repo_map.keys()):
+        if history is not None and history.repo_root.resolve() == repo_root:
+            repo_history = history
+        else:
+            repo_history = build_git_history_index(repo_root)
+
+        repo_commits, aggregates = _update_repo_aggregates(
+            repo_root, author_identifiers, include_merges, repo_history
+        )
+        all_commits.extend(repo_commits)
+        reports.append(aggregates.get("extraction"))
+
+    if len(repo_map) > 1:
+        # Nested repositories: per-repo states are in different orders, so
+        # re-fold the (already extracted) commit records into one aggregate.
+        aggregates = {
+            "metrics": accumulate_github_individual_metrics(all_commits),
+            "patterns": accumulate_github_development_patterns(all_commits),
+            "extraction": merge_reports(*reports),
+        }
+
+    return all_commits, aggregates
@@ -0,0 +1,202 @@
+"""
+Persistent cache of LLM responses.
+
+Re-analysing a project, or scoring the same job description again, used to
+re-send identical prompts to the model. Each row of LLM_RESPONSE_CACHE holds
+one response, keyed by a BLAKE2b digest of the model name, the normalised
+prompt and the generation parameters. Rows expire after a TTL, and the table
+is bounded by total response size, evicting the least recently used rows
+first. Concurrent identical requests from threads in this process are
+single-flighted: one caller asks the model and the others wait for its
+response. cached_generate_async() reads and writes the same cache from
+coroutines and single-flights identical requests awaited on one event loop.
+
+Cache failures never fail a request; the model is asked instead.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.data.db import get_connection
+from app.utils.single_flight import AsyncSingleFlight, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Bump when the meaning of a cached response changes for the same key.
+LLM_CACHE_VERSION = 1
+
+LLM_CACHE_TTL_ENV = "LLM_CACHE_TTL_SECONDS"
+DEFAULT_LLM_CACHE_TTL_SECONDS = 30 * 24 * 3600
+LLM_CACHE_MAX_BYTES_ENV = "LLM_CACHE_MAX_BYTES"
+DEFAULT_LLM_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _resolve(env_name: str, default: int, value: Optional[int] = None) -> int:
+    if value is None:
+        try:
+            value = int(os.environ.get(env_name, default))
+        except ValueError:
+            value = default
+    return max(0, int(value))
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompt text with line endings, trailing spaces and outer blank lines normalised."""
+    lines = str(prompt).replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def cache_key(model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+    """BLAKE2b cache key for one request."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"llm_cache={LLM_CACHE_VERSION}\0{model}\0".encode("utf-8"))
+    h.update(json.dumps(params or {}, sort_keys=True, default=str).encode("utf-8"))
+    h.update(b"\0")
+    h.update(normalize_prompt(prompt).encode("utf-8", "surrogatepass"))
+    return h.digest()
+
+
+def load_cached_response(key: bytes, ttl_seconds: Optional[int] = None) -> Optional[str]:
+    """The cached response for `key` if present and younger than the TTL; marks it recently used."""
+    ttl_seconds = _resolve(LLM_CACHE_TTL_ENV, DEFAULT_LLM_CACHE_TTL_SECONDS, ttl_seconds)
+    now = time.time()
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT response, created_at FROM LLM_RESPONSE_CACHE WHERE cache_key = ?", (key,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        if now - row[1] > ttl_seconds:
+            cursor.execute("DELETE FROM LLM_RESPONSE_CACHE WHERE cache_key = ?", (key,))
+            conn.commit()
+            return None
+        cursor.execute("UPDATE LLM_RESPONSE_CACHE SET last_used = ? WHERE cache_key = ?", (now, key))
+        conn.commit()
+        return row[0]
+    finally:
+        conn.close()
+
+
+def save_cached_response(key: bytes, model: str, response: str, max_bytes: Optional[int] = None) -> None:
+    """Upsert a response, then evict least recently used rows beyond the size budget."""
+    max_bytes = _resolve(LLM_CACHE_MAX_BYTES_ENV, DEFAULT_LLM_CACHE_MAX_BYTES, max_bytes)
+    if max_bytes == 0:
+        return
+    now = time.time()
+    size = len(response.encode("utf-8", "surrogatepass"))
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO LLM_RESPONSE_CACHE (cache_key, model, response, size_bytes, created_at, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                model = excluded.model,
+                response = excluded.response,
+                size_bytes = excluded.size_bytes,
+                created_at = excluded.created_at,
+                last_used = excluded.last_used
+            """,
+            (key, model, response, size, now, now),
+        )
+        cursor.execute(
+            """
+            DELETE FROM LLM_RESPONSE_CACHE WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key,
+                           SUM(size_bytes) OVER (ORDER BY last_used DESC, cache_key) AS running
+                    FROM LLM_RESPONSE_CACHE
+                ) WHERE running > ?
+            )
+            """,
+            (max_bytes,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+
+def _load_quietly(key: bytes) -> Optional[str]:
+    try:
+        return load_cached_response(key)
+    except Exception as e:
+        logger.debug("LLM cache lookup failed: %s", e)
+        return None
+
+
+def _save_quietly(key: bytes, model: str, response: Any, is_cacheable: Callable[[str], bool]) -> None:
+    if not (isinstance(response, str) and is_cacheable(response)):
+        return
+    try:
+        save_cached_response(key, model, response)
+    except Exception as e:
+        logger.debug("LLM cache store failed: %s", e)
+
+
+def cached_generate(
+    model: str,
+    prompt: str,
+    generate: Callable[[], str],
+    params: Optional[Dict[str, Any]] = None,
+    is_cacheable: Callable[[str], bool] = bool,
+) -> str:
+    """
+    Response for (model, prompt, params): from the cache, from an identical
+    request already in flight, or by calling `generate()`.
+
+    Only responses for which `is_cacheable(response)` holds are stored, so
+    error texts are retried on the next call. Setting LLM_CACHE_MAX_BYTES=0
+    turns the cache off.
+    """
+    if _resolve(LLM_CACHE_MAX_BYTES_ENV, DEFAULT_LLM_CACHE_MAX_BYTES) == 0:
+        return generate()
+    key = cache_key(model, prompt, params)
+    cached = _load_quietly(key)
+    if cached is not None:
+        return cached
+
+    def generate_and_store() -> str:
+        # An identical call may have finished between the lookup and taking the lead.
+        response = _load_quietly(key)
+        if response is None:
+            response = generate()
+            _save_quietly(key, model, response, is_cacheable)
+        return response
+
+    return _flights.do(key, generate_and_store)[0]
+
+
+async def cached_generate_async(
+    model: str,
+    prompt: str,
+    generate: Callable[[], Awaitable[str]],
+    params: Optional[Dict[str, Any]] = None,
+    is_cacheable: Callable[[str], bool] = bool,
+) -> str:
+    """cached_generate() for coroutines; cache reads and writes run in a worker thread."""
+    if _resolve(LLM_CACHE_MAX_BYTES_ENV, DEFAULT_LLM_CACHE_MAX_BYTES) == 0:
+        return await generate()
+    key = cache_key(model, prompt, params)
+    cached = await asyncio.to_thread(_load_quietly, key)
+    if cached is not None:
+        return cached
+
+    async def generate_and_store() -> str:
+        response = await asyncio.to_thread(_load_quietly, key)
+        if response is None:
+            response = await generate()
+            await asyncio.to_thread(_save_quietly, key, model, response, is_cacheable)
+        return response
+
+    return (await _async_flights.do(key, generate_and_store))[0]
@@ -1,33 +1,370 @@
-# Import the Google Generative AI Python client
-import google.generativeai as genai
+"""
+Client for Google's Gemini models over the Generative Language REST API.
+
+Every client in the process shares one runtime: an event loop on a daemon
+thread holding a pooled HTTP/1.1 keep-alive client, a token bucket that paces
+requests to GEMINI_REQUESTS_PER_MINUTE, and a semaphore that caps requests in
+flight at GEMINI_MAX_CONCURRENCY. Prompts for several projects analysed side
+by side are therefore sent concurrently, but under one limit. Rate limiting
+(429), timeouts, dropped connections and server errors are retried with
+jittered exponential backoff, waiting at least as long as the API asks.
+
+Responses are cached by model, prompt and generation config (see
+llm_cache.py), so a prompt sent again is answered without a model call.
+"""
+
+import asyncio
+import contextvars
 import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.client.llm_cache import cached_generate, cached_generate_async
+from app.utils.stage_timing import span
 
 logger = logging.getLogger(__name__)
 
+API_ERROR_PREFIX = "Gemini API error"
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+GEMINI_API_BASE_URL_ENV = "GEMINI_API_BASE_URL"
+DEFAULT_GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com"
+GEMINI_REQUESTS_PER_MINUTE_ENV = "GEMINI_REQUESTS_PER_MINUTE"
+DEFAULT_GEMINI_REQUESTS_PER_MINUTE = 60
+GEMINI_BURST_ENV = "GEMINI_BURST"
+DEFAULT_GEMINI_BURST = 5
+GEMINI_MAX_CONCURRENCY_ENV = "GEMINI_MAX_CONCURRENCY"
+DEFAULT_GEMINI_MAX_CONCURRENCY = 4
+GEMINI_MAX_RETRIES_ENV = "GEMINI_MAX_RETRIES"
+DEFAULT_GEMINI_MAX_RETRIES = 4
+GEMINI_TIMEOUT_ENV = "GEMINI_TIMEOUT_SECONDS"
+DEFAULT_GEMINI_TIMEOUT_SECONDS = 60.0
+GEMINI_BACKOFF_BASE_ENV = "GEMINI_BACKOFF_BASE_SECONDS"
+DEFAULT_GEMINI_BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Statuses worth retrying: timeouts, rate limiting and transient server errors.
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _env_number(name: str, default, cast=int):
+    try:
+        return max(0, cast(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class LLMError(Exception):
+    """A request the model did not answer."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def is_error_response(response: Optional[str]) -> bool:
+    """Whether a generate() result is an error text rather than model output."""
+    return isinstance(response, str) and response.startswith(API_ERROR_PREFIX)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most
+    `capacity`. Each request takes one token; when none is left, the caller
+    is told how long to wait for its own. The balance may go negative, which
+    queues callers behind each other in arrival order. A rate of 0 disables
+    the limit.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _camel_case(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def _request_body(prompt: str, generation_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    body: Dict[str, Any] = {"contents": [{"role": "user", "parts": [{"text": str(prompt)}]}]}
+    if generation_config:
+        # The REST API spells fields in camelCase; accept the SDK's snake_case too.
+        body["generationConfig"] = {_camel_case(k): v for k, v in generation_config.items()}
+    return body
+
+
+def _response_text(data: Any) -> str:
+    if not isinstance(data, dict):
+        raise LLMError(f"unexpected response body ({type(data).__name__}, not an object)")
+    candidates = data.get("candidates") or []
+    if not candidates:
+        feedback = data.get("promptFeedback")
+        reason = feedback.get("blockReason") if isinstance(feedback, dict) else None
+        if reason:
+            raise LLMError(f"prompt blocked ({reason})")
+        raise LLMError("response has no candidates")
+    candidate = candidates[0] if isinstance(candidates, list) else None
+    if not isinstance(candidate, dict):
+        raise LLMError("malformed candidate in response")
+    content = candidate.get("content")
+    parts = content.get("parts") if isinstance(content, dict) else None
+    if not isinstance(parts, list):
+        parts = []
+    text = "".join(str(part.get("text", "")) for part in parts if isinstance(part, dict))
+    if not text and candidate.get("finishReason") not in (None, "STOP", "MAX_TOKENS"):
+        raise LLMError(f"no text returned (finishReason {candidate['finishReason']})")
+    return text
+
+
+def _parse_seconds(value: Any) -> Optional[float]:
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)s?\s*", str(value))
+    return float(match.group(1)) if match else None
+
+
+def _error_from_response(response: httpx.Response) -> LLMError:
+    message, retry_after = response.reason_phrase, _parse_seconds(response.headers.get("retry-after", ""))
+    try:
+        error = response.json().get("error") or {}
+        message = error.get("message") or message
+        for detail in error.get("details") or []:
+            if str(detail.get("@type", "")).endswith("RetryInfo"):
+                retry_after = _parse_seconds(detail.get("retryDelay", "")) or retry_after
+    except (ValueError, AttributeError):
+        pass
+    return LLMError(
+        f"{response.status_code} {message}",
+        status_code=response.status_code,
+        retryable=response.status_code in RETRYABLE_STATUS,
+        retry_after=retry_after,
+    )
+
+
+class _GeminiRuntime:
+    """The process-wide event loop, HTTP client and limits every request goes through."""
+
+    def __init__(self):
+        self.base_url = os.environ.get(GEMINI_API_BASE_URL_ENV) or DEFAULT_GEMINI_API_BASE_URL
+        self.max_concurrency = max(1, _env_number(GEMINI_MAX_CONCURRENCY_ENV, DEFAULT_GEMINI_MAX_CONCURRENCY))
+        self.max_retries = _env_number(GEMINI_MAX_RETRIES_ENV, DEFAULT_GEMINI_MAX_RETRIES)
+        self.backoff_base = _env_number(GEMINI_BACKOFF_BASE_ENV, DEFAULT_GEMINI_BACKOFF_BASE_SECONDS, float)
+        timeout = _env_number(GEMINI_TIMEOUT_ENV, DEFAULT_GEMINI_TIMEOUT_SECONDS, float) or None
+        rpm = _env_number(GEMINI_REQUESTS_PER_MINUTE_ENV, DEFAULT_GEMINI_REQUESTS_PER_MINUTE, float)
+        self.bucket = TokenBucket(rpm / 60.0, _env_number(GEMINI_BURST_ENV, DEFAULT_GEMINI_BURST, float))
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency
+            ),
+        )
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="gemini-client", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def backoff(self, attempt: int, error: LLMError) -> float:
+        """Full-jitter exponential backoff, but never sooner than the server asked."""
+        delay = random.uniform(0, min(BACKOFF_MAX_SECONDS, self.backoff_base * (2 ** attempt)))
+        if error.retry_after is not None:
+            delay = max(delay, min(BACKOFF_MAX_SECONDS, error.retry_after))
+        return delay
+
+    async def generate_content(
+        self, api_key: str, model: str, prompt: str, generation_config: Optional[Dict[str, Any]]
+    ) -> str:
+        body = _request_body(prompt, generation_config)
+        url = f"/v1beta/models/{model}:generateContent"
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    await self.bucket.acquire()
+                    response = await self.http.post(url, json=body, headers={"x-goog-api-key": api_key})
+                if response.status_code != 200:
+                    raise _error_from_response(response)
+                try:
+                    data = response.json()
+                except ValueError as e:
+                    raise LLMError(f"invalid JSON in response: {e}") from e
+                return _response_text(data)
+            except httpx.TransportError as e:
+                error = LLMError(f"{type(e).__name__}: {e}", retryable=True)
+            except httpx.HTTPError as e:
+                # e.g. DecodingError, TooManyRedirects: retrying would not help.
+                error = LLMError(f"{type(e).__name__}: {e}")
+            except LLMError as e:
+                error = e
+            if not error.retryable or attempt >= self.max_retries:
+                raise error
+            delay = self.backoff(attempt, error)
+            logger.warning("Gemini request failed (%s); retry %d in %.1fs", error, attempt + 1, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def close(self) -> None:
+        try:
+            self.submit(self.http.aclose()).result(timeout=5)
+        except Exception as e:
+            logger.debug("Closing the Gemini HTTP client failed: %s", e)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self.loop.close()
+
+
+_runtime: Optional[_GeminiRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> _GeminiRuntime:
+    """The shared runtime, created on first use from the GEMINI_* settings."""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = _GeminiRuntime()
+    return _runtime
+
+
+def reset_gemini_runtime() -> None:
+    """Close the shared runtime; the next request starts one with the current settings."""
+    global _runtime
+    with _runtime_lock:
+        runtime, _runtime = _runtime, None
+    if runtime is not None:
+        runtime.close()
+
+
 class GeminiLLMClient:
     """
     Client for interacting with Google's Gemini LLM via the Generative AI API.
+
+    complete() and complete_async() raise LLMError when the model cannot
+    answer; generate() keeps the older contract of never raising and returns
+    any error as a "Gemini API error: ..." text (see is_error_response).
     """
 
-    def __init__(self, api_key, model="gemini-2.5-flash"):
+    def __init__(self, api_key, model=DEFAULT_MODEL, generation_config=None):
         """
         Initialize the Gemini client with an API key and model name.
         :param api_key: Your Gemini API key as a string.
         :param model: The model name to use (default: 'gemini-2.5-flash').
+        :param generation_config: Optional generation parameters (temperature, etc.).
         """
-        genai.configure(api_key=api_key)
+        self.api_key = api_key
         self.model = model
+        self.generation_config = generation_config
+
+    def _request(self, prompt):
+        if not self.api_key:
+            raise LLMError("no API key configured")
+        return get_runtime().generate_content(self.api_key, self.model, prompt, self.generation_config)
+
+    def complete(self, prompt) -> str:
+        """
+        The model's response text for a prompt.
+        :raises LLMError: if the model did not answer after the allowed retries.
+        """
+        with span("llm", requests=1):
+            return cached_generate(
+                self.model,
+                prompt,
+                lambda: get_runtime().submit(self._request(prompt)).result(),
+                params=self.generation_config,
+                is_cacheable=_is_cacheable,
+            )
+
+    async def complete_async(self, prompt) -> str:
+        """complete() for coroutines; waits without blocking the caller's event loop."""
+        with span("llm", requests=1):
+            return await cached_generate_async(
+                self.model,
+                prompt,
+                lambda: asyncio.wrap_future(get_runtime().submit(self._request(prompt))),
+                params=self.generation_config,
+                is_cacheable=_is_cacheable,
+            )
 
     def generate(self, prompt):
         """
         Generate a response from the Gemini model given a prompt.
         :param prompt: The prompt string to send to the model.
-        :return: The model's response text.
+        :return: The model's response text, or a "Gemini API error: ..." text.
         """
         try:
-            model = genai.GenerativeModel(self.model)
-            response = model.generate_content(prompt)
-            return response.text
+            return self.complete(prompt)
+        except LLMError as e:
+            logger.error(f"{API_ERROR_PREFIX}: {e}")
+            return f"{API_ERROR_PREFIX}: {e}"
         except Exception as e:
-            logger.error(f"Gemini API error: {e}")
-            return f"Gemini API error: {e}"
\ No newline at end of file
+            logger.exception(f"{API_ERROR_PREFIX}: {e}")
+            return f"{API_ERROR_PREFIX}: {e}"
+
+    async def generate_async(self, prompt):
+        """generate() for coroutines."""
+        try:
+            return await self.complete_async(prompt)
+        except LLMError as e:
+            logger.error(f"{API_ERROR_PREFIX}: {e}")
+            return f"{API_ERROR_PREFIX}: {e}"
+        except Exception as e:
+            logger.exception(f"{API_ERROR_PREFIX}: {e}")
+            return f"{API_ERROR_PREFIX}: {e}"
+
+    def generate_many(self, prompts: List[str]) -> List[str]:
+        """
+        generate() for several independent prompts, sent concurrently; results
+        are in prompt order. The shared concurrency cap and rate limit apply.
+        """
+        prompts = list(prompts)
+        if len(prompts) <= 1:
+            return [self.generate(prompt) for prompt in prompts]
+        workers = min(len(prompts), get_runtime().max_concurrency)
+        # Each prompt runs in a copy of the caller's context, so its time is
+        # attributed to the caller's analysis stage timer.
+        contexts = [contextvars.copy_context() for _ in prompts]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini-prompt") as pool:
+            return list(pool.map(lambda ctx, prompt: ctx.run(self.generate, prompt), contexts, prompts))
+
+
+def _is_cacheable(response):
+    """Error texts and empty responses are retried rather than cached."""
+    return bool(response and response.strip()) and not is_error_response(response)
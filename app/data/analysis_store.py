@@ -0,0 +1,98 @@
+"""
+Batched writes of one project's analysis results.
+
+save_project_analysis() replaces everything an analysis run stores for a
+project (the PROJECT row, SKILL_ANALYSIS, RESUME_SUMMARY, DASHBOARD_DATA and
+GIT_HISTORY) with one upsert and one executemany per table, inside the
+caller's transaction, so a failure part-way leaves the previous analysis in
+place. The SQL text is fixed at module level: pooled connections live across
+projects, and sqlite3's per-connection statement cache hands back the same
+prepared statements for every project written.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# A fresh analysis resets any score override, including the stored exclusion list.
+UPSERT_PROJECT_SQL = """
+    INSERT INTO PROJECT (project_signature, name, summary, score, score_overridden, score_overridden_value)
+    VALUES (?, ?, ?, ?, 0, NULL)
+    ON CONFLICT(project_signature) DO UPDATE SET
+        name = excluded.name,
+        summary = excluded.summary,
+        score = excluded.score,
+        score_overridden = 0,
+        score_overridden_value = NULL,
+        score_override_exclusions = NULL
+"""
+INSERT_SKILL_SQL = "INSERT INTO SKILL_ANALYSIS (project_id, skill, source, date) VALUES (?, ?, ?, ?)"
+INSERT_RESUME_SUMMARY_SQL = "INSERT INTO RESUME_SUMMARY (project_id, summary_text) VALUES (?, ?)"
+INSERT_METRIC_SQL = "INSERT INTO DASHBOARD_DATA (project_id, metric_name, metric_value) VALUES (?, ?, ?)"
+INSERT_GIT_HISTORY_SQL = """
+    INSERT INTO GIT_HISTORY (project_id, commit_hash, author_name, author_email, commit_date, message)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Tables holding one analysis run's rows; all are cleared before a project is rewritten.
+ANALYSIS_TABLES = ("GIT_HISTORY", "SKILL_ANALYSIS", "RESUME_SUMMARY", "DASHBOARD_DATA")
+_DELETE_SQL = {table: f"DELETE FROM {table} WHERE project_id = ?" for table in ANALYSIS_TABLES}
+
+
+def git_history_rows(project_signature: str, git_commits: Iterable[Dict[str, Any]]) -> List[Tuple[str, ...]]:
+    """GIT_HISTORY rows for the parsed commits that have both a hash and a date."""
+    rows = []
+    for commit in git_commits or []:
+        if not isinstance(commit, dict):
+            continue
+        commit_hash = commit.get("hash") or commit.get("commit_hash")
+        commit_date = commit.get("authored_datetime") or commit.get("committed_datetime")
+        if not commit_hash or not commit_date:
+            continue
+        rows.append((
+            project_signature,
+            str(commit_hash),
+            str(commit.get("author_name") or ""),
+            str(commit.get("author_email") or ""),
+            str(commit_date),
+            str(commit.get("message_summary") or commit.get("message") or ""),
+        ))
+    return rows
+
+
+def save_project_analysis(
+    conn: sqlite3.Connection,
+    project_signature: str,
+    project_name: str,
+    summary: Optional[str],
+    score: Optional[float],
+    skills: Iterable[Tuple[str, str, Optional[str]]],
+    resume_bullets: List[str],
+    metrics: Dict[str, Any],
+    git_commits: Optional[Iterable[Dict[str, Any]]] = None,
+) -> None:
+    """
+    Write one project's complete analysis on `conn`; the caller commits or rolls back.
+
+    `skills` are (skill, source, date) tuples. Previous analysis rows of the
+    project are replaced; GIT_HISTORY is left empty unless `git_commits` holds
+    valid commits.
+    """
+    conn.execute(UPSERT_PROJECT_SQL, (project_signature, project_name, summary, score))
+    for table in ANALYSIS_TABLES:
+        conn.execute(_DELETE_SQL[table], (project_signature,))
+
+    conn.executemany(
+        INSERT_SKILL_SQL,
+        [(project_signature, skill, source, date) for skill, source, date in skills],
+    )
+    conn.execute(INSERT_RESUME_SUMMARY_SQL, (project_signature, json.dumps(resume_bullets)))
+    conn.executemany(
+        INSERT_METRIC_SQL,
+        [
+            # Flatten if value is a dictionary or list type
+            (project_signature, key, json.dumps(value) if isinstance(value, (dict, list)) else value)
+            for key, value in metrics.items()
+        ],
+    )
+    if git_commits is not None:
+        conn.executemany(INSERT_GIT_HISTORY_SQL, git_history_rows(project_signature, git_commits))
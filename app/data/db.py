@@ -1,15 +1,29 @@
 import datetime
+import itertools
 import json
+import os
 import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional
 
 # --- Paths ---
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR 
 DB_PATH = DATA_DIR / "app.sqlite3"
 
+# Numeric value of a DASHBOARD_DATA metric (INTEGER or REAL), NULL for JSON
+# objects/arrays and free text. Lets aggregates and load_project_metrics read
+# numbers without casting or parsing metric_value.
+METRIC_NUMBER_EXPR = (
+    "CASE WHEN json_valid(metric_value) AND json_type(metric_value) IN ('integer', 'real') "
+    "THEN json_extract(metric_value, '$') END"
+)
+
 # --- SQL Schema ---
-SCHEMA = """
+SCHEMA = f"""
 CREATE TABLE IF NOT EXISTS CONSENT (
     id INTEGER PRIMARY KEY,
     policy_version TEXT,
@@ -48,6 +62,16 @@ CREATE TABLE IF NOT EXISTS PROJECT (
     thumbnail_path TEXT
 );
 
+-- One row per distinct entry of PROJECT.file_signatures, kept in sync by triggers --
+-- (see _migration_2_project_file_signatures); indexed for similarity candidate lookup.
+CREATE TABLE IF NOT EXISTS PROJECT_FILE_SIGNATURE (
+    project_signature TEXT NOT NULL,
+    file_signature TEXT NOT NULL,
+    PRIMARY KEY (project_signature, file_signature)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_project_file_signature_file ON PROJECT_FILE_SIGNATURE(file_signature);
+
 --Analyzed Git Data---
 
 CREATE TABLE IF NOT EXISTS GIT_HISTORY (
@@ -61,6 +85,88 @@ CREATE TABLE IF NOT EXISTS GIT_HISTORY (
     FOREIGN KEY (project_id) REFERENCES PROJECT(project_signature) ON DELETE CASCADE
 );
 
+-- Incremental git aggregates per repository (root commits) and author identity --
+-- Not tied to a PROJECT row: re-uploads get new signatures but keep their history.
+CREATE TABLE IF NOT EXISTS GIT_AGGREGATE_CACHE (
+    repo_key TEXT NOT NULL,
+    author_key TEXT NOT NULL,
+    ref_tips JSON NOT NULL, -- commit hashes of every ref when last analyzed
+    metrics_state JSON NOT NULL,
+    patterns_state JSON NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (repo_key, author_key)
+);
+
+-- Extracted commit records (patch text stripped) of a GIT_AGGREGATE_CACHE row --
+-- Incremental runs only insert their new commits.
+CREATE TABLE IF NOT EXISTS GIT_AGGREGATE_COMMIT (
+    repo_key TEXT NOT NULL,
+    author_key TEXT NOT NULL,
+    hexsha TEXT NOT NULL,
+    seq INTEGER NOT NULL, -- git log order: higher is newer
+    record JSON NOT NULL,
+    PRIMARY KEY (repo_key, author_key, hexsha),
+    FOREIGN KEY (repo_key, author_key) REFERENCES GIT_AGGREGATE_CACHE(repo_key, author_key) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_git_aggregate_commit_seq ON GIT_AGGREGATE_COMMIT(repo_key, author_key, seq);
+
+-- Per-file parse_code_flow results keyed by content hash (see parse_cache.py) --
+CREATE TABLE IF NOT EXISTS PARSE_CACHE (
+    content_key BLOB PRIMARY KEY, -- BLAKE2b of parser version, file name, top-level dirs and bytes
+    payload BLOB NOT NULL, -- zlib-compressed JSON of the parsed file entry
+    size_bytes INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON PARSE_CACHE(last_used);
+
+-- Model responses keyed by model, normalised prompt and parameters (see llm_cache.py) --
+CREATE TABLE IF NOT EXISTS LLM_RESPONSE_CACHE (
+    cache_key BLOB PRIMARY KEY, -- BLAKE2b of cache version, model, generation parameters and prompt
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL, -- rows older than LLM_CACHE_TTL_SECONDS are not served
+    last_used REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_used ON LLM_RESPONSE_CACHE(last_used);
+
+-- Materialized portfolio (see portfolio_cache.py); triggers from migration 3 invalidate it --
+CREATE TABLE IF NOT EXISTS PORTFOLIO_CACHE (
+    selection_key TEXT PRIMARY KEY, -- '' for all projects, else the JSON list of requested project ids
+    model JSON NOT NULL,
+    built_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS PORTFOLIO_PROJECT_CACHE (
+    project_signature TEXT PRIMARY KEY,
+    entry JSON NOT NULL, -- the project's entry in the portfolio model
+    collaborators JSON NOT NULL, -- resolved collaborators, including the git fallbacks
+    built_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS PORTFOLIO_CACHE_STATE (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL -- bumped by every write the portfolio depends on
+);
+
+-- Background analysis jobs (see analysis_jobs.py); unfinished jobs resume on startup --
+CREATE TABLE IF NOT EXISTS ANALYSIS_JOB (
+    job_id TEXT PRIMARY KEY,
+    upload_id TEXT NOT NULL,
+    payload JSON NOT NULL, -- AnalyzeUploadRequest the job was submitted with
+    status TEXT NOT NULL CHECK (status IN ('queued', 'running', 'completed', 'failed', 'cancelled')),
+    progress JSON, -- per-project stage and status, plus results of finished projects
+    result JSON,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_job_status ON ANALYSIS_JOB(status);
+
 -- Analyzed Skill Analysis Data --
 
 CREATE TABLE IF NOT EXISTS SKILL_ANALYSIS (
@@ -81,6 +187,7 @@ CREATE TABLE IF NOT EXISTS DASHBOARD_DATA (
     metric_value TEXT,
     chart_type TEXT DEFAULT NONE,
     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    metric_number NUMERIC GENERATED ALWAYS AS ({METRIC_NUMBER_EXPR}) VIRTUAL,
     FOREIGN KEY (project_id) REFERENCES PROJECT(project_signature) ON DELETE CASCADE
 );
 
@@ -166,11 +273,276 @@ CREATE TABLE IF NOT EXISTS COVER_LETTER (
 def ensure_data_dir():
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# --- Connection pool ---
+# Connections are pooled per thread (sqlite3 connections must stay on the thread
+# that opened them) and opened in WAL mode, so API readers keep reading while an
+# analysis run writes. get_connection() keeps its open/close contract: close()
+# hands the connection back to the pool, rolling back anything left uncommitted.
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+CACHE_SIZE_KIB = 16 * 1024
+# Prepared statements kept per connection; pooled connections reuse them across requests.
+STATEMENT_CACHE_SIZE = 256
+# Idle connections kept per thread, across all database paths.
+MAX_IDLE_CONNECTIONS = 4
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};",
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    f"PRAGMA mmap_size = {MMAP_SIZE_BYTES};",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KIB};",
+    "PRAGMA temp_store = MEMORY;",
+)
+
+
+def _file_id(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _open_connection(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, cached_statements=STATEMENT_CACHE_SIZE)
+    for pragma in CONNECTION_PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.DatabaseError:
+            # e.g. WAL is unavailable on some network filesystems; keep the default.
+            pass
+    return conn
+
+
+class _ThreadPool:
+    """Idle connections of one thread, most recently used last."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle = []  # (path, file_id, connection)
+        self.units = {}  # path -> connection of the active unit of work
+
+    def acquire(self, path: str) -> sqlite3.Connection:
+        with self.lock:
+            for i in range(len(self.idle) - 1, -1, -1):
+                if self.idle[i][0] == path:
+                    _, file_id, conn = self.idle.pop(i)
+                    break
+            else:
+                conn = None
+        if conn is not None:
+            # The file was deleted or replaced since; this connection points at the old one.
+            if file_id is not None and file_id == _file_id(path):
+                return conn
+            conn.close()
+        return _open_connection(path)
+
+    def release(self, path: str, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self.lock:
+            self.idle.append((path, _file_id(path), conn))
+            evicted = self.idle[:-MAX_IDLE_CONNECTIONS] if len(self.idle) > MAX_IDLE_CONNECTIONS else []
+            del self.idle[:len(evicted)]
+        for _, _, old in evicted:
+            old.close()
+
+    def close_idle(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for _, _, conn in idle:
+            conn.close()
+
+
+_local = threading.local()
+
+
+def _thread_pool() -> _ThreadPool:
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = _ThreadPool()
+    return pool
+
+
+class _SharedConnection:
+    """The connection of a shared_connection() block and its open units of work."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        # One entry per open unit_of_work(), innermost last: the savepoint it
+        # rolls back to, or None when it started outside a transaction.
+        self.units = []
+
+    def rollback_unit(self) -> None:
+        """Undo the innermost unit's changes so far (the unit stays open)."""
+        savepoint = self.units[-1]
+        if savepoint is not None:
+            try:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                return
+            except sqlite3.OperationalError:
+                # The savepoint is gone (a full rollback or commit ended the transaction).
+                pass
+        self.conn.rollback()
+
+
+class PooledConnection:
+    """
+    sqlite3.Connection handle returned by get_connection(). Everything is
+    delegated to the underlying connection except close(), which returns it to
+    the pool (or does nothing inside shared_connection()), and, inside a
+    unit_of_work(), commit() and rollback(): commit() leaves the changes to the
+    unit and rollback() undoes the innermost unit's changes so far.
+    """
+
+    __slots__ = ("_conn", "_release", "_shared")
+
+    def __init__(self, conn: sqlite3.Connection, release=None, shared: Optional[_SharedConnection] = None):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_release", release)
+        object.__setattr__(self, "_shared", shared)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return self._conn
+
+    def _in_unit(self) -> bool:
+        return self._shared is not None and bool(self._shared.units)
+
+    def commit(self) -> None:
+        if not self._in_unit():
+            self.connection.commit()
+
+    def rollback(self) -> None:
+        if self._in_unit():
+            self._shared.rollback_unit()
+        else:
+            self.connection.rollback()
+
+    def close(self) -> None:
+        conn, release = self._conn, self._release
+        object.__setattr__(self, "_conn", None)
+        if conn is not None and release is not None:
+            release(conn)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.connection, name, value)
+
+    def __enter__(self):
+        self.connection.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self._in_unit():
+            return self.connection.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            self.rollback()
+        return False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
 def get_connection():
+    """
+    Connection to DB_PATH from the calling thread's pool (or the thread's active
+    shared_connection() block). Callers close() it as before; that returns it to the pool.
+    """
     ensure_data_dir()
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    path = str(DB_PATH)
+    pool = _thread_pool()
+    shared = pool.units.get(path)
+    if shared is not None:
+        return PooledConnection(shared.conn, shared=shared)
+    return PooledConnection(pool.acquire(path), lambda conn: pool.release(path, conn))
+
+
+@contextmanager
+def shared_connection():
+    """
+    Share one connection for a block of work on this thread.
+
+    Every get_connection() inside the block returns the same connection (and
+    their close() calls are no-ops). This only saves connection checkouts:
+    changes are committed when the code making them commits, as outside the
+    block, and whatever is left uncommitted when the block ends is rolled back,
+    as close() does. Use unit_of_work() for writes that must be atomic. Nested
+    blocks join the outermost one.
+    """
+    ensure_data_dir()
+    path = str(DB_PATH)
+    pool = _thread_pool()
+    shared = pool.units.get(path)
+    if shared is not None:
+        yield PooledConnection(shared.conn, shared=shared)
+        return
+    conn = pool.acquire(path)
+    shared = pool.units[path] = _SharedConnection(conn)
+    try:
+        yield PooledConnection(conn, shared=shared)
+    finally:
+        del pool.units[path]
+        pool.release(path, conn)
+
+
+_savepoint_ids = itertools.count(1)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Run a block of writes as one transaction on this thread's shared connection.
+
+    The block commits when it exits normally and rolls back if it raises.
+    commit() calls made inside it (e.g. by helpers that commit their own
+    writes) are deferred to the outermost block's end. A nested block is a
+    savepoint: if it raises, only its own changes are rolled back, even when
+    the caller handles the error and the outer block goes on to commit.
+    """
+    with shared_connection() as handle:
+        shared = handle._shared
+        outermost = not shared.units
+        conn = shared.conn
+        savepoint = None
+        if conn.in_transaction:
+            # Changes made before the block stay out of its rollback.
+            savepoint = f"unit_of_work_{next(_savepoint_ids)}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+        shared.units.append(savepoint)
+        try:
+            yield handle
+        except BaseException:
+            shared.rollback_unit()
+            raise
+        finally:
+            shared.units.pop()
+            if savepoint is not None:
+                try:
+                    conn.execute(f"RELEASE {savepoint}")
+                except sqlite3.OperationalError:
+                    pass
+        if outermost:
+            conn.commit()
+
+
+def close_pooled_connections() -> None:
+    """Close the calling thread's idle pooled connections."""
+    _thread_pool().close_idle()
 
 
 def init_db():
@@ -192,11 +564,147 @@ def init_db():
     _ensure_resume_project_has_no_project_fk(cursor)
     _ensure_cover_letter_table(cursor)
     _ensure_consent_columns(cursor)
+    _ensure_git_aggregate_commits_table(cursor)
+    _apply_migrations(cursor)
     conn.commit()
     conn.close()
     print(f"Database initialized at: {DB_PATH}")
 
 
+def _migration_1_indexed_analysis_tables(cursor: sqlite3.Cursor) -> None:
+    """Index per-project analysis tables and add the typed DASHBOARD_DATA.metric_number column."""
+    cursor.execute("PRAGMA table_xinfo(DASHBOARD_DATA)")
+    if "metric_number" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(
+            "ALTER TABLE DASHBOARD_DATA ADD COLUMN metric_number NUMERIC "
+            f"GENERATED ALWAYS AS ({METRIC_NUMBER_EXPR}) VIRTUAL"
+        )
+    # Single-column project_id indexes keep per-project rows in insertion order.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_skill_analysis_project ON SKILL_ANALYSIS(project_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_skill_analysis_skill ON SKILL_ANALYSIS(skill, source, project_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dashboard_data_project ON DASHBOARD_DATA(project_id)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dashboard_data_metric "
+        "ON DASHBOARD_DATA(metric_name, project_id, metric_number)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resume_summary_project ON RESUME_SUMMARY(project_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_git_history_project ON GIT_HISTORY(project_id)")
+
+
+# Inserts the string entries of a PROJECT row's file_signatures JSON array.
+_PROJECT_FILE_SIGNATURE_FILL = """
+    INSERT OR IGNORE INTO PROJECT_FILE_SIGNATURE (project_signature, file_signature)
+    SELECT NEW.project_signature, value
+    FROM json_each(CASE WHEN json_valid(NEW.file_signatures) AND json_type(NEW.file_signatures) = 'array'
+                        THEN NEW.file_signatures END)
+    WHERE type = 'text';
+"""
+
+
+def _migration_2_project_file_signatures(cursor: sqlite3.Cursor) -> None:
+    """Mirror PROJECT.file_signatures into PROJECT_FILE_SIGNATURE, for every writer, and backfill it."""
+    # INSERT OR REPLACE does not fire delete triggers, so inserts clear stale rows themselves.
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS project_file_signature_insert
+        AFTER INSERT ON PROJECT
+        FOR EACH ROW
+        BEGIN
+            DELETE FROM PROJECT_FILE_SIGNATURE WHERE project_signature = NEW.project_signature;
+            {_PROJECT_FILE_SIGNATURE_FILL}
+        END;
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS project_file_signature_update
+        AFTER UPDATE OF project_signature, file_signatures ON PROJECT
+        FOR EACH ROW
+        BEGIN
+            DELETE FROM PROJECT_FILE_SIGNATURE WHERE project_signature = OLD.project_signature;
+            {_PROJECT_FILE_SIGNATURE_FILL}
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_file_signature_delete
+        AFTER DELETE ON PROJECT
+        FOR EACH ROW
+        BEGIN
+            DELETE FROM PROJECT_FILE_SIGNATURE WHERE project_signature = OLD.project_signature;
+        END;
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO PROJECT_FILE_SIGNATURE (project_signature, file_signature)
+        SELECT p.project_signature, s.value
+        FROM PROJECT p,
+             json_each(CASE WHEN json_valid(p.file_signatures) AND json_type(p.file_signatures) = 'array'
+                            THEN p.file_signatures END) s
+        WHERE s.type = 'text'
+    """)
+
+
+# Writes that change the portfolio model: (table, project id column, columns the portfolio reads).
+# A None project column means the write affects every project (the user's aliases mark collaborators).
+PORTFOLIO_SOURCES = (
+    ("PROJECT", "project_signature",
+     "project_signature, name, summary, score, score_overridden, score_overridden_value, "
+     "score_override_exclusions, created_at, last_modified, path, thumbnail_path"),
+    ("SKILL_ANALYSIS", "project_id", "project_id, skill"),
+    ("DASHBOARD_DATA", "project_id", "project_id, metric_name, metric_value"),
+    ("GIT_HISTORY", "project_id", "project_id, author_name, author_email, commit_date"),
+    ("USER_PREFERENCES", None, None),
+)
+
+
+def _portfolio_invalidation(project_column: Optional[str], *rows: str) -> str:
+    statements = [
+        "UPDATE PORTFOLIO_CACHE_STATE SET version = version + 1 WHERE id = 1;",
+        "DELETE FROM PORTFOLIO_CACHE;",
+    ]
+    if project_column is None:
+        statements.append("DELETE FROM PORTFOLIO_PROJECT_CACHE;")
+    else:
+        statements += [
+            f"DELETE FROM PORTFOLIO_PROJECT_CACHE WHERE project_signature = {row}.{project_column};"
+            for row in rows
+        ]
+    return "\n            ".join(statements)
+
+
+def _migration_3_portfolio_cache(cursor: sqlite3.Cursor) -> None:
+    """Invalidate the materialized portfolio on every write to the rows it is built from."""
+    cursor.execute("INSERT OR IGNORE INTO PORTFOLIO_CACHE_STATE (id, version) VALUES (1, 0)")
+    for table, project_column, columns in PORTFOLIO_SOURCES:
+        update_of = f"UPDATE OF {columns}" if columns else "UPDATE"
+        for event, timing, rows in (
+            ("insert", "INSERT", ("NEW",)),
+            ("update", update_of, ("OLD", "NEW")),
+            ("delete", "DELETE", ("OLD",)),
+        ):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS portfolio_cache_{table.lower()}_{event}
+                AFTER {timing} ON {table}
+                FOR EACH ROW
+                BEGIN
+                    {_portfolio_invalidation(project_column, *rows)}
+                END;
+            """)
+
+
+# Ordered schema migrations; PRAGMA user_version records how many have run.
+MIGRATIONS = [
+    _migration_1_indexed_analysis_tables,
+    _migration_2_project_file_signatures,
+    _migration_3_portfolio_cache,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def _apply_migrations(cursor: sqlite3.Cursor) -> None:
+    """Run the migrations newer than the database's user_version, in order."""
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(cursor)
+        cursor.execute(f"PRAGMA user_version = {number}")
+
+
 def _ensure_consent_columns(cursor: sqlite3.Cursor) -> None:
     """Older DBs may have CONSENT without timestamp/policy_version; API GET uses timestamp."""
     cursor.execute(
@@ -214,6 +722,20 @@ def _ensure_consent_columns(cursor: sqlite3.Cursor) -> None:
         )
 
 
+def _ensure_git_aggregate_commits_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Earlier GIT_AGGREGATE_CACHE rows kept every commit record in one JSON
+    `commits` column. It only holds derived data, so a table of that shape is
+    dropped and recreated empty; the next analysis of each repository
+    extracts its history again into GIT_AGGREGATE_COMMIT.
+    """
+    cursor.execute("PRAGMA table_info(GIT_AGGREGATE_CACHE)")
+    if "commits" not in {row[1] for row in cursor.fetchall()}:
+        return
+    cursor.execute("DROP TABLE GIT_AGGREGATE_CACHE")
+    cursor.executescript(SCHEMA)
+
+
 def _ensure_project_override_exclusions_column(cursor: sqlite3.Cursor) -> None:
     """Ensure PROJECT has score_override_exclusions column on existing DBs."""
     cursor.execute("PRAGMA table_info(PROJECT)")
@@ -647,7 +1169,64 @@ def seed_db():
         "local"
     ))
 
+    # --- GIT_AGGREGATE_CACHE ---
+    cursor.execute("""
+        INSERT OR IGNORE INTO GIT_AGGREGATE_CACHE (repo_key, author_key, ref_tips, metrics_state, patterns_state)
+        VALUES (?, ?, ?, ?, ?)
+    """, (
+        "seed_repo_key",
+        "v1|merges=0|johnu@gmail.com|testuser",
+        json.dumps(["c2"]),
+        json.dumps({"total_commits": 1}),
+        json.dumps({"total_commits": 1}),
+    ))
+    cursor.execute("""
+        INSERT OR IGNORE INTO GIT_AGGREGATE_COMMIT (repo_key, author_key, hexsha, seq, record)
+        VALUES (?, ?, ?, ?, ?)
+    """, (
+        "seed_repo_key",
+        "v1|merges=0|johnu@gmail.com|testuser",
+        "c2",
+        1,
+        json.dumps({"hash": "c2", "author_email": "johnu@gmail.com", "message_summary": "Seed commit", "files": []}),
+    ))
+
+    # --- PARSE_CACHE ---
+    seed_payload = zlib.compress(json.dumps({"language": "Python", "lines_of_code": 1}).encode("utf-8"))
+    cursor.execute("""
+        INSERT OR IGNORE INTO PARSE_CACHE (content_key, payload, size_bytes, last_used)
+        VALUES (?, ?, ?, ?)
+    """, (b"seed_content_key", seed_payload, len(seed_payload), 0.0))
+
+    # --- LLM_RESPONSE_CACHE ---
+    cursor.execute("""
+        INSERT OR IGNORE INTO LLM_RESPONSE_CACHE (cache_key, model, response, size_bytes, created_at, last_used)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (b"seed_cache_key", "gemini-2.5-flash", "Seed response.", len("Seed response."), 0.0, 0.0))
+
+    # --- ANALYSIS_JOB ---
+    cursor.execute("""
+        INSERT OR IGNORE INTO ANALYSIS_JOB
+            (job_id, upload_id, payload, status, progress, result, error, cancel_requested, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        "seed_job",
+        "seed_upload",
+        json.dumps({"upload_id": "seed_upload", "default_analysis_type": "local"}),
+        "completed",
+        json.dumps({"projects": []}),
+        json.dumps({"projects": []}),
+        None,
+        0,
+        "2025-01-01T00:00:00+00:00",
+        "2025-01-01T00:00:00+00:00",
+    ))
+
     conn.commit()
     conn.close()
 
+    # --- PORTFOLIO_CACHE, PORTFOLIO_PROJECT_CACHE: materialize the seeded portfolio ---
+    from app.utils.generate_portfolio import build_portfolio_model
+    build_portfolio_model()
+
     print("Seed data inserted successfully")
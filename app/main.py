@@ -44,9 +44,12 @@ from app.utils.non_code_analysis.non_code_file_checker import classify_non_code_
 from app.utils.non_code_parsing.document_parser import parsed_input_text
 from app.utils.project_extractor import get_project_top_level_dirs 
 from app.utils.code_analysis.parse_code_utils import parse_code_flow
-from app.utils.git_utils import detect_git
-from app.cli.git_code_parsing import run_git_parsing_from_files, _get_preferred_author_email
+from app.utils.git_utils import build_git_history_index, detect_git
+from app.cli.git_code_parsing import iter_git_commit_records, _get_preferred_author_email
+from app.utils.git_budget import GitBudget
+from app.utils.stage_timing import StageTimer, span
 from app.utils.non_code_analysis.non_3rd_party_analysis import analyze_project_clean
+from app.utils.project_scheduler import estimate_project_memory, run_projects, write_through
 from app.utils.non_code_analysis.non_code_analysis_utils import (
     analyze_non_code_files,
 )
@@ -140,6 +143,178 @@ def _open_delete_manager() -> None:
     except Exception as e:
         print(f"❌ Error in delete manager: {e}")
 
+def _print_stage_timings(project_name: str, timings: dict) -> None:
+    stages = ", ".join(
+        f"{stage} {entry['seconds']:.2f}s" for stage, entry in timings["stages"].items()
+    )
+    print(f"⏱️ {project_name}: {timings['total_seconds']:.2f}s ({stages})")
+
+
+def _analyze_cli_project(project: dict, writer=None) -> None:
+    """
+    Parse, analyse and store one project the CLI has already scanned and asked
+    about. Runs on a project scheduler thread when several projects are analysed
+    at once, so it must not prompt; results are written through `writer`.
+    Prints the time spent per stage when done.
+    """
+    timer = StageTimer()
+    with timer.activate():
+        _run_cli_project_stages(project, writer)
+    _print_stage_timings(project["project_name"], timer.finish("analyzed"))
+
+
+def _run_cli_project_stages(project: dict, writer=None) -> None:
+    project_path = project["project_path"]
+    project_name = project["project_name"]
+    scan_result = project["scan_result"]
+    files = scan_result['files']
+    top_level_dirs = project["top_level_dirs"]
+    git_history = project["git_history"]
+    non_code_result = project["non_code_result"]
+    analysis_type = project["analysis_type"]
+
+    # --- Parsing integration ---
+    print("📄 Parsing non-code files...")
+    try:
+        # Pass both email and username for better author matching
+        author_identifiers = []
+        if non_code_result['user_identity'].get('email'):
+            author_identifiers.append(non_code_result['user_identity']['email'])
+        if non_code_result['user_identity'].get('name'):
+            author_identifiers.append(non_code_result['user_identity']['name'])
+
+        with span("parse") as counts:
+            parsed_non_code = parsed_input_text(
+                file_paths_dict={
+                    'collaborative': non_code_result['collaborative'],
+                    'non_collaborative': non_code_result['non_collaborative']
+                },
+                repo_path=project_path if detect_git(project_path) else None,
+                author=author_identifiers if author_identifiers else None,
+                history=git_history
+            )
+            counts["documents"] = len(parsed_non_code.get("parsed_files", []))
+        print(f"✅ Parsed {len(parsed_non_code.get('parsed_files', []))} non-code files")
+    except Exception as e:
+        print(f"⚠️ Warning: Non-code parsing failed: {e}")
+        parsed_non_code = {'parsed_files': []}
+    # --- End parsing integration ---  
+
+
+    print(f"🔍 Analyzing code files in {project_name}... hang tight! ⚙️📁")
+    #check if git or non git 
+    # if git: call parsing for git -> analysis for git USING LLM
+    if detect_git(project_path):
+        print("📘 Git repository detected — running Git-based code parsing...")
+        try:
+            git_budget = GitBudget()
+            with span("git_extraction") as counts:
+                git_commits = list(iter_git_commit_records(
+                file_paths=files,
+                include_merges=False,
+                max_commits=None,  # set a limit if needed
+                history=git_history,
+                budget=git_budget,
+                ))
+                counts["commits"] = len(git_commits)
+            print("✅ Git code parsing completed.")
+        except Exception as e:
+            print(f"⚠️ Git code parsing failed: {e}")
+    # else call parsing for local -> analysis for local USING LLM
+    else:
+        with span("parse", files=len(files)):
+            parse_code = parse_code_flow(files, top_level_dirs)
+
+
+    # analysis flow with LLM
+    if analysis_type == 'ai':
+        print("🤖 Running AI analysis...")
+
+        # Double-check API key (safety check)
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            print("❌ Error: Gemini API key not available. Falling back to local analysis.")
+            analysis_type = 'local'
+        else:
+            try:
+                llm_client = GeminiLLMClient(api_key=api_key)
+
+                print(f"✅ Starting AI analysis for {project_name}")                                
+                # --- NON-CODE ANALYSIS (AI) ---
+                try:
+                    with span("nlp"):
+                        non_code_analysis_results=analyze_non_code_files(parsed_non_code=parsed_non_code)
+                    print(f"✅ AI Non Code Analysis completed successfully!")
+
+                except Exception as e:
+                    print(f"⚠️ AI non-code analysis failed: {e}")
+                    print("🔄 Falling back to local non-code analysis...")
+                    with span("nlp"):
+                        non_code_analysis_results = analyze_project_clean(parsed_non_code)
+                 # --- NON-CODE ANALYSIS (AI) ---
+
+                try:
+                    with span("analysis"):
+                        if detect_git(project_path):
+                            code_analysis_results = analyze_github_project(git_commits, llm_client, extraction=git_budget.report())
+                        else:
+                            code_analysis_results = analyze_parsed_project(parse_code, llm_client)
+                except Exception as e:
+                    print(f"⚠️ AI code analysis failed: {e}")
+                    print("🔄 Falling back to local non-code analysis...")
+                    with span("analysis"):
+                        code_analysis_results = analyze_parsed_project(parsed_non_code)
+                 # --- NON-CODE ANALYSIS (AI) ---
+                # merge code and non code LLM analysis then store into db
+                try:
+                    with span("merge"):
+                        write_through(writer, merge_analysis_results, non_code_analysis_results=non_code_analysis_results,code_analysis_results=code_analysis_results, project_name=project_name, project_signature=scan_result["signature"], history=git_history)
+                    with span("persist", files=len(files)):
+                        write_through(writer, persist_analyzed_file_signatures, scan_result["signature"], project_path, files)
+                except Exception as e:
+                    print(f"❌ Error storing analysis results for {project_name}: {e}")
+
+
+            except Exception as e:
+                print(f"❌ Error initializing AI client: {e}")
+                print("🔄 Falling back to local analysis...")
+                analysis_type = 'local'
+
+    # Handle local analysis (including fallbacks from AI failures)
+    if analysis_type == 'local':
+        print("📊 Running local analysis...")
+        print(f"✅ Starting Local analysis for {project_name}")
+
+        try:
+            # Run non-3rd party analysis (no LLM) using parsed_non_code with user preferences
+            with span("nlp"):
+                non_code_local_results = analyze_project_clean(parsed_non_code)
+            print(f"✅ Non Code Analysis completed successfully!")
+        except Exception as e:
+            print(f"⚠️ Non Code Local analysis failed: {e}")
+            import traceback
+            traceback.print_exc()
+            non_code_local_results = {}
+
+        try:
+            with span("analysis"):
+                if detect_git(project_path):
+                    code_analysis_results = analyze_github_project(git_commits, extraction=git_budget.report())
+                else:
+                    code_analysis_results = analyze_parsed_project(parse_code)
+        except Exception as e:
+            print(f"⚠️ Code Local analysis failed: {e}")
+            code_analysis_results = {}
+        # merge code and non code LOCAL analysis then store into db
+        try:
+            with span("merge"):
+                write_through(writer, merge_analysis_results, non_code_analysis_results=non_code_local_results, code_analysis_results=code_analysis_results, project_name=project_name, project_signature=scan_result["signature"], history=git_history)
+            with span("persist", files=len(files)):
+                write_through(writer, persist_analyzed_file_signatures, scan_result["signature"], project_path, files)
+        except Exception as e:
+            print(f"❌ Error storing analysis results for {project_name}: {e}")
+
+
 # Database Entry Point
 def main():
     init_db()  # creates the SQLite DB + tables
@@ -262,6 +437,7 @@ def main():
                 
                 # will be used once analysis on each project is done to be able to fetch individual project analysis to display
                 project_signatures = []
+                pending_projects = []
                 
                 for i, project_path in enumerate(rc["projects"], 1):
                     project_name = Path(project_path).name
@@ -293,140 +469,38 @@ def main():
                         except Exception:
                             latest_prefs = None
 
+                        # Walk git history once per project and share it across stages
+                        git_history = build_git_history_index(project_path) if detect_git(project_path) else None
+
                         username, email=_get_preferred_author_email()
-                        non_code_result = classify_non_code_files_with_user_verification(project_path, email, username)
+                        non_code_result = classify_non_code_files_with_user_verification(project_path, email, username, history=git_history)
                         print(f"--- Non-Code File Checker Results for {project_name} ---")
                         print(f"Collaborative non-code files: {len(non_code_result['collaborative'])}")
                         print(f"Non-collaborative non-code files: {len(non_code_result['non_collaborative'])}")
                         print(f"--------------------------------------------------------")
                         # --- End non-code file checker integration ---
                         
-                        # --- Parsing integration ---
-                        print("📄 Parsing non-code files...")
-                        try:
-                            # Pass both email and username for better author matching
-                            author_identifiers = []
-                            if non_code_result['user_identity'].get('email'):
-                                author_identifiers.append(non_code_result['user_identity']['email'])
-                            if non_code_result['user_identity'].get('name'):
-                                author_identifiers.append(non_code_result['user_identity']['name'])
-                            
-                            parsed_non_code = parsed_input_text(
-                                file_paths_dict={
-                                    'collaborative': non_code_result['collaborative'],
-                                    'non_collaborative': non_code_result['non_collaborative']
-                                },
-                                repo_path=project_path if detect_git(project_path) else None,
-                                author=author_identifiers if author_identifiers else None
-                            )
-                            print(f"✅ Parsed {len(parsed_non_code.get('parsed_files', []))} non-code files")
-                        except Exception as e:
-                            print(f"⚠️ Warning: Non-code parsing failed: {e}")
-                            parsed_non_code = {'parsed_files': []}
-                        # --- End parsing integration ---  
-                                
-    
-                        print(f"🔍 Analyzing code files in {project_name}... hang tight! ⚙️📁")
-                        #check if git or non git 
-                        # if git: call parsing for git -> analysis for git USING LLM
-                        if detect_git(project_path):
-                            print("📘 Git repository detected — running Git-based code parsing...")
-                            try:
-                                code_git_history_json = run_git_parsing_from_files(
-                                file_paths=files,
-                                include_merges=False,
-                                max_commits=None,  # set a limit if needed
-                                )
-                                print("✅ Git code parsing completed.")
-                            except Exception as e:
-                                print(f"⚠️ Git code parsing failed: {e}")
-                        # else call parsing for local -> analysis for local USING LLM
-                        else:
-                            parse_code = parse_code_flow(files, top_level_dirs)
-                        
-                    project_signatures.append(scan_result["signature"])
-                    analysis_type = llm_manager.ask_analysis_type(project_name)
-                    
-                    # analysis flow with LLM
-                    if analysis_type == 'ai':
-                        print("🤖 Running AI analysis...")
-                        
-                        # Double-check API key (safety check)
-                        api_key = os.getenv("GEMINI_API_KEY")
-                        if not api_key:
-                            print("❌ Error: Gemini API key not available. Falling back to local analysis.")
-                            analysis_type = 'local'
-                        else:
-                            try:
-                                llm_client = GeminiLLMClient(api_key=api_key)
-                                
-                                print(f"✅ Starting AI analysis for {project_name}")                                
-                                # --- NON-CODE ANALYSIS (AI) ---
-                                try:
-                                    non_code_analysis_results=analyze_non_code_files(parsed_non_code=parsed_non_code)
-                                    print(f"✅ AI Non Code Analysis completed successfully!")
-                                    
-                                except Exception as e:
-                                    print(f"⚠️ AI non-code analysis failed: {e}")
-                                    print("🔄 Falling back to local non-code analysis...")
-                                    non_code_analysis_results = analyze_project_clean(parsed_non_code)
-                                 # --- NON-CODE ANALYSIS (AI) ---
-
-                                try:
-                                    if detect_git(project_path):
-                                        code_analysis_results = analyze_github_project(code_git_history_json, llm_client)
-                                    else:
-                                        code_analysis_results = analyze_parsed_project(parse_code, llm_client)
-                                except Exception as e:
-                                    print(f"⚠️ AI code analysis failed: {e}")
-                                    print("🔄 Falling back to local non-code analysis...")
-                                    code_analysis_results = analyze_parsed_project(parsed_non_code)
-                                 # --- NON-CODE ANALYSIS (AI) ---
-                                # merge code and non code LLM analysis then store into db
-                                try:
-                                    merge_analysis_results(non_code_analysis_results=non_code_analysis_results,code_analysis_results=code_analysis_results, project_name=project_name, project_signature=scan_result["signature"])
-                                    persist_analyzed_file_signatures(scan_result["signature"], project_path, files)
-                                except Exception as e:
-                                    print(f"❌ Error storing analysis results for {project_name}: {e}")
-                                    
-                                
-                            except Exception as e:
-                                print(f"❌ Error initializing AI client: {e}")
-                                print("🔄 Falling back to local analysis...")
-                                analysis_type = 'local'
-                    
-                    # Handle local analysis (including fallbacks from AI failures)
-                    if analysis_type == 'local':
-                        print("📊 Running local analysis...")
-                        print(f"✅ Starting Local analysis for {project_name}")
-                        
-                        try:
-                            # Run non-3rd party analysis (no LLM) using parsed_non_code with user preferences
-                            non_code_local_results = analyze_project_clean(parsed_non_code)
-                            print(f"✅ Non Code Analysis completed successfully!")
-                        except Exception as e:
-                            print(f"⚠️ Non Code Local analysis failed: {e}")
-                            import traceback
-                            traceback.print_exc()
-                            non_code_local_results = {}
-                        
-                        try:
-                            if detect_git(project_path):
-                                code_analysis_results = analyze_github_project(json.loads(code_git_history_json))
-                            else:
-                                code_analysis_results = analyze_parsed_project(parse_code)
-                        except Exception as e:
-                            print(f"⚠️ Code Local analysis failed: {e}")
-                            code_analysis_results = {}
-                        # merge code and non code LOCAL analysis then store into db
-                        try:
-                            merge_analysis_results(non_code_analysis_results=non_code_local_results, code_analysis_results=code_analysis_results, project_name=project_name, project_signature=scan_result["signature"])
-                            persist_analyzed_file_signatures(scan_result["signature"], project_path, files)
-                        except Exception as e:
-                            print(f"❌ Error storing analysis results for {project_name}: {e}")
-       
-            
-                
+                        project_signatures.append(scan_result["signature"])
+                        # Ask up front: the analysis itself may run on worker threads.
+                        analysis_type = llm_manager.ask_analysis_type(project_name)
+                        pending_projects.append({
+                            "project_path": project_path,
+                            "project_name": project_name,
+                            "scan_result": scan_result,
+                            "top_level_dirs": top_level_dirs,
+                            "git_history": git_history,
+                            "non_code_result": non_code_result,
+                            "analysis_type": analysis_type,
+                        })
+
+                # Independent projects are analysed concurrently (see project_scheduler).
+                if pending_projects:
+                    run_projects(
+                        pending_projects,
+                        _analyze_cli_project,
+                        estimate=lambda project: estimate_project_memory(project["project_path"]),
+                    )
+
                 # 1. Print specific projects analyzed this session
                 if project_signatures:
                     print(f"\n🎯 PROJECTS ANALYZED THIS SESSION ({len(project_signatures)} projects)")
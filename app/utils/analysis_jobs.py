@@ -0,0 +1,330 @@
+"""
+Background analysis jobs for uploaded ZIPs.
+
+POST /api/analysis/jobs queues a job and returns its id straight away; a bounded
+thread pool runs the projects of each job and records per-project stage progress.
+Every state change is written to the ANALYSIS_JOB table, so GET /api/analysis/jobs/{id}
+and its SSE stream see the same snapshot, and a restarted server can pick up jobs
+that were still queued or running (projects that already finished are not re-run).
+
+Cancellation is cooperative: it is honoured before the next project or stage starts.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.data.db import get_connection
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_JOB_WORKERS_ENV = "ANALYSIS_JOB_WORKERS"
+DEFAULT_ANALYSIS_JOB_WORKERS = 2
+
+JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+TERMINAL_JOB_STATUSES = frozenset({"completed", "failed", "cancelled"})
+# Project entries that are done and are not re-run when a job resumes.
+FINISHED_PROJECT_STATUSES = frozenset({"analyzed", "skipped", "failed"})
+
+
+class AnalysisJobCancelled(Exception):
+    """Raised inside a running job once cancellation has been requested."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _resolve_job_workers(max_workers: Optional[int] = None) -> int:
+    if max_workers is None:
+        try:
+            max_workers = int(os.environ.get(ANALYSIS_JOB_WORKERS_ENV, DEFAULT_ANALYSIS_JOB_WORKERS))
+        except ValueError:
+            max_workers = DEFAULT_ANALYSIS_JOB_WORKERS
+    return max(1, int(max_workers))
+
+
+# ---- Persistence ----
+def save_job(job: Dict[str, Any]) -> None:
+    conn = get_connection()
+    try:
+        conn.execute(
+            """
+            INSERT INTO ANALYSIS_JOB
+                (job_id, upload_id, payload, status, progress, result, error, cancel_requested, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET
+                status = excluded.status,
+                progress = excluded.progress,
+                result = excluded.result,
+                error = excluded.error,
+                cancel_requested = excluded.cancel_requested,
+                updated_at = excluded.updated_at
+            """,
+            (
+                job["job_id"],
+                job["upload_id"],
+                json.dumps(job["payload"]),
+                job["status"],
+                json.dumps({"projects": job["projects"]}),
+                json.dumps(job["result"]) if job["result"] is not None else None,
+                job["error"],
+                int(job["cancel_requested"]),
+                job["created_at"],
+                job["updated_at"],
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _row_to_job(row) -> Dict[str, Any]:
+    job_id, upload_id, payload, status, progress, result, error, cancel_requested, created_at, updated_at = row
+    return {
+        "job_id": job_id,
+        "upload_id": upload_id,
+        "payload": json.loads(payload) if payload else {},
+        "status": status,
+        "projects": (json.loads(progress) if progress else {}).get("projects", []),
+        "result": json.loads(result) if result else None,
+        "error": error,
+        "cancel_requested": bool(cancel_requested),
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+
+_JOB_COLUMNS = "job_id, upload_id, payload, status, progress, result, error, cancel_requested, created_at, updated_at"
+
+
+def load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    conn = get_connection()
+    try:
+        row = conn.execute(f"SELECT {_JOB_COLUMNS} FROM ANALYSIS_JOB WHERE job_id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return _row_to_job(row) if row else None
+
+
+def load_unfinished_jobs() -> List[Dict[str, Any]]:
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            f"SELECT {_JOB_COLUMNS} FROM ANALYSIS_JOB WHERE status IN ('queued', 'running') ORDER BY created_at"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [_row_to_job(row) for row in rows]
+
+
+class AnalysisJobContext:
+    """Handle a runner uses to report progress for one job."""
+
+    def __init__(self, manager: "AnalysisJobManager", job_id: str):
+        self._manager = manager
+        self.job_id = job_id
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return self._manager._jobs[self.job_id]["payload"]
+
+    def check_cancelled(self) -> None:
+        if self._manager._jobs[self.job_id]["cancel_requested"]:
+            raise AnalysisJobCancelled(self.job_id)
+
+    def set_projects(self, project_paths: List[str]) -> None:
+        """Register the job's projects, keeping entries from an earlier (interrupted) run."""
+        def update(job):
+            known = {p["project_path"]: p for p in job["projects"]}
+            job["projects"] = [
+                known.get(path) or {
+                    "project_name": Path(path).name,
+                    "project_path": path,
+                    "stage": "queued",
+                    "status": "queued",
+                    "result": None,
+                }
+                for path in project_paths
+            ]
+        self._manager._update(self.job_id, update)
+
+    def finished_result(self, project_path: str) -> Optional[Dict[str, Any]]:
+        """Result of a project that already finished in an earlier run of this job."""
+        for project in self._manager._jobs[self.job_id]["projects"]:
+            if project["project_path"] == project_path and project["status"] in FINISHED_PROJECT_STATUSES:
+                return project["result"]
+        return None
+
+    def stage(self, project_path: str, stage: str) -> None:
+        """Record that `project_path` entered `stage`; raises if the job was cancelled."""
+        self.check_cancelled()
+
+        def update(job):
+            for project in job["projects"]:
+                if project["project_path"] == project_path:
+                    project["stage"] = stage
+                    project["status"] = "running"
+        self._manager._update(self.job_id, update)
+
+    def project_finished(self, project_path: str, result: Dict[str, Any]) -> None:
+        def update(job):
+            for project in job["projects"]:
+                if project["project_path"] == project_path:
+                    project["stage"] = "done"
+                    project["status"] = result.get("status", "analyzed")
+                    project["result"] = result
+        self._manager._update(self.job_id, update)
+
+
+class AnalysisJobManager:
+    """
+    Runs analysis jobs on a bounded thread pool and keeps the latest snapshot of
+    each unfinished job in memory (mirrored to ANALYSIS_JOB) for polling and
+    streaming. Once a finished job is persisted, it is only read from the table.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=_resolve_job_workers(max_workers), thread_name_prefix="analysis-job"
+        )
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._changed = threading.Condition()
+
+    def _update(self, job_id: str, mutate: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        with self._changed:
+            job = self._jobs[job_id]
+            mutate(job)
+            job["updated_at"] = _now()
+            job["version"] = job.get("version", 0) + 1
+            snapshot = json.loads(json.dumps(job))
+            # Persist under the lock so concurrent updates reach SQLite in order.
+            try:
+                save_job(snapshot)
+            except Exception as e:
+                logger.warning("Could not persist analysis job %s: %s", job_id, e)
+            else:
+                if job["status"] in TERMINAL_JOB_STATUSES:
+                    # Finished jobs are read back from ANALYSIS_JOB (see get()), not kept in memory.
+                    del self._jobs[job_id]
+            self._changed.notify_all()
+        return snapshot
+
+    def submit(self, payload: Dict[str, Any], runner: Callable[[AnalysisJobContext], Dict[str, Any]]) -> Dict[str, Any]:
+        now = _now()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "upload_id": payload.get("upload_id", ""),
+            "payload": payload,
+            "status": "queued",
+            "projects": [],
+            "result": None,
+            "error": None,
+            "cancel_requested": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        return self._enqueue(job, runner)
+
+    def _enqueue(self, job: Dict[str, Any], runner: Callable[[AnalysisJobContext], Dict[str, Any]]) -> Dict[str, Any]:
+        with self._changed:
+            self._jobs[job["job_id"]] = job
+        snapshot = self._update(job["job_id"], lambda j: None)
+        self._executor.submit(self._run, job["job_id"], runner)
+        return snapshot
+
+    def resume(self, runner: Callable[[AnalysisJobContext], Dict[str, Any]]) -> List[str]:
+        """Re-queue jobs left queued or running by a previous server process."""
+        resumed = []
+        for job in load_unfinished_jobs():
+            if job["job_id"] in self._jobs:
+                continue
+            job["status"] = "cancelled" if job["cancel_requested"] else "queued"
+            if job["status"] == "cancelled":
+                with self._changed:
+                    self._jobs[job["job_id"]] = job
+                self._update(job["job_id"], lambda j: None)
+                continue
+            self._enqueue(job, runner)
+            resumed.append(job["job_id"])
+        return resumed
+
+    def _run(self, job_id: str, runner: Callable[[AnalysisJobContext], Dict[str, Any]]) -> None:
+        if self._jobs[job_id]["cancel_requested"]:
+            self._update(job_id, lambda j: j.update(status="cancelled"))
+            return
+        self._update(job_id, lambda j: j.update(status="running"))
+        try:
+            result = runner(AnalysisJobContext(self, job_id))
+        except AnalysisJobCancelled:
+            self._update(job_id, lambda j: j.update(status="cancelled"))
+        except Exception as exc:
+            logger.exception("Analysis job %s failed", job_id)
+            detail = getattr(exc, "detail", None) or str(exc)
+            self._update(job_id, lambda j: j.update(status="failed", error=str(detail)))
+        else:
+            self._update(job_id, lambda j: j.update(status="completed", result=result))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return json.loads(json.dumps(job))
+        try:
+            return load_job(job_id)
+        except Exception:
+            return None
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Request cancellation; a queued job is cancelled before it starts."""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] not in TERMINAL_JOB_STATUSES:
+                return self._update(job_id, lambda j: j.update(cancel_requested=True))
+        return self.get(job_id)
+
+    def wait_for_change(self, job_id: str, version: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """Block until the job's version moves past `version` (or `timeout`); returns the snapshot."""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._jobs.get(job_id, {}).get("version", 0) != version, timeout=timeout
+            )
+        return self.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_manager: Optional[AnalysisJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_analysis_job_manager() -> AnalysisJobManager:
+    """Process-wide job manager (created on first use)."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = AnalysisJobManager()
+    return _manager
+
+
+def public_job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job snapshot as returned by the API (request payload omitted)."""
+    return {
+        "job_id": job["job_id"],
+        "upload_id": job["upload_id"],
+        "status": job["status"],
+        "cancel_requested": job["cancel_requested"],
+        "projects": job["projects"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
@@ -3,12 +3,13 @@
 import json
 import re
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 from app.utils.non_code_analysis.non_code_analysis_utils import _sumy_lsa_summarize
-from app.data.db import get_connection
+from app.data.analysis_store import save_project_analysis
+from app.data.db import get_connection, unit_of_work
 from app.utils.project_score import compute_overall_project_contribution_score
-from app.utils.git_utils import detect_git, get_repo, is_repo_empty, author_matches
+from app.utils.git_utils import detect_git, get_repo, is_repo_empty, author_matches, GitHistoryIndex
 from app.cli.git_code_parsing import _get_preferred_author_email
 MAX_SKILLS = 10 #Maximum number of skills to be stored per project (TDB: adjust based on some condition)
 MAX_BULLETS = 5 #Maximum number of resume bullets to be stored per project (TBD: adjust based on some condition)
@@ -72,7 +73,7 @@ SKILL_TO_EXTENSIONS = {
 }
 
 # Merge results from code and non-code analysis
-def merge_analysis_results(code_analysis_results, non_code_analysis_results, project_name, project_signature):
+def merge_analysis_results(code_analysis_results, non_code_analysis_results, project_name, project_signature, history=None, git_commits=None):
     """
     This function merges the results from code analysis and non-code analysis.
     
@@ -143,6 +144,11 @@ def merge_analysis_results(code_analysis_results, non_code_analysis_results, pro
 
         *Assuming that once Analysis is done, distinction between code/non_code skills & metrics is negligible/not necessary to store*
 
+        history (GitHistoryIndex, optional): Prebuilt git history index for the project,
+            reused for skill date inference instead of walking history again.
+        git_commits (list, optional): Parsed commits, stored in GIT_HISTORY in the same
+            transaction as the rest of the results.
+
     Returns:
         merged_results (dict): Merged results.
         
@@ -241,7 +247,7 @@ def merge_analysis_results(code_analysis_results, non_code_analysis_results, pro
     }
     
     # Store scored project & results in the database
-    store_results_in_db(project_name, merged_results, project_score, project_signature)
+    store_results_in_db(project_name, merged_results, project_score, project_signature, history=history, git_commits=git_commits)
         
     return merged_results
 
@@ -356,19 +362,156 @@ def _get_skill_extensions(skill: str) -> List[str]:
     
     return []
 
-def _infer_skill_dates_from_git(project_path: str, skills: List[str]) -> Dict[str, Optional[str]]:
+def _path_matches_extensions(file_path: str, extensions: List[str]) -> bool:
+    """Return True if file_path matches any of a skill's extensions (Dockerfile by name)."""
+    for ext in extensions:
+        if ext == "Dockerfile":
+            if "dockerfile" in file_path.lower():
+                return True
+        elif file_path.endswith(ext):
+            return True
+    return False
+
+def _extension_key(file_path: str) -> Optional[str]:
+    """The path's last suffix (".py"), or None when its file name has no dot."""
+    dot = file_path.rfind(".")
+    if dot < 0 or "/" in file_path[dot:]:
+        return None
+    return file_path[dot:]
+
+def _is_plain_extension(ext: str) -> bool:
+    """True for single suffixes like ".py", which can be looked up by _extension_key."""
+    return ext.startswith(".") and ext.count(".") == 1 and "/" not in ext
+
+class SkillTouchIndex:
+    """
+    First and last commit touching each file extension and each path, built in
+    a single pass over the history (oldest commit first).
+
+    Every skill's date range is then a lookup of its extensions, instead of one
+    walk of the history per skill. Entries are [first_seq, first_date,
+    last_seq, last_date]; seq is the commit's position in the walk, so "first"
+    keeps the walk order even when committer dates are out of order.
+    """
+
+    def __init__(self):
+        self.by_extension: Dict[str, List[int]] = {}
+        self.by_path: Dict[str, List[int]] = {}
+        self.commits = 0
+
+    def add_commit(self, committed_date: int, file_paths: Iterable[str]) -> None:
+        seq = self.commits
+        self.commits += 1
+        for file_path in file_paths:
+            for table, key in ((self.by_path, file_path), (self.by_extension, _extension_key(file_path))):
+                if key is None:
+                    continue
+                entry = table.get(key)
+                if entry is None:
+                    table[key] = [seq, committed_date, seq, committed_date]
+                else:
+                    entry[2] = seq
+                    entry[3] = committed_date
+
+    def date_range(self, extensions: List[str]) -> Optional[Tuple[int, int]]:
+        """(first, last) committed timestamps of commits touching any of `extensions`."""
+        entries = []
+        for ext in extensions:
+            if _is_plain_extension(ext):
+                entry = self.by_extension.get(ext)
+                if entry is not None:
+                    entries.append(entry)
+            else:
+                # Name-based matches (Dockerfile): scan the distinct paths, not the history.
+                entries.extend(
+                    entry for file_path, entry in self.by_path.items()
+                    if _path_matches_extensions(file_path, [ext])
+                )
+        if not entries:
+            return None
+        first = min(entries, key=lambda entry: entry[0])
+        last = max(entries, key=lambda entry: entry[2])
+        return first[1], last[3]
+
+    def first_dates(self, skills: List[str]) -> Dict[str, Optional[str]]:
+        """Map each skill to the date (YYYY-MM-DD) its files were first committed, or None."""
+        skill_dates: Dict[str, Optional[str]] = {}
+        for skill in skills:
+            extensions = _get_skill_extensions(skill)
+            span = self.date_range(extensions) if extensions else None
+            skill_dates[skill] = datetime.fromtimestamp(span[0]).strftime('%Y-%m-%d') if span else None
+        return skill_dates
+
+def _author_identifiers() -> List[str]:
+    github_user, user_email = _get_preferred_author_email()
+    return [ident for ident in [github_user, user_email] if ident]
+
+def _build_skill_touch_index_from_history(history: GitHistoryIndex) -> SkillTouchIndex:
+    """SkillTouchIndex from the prebuilt GitHistoryIndex: no commit trees or diffs are loaded."""
+    author_identifiers = _author_identifiers()
+    author_ids = history.matching_author_ids(author_identifiers) if author_identifiers else None
+
+    touches = SkillTouchIndex()
+    # Oldest first, same as iter_commits(reverse=True)
+    for i in range(len(history) - 1, -1, -1):
+        if author_ids is not None and history.author_ids[i] not in author_ids:
+            continue
+        touches.add_commit(history.committed_dates[i], (file_path for file_path, _, _ in history.files(i)))
+    return touches
+
+def _build_skill_touch_index_from_repo(repo) -> SkillTouchIndex:
+    """SkillTouchIndex from one GitPython walk over all refs, oldest commit first."""
+    author_identifiers = _author_identifiers()
+
+    touches = SkillTouchIndex()
+    for commit in repo.iter_commits(rev="--all", reverse=True):
+        # Filter commits by author identifiers if available
+        if author_identifiers and not author_matches(commit, author_identifiers):
+            continue
+        parent = commit.parents[0] if commit.parents else None
+        if parent is None:
+            # Initial commit - every file in the tree
+            file_paths = [item.path for item in commit.tree.traverse() if hasattr(item, 'path')]
+        else:
+            file_paths = [
+                diff_item.b_path or diff_item.a_path
+                for diff_item in commit.diff(parent)
+                if diff_item.b_path or diff_item.a_path
+            ]
+        touches.add_commit(commit.committed_date, file_paths)
+    return touches
+
+def _infer_skill_dates_from_index(history: GitHistoryIndex, skills: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Index-backed version of _infer_skill_dates_from_git(): the per-commit file lists
+    come from the prebuilt GitHistoryIndex, so no commit trees or diffs are loaded.
+    """
+    return _build_skill_touch_index_from_history(history).first_dates(skills)
+
+def _infer_skill_dates_from_git(
+    project_path: str,
+    skills: List[str],
+    history: Optional[GitHistoryIndex] = None,
+) -> Dict[str, Optional[str]]:
     """
     Infer skill dates from Git history by finding when files with related
     extensions were first committed by the current user.
+
+    The history is walked once for all skills (see SkillTouchIndex).
     
     Args:
         project_path: Path to the project directory
         skills: List of skill names
+        history: Prebuilt GitHistoryIndex for the project (optional)
     
     Returns:
         Dictionary mapping skill -> date string (YYYY-MM-DD) or None
     """
-    skill_dates = {}
+    if history is not None:
+        try:
+            return _infer_skill_dates_from_index(history, skills)
+        except Exception:
+            return {skill: None for skill in skills}
     
     # Check if it's a Git repository
     if not detect_git(project_path):
@@ -381,133 +524,38 @@ def _infer_skill_dates_from_git(project_path: str, skills: List[str]) -> Dict[st
         if is_repo_empty(project_path):
             return {skill: None for skill in skills}
         
-        # Get the user's preferred author identifiers for filtering
-        github_user, user_email = _get_preferred_author_email()
-        author_identifiers = [ident for ident in [github_user, user_email] if ident]
-        
-        # For each skill, find the earliest commit with matching file extensions
-        for skill in skills:
-            extensions = _get_skill_extensions(skill)
-            if not extensions:
-                skill_dates[skill] = None
-                continue
-            
-            earliest_date = None
-            
-            # Iterate through all commits (oldest first)
-            try:
-                for commit in repo.iter_commits(rev="--all", reverse=True):
-                    # Filter commits by author identifiers if available
-                    if author_identifiers and not author_matches(commit, author_identifiers):
-                        continue
-                    
-                    # Check if this commit touched files with relevant extensions
-                    parent = commit.parents[0] if commit.parents else None
-                    
-                    if parent is None:
-                        # Initial commit - check all files
-                        for item in commit.tree.traverse():
-                            if hasattr(item, 'path'):
-                                file_path = item.path
-                                # Check if any extension matches
-                                for ext in extensions:
-                                    if ext == "Dockerfile":
-                                        # Special case for Dockerfile
-                                        if "dockerfile" in file_path.lower():
-                                            earliest_date = datetime.fromtimestamp(
-                                                commit.committed_date
-                                            ).strftime('%Y-%m-%d')
-                                            break
-                                    elif file_path.endswith(ext):
-                                        earliest_date = datetime.fromtimestamp(
-                                            commit.committed_date
-                                        ).strftime('%Y-%m-%d')
-                                        break
-                                if earliest_date:
-                                    break
-                    else:
-                        # Check diff for files with matching extensions
-                        diffs = commit.diff(parent)
-                        for diff_item in diffs:
-                            file_path = diff_item.b_path or diff_item.a_path
-                            if file_path:
-                                for ext in extensions:
-                                    if ext == "Dockerfile":
-                                        if "dockerfile" in file_path.lower():
-                                            earliest_date = datetime.fromtimestamp(
-                                                commit.committed_date
-                                            ).strftime('%Y-%m-%d')
-                                            break
-                                    elif file_path.endswith(ext):
-                                        earliest_date = datetime.fromtimestamp(
-                                            commit.committed_date
-                                        ).strftime('%Y-%m-%d')
-                                        break
-                            if earliest_date:
-                                break
-                    
-                    if earliest_date:
-                        break  # Found the first commit with this skill
-                
-                skill_dates[skill] = earliest_date
-            except Exception:
-                skill_dates[skill] = None
-    
+        return _build_skill_touch_index_from_repo(repo).first_dates(skills)
     except Exception:
         return {skill: None for skill in skills}
-    
-    return skill_dates
 
-def store_results_in_db(project_name, merged_results, project_score, project_signature):
+def store_results_in_db(project_name, merged_results, project_score, project_signature, history=None, git_commits=None):
     """
     This function stores the scored results in the database.
     To be stored in DASHBOARD_DATA & SKILL_ANALYSIS & RESUME_SUMMARY & PROJECT Tables
+    (and GIT_HISTORY, which is replaced by `git_commits` or cleared).
+
+    Everything is written in one unit of work (a savepoint when the caller
+    already has one open; see app.data.analysis_store), so a failure part-way
+    leaves the project's previous results untouched.
     
     Args:
         ranked_results (list): List of scored results.
+        history (GitHistoryIndex, optional): Prebuilt git history index used for skill dates.
+        git_commits (list, optional): Parsed commits to store in GIT_HISTORY.
         
     Returns:
         None
     """
-    # Get DB connection 
+    # Get project path for Git history analysis
     conn = get_connection()
     cur = conn.cursor()
-        
-    # Use project_signature to identify the project in DB
-    # Ensure project exists
-    cur.execute("SELECT 1 FROM PROJECT WHERE project_signature = ?", (project_signature,))
-    if not cur.fetchone():
-        cur.execute("""
-        INSERT INTO PROJECT (project_signature, name, summary, score, score_overridden, score_overridden_value)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (project_signature, project_name, merged_results["summary"], project_score, 0, None))
-    else:
-        # Update summary if project already exists
-        # Reset override state including stored exclusion list — a fresh analysis run should not
-        # keep prior metric exclusions (same project re-upload / re-analyze).
-        cur.execute("""
-        UPDATE PROJECT
-        SET name = ?,
-            summary = ?,
-            score = ?,
-            score_overridden = 0,
-            score_overridden_value = NULL,
-            score_override_exclusions = NULL
-        WHERE project_signature = ?
-        """, (project_name, merged_results["summary"], project_score, project_signature))
-    
-        # Delete existing records to avoid duplicates (including git-derived metrics)
-        cur.execute("DELETE FROM GIT_HISTORY WHERE project_id = ?", (project_signature,))
-        cur.execute("DELETE FROM SKILL_ANALYSIS WHERE project_id = ?", (project_signature,))
-        cur.execute("DELETE FROM RESUME_SUMMARY WHERE project_id = ?", (project_signature,))
-        cur.execute("DELETE FROM DASHBOARD_DATA WHERE project_id = ?", (project_signature,))
-
-    # Store skills in SKILL_ANALYSIS table with smart date inference
-    # Get project path for Git history analysis
     cur.execute("SELECT path, created_at FROM PROJECT WHERE project_signature = ?", (project_signature,))
     project_info = cur.fetchone()
+    cur.close()
+    conn.close()
     project_path = project_info[0] if project_info else None
-    project_created_at = project_info[1] if project_info else None
+    # A new PROJECT row gets created_at = CURRENT_TIMESTAMP (UTC)
+    project_created_at = project_info[1] if project_info else datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
     
     # Extract date portion (YYYY-MM-DD) from project_created_at
     fallback_date = None
@@ -524,43 +572,29 @@ def store_results_in_db(project_name, merged_results, project_score, project_sig
         merged_results["skills"]["technical_skills"]
     )
     
-    # Infer dates from Git history if project path is available
+    # Infer dates from Git history if project path is available. This happens before
+    # the write transaction so the database is not locked while history is read.
     skill_dates = {}
     if project_path and Path(project_path).exists():
-        skill_dates = _infer_skill_dates_from_git(project_path, all_skills)
-    
-    # Store soft skills
-    for skill in merged_results["skills"]["soft_skills"]:
-        skill_date = skill_dates.get(skill) or fallback_date
-        cur.execute("""
-        INSERT INTO SKILL_ANALYSIS (project_id, skill, source, date) VALUES (?, ?, ?, ?)
-        """, (project_signature, skill, "soft_skill", skill_date))
-
-    # Store technical skills
-    for skill in merged_results["skills"]["technical_skills"]:
-        skill_date = skill_dates.get(skill) or fallback_date
-        cur.execute("""
-        INSERT INTO SKILL_ANALYSIS (project_id, skill, source, date) VALUES (?, ?, ?, ?)
-        """, (project_signature, skill, "technical_skill", skill_date))
-
-    # Store resume bullets in RESUME_SUMMARY table
-    cur.execute("""
-    INSERT INTO RESUME_SUMMARY (project_id, summary_text) VALUES (?, ?)
-    """, (project_signature, json.dumps(merged_results["resume_bullets"])))
-
-    # Store metrics in DASHBOARD_DATA table
-    for key, value in merged_results["metrics"].items():
-        # Flatten if value is a dictionary or list type
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value)
-        cur.execute("""
-            INSERT INTO DASHBOARD_DATA (project_id, metric_name, metric_value)
-        VALUES (?, ?, ?)
-    """, (project_signature, key, value))
-
-    # Commit changes to DB
-    conn.commit()
-    
-    # Close cursor and connection
-    cur.close()
-    conn.close()
+        skill_dates = _infer_skill_dates_from_git(project_path, all_skills, history=history)
+    
+    skills = [
+        (skill, "soft_skill", skill_dates.get(skill) or fallback_date)
+        for skill in merged_results["skills"]["soft_skills"]
+    ] + [
+        (skill, "technical_skill", skill_dates.get(skill) or fallback_date)
+        for skill in merged_results["skills"]["technical_skills"]
+    ]
+
+    with unit_of_work() as conn:
+        save_project_analysis(
+            conn,
+            project_signature,
+            project_name,
+            merged_results["summary"],
+            project_score,
+            skills,
+            merged_results["resume_bullets"],
+            merged_results["metrics"],
+            git_commits=git_commits,
+        )
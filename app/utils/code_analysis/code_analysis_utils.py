@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 from collections import Counter, defaultdict
 import re
+from app.client.llm_client import is_error_response
 from .patterns.tech_patterns import TechnicalPatterns
 from .text_processing import split_camelcase_and_filter, extract_meaningful_filename_keywords, get_top_keywords
 from .user_preferences import load_user_preferences, get_preference_weighted_keywords, enhance_resume_bullets_with_preferences, prioritize_patterns_by_preferences
@@ -182,34 +183,25 @@ def analyze_github_commit_patterns(commits: List[Dict]) -> Dict:
     
     return patterns
 
-def analyze_github_development_patterns(commits: List[Dict]) -> Dict:
+def _merge_ordered_counts(first: Dict[str, int], second: Dict[str, int]) -> Dict[str, int]:
+    """Helper: Add two count dicts, keeping first-seen key order (used for tie-breaking)."""
+    merged = dict(first)
+    for key, count in second.items():
+        merged[key] = merged.get(key, 0) + count
+    return merged
+
+def accumulate_github_development_patterns(commits: List[Dict], state: Optional[Dict] = None) -> Dict:
     """
-    Analyze development patterns from GitHub commit history.
+    Fold commits into a JSON-serialisable development-pattern aggregate.
+    Pass a previously stored `state` to merge a delta of commits into it;
+    the stored commits are treated as coming after the new ones (git log order).
     """
-    patterns = {
-        "code_practices": [],
-        "project_evolution": []
-    }
-    
-    if not commits:
-        return patterns
-    
-    # Analyze commit messages for patterns
     commit_types = defaultdict(int)
-    all_messages = []
-    all_files = []
-    
+    file_extensions = defaultdict(int)
+
     for commit in commits:
         message = commit.get("message_summary", "").lower()
-        all_messages.append(message)
-        
-        # Collect all file paths for additional analysis
-        files = commit.get("files", [])
-        for file in files:
-            path = file.get("path_after") or file.get("path_before", "")
-            if path:
-                all_files.append(path.lower())
-        
+
         # Categorize commit types
         if any(keyword in message for keyword in ['feat:', 'feature', 'add', 'implement']):
             commit_types['feature'] += 1
@@ -221,25 +213,8 @@ def analyze_github_development_patterns(commits: List[Dict]) -> Dict:
             commit_types['testing'] += 1
         if any(keyword in message for keyword in ['docs:', 'documentation', 'readme']):
             commit_types['documentation'] += 1
-    
-    total_commits = len(commits)
-    
-    # Calculate ratios and check thresholds
-    if total_commits > 0:
-        testing_ratio = commit_types['testing'] / total_commits
-        refactor_ratio = commit_types['refactor'] / total_commits  
-        doc_ratio = commit_types['documentation'] / total_commits
-        if testing_ratio > 0.1:
-            patterns["code_practices"].append("Test-Driven Development")
-        if refactor_ratio > 0.15:
-            patterns["code_practices"].append("Code Refactoring")
-        
-        if doc_ratio > 0.05:
-            patterns["code_practices"].append("Documentation-Focused")
-    
-    # Analyze file changes for project evolution - FIXED EXTENSION HANDLING
-    file_extensions = defaultdict(int)
-    for commit in commits:
+
+        # Analyze file changes for project evolution - FIXED EXTENSION HANDLING
         for file in commit.get("files", []):
             path = file.get("path_after") or file.get("path_before", "")
             if path:
@@ -249,9 +224,48 @@ def analyze_github_development_patterns(commits: List[Dict]) -> Dict:
                 else:
                     # Use filename as extension for files without extensions
                     ext = os.path.basename(path).lower()
-                
+
                 file_extensions[ext] += 1
-    
+
+    delta = {
+        "total_commits": len(commits),
+        "commit_types": dict(commit_types),
+        "file_extensions": dict(file_extensions),
+    }
+    if not state:
+        return delta
+    return {
+        "total_commits": delta["total_commits"] + state.get("total_commits", 0),
+        "commit_types": _merge_ordered_counts(delta["commit_types"], state.get("commit_types", {})),
+        "file_extensions": _merge_ordered_counts(delta["file_extensions"], state.get("file_extensions", {})),
+    }
+
+def finalize_github_development_patterns(state: Dict) -> Dict:
+    """Turn an accumulated development-pattern aggregate into the patterns dict."""
+    patterns = {
+        "code_practices": [],
+        "project_evolution": []
+    }
+
+    total_commits = state.get("total_commits", 0)
+    if not total_commits:
+        return patterns
+
+    commit_types = state.get("commit_types", {})
+
+    # Calculate ratios and check thresholds
+    testing_ratio = commit_types.get('testing', 0) / total_commits
+    refactor_ratio = commit_types.get('refactor', 0) / total_commits
+    doc_ratio = commit_types.get('documentation', 0) / total_commits
+    if testing_ratio > 0.1:
+        patterns["code_practices"].append("Test-Driven Development")
+    if refactor_ratio > 0.15:
+        patterns["code_practices"].append("Code Refactoring")
+
+    if doc_ratio > 0.05:
+        patterns["code_practices"].append("Documentation-Focused")
+
+    file_extensions = state.get("file_extensions", {})
     if file_extensions:
         dominant_tech = max(file_extensions, key=file_extensions.get)
         if dominant_tech in ['js', 'jsx', 'ts', 'tsx']:
@@ -264,9 +278,16 @@ def analyze_github_development_patterns(commits: List[Dict]) -> Dict:
             patterns["project_evolution"].append("DevOps/Infrastructure Development")
         else:
             patterns["project_evolution"].append("Multi-technology Development")
-    
+
     return patterns
 
+def analyze_github_development_patterns(commits: List[Dict], state: Optional[Dict] = None) -> Dict:
+    """
+    Analyze development patterns from GitHub commit history.
+    With a stored aggregate `state`, only `commits` (the delta) are scanned.
+    """
+    return finalize_github_development_patterns(accumulate_github_development_patterns(commits, state))
+
 def generate_github_resume_summary(metrics: Dict) -> List[str]:
     """
     Enhanced GitHub resume generation with commit patterns and file contribution insights.
@@ -391,22 +412,23 @@ def generate_github_resume_summary(metrics: Dict) -> List[str]:
     return summary
     
 # Aggregate metrics from a list of GitHub commits
-def aggregate_github_individual_metrics(commits: List[Dict]) -> Dict:
+def accumulate_github_individual_metrics(commits: List[Dict], state: Optional[Dict] = None) -> Dict:
     """
-    Aggregates key metrics from a list of individual commit dicts.
-    Updated to handle new fields: language and code_lines_added.
-    Returns a dictionary of contribution statistics.
+    Fold commits into a JSON-serialisable contribution aggregate.
+    Pass a previously stored `state` to merge a delta of commits into it;
+    the stored commits are treated as coming after the new ones (git log order).
     """
     file_status_counter = Counter()
     file_types_counter = Counter()
     language_counter = Counter()  # NEW: Track languages
-    authors = set()
-    dates = []
+    authors = {}
     messages = []
-    total_files_changed = set()
+    total_files_changed = {}
     total_code_lines_added = 0  # NEW: Track total code lines
     roles = set()
-    
+    first_date = None
+    last_date = None
+
     # File type extensions for classification
     code_exts = TechnicalPatterns.CODE_EXTS
     doc_exts = TechnicalPatterns.DOC_EXTS
@@ -414,8 +436,11 @@ def aggregate_github_individual_metrics(commits: List[Dict]) -> Dict:
 
     # Collect metrics from each commit
     for commit in commits:
-        authors.add(commit.get("author_name"))
-        dates.append(commit.get("authored_datetime"))
+        authors.setdefault(commit.get("author_name"), None)
+        date = commit.get("authored_datetime")
+        if date:
+            first_date = date if first_date is None else min(first_date, date)
+            last_date = date if last_date is None else max(last_date, date)
         messages.append(commit.get("message_summary"))
         files = commit.get("files", [])
         
@@ -425,7 +450,7 @@ def aggregate_github_individual_metrics(commits: List[Dict]) -> Dict:
             path = f.get("path_after") or f.get("path_before")
             
             if path:
-                total_files_changed.add(path)
+                total_files_changed.setdefault(path, None)
                 ext = os.path.splitext(path)[1].lower()
                 fname = os.path.basename(path).lower()
                 
@@ -450,34 +475,64 @@ def aggregate_github_individual_metrics(commits: List[Dict]) -> Dict:
                     file_types_counter["other"] += 1
         
         roles.update(infer_roles_from_commit_files(files))
-        
+
+    state = state or {}
+    stored_first = state.get("first_date")
+    stored_last = state.get("last_date")
+    return {
+        "total_commits": len(commits) + state.get("total_commits", 0),
+        "authors": list(dict.fromkeys(list(authors) + state.get("authors", []))),
+        "first_date": min(d for d in (first_date, stored_first) if d) if (first_date or stored_first) else None,
+        "last_date": max(d for d in (last_date, stored_last) if d) if (last_date or stored_last) else None,
+        "messages": messages + state.get("messages", []),
+        "files_changed": list(dict.fromkeys(list(total_files_changed) + state.get("files_changed", []))),
+        "file_status": _merge_ordered_counts(dict(file_status_counter), state.get("file_status", {})),
+        "file_types": _merge_ordered_counts(dict(file_types_counter), state.get("file_types", {})),
+        "languages": _merge_ordered_counts(dict(language_counter), state.get("languages", {})),
+        "code_lines_added": total_code_lines_added + state.get("code_lines_added", 0),
+        "roles": sorted(roles.union(state.get("roles", []))),
+    }
+
+def finalize_github_individual_metrics(state: Dict) -> Dict:
+    """Turn an accumulated contribution aggregate into the metrics dict."""
     # Calculate duration in days between first and last commit
     def parse_dt(dt): return datetime.fromisoformat(dt)
-    if dates:
-        dates_sorted = sorted(dates)
-        duration_days = (parse_dt(dates_sorted[-1]) - parse_dt(dates_sorted[0])).days
+    if state.get("first_date") and state.get("last_date"):
+        duration_days = (parse_dt(state["last_date"]) - parse_dt(state["first_date"])).days
     else:
         duration_days = 0
 
+    file_status = state.get("file_status", {})
+    file_types = state.get("file_types", {})
+    messages = state.get("messages", [])
     metrics = {
-        "authors": list(authors),
-        "total_commits": len(commits),
+        "authors": list(state.get("authors", [])),
+        "total_commits": state.get("total_commits", 0),
         "duration_days": duration_days,
-        "files_added": file_status_counter["A"],
-        "files_modified": file_status_counter["M"],
-        "files_deleted": file_status_counter["D"],
-        "total_files_changed": len(total_files_changed),
-        "code_files_changed": file_types_counter["code"],
-        "doc_files_changed": file_types_counter["docs"],
-        "test_files_changed": file_types_counter["test"],
-        "other_files_changed": file_types_counter["other"],
-        "languages": list(language_counter.keys()),  # NEW: Languages detected
-        "total_lines": total_code_lines_added,  # NEW: Total code lines for consistency
+        "files_added": file_status.get("A", 0),
+        "files_modified": file_status.get("M", 0),
+        "files_deleted": file_status.get("D", 0),
+        "total_files_changed": len(state.get("files_changed", [])),
+        "code_files_changed": file_types.get("code", 0),
+        "doc_files_changed": file_types.get("docs", 0),
+        "test_files_changed": file_types.get("test", 0),
+        "other_files_changed": file_types.get("other", 0),
+        "languages": list(state.get("languages", {}).keys()),  # NEW: Languages detected
+        "total_lines": state.get("code_lines_added", 0),  # NEW: Total code lines for consistency
         "sample_messages": (messages[:5] + messages[len(messages)//2:len(messages)//2+5] + messages[-5:] if len(messages) >= 20 else messages), 
-        "roles": list(roles),
+        "roles": list(state.get("roles", [])),
     }
     return metrics
 
+def aggregate_github_individual_metrics(commits: List[Dict], state: Optional[Dict] = None) -> Dict:
+    """
+    Aggregates key metrics from a list of individual commit dicts.
+    Updated to handle new fields: language and code_lines_added.
+    With a stored aggregate `state`, only `commits` (the delta) are scanned.
+    Returns a dictionary of contribution statistics.
+    """
+    return finalize_github_individual_metrics(accumulate_github_individual_metrics(commits, state))
+
 # --- Role inference for GitHub commits ---
 def infer_roles_from_commit_files(files):
     """
@@ -1196,7 +1251,7 @@ def analyze_parsed_project(parsed_files: List[Dict], llm_client=None, email: Opt
             )
         
         llm_response = llm_client.generate(resume_prompt)
-        if llm_response:
+        if llm_response and not is_error_response(llm_response):
             # Split by newlines and clean up
             raw_bullets = llm_response.strip().split('\n')
             # Filter out empty lines and clean up bullet formatting
@@ -1241,7 +1296,13 @@ def analyze_parsed_project(parsed_files: List[Dict], llm_client=None, email: Opt
     }
 
 # Main entry point for github project analysis
-def analyze_github_project(commits: List[Dict], llm_client=None, email: Optional[str] = None) -> Dict:
+def analyze_github_project(
+    commits: List[Dict],
+    llm_client=None,
+    email: Optional[str] = None,
+    aggregates: Optional[Dict] = None,
+    extraction: Optional[Dict] = None,
+) -> Dict:
     """
     Analyze a project from GitHub commit dicts and return a structured JSON summary.
     User preferences enhance the relevance and targeting of extracted data.
@@ -1250,14 +1311,25 @@ def analyze_github_project(commits: List[Dict], llm_client=None, email: Optional
         commits: List of GitHub commit dictionaries
         llm_client: Optional LLM client for resume generation
         email: Optional user email for preference-enhanced analysis
+        aggregates: Optional {"metrics": ..., "patterns": ...} aggregate states that
+            already cover `commits` (see run_incremental_git_parsing_from_files);
+            when given, metrics and development patterns are read from them
+            instead of being recomputed over every commit.
+        extraction: Optional GitBudget report for `commits` (defaults to
+            aggregates["extraction"]); when the history was sampled or patches
+            were cut off, it is returned as Metrics["git_extraction"].
     """
     # Load user preferences for quality enhancement
     user_prefs = load_user_preferences(email)
     
     # Get analysis with preference-enhanced keyword prioritization
-    metrics = aggregate_github_individual_metrics(commits)
+    if aggregates:
+        metrics = finalize_github_individual_metrics(aggregates["metrics"])
+        development_patterns = finalize_github_development_patterns(aggregates["patterns"])
+    else:
+        metrics = aggregate_github_individual_metrics(commits)
+        development_patterns = analyze_github_development_patterns(commits)
     technical_keywords = extract_technical_keywords_from_github(commits, user_prefs)
-    development_patterns = analyze_github_development_patterns(commits)
     commit_patterns = analyze_github_commit_patterns(commits)
     
     # Enhanced metrics for analysis
@@ -1276,7 +1348,7 @@ def analyze_github_project(commits: List[Dict], llm_client=None, email: Optional
             )
         
         llm_response = llm_client.generate(resume_prompt)
-        if llm_response:
+        if llm_response and not is_error_response(llm_response):
             # Split by newlines and clean up
             raw_bullets = llm_response.strip().split('\n')
             # Filter out empty lines and clean up bullet formatting
@@ -1299,7 +1371,7 @@ def analyze_github_project(commits: List[Dict], llm_client=None, email: Optional
     # Enhance resume bullets with user preference targeting
     resume_bullets = enhance_resume_bullets_with_preferences(resume_bullets, user_prefs, metrics)
     
-    return {
+    result = {
         "Resume_bullets": resume_bullets,  # Enhanced for user preferences
         "Metrics": {
             "authors": metrics["authors"],
@@ -1319,4 +1391,9 @@ def analyze_github_project(commits: List[Dict], llm_client=None, email: Optional
             "development_patterns": development_patterns,
             "commit_patterns": commit_patterns
         }
-    }
\ No newline at end of file
+    }
+    if extraction is None and aggregates:
+        extraction = aggregates.get("extraction")
+    if extraction:
+        result["Metrics"]["git_extraction"] = extraction
+    return result
\ No newline at end of file
@@ -1,7 +1,8 @@
 from tree_sitter import Parser, Node, Query, Tree, Language
 from tree_sitter_language_pack import get_language
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 from pathlib import Path
+import threading
 
 def classify_node_types(rule_names: List[str]) -> Tuple[List[str], List[str], List[str]]:
     """
@@ -62,11 +63,35 @@ def classify_node_types(rule_names: List[str]) -> Tuple[List[str], List[str], Li
 
     return class_nodes, function_nodes, component_nodes
 
+# One Parser per language per thread (and so per pool worker); Parser is not thread-safe.
+_thread_parsers = threading.local()
+
+def get_cached_parser(ts_lang: Language) -> Parser:
+    parsers = getattr(_thread_parsers, "parsers", None)
+    if parsers is None:
+        parsers = _thread_parsers.parsers = {}
+    parser = parsers.get(ts_lang)
+    if parser is None:
+        parser = Parser()
+        parser.language = ts_lang
+        parsers[ts_lang] = parser
+    return parser
+
 def get_parser(file_content: str, ts_lang: str)-> Tree:
-    parser = Parser()
-    parser.language = ts_lang
-    tree = parser.parse(file_content.encode())
-    return tree
+    return get_cached_parser(ts_lang).parse(file_content.encode())
+
+def iter_subtree(node: Node, include_root: bool = True) -> Iterator[Node]:
+    """
+    Pre-order walk over `node` and its descendants using an explicit stack, so deeply
+    nested sources cannot hit Python's recursion limit.
+    """
+    stack = [node] if include_root else list(node.children[::-1])
+    while stack:
+        n = stack.pop()
+        yield n
+        children = n.children
+        if children:
+            stack.extend(children[::-1])
 
 # ------ Class methods -------
 # ---- Helper methods for extract_classes ----
@@ -74,11 +99,8 @@ def walk_class_nodes(node: Node, text: str, class_types: set, function_types: se
     """
     DFS scan of the AST to collect class nodes.
     """
-    if node.type in class_types:
-        out.append(extract_single_class(node, text, function_types, file_path))
-
-    for child in node.children:
-        walk_class_nodes(child, text, class_types, function_types, out, file_path)
+    found = walk_file_entities(node, text, class_types, function_types, set(), file_path, collect=("classes",))
+    out.extend(found["classes"])
         
 def extract_single_class(node: Node, text: str, function_types: set, file_path: Path) -> dict:
     """Extract class name + methods using provided function_types."""
@@ -121,6 +143,9 @@ def extract_classes(root: Node, file_content: str, class_node_types: List[str],
     """
     results: List[dict] = []
     walk_class_nodes(root, file_content, set(class_node_types), set(function_node_types), results, file_path)
+    return _dedup_classes(results)
+
+def _dedup_classes(results: List[dict]) -> List[dict]:
     # Deduplicate classes by (name) to reduce false repeats (language-agnostic heuristic)
     dedup = []
     seen = set()
@@ -135,9 +160,29 @@ def extract_entities(tree: Tree, file_content: str, class_node_types: List[str],
     """
     Main entry point for extracting structured entities from a single file.
     """
-    class_entities = extract_classes(tree.root_node, file_content, class_node_types, function_node_types, file_path)
-    function_entities = extract_functions(tree.root_node, file_content, function_node_types, class_node_types, file_path)
-    component_entities = extract_components(tree.root_node, file_content, component_node_types, file_path)
+    found = walk_file_entities(
+        tree.root_node, file_content, set(class_node_types), set(function_node_types),
+        set(component_node_types), file_path, collect=("classes", "functions", "components"),
+    )
+    return _prune_entities(found)
+
+def extract_file_structure(tree: Tree, file_content: str, class_node_types: Iterable[str], function_node_types: Iterable[str], component_node_types: Iterable[str], file_path: Path, import_match: Callable[[str], bool]) -> Tuple[List[str], Dict[str, List[dict]]]:
+    """
+    Imports and entities of one parsed file from a single walk of its tree.
+
+    `import_match(node_type)` decides which nodes are import statements; entities are
+    the same as extract_entities would return for the same tree.
+    """
+    found = walk_file_entities(
+        tree.root_node, file_content, set(class_node_types), set(function_node_types),
+        set(component_node_types), file_path, import_match=import_match,
+    )
+    return found["imports"], _prune_entities(found)
+
+def _prune_entities(found: Dict[str, List]) -> Dict[str, List[dict]]:
+    class_entities = _dedup_classes(found["classes"])
+    function_entities = found["functions"]
+    component_entities = found["components"]
 
     # --- Pruning stage ---
     # Classes: remove entries where name is None AND methods list is empty.
@@ -282,12 +327,11 @@ def extract_method_parameters(method_node: Node, text: str) -> List[str]:
 
     # Recursively traverse nodes inside a parameter container and collect names
     def collect_param_names(node: Node):
-        for ch in node.children:
+        # Descend through every level to catch deeply nested declarators
+        for ch in iter_subtree(node, include_root=False):
             # If this child represents some form of parameter identifier, capture it
             if ch.type in PARAM_NAME_TYPES:
                 params.append(text[ch.start_byte:ch.end_byte])
-            # Continue descending to catch deeply nested declarators
-            collect_param_names(ch)
 
     # Search immediate children of the method node for parameter containers
     for child in method_node.children:
@@ -326,7 +370,8 @@ def extract_method_calls(method_node: Node, text: str) -> List[str]:
 
     calls = []
 
-    def walk(n: Node):
+    # Walk the method node and all its descendants
+    for n in iter_subtree(method_node):
         # Detect call-like nodes
         if n.type in CALL_NODE_TYPES:
             # Attempt to extract the callee from the call's first child
@@ -344,13 +389,6 @@ def extract_method_calls(method_node: Node, text: str) -> List[str]:
                             calls.append(text[ch.start_byte:ch.end_byte])
                             break
 
-        # Continue walking all descendant nodes
-        for ch in n.children:
-            walk(ch)
-
-    # Begin recursive traversal from the method node
-    walk(method_node)
-
     # Remove duplicates while preserving order
     dedup = []
     seen = set()
@@ -368,34 +406,40 @@ def extract_method_calls(method_node: Node, text: str) -> List[str]:
 # ---------------- New helper methods for free-standing function extraction -----------------
 def walk_function_nodes(node: Node, text: str, function_types: set, class_types: set, in_class: bool, out: List[dict], file_path: Path):
     """Collect free-standing functions (not linked to a class)"""
-    WRAPPER_TYPES = {"decorated_definition", "annotation", "attribute_declaration"}
+    found = walk_file_entities(node, text, class_types, function_types, set(), file_path, collect=("functions",), in_class=in_class)
+    out.extend(found["functions"])
+
+_FUNCTION_WRAPPER_TYPES = frozenset({"decorated_definition", "annotation", "attribute_declaration"})
+_FUNCTION_PARAM_HINTS = frozenset({"parameters", "parameter_list", "formal_parameters"})
+_FUNCTION_BODY_HINTS = frozenset({"block", "suite", "body", "compound_statement"})
 
+def _visit_function_node(node: Node, children: List[Node], text: str, function_types: set, class_types: set, in_class: bool, out: List[dict], file_path: Path) -> Optional[bool]:
+    """
+    One step of the free-standing function walk. Returns `in_class` for the node's
+    children, or None when the walk must not descend any further.
+    """
+    node_type = node.type
     if not in_class:
-        if node.type in WRAPPER_TYPES:
-            for ch in node.children:
+        if node_type in _FUNCTION_WRAPPER_TYPES:
+            for ch in children:
                 if ch.type in function_types:
                     out.append(extract_single_method(ch, text, file_path))
-                    return
-        elif node.type in function_types:
+                    return None
+        elif node_type in function_types:
             out.append(extract_single_method(node, text, file_path))
 
-    # Structural fallback: if classification missed function types, detect by presence of parameter & body containers
-    if not in_class and node.type not in function_types:
-        PARAM_HINTS = {"parameters", "parameter_list", "formal_parameters"}
-        BODY_HINTS = {"block", "suite", "body", "compound_statement"}
-        has_params = any(ch.type in PARAM_HINTS for ch in node.children)
-        has_body = any(ch.type in BODY_HINTS for ch in node.children)
-        if has_params and has_body:
-            out.append(extract_single_method(node, text, file_path))
-            return
+        # Structural fallback: if classification missed function types, detect by presence of parameter & body containers
+        if node_type not in function_types and len(children) > 1:
+            child_types = {ch.type for ch in children}
+            if not child_types.isdisjoint(_FUNCTION_PARAM_HINTS) and not child_types.isdisjoint(_FUNCTION_BODY_HINTS):
+                out.append(extract_single_method(node, text, file_path))
+                return None
 
-    next_in_class = in_class or (node.type in class_types)
     # Limit descent: do not descend inside function definitions
     # Do not retrieve nested functions
-    if node.type in function_types:
-        return
-    for child in node.children:
-        walk_function_nodes(child, text, function_types, class_types, next_in_class, out, file_path)
+    if node_type in function_types:
+        return None
+    return in_class or (node_type in class_types)
 
 def extract_functions(root: Node, file_content: str, function_node_types: List[str], class_node_types: List[str], file_path: Path) -> List[dict]:
     """
@@ -412,18 +456,7 @@ def _node_text_generic(text: str, n: Node) -> str:
 
 def _contains_jsx(text: str, n: Node) -> bool:
     jsx_types = {"jsx_opening_element", "jsx_self_closing_element", "jsx_element", "jsx_fragment"}
-    found = False
-    def walk(x: Node):
-        nonlocal found
-        if x.type in jsx_types:
-            found = True
-            return
-        for c in x.children:
-            if found:
-                break
-            walk(c)
-    walk(n)
-    return found
+    return any(x.type in jsx_types for x in iter_subtree(n))
 
 HOOK_NAMES = {
     "usestate","useeffect","usecontext","usereducer","usememo","usecallback","useref",
@@ -432,7 +465,7 @@ HOOK_NAMES = {
 
 def _collect_hooks(text: str, n: Node) -> List[str]:
     hooks: List[str] = []
-    def walk(x: Node):
+    for x in iter_subtree(n):
         if x.type == "call_expression" and x.children:
             callee = x.children[0]
             name_candidate = None
@@ -445,14 +478,11 @@ def _collect_hooks(text: str, n: Node) -> List[str]:
                         break
             if name_candidate and name_candidate.lower() in HOOK_NAMES and name_candidate not in hooks:
                 hooks.append(name_candidate)
-        for ch in x.children:
-            walk(ch)
-    walk(n)
     return hooks
 
 def _collect_state_vars(text: str, n: Node) -> List[str]:
     state_vars: List[str] = []
-    def walk(x: Node):
+    for x in iter_subtree(n):
         if x.type == "variable_declarator" and x.children:
             init_call = None
             array_pattern = None
@@ -477,14 +507,11 @@ def _collect_state_vars(text: str, n: Node) -> List[str]:
                             name = _node_text_generic(text, ap_child)
                             if name and name not in state_vars:
                                 state_vars.append(name)
-        for ch in x.children:
-            walk(ch)
-    walk(n)
     return state_vars
 
 def _collect_props_member_access(text: str, n: Node, root_param_name: str) -> List[str]:
     props: List[str] = []
-    def walk(x: Node):
+    for x in iter_subtree(n):
         if x.type == "member_expression" and x.children:
             obj = x.children[0]
             prop = None
@@ -496,9 +523,6 @@ def _collect_props_member_access(text: str, n: Node, root_param_name: str) -> Li
                 pname = _node_text_generic(text, prop)
                 if pname and pname not in props:
                     props.append(pname)
-        for ch in x.children:
-            walk(ch)
-    walk(n)
     return props
 
 def _extract_function_component(text: str, fn: Node) -> Optional[dict]:
@@ -564,7 +588,7 @@ def _extract_class_component(text: str, cls: Node) -> Optional[dict]:
     FIELD_TYPES = {"public_field_definition", "property_signature", "property_definition"}
     METHOD_TYPES = {"method_definition", "method_signature", "function_signature"}
 
-    def walk_body(n: Node):
+    def visit_body_node(n: Node):
         if n.type in FIELD_TYPES:
             field_name = None
             field_decorators: List[str] = []
@@ -592,15 +616,12 @@ def _extract_class_component(text: str, cls: Node) -> Optional[dict]:
             if mname and any(mname.startswith(pref) for pref in LIFECYCLE_METHOD_PREFIXES):
                 if mname not in lifecycle_hooks:
                     lifecycle_hooks.append(mname)
-        for ch in n.children:
-            walk_body(ch)
 
     for child in cls.children:
-        if child.type == "class_body":
-            for grand in child.children:
-                walk_body(grand)
-        else:
-            walk_body(child)
+        starts = child.children if child.type == "class_body" else [child]
+        for start in starts:
+            for n in iter_subtree(start):
+                visit_body_node(n)
 
     high_signal = has_suffix or has_decorator or has_interface or lifecycle_hooks
     if not high_signal:
@@ -615,30 +636,20 @@ def _extract_class_component(text: str, cls: Node) -> Optional[dict]:
     }
 
 def extract_components(root: Node, file_content: str, component_node_types: List[str], file_path: Path) -> List[dict]:
-    text = file_content
-    component_type_set = set(component_node_types)
-    FUNCTION_TYPES = {"function_definition", "function_declaration", "method_definition", "function_signature"}
-    CLASS_TYPES = {"class", "class_declaration", "abstract_class_declaration"}
-    results: List[dict] = []
-    seen_names: set = set()
-
-    def traverse(n: Node):
-        comp: Optional[dict] = None
-        if n.type in component_type_set:
-            comp = extract_component_from_node_type(n, text)
-        elif n.type in FUNCTION_TYPES:
-            comp = _extract_function_component(text, n)
-        elif n.type in CLASS_TYPES:
-            comp = _extract_class_component(text, n)
-        if comp:
-            nm = comp.get("name")
-            if nm and nm not in seen_names:
-                seen_names.add(nm)
-                results.append(comp)
-        for ch in n.children:
-            traverse(ch)
-    traverse(root)
-    return results
+    found = walk_file_entities(root, file_content, set(), set(), set(component_node_types), file_path, collect=("components",))
+    return found["components"]
+
+_COMPONENT_FUNCTION_TYPES = frozenset({"function_definition", "function_declaration", "method_definition", "function_signature"})
+_COMPONENT_CLASS_TYPES = frozenset({"class", "class_declaration", "abstract_class_declaration"})
+
+def _component_for_node(n: Node, text: str, component_type_set: set) -> Optional[dict]:
+    if n.type in component_type_set:
+        return extract_component_from_node_type(n, text)
+    if n.type in _COMPONENT_FUNCTION_TYPES:
+        return _extract_function_component(text, n)
+    if n.type in _COMPONENT_CLASS_TYPES:
+        return _extract_class_component(text, n)
+    return None
 
 def extract_component_from_node_type(node: Node, file_content: str) -> Optional[dict]:
     """Attempt to extract a component entity purely from a matched component node type.
@@ -684,4 +695,72 @@ def extract_component_from_node_type(node: Node, file_content: str) -> Optional[
         "props": props,
         "state_variables": [],
         "hooks_used": []
-    }
\ No newline at end of file
+    }
+
+# ---------------- Single-pass extraction -----------------
+ENTITY_KINDS = ("imports", "classes", "functions", "components")
+
+def walk_file_entities(
+    root: Node,
+    text: str,
+    class_types: set,
+    function_types: set,
+    component_types: set,
+    file_path: Path,
+    import_match: Optional[Callable[[str], bool]] = None,
+    collect: Iterable[str] = ENTITY_KINDS,
+    in_class: bool = False,
+) -> Dict[str, List]:
+    """
+    Collect imports, classes, free-standing functions and components in one pre-order
+    walk of the tree, using an explicit stack instead of recursion.
+
+    Each kind follows the same rules (and order) as its former dedicated walk:
+    imports are nodes accepted by `import_match`, classes are every node in `class_types`,
+    functions only count outside classes and the function walk does not enter function
+    bodies, and components are kept once per name. Results are unpruned.
+    """
+    collect = set(collect)
+    want_imports = "imports" in collect and import_match is not None
+    want_classes = "classes" in collect
+    want_functions = "functions" in collect
+    want_components = "components" in collect
+
+    found: Dict[str, List] = {kind: [] for kind in ENTITY_KINDS}
+    imports, classes, functions, components = (found[kind] for kind in ENTITY_KINDS)
+    seen_components: set = set()
+    function_or_wrapper_types = set(function_types) | _FUNCTION_WRAPPER_TYPES
+    # Node types that can yield a component; everything else skips _component_for_node.
+    component_candidates = set(component_types) | _COMPONENT_FUNCTION_TYPES | _COMPONENT_CLASS_TYPES
+
+    # The second element is the function-walk state for that node: whether it sits inside a
+    # class, or None once the function walk stopped descending on this branch.
+    stack: List[Tuple[Node, Optional[bool]]] = [(root, in_class if want_functions else None)]
+    while stack:
+        node, fn_state = stack.pop()
+        node_type = node.type
+        children = node.children
+
+        if want_imports and import_match(node_type):
+            imports.append(text[node.start_byte:node.end_byte].strip())
+        if want_classes and node_type in class_types:
+            classes.append(extract_single_class(node, text, function_types, file_path))
+        # Fast paths for the common nodes that can neither be nor wrap a function.
+        if fn_state is True and node_type not in function_types:
+            pass  # inside a class: nothing to collect, keep descending
+        elif fn_state is False and len(children) < 2 and node_type not in function_or_wrapper_types:
+            fn_state = node_type in class_types
+        elif fn_state is not None:
+            fn_state = _visit_function_node(node, children, text, function_types, class_types, fn_state, functions, file_path)
+        if want_components and node_type in component_candidates:
+            comp = _component_for_node(node, text, component_types)
+            if comp:
+                nm = comp.get("name")
+                if nm and nm not in seen_components:
+                    seen_components.add(nm)
+                    components.append(comp)
+
+        if children:
+            stack.extend((child, fn_state) for child in children[::-1])
+
+    return found
@@ -0,0 +1,125 @@
+"""
+Tree-sitter language registry: precompiled node-type sets and per-language parsers.
+
+The class/function/component node types used by entity extraction used to be derived
+per file by regex-scanning app/shared/grammars/<lang>.js and re-running
+classify_node_types. They are now computed once at build time into
+app/shared/treesitter_node_registry.json (together with the import node types from
+treesitter_import_keywords.json). Regenerate the artifact after touching a grammar or
+the classifier:
+
+    python -m app.utils.code_analysis.language_registry
+"""
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from tree_sitter import Parser, Tree
+from tree_sitter_language_pack import get_language
+
+from app.utils.code_analysis.file_entity_utils import classify_node_types, get_cached_parser
+from app.utils.code_analysis.grammar_loader import extract_rule_names
+
+logger = logging.getLogger(__name__)
+
+NODE_REGISTRY_FILENAME = "treesitter_node_registry.json"
+# Bump when classify_node_types or the artifact layout changes.
+NODE_REGISTRY_VERSION = 1
+
+_KINDS = ("class", "function", "component", "import")
+
+
+class NodeTypes(NamedTuple):
+    class_types: Tuple[str, ...] = ()
+    function_types: Tuple[str, ...] = ()
+    component_types: Tuple[str, ...] = ()
+    import_types: Tuple[str, ...] = ()
+
+
+def _shared_dir() -> Path:
+    # Imported here: parse_code_utils imports this module.
+    from app.utils.code_analysis.parse_code_utils import _shared_package_dir
+    return _shared_package_dir()
+
+
+def _classify_grammar(grammar_path: Path) -> Tuple[List[str], List[str], List[str]]:
+    return classify_node_types(extract_rule_names(grammar_path))
+
+
+def build_node_registry(shared_dir: Optional[Path] = None) -> Dict:
+    """Compute the registry from the grammar files and import keyword table."""
+    shared_dir = shared_dir or _shared_dir()
+    import_nodes = json.loads((shared_dir / "treesitter_import_keywords.json").read_text(encoding="utf-8"))
+
+    languages: Dict[str, Dict[str, List[str]]] = {}
+    for grammar_path in sorted((shared_dir / "grammars").glob("*.js")):
+        class_nodes, func_nodes, component_nodes = _classify_grammar(grammar_path)
+        entry = dict(zip(_KINDS, (class_nodes, func_nodes, component_nodes, import_nodes.get(grammar_path.stem, []))))
+        # Empty kinds are omitted to keep the artifact small.
+        languages[grammar_path.stem] = {kind: types for kind, types in entry.items() if types}
+
+    return {"version": NODE_REGISTRY_VERSION, "languages": languages}
+
+
+def write_node_registry(shared_dir: Optional[Path] = None) -> Path:
+    shared_dir = shared_dir or _shared_dir()
+    path = shared_dir / NODE_REGISTRY_FILENAME
+    registry = build_node_registry(shared_dir)
+    path.write_text(json.dumps(registry, separators=(",", ":"), sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+@lru_cache(maxsize=1)
+def load_node_registry() -> Dict[str, Dict[str, List[str]]]:
+    """Load the precompiled per-language node types; {} when missing or stale."""
+    path = _shared_dir() / NODE_REGISTRY_FILENAME
+    try:
+        with path.open(encoding="utf-8") as f:
+            registry = json.load(f)
+    except Exception as e:
+        logger.warning("Could not load %s: %s", path, e)
+        return {}
+    if registry.get("version") != NODE_REGISTRY_VERSION:
+        logger.warning("Ignoring %s: version %s != %s", path, registry.get("version"), NODE_REGISTRY_VERSION)
+        return {}
+    return registry.get("languages", {})
+
+
+@lru_cache(maxsize=None)
+def get_node_types(language: str) -> NodeTypes:
+    """
+    Node types for a Tree-sitter language name (as returned by map_language_for_treesitter).
+
+    Reads the precompiled registry; languages it does not know about fall back to scanning
+    the grammar once per process. Raises FileNotFoundError if there is no grammar either.
+    """
+    entry = load_node_registry().get(language)
+    if entry is not None:
+        return NodeTypes(*(tuple(entry.get(kind, ())) for kind in _KINDS))
+
+    shared_dir = _shared_dir()
+    class_nodes, func_nodes, component_nodes = _classify_grammar(shared_dir / "grammars" / f"{language}.js")
+    import_nodes = json.loads((shared_dir / "treesitter_import_keywords.json").read_text(encoding="utf-8"))
+    return NodeTypes(tuple(class_nodes), tuple(func_nodes), tuple(component_nodes), tuple(import_nodes.get(language, ())))
+
+
+@lru_cache(maxsize=None)
+def get_ts_language(language: str):
+    """Memoized tree_sitter_language_pack.get_language; raises LookupError if unsupported."""
+    return get_language(language)
+
+
+def get_ts_parser(language: str, ts_lang=None) -> Parser:
+    """Reusable Parser for `language` in the calling thread/worker."""
+    return get_cached_parser(ts_lang if ts_lang is not None else get_ts_language(language))
+
+
+def parse_source(source: bytes, language: str, ts_lang=None) -> Tree:
+    """Parse UTF-8 `source` with the cached parser for `language`."""
+    return get_ts_parser(language, ts_lang).parse(source)
+
+
+if __name__ == "__main__":
+    print(f"Wrote {write_node_registry()}")
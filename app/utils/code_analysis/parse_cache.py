@@ -0,0 +1,164 @@
+"""
+Persistent cache of parse_code_flow results keyed by file content.
+
+Re-uploading a project used to re-parse every file even when only a handful
+changed. Each row of PARSE_CACHE holds the parsed entry for one file (language,
+lines of code, imports, entities, metrics; the project-relative `file_path` is
+recomputed on every run), stored as zlib-compressed JSON. Rows are keyed by a
+BLAKE2b digest of the parser version, the file name (language detection looks
+at it), the project's top-level directories (library vs. internal import
+classification depends on them) and the file bytes, so any of those changing is
+simply a miss. The table is bounded by total payload size and evicts the least
+recently used rows first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.data.db import get_connection
+from app.utils.code_analysis.language_registry import NODE_REGISTRY_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Bump when _parse_single_file changes what it produces for the same input.
+PARSE_CACHE_VERSION = 1
+
+PARSE_CACHE_MAX_BYTES_ENV = "PARSE_CACHE_MAX_BYTES"
+DEFAULT_PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Third-party packages whose upgrades can change parse results.
+_VERSIONED_PACKAGES = ("pygments", "pygount", "tree-sitter", "tree-sitter-language-pack")
+
+
+@lru_cache(maxsize=1)
+def parser_version() -> str:
+    """Everything that determines a parse result besides the file itself."""
+    parts = [f"parse_cache={PARSE_CACHE_VERSION}", f"node_registry={NODE_REGISTRY_VERSION}"]
+    for package in _VERSIONED_PACKAGES:
+        try:
+            parts.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            parts.append(f"{package}=?")
+    return ";".join(parts)
+
+
+def content_key(content: bytes, file_name: str, top_level_dirs: Iterable[str]) -> bytes:
+    """BLAKE2b cache key for one file's bytes in the context of its project."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(parser_version().encode("utf-8"))
+    h.update(b"\0" + file_name.encode("utf-8", "surrogateescape"))
+    h.update(b"\0" + json.dumps(list(top_level_dirs or [])).encode("utf-8"))
+    h.update(b"\0")
+    h.update(content)
+    return h.digest()
+
+
+def encode_entry(entry: Dict) -> bytes:
+    return zlib.compress(json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_entry(payload: bytes) -> Dict:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _resolve_max_bytes(max_bytes: Optional[int] = None) -> int:
+    if max_bytes is None:
+        try:
+            max_bytes = int(os.environ.get(PARSE_CACHE_MAX_BYTES_ENV, DEFAULT_PARSE_CACHE_MAX_BYTES))
+        except ValueError:
+            max_bytes = DEFAULT_PARSE_CACHE_MAX_BYTES
+    return max(0, int(max_bytes))
+
+
+def compute_content_keys(file_paths: List[Path], top_level_dirs: List[str]) -> List[Optional[bytes]]:
+    """Cache key per path, aligned with `file_paths`; None where the file cannot be read."""
+    keys: List[Optional[bytes]] = []
+    for file_path in file_paths:
+        try:
+            keys.append(content_key(Path(file_path).read_bytes(), Path(file_path).name, top_level_dirs))
+        except OSError:
+            keys.append(None)
+    return keys
+
+
+def load_parse_cache_entries(keys: Iterable[bytes]) -> Dict[bytes, Dict]:
+    """Cached entries for `keys` (missing keys are absent); marks the hits as recently used."""
+    wanted = list(dict.fromkeys(k for k in keys if k))
+    if not wanted:
+        return {}
+    found: Dict[bytes, Dict] = {}
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Stay well under SQLite's bound-parameter limit.
+        for start in range(0, len(wanted), 500):
+            batch = wanted[start:start + 500]
+            cursor.execute(
+                f"SELECT content_key, payload FROM PARSE_CACHE WHERE content_key IN ({','.join('?' * len(batch))})",
+                batch,
+            )
+            for key, payload in cursor.fetchall():
+                try:
+                    found[bytes(key)] = decode_entry(payload)
+                except Exception as e:
+                    logger.debug("Discarding unreadable parse cache row: %s", e)
+        if found:
+            now = time.time()
+            cursor.executemany(
+                "UPDATE PARSE_CACHE SET last_used = ? WHERE content_key = ?",
+                [(now, key) for key in found],
+            )
+            conn.commit()
+    finally:
+        conn.close()
+    return found
+
+
+def save_parse_cache_entries(entries: Dict[bytes, Dict], max_bytes: Optional[int] = None) -> None:
+    """Upsert parsed entries, then evict least recently used rows beyond the size budget."""
+    max_bytes = _resolve_max_bytes(max_bytes)
+    if not entries or max_bytes == 0:
+        return
+    now = time.time()
+    rows: List[Tuple[bytes, bytes, int, float]] = []
+    for key, entry in entries.items():
+        payload = encode_entry(entry)
+        rows.append((key, payload, len(payload), now))
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            INSERT INTO PARSE_CACHE (content_key, payload, size_bytes, last_used)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(content_key) DO UPDATE SET
+                payload = excluded.payload,
+                size_bytes = excluded.size_bytes,
+                last_used = excluded.last_used
+            """,
+            rows,
+        )
+        cursor.execute(
+            """
+            DELETE FROM PARSE_CACHE WHERE content_key IN (
+                SELECT content_key FROM (
+                    SELECT content_key,
+                           SUM(size_bytes) OVER (ORDER BY last_used DESC, content_key) AS running
+                    FROM PARSE_CACHE
+                ) WHERE running > ?
+            )
+            """,
+            (max_bytes,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
@@ -1,13 +1,23 @@
 from pathlib import Path
-from typing import Union, List, Dict, Optional
+from typing import Union, List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import lru_cache
 import json
 import logging
+import os
+import signal
 import sys
-from pygments.lexers import guess_lexer, guess_lexer_for_filename
+import time
+from app.utils.lexers import guess_lexer, guess_lexer_for_filename
 from pygments.util import ClassNotFound
-from app.utils.code_analysis.file_entity_utils import classify_node_types, extract_entities, get_parser
-from app.utils.code_analysis.grammar_loader import extract_rule_names
-from pygount import SourceAnalysis
+from app.utils.code_analysis.file_entity_utils import extract_file_structure, get_cached_parser, iter_subtree, walk_file_entities
+from app.utils.code_analysis.language_registry import get_node_types, parse_source
+from app.utils.code_analysis.parse_cache import (
+    compute_content_keys,
+    load_parse_cache_entries,
+    save_parse_cache_entries,
+)
+from app.utils.code_analysis.source_file import SourceFile
 from tree_sitter import Parser, Node, Query
 from tree_sitter_language_pack import get_language
 from typing import List, Set
@@ -67,37 +77,6 @@ _TS_LANGUAGE_MAPPING = {
     k.strip().lower(): v for k, v in _TS_LANGUAGE_MAPPING_LOAD.items()
 }
 
-def _read_file_with_encoding_fallback(file_path: Path, return_content: bool = True) -> str | None:
-    """
-    Helper method to read file content with encoding fallback.
-    
-    Args:
-        file_path: Path to the file to read
-        return_content: If True, returns content; if False, just tests readability
-    
-    Returns:
-        File content if successful and return_content=True, None if failed
-    """
-    encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            content = file_path.read_text(encoding=encoding)
-            return content if return_content else "success"
-        except UnicodeDecodeError as e:
-            logger.debug(f"Failed to read {file_path} with {encoding}: {e}")
-            continue
-        except Exception as e:
-            logger.debug(f"Other error reading {file_path} with {encoding}: {e}")
-            continue
-    
-    # Final fallback with error replacement
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='replace')
-        return content if return_content else "success"
-    except Exception:
-        return None
-
 def _is_comment_line(line: str, language: str) -> bool:
     """
     Check if a line is a comment based on the programming language.
@@ -136,23 +115,23 @@ def _is_comment_line(line: str, language: str) -> bool:
     # Default fallback - try common comment patterns
     return stripped.startswith(('#', '//', '/*', '*', '--', '<!--'))
 
-def detect_language(file_path: Path) -> str | None:
+def detect_language(file_path: Union[Path, SourceFile]) -> str | None:
     """
     Detect the programming language of the given file based on filename or content.
     
     Args:
-        file_path: Path to the file.
+        file_path: Path to the file, or an already-read SourceFile.
 
     Returns:
         Language name if detected, else None.
     """
     
     try:
-        content = _read_file_with_encoding_fallback(file_path)
-        if content is None:
-            return None
-        
-        lexer = guess_lexer_for_filename(file_path.name, content)
+        source = SourceFile.coerce(file_path)
+        source.raw  # surface FileNotFoundError / OSError before guessing
+        content = source.text
+
+        lexer = guess_lexer_for_filename(source.name, content)
         language = lexer.name
         language = re.split(r'\+(?=[A-Za-z])', language)[0].strip()
         language = language.split()[0]
@@ -160,112 +139,42 @@ def detect_language(file_path: Path) -> str | None:
     except (ClassNotFound, FileNotFoundError, OSError):
         return None
 
-def count_lines_of_code(file_path: Path) -> int:
+def count_lines_of_code(file_path: Union[Path, SourceFile]) -> int:
     """Return the number of lines of code in the given source file."""
-    encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            analysis = SourceAnalysis.from_file(str(file_path), "pygount", encoding=encoding)
-            return analysis.code_count
-        except Exception:
-            continue
-    
-    # If all encodings fail, try with error handling
-    try:
-        content = _read_file_with_encoding_fallback(file_path)
-        if content is None:
-            return 0
-        
-        # Detect language for better comment detection
-        language = detect_language(file_path) or 'unknown'
-        
-        # Count non-empty, non-comment lines
-        return len([line for line in content.splitlines() 
-                   if line.strip() and not _is_comment_line(line, language)])
-    except Exception:
-        return 0
+    return SourceFile.coerce(file_path).line_counts[0]
 
-def count_lines_of_documentation(file_path: Path) -> int:
+def count_lines_of_documentation(file_path: Union[Path, SourceFile]) -> int:
     """Return the number of documentation lines in the given source file."""
-    encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            analysis = SourceAnalysis.from_file(str(file_path), "pygount", encoding=encoding)
-            return analysis.documentation_count
-        except Exception:
-            continue
-    
-    # Fallback to manual counting if pygount fails with all encodings
-    content = _read_file_with_encoding_fallback(file_path)
-    if content is None:
-        return 0
-    
-    # Detect language for better comment detection
-    language = detect_language(file_path) or 'unknown'
-    
-    # Count comment/documentation lines
-    lines = content.splitlines()
-    doc_lines = 0
-    
-    for line in lines:
-        if _is_comment_line(line, language):
-            doc_lines += 1
-        # Also check for docstring patterns
-        stripped = line.strip()
-        if stripped.startswith(('"""', "'''", '/**', '/*')):
-            doc_lines += 1
-    
-    return doc_lines
+    return SourceFile.coerce(file_path).line_counts[1]
 
-def extract_contents(file_path: Path) -> str:
-    """Extracts the contents of the given file."""
-    encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            return file_path.read_text(encoding=encoding)
-        except UnicodeDecodeError as e:
-            logger.debug(f"Failed to read {file_path} with {encoding}: {e}")
-            if encoding == 'utf-8':  
-                try:
-                    with open(file_path, 'rb') as f:
-                        raw_bytes = f.read()
-                    logger.debug(f"Bytes around position {e.start}: {raw_bytes[max(0, e.start-10):e.start+10]}")
-                    logger.debug(f"Problematic byte at position {e.start}: 0x{raw_bytes[e.start]:02x}")
-                except Exception as debug_e:
-                    logger.debug(f"Debug read failed: {debug_e}")
-            continue
-        except Exception as e:
-            logger.debug(f"Other error reading {file_path} with {encoding}: {e}")
-            continue
-    
-    # If all encodings fail, use utf-8 with error handling
-    try:
-        return file_path.read_text(encoding='utf-8', errors='replace')
-    except Exception:
-        # Last resort: return empty string if file can't be read at all
-        return ""
+def extract_contents(file_path: Union[Path, SourceFile]) -> str:
+    """Extracts the contents of the given file (decoded once per SourceFile)."""
+    return SourceFile.coerce(file_path).text
 
 # ---- Helper methods for extract_imports ----
 def collect_node_types(node: Node, seen: Set[str] | None = None) -> Set[str]:
-    """Recursively collect all node types in a syntax tree."""
+    """Collect all node types in a syntax tree."""
     if seen is None:
         seen = set()
-    seen.add(node.type)
-    for child in node.children:
-        collect_node_types(child, seen)
+    seen.update(n.type for n in iter_subtree(node))
     return seen
 
 def traverse_imports(node: Node, file_content: str, import_node_types: Set[str], imports: List[str]) -> None:
-    """Recursively traverse the tree to find and collect import statements."""
-    if node.type in import_node_types:
-        imports.append(file_content[node.start_byte:node.end_byte].strip())
-    for child in node.children:
-        traverse_imports(child, file_content, import_node_types, imports)
-        
-def extract_with_treesitter_dynamic(file_content: str, ts_lang: str, language:str) -> List[str]:
+    """Traverse the tree to find and collect import statements."""
+    found = walk_file_entities(node, file_content, set(), set(), set(), None,
+                               import_match=import_node_types.__contains__, collect=("imports",))
+    imports.extend(found["imports"])
+
+_IMPORT_HEURISTIC_KEYWORDS = ("import", "use", "require", "open", "include", "load")
+
+@lru_cache(maxsize=None)
+def _looks_like_import_type(node_type: str) -> bool:
+    """Heuristic import node type for languages missing from `_TS_IMPORT_NODES`."""
+    lowered = node_type.lower()
+    return any(k in lowered for k in _IMPORT_HEURISTIC_KEYWORDS)
+
+
+def extract_with_treesitter_dynamic(file_content: str, ts_lang: str, language:str, parser: Optional[Parser] = None) -> List[str]:
     """
     Extract import statements from source code using a Tree-sitter parser.
 
@@ -276,10 +185,13 @@ def extract_with_treesitter_dynamic(file_content: str, ts_lang: str, language:st
     - Tree-sitter Language objects from `tree_sitter_language_pack` have `name=None`.
     - The `language` string is required for looking up language-specific import node types 
     in `_TS_IMPORT_NODES`, which is why both `ts_lang` and `language` are passed.
+    - `parser` is a reusable parser already set to `ts_lang` (see language_registry);
+    a fresh one is built when it is omitted.
     """
 
-    parser = Parser()
-    parser.language = ts_lang
+    if parser is None:
+        parser = Parser()
+        parser.language = ts_lang
     tree = parser.parse(file_content.encode())
     root = tree.root_node
 
@@ -288,10 +200,7 @@ def extract_with_treesitter_dynamic(file_content: str, ts_lang: str, language:st
     # If no mapping exists, fall back to heuristic discovery
     if not import_types:
         all_types = collect_node_types(root)
-        import_types = {
-            t for t in all_types
-            if any(k in t.lower() for k in ("import", "use", "require", "open", "include", "load"))
-        }
+        import_types = {t for t in all_types if _looks_like_import_type(t)}
 
     # If still empty, return early
     if not import_types:
@@ -356,7 +265,9 @@ def extract_imports(file_content: str, language: str) -> List[str]:
     try:
         language = map_language_for_treesitter(language)
         ts_language = get_language(language)
-        imports = extract_with_treesitter_dynamic(file_content, ts_language, language)
+        imports = extract_with_treesitter_dynamic(
+            file_content, ts_language, language, parser=get_cached_parser(ts_language)
+        )
     except (ValueError, Exception):
         # ValueError: language not supported by tree_sitter_languages
         # Exception: any runtime error during parsing
@@ -373,6 +284,47 @@ def extract_imports(file_content: str, language: str) -> List[str]:
 
     return imports
 
+def extract_imports_and_entities(source: SourceFile, language: str) -> Tuple[List[str], Dict[str, List[Dict]]]:
+    """
+    Parse a file once and collect its imports and entities in a single tree walk.
+
+    Imports fall back to the regex patterns exactly like `extract_imports`; entities are
+    {} when the language has no Tree-sitter grammar.
+    """
+    contents = source.text
+    language = map_language_for_treesitter(language)
+    imports: List[str] = []
+    entities: Dict[str, List[Dict]] = {}
+    if language:
+        try:
+            tree = parse_source(source.utf8, language)
+            import_types = frozenset(_TS_IMPORT_NODES.get(language, []))
+            import_match = import_types.__contains__ if import_types else _looks_like_import_type
+            try:
+                node_types = get_node_types(language)
+            except (FileNotFoundError, OSError):
+                node_types = None
+            if node_types is None:
+                found = walk_file_entities(tree.root_node, contents, set(), set(), set(), source.path,
+                                           import_match=import_match, collect=("imports",))
+                imports = found["imports"]
+            else:
+                imports, entities = extract_file_structure(
+                    tree, contents, node_types.class_types, node_types.function_types,
+                    node_types.component_types, source.path, import_match,
+                )
+        except Exception:
+            # Unsupported language (LookupError) or a parsing failure: no tree-sitter results.
+            imports, entities = [], {}
+
+    if not imports:
+        try:
+            imports = extract_with_regex_fallback(contents, (language or "").lower())
+        except Exception:
+            imports = []
+
+    return imports, entities
+
 def extract_libraries(import_statements: List[str], language: str, project_names: Optional[List[str]] = None) -> List[str]:
     """
     Extract library/module names from a list of import statements.
@@ -526,7 +478,7 @@ def normalize_library(lib: str, language: str) -> str:
     # Single-segment library: keep as-is
     return lib
 
-def extract_metrics(file_path: Path, entities: Dict[str, List[Dict]]) -> Dict[str, Optional[float]]:
+def extract_metrics(file_path: Union[Path, SourceFile], entities: Dict[str, List[Dict]]) -> Dict[str, Optional[float]]:
     """
     Compute per-file metrics including class methods + free functions.
     """
@@ -559,68 +511,262 @@ def extract_metrics(file_path: Path, entities: Dict[str, List[Dict]]) -> Dict[st
         "comment_ratio": comment_ratio
     }
     
-def parse_code_flow(file_paths: List[Path],top_level_dirs: List[str]) -> List[Dict]:
-    """ This method performs the whole flow of detecting code files to parsing the files and returning an array of JSON """
-    parsed_files = []
-    
-    for file_path in file_paths:
+def _relative_file_path(file_path: Path, top_level_dirs: List[str]) -> str:
+    """Build relative path using discovered top-level names."""
+    relative_path = None
+    top_level_names = top_level_dirs if top_level_dirs else []
+    parts = Path(file_path).parts
+
+    if top_level_names:
+        for idx, part in enumerate(parts):
+            if part in top_level_names:
+                relative_path = "/".join(parts[idx:])
+                break
+    if not relative_path:
+        relative_path = Path(file_path).name
+    return relative_path
+
+def _parse_single_file(file_path: Path, top_level_dirs: List[str]) -> Optional[Dict]:
+    """Run the full parsing flow for one file. Returns None if the file is skipped."""
+    try:
+        # Read and decode once; every stage below shares this object.
+        source = SourceFile(file_path)
+        language = detect_language(source)
+        if not language:
+            return None  # skip files where language could not be detected
+
+        lines_of_code = count_lines_of_code(source)
+        # One parse and one tree walk for imports and entities.
+        import_statements, entities = extract_imports_and_entities(source, language)
+        project_top_level_dir = []
         try:
-            language = detect_language(file_path)
-            if not language:
-                continue  # skip files where language could not be detected
-
-            lines_of_code = count_lines_of_code(file_path)
-            contents = extract_contents(file_path)
-            import_statements = extract_imports(contents, language)
+            project_top_level_dir = top_level_dirs
+        except Exception:
             project_top_level_dir = []
-            try:
-                project_top_level_dir = top_level_dirs
-            except Exception:
-                project_top_level_dir = []
-            libraries = extract_libraries(import_statements, language, project_top_level_dir)
-            dependencies = extract_internal_dependencies(import_statements, language, project_top_level_dir)
-
-            mapped_language = map_language_for_treesitter(language)
-            entities = {}
-            if mapped_language:
+        libraries = extract_libraries(import_statements, language, project_top_level_dir)
+        dependencies = extract_internal_dependencies(import_statements, language, project_top_level_dir)
+
+        metrics = extract_metrics(source, entities)
+
+        return {
+            "file_path": _relative_file_path(file_path, project_top_level_dir),
+            "language": language,               
+            "lines_of_code": lines_of_code,
+            "imports": libraries,               
+            "dependencies_internal": dependencies,
+            "entities": entities,
+            "metrics": metrics,
+        }
+    except Exception:
+        # Absolute last-resort safety: ignore unexpected errors for this file
+        return None
+
+# ---- Parallel parsing ----
+PARSE_WORKERS_ENV = "PARSE_CODE_WORKERS"
+PARSE_FILE_TIMEOUT_ENV = "PARSE_CODE_FILE_TIMEOUT"
+_DEFAULT_FILE_TIMEOUT = 30.0
+_CHUNK_SIZE = 32
+# Below this many files the pool start-up cost outweighs the gain.
+_MIN_FILES_FOR_POOL = 64
+
+
+class _FileParseTimeout(Exception):
+    """Raised inside a worker when one file exceeds its time budget."""
+
+
+def _raise_file_timeout(signum, frame):
+    raise _FileParseTimeout()
+
+
+def resolve_parse_workers(workers: Optional[int] = None) -> int:
+    """
+    Number of worker processes for parse_code_flow.
+    Explicit `workers` wins, then PARSE_CODE_WORKERS ("auto" = CPU count); default 1 (sequential).
+    """
+    if workers is None:
+        raw = os.environ.get(PARSE_WORKERS_ENV, "").strip().lower()
+        if raw == "auto":
+            workers = os.cpu_count() or 1
+        elif raw.isdigit():
+            workers = int(raw)
+        else:
+            workers = 1
+    return max(1, int(workers))
+
+
+def _resolve_file_timeout(file_timeout: Optional[float] = None) -> float:
+    """Per-file time budget in seconds (PARSE_CODE_FILE_TIMEOUT, default 30)."""
+    if file_timeout is None:
+        try:
+            file_timeout = float(os.environ.get(PARSE_FILE_TIMEOUT_ENV, _DEFAULT_FILE_TIMEOUT))
+        except ValueError:
+            file_timeout = _DEFAULT_FILE_TIMEOUT
+    return max(0.0, float(file_timeout))
+
+
+def _parse_file_chunk(
+    chunk: List[Tuple[int, Path]], top_level_dirs: List[str], file_timeout: float
+) -> List[Tuple[int, Optional[Dict]]]:
+    """
+    Worker entry point: parse a chunk of (index, path) pairs.
+    Each file gets its own SIGALRM budget where the platform supports it; a file
+    that runs over is dropped, exactly like a file that raised.
+    """
+    use_alarm = file_timeout > 0 and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_file_timeout)
+
+    results: List[Tuple[int, Optional[Dict]]] = []
+    for index, file_path in chunk:
+        try:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, file_timeout)
+            results.append((index, _parse_single_file(file_path, top_level_dirs)))
+        except _FileParseTimeout:
+            logger.warning("Parsing %s exceeded %.1fs; skipping", file_path, file_timeout)
+            results.append((index, None))
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    return results
+
+
+def _parse_code_flow_parallel(
+    file_paths: List[Path], top_level_dirs: List[str], workers: int, file_timeout: float
+) -> List[Optional[Dict]]:
+    """
+    Fan chunks of files out to a process pool and reassemble results in input order
+    (None for files that were skipped, failed or timed out).
+
+    A chunk whose worker dies or overruns its budget is retried one file per task
+    in a fresh pool, so a single pathological file only loses itself.
+    """
+    indexed = list(enumerate(file_paths))
+    chunks = [indexed[i:i + _CHUNK_SIZE] for i in range(0, len(indexed), _CHUNK_SIZE)]
+    results: Dict[int, Optional[Dict]] = {}
+    failed: List[Tuple[int, Path]] = []
+
+    def _run(pool_chunks: List[List[Tuple[int, Path]]]) -> List[List[Tuple[int, Path]]]:
+        lost: List[List[Tuple[int, Path]]] = []
+        pool_workers = min(workers, len(pool_chunks))
+        # Worst case every file uses its full budget; rounds = chunks queued per worker.
+        rounds = -(-len(pool_chunks) // pool_workers)
+        deadline = None
+        if file_timeout:
+            longest = max(len(chunk) for chunk in pool_chunks)
+            deadline = time.monotonic() + file_timeout * (longest + 1) * rounds
+        pool = ProcessPoolExecutor(max_workers=pool_workers)
+        timed_out = False
+        try:
+            futures = [
+                (pool.submit(_parse_file_chunk, chunk, top_level_dirs, file_timeout), chunk)
+                for chunk in pool_chunks
+            ]
+            for future, chunk in futures:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
                 try:
-                    grammar_path = _shared_package_dir() / "grammars" / f"{mapped_language}.js"
-                    rule_names = extract_rule_names(grammar_path)
-                    class_nodes, func_nodes, component_nodes = classify_node_types(rule_names)
-                    ts_lang = get_language(mapped_language)
-                    tree = get_parser(contents, ts_lang)
-                    entities = extract_entities(tree, contents, class_nodes, func_nodes, component_nodes, file_path)
-                except (FileNotFoundError, LookupError, ModuleNotFoundError, ValueError):
-                    entities = {}
+                    for index, parsed in future.result(timeout=remaining):
+                        results[index] = parsed
+                except FuturesTimeoutError:
+                    timed_out = True
+                    lost.append(chunk)
                 except Exception:
-                    entities = {}
+                    # BrokenProcessPool (worker crashed) or an error raised in the worker
+                    lost.append(chunk)
+        finally:
+            if timed_out:
+                # A worker stuck in native code ignores SIGALRM; stop it instead of waiting.
+                for process in list(getattr(pool, "_processes", {}).values()):
+                    process.terminate()
+            pool.shutdown(wait=not timed_out, cancel_futures=True)
+        return lost
+
+    for chunk in _run(chunks):
+        failed.extend(chunk)
+    if failed:
+        logger.warning("Retrying %d file(s) individually after a worker failure", len(failed))
+        _run([[item] for item in failed])
+
+    return [results.get(i) for i in range(len(file_paths))]
+
+
+def _parse_files(
+    file_paths: List[Path], top_level_dirs: List[str], workers: int, file_timeout: Optional[float]
+) -> List[Optional[Dict]]:
+    """Parse every path, sequentially or on the pool; results are aligned with `file_paths`."""
+    if workers > 1 and len(file_paths) >= _MIN_FILES_FOR_POOL:
+        try:
+            return _parse_code_flow_parallel(
+                list(file_paths), top_level_dirs, workers, _resolve_file_timeout(file_timeout)
+            )
+        except Exception as e:
+            # e.g. process creation not permitted; fall back to sequential parsing
+            logger.warning("Parallel parsing unavailable (%s); parsing sequentially", e)
 
-            # Build relative path using discovered top-level names
-            relative_path = None
-            top_level_names = project_top_level_dir if project_top_level_dir else []
-            parts = file_path.parts
-            
-            if top_level_names:
-                for idx, part in enumerate(parts):
-                    if part in top_level_names:
-                        relative_path = "/".join(parts[idx:])
-                        break
-            if not relative_path:
-                relative_path = file_path.name
-
-            metrics = extract_metrics(file_path, entities)
-
-            parsed_files.append({
-                "file_path": relative_path,
-                "language": language,               
-                "lines_of_code": lines_of_code,
-                "imports": libraries,               
-                "dependencies_internal": dependencies,
-                "entities": entities,
-                "metrics": metrics,
-            })
-        except Exception:
-            # Absolute last-resort safety: ignore unexpected errors for this file
-            continue
+    return [_parse_single_file(file_path, top_level_dirs) for file_path in file_paths]
 
-    return parsed_files
+
+def _parse_files_with_cache(
+    file_paths: List[Path], top_level_dirs: List[str], workers: int, file_timeout: Optional[float]
+) -> List[Optional[Dict]]:
+    """
+    Serve unchanged files from the parse cache and parse only the rest.
+    Any cache failure degrades to parsing every file.
+    """
+    try:
+        keys = compute_content_keys(file_paths, top_level_dirs)
+        cached = load_parse_cache_entries(keys)
+    except Exception as e:
+        logger.warning("Parse cache unavailable (%s); parsing all files", e)
+        return _parse_files(file_paths, top_level_dirs, workers, file_timeout)
+
+    results: List[Optional[Dict]] = [None] * len(file_paths)
+    misses: List[int] = []
+    for i, (file_path, key) in enumerate(zip(file_paths, keys)):
+        entry = cached.get(key) if key else None
+        if entry is None:
+            misses.append(i)
+        else:
+            results[i] = {"file_path": _relative_file_path(file_path, top_level_dirs), **entry}
+
+    parsed = _parse_files([file_paths[i] for i in misses], top_level_dirs, workers, file_timeout)
+    new_entries: Dict[bytes, Dict] = {}
+    for i, entry in zip(misses, parsed):
+        results[i] = entry
+        # Skipped/failed/timed-out files are not cached; they may parse next time.
+        if entry is not None and keys[i]:
+            new_entries[keys[i]] = {k: v for k, v in entry.items() if k != "file_path"}
+
+    if misses:
+        logger.info("Parse cache: %d hit(s), %d file(s) parsed", len(file_paths) - len(misses), len(misses))
+    try:
+        save_parse_cache_entries(new_entries)
+    except Exception as e:
+        logger.warning("Could not store parse cache entries: %s", e)
+    return results
+
+
+def parse_code_flow(
+    file_paths: List[Path],
+    top_level_dirs: List[str],
+    workers: Optional[int] = None,
+    file_timeout: Optional[float] = None,
+    use_cache: bool = False,
+) -> List[Dict]:
+    """
+    This method performs the whole flow of detecting code files to parsing the files and returning an array of JSON.
+
+    With more than one worker (argument or PARSE_CODE_WORKERS) and enough files, files are
+    parsed in chunks on a process pool with a per-file timeout (PARSE_CODE_FILE_TIMEOUT);
+    the result is the same list, in the same order, as the sequential run.
+
+    With `use_cache`, files whose content was parsed before (see parse_cache) are
+    served from the PARSE_CACHE table and only new or changed files are parsed.
+    """
+    workers = resolve_parse_workers(workers)
+    file_paths = list(file_paths)
+    if use_cache:
+        parsed = _parse_files_with_cache(file_paths, top_level_dirs, workers, file_timeout)
+    else:
+        parsed = _parse_files(file_paths, top_level_dirs, workers, file_timeout)
+    return [entry for entry in parsed if entry is not None]
@@ -0,0 +1,153 @@
+import codecs
+import logging
+from io import StringIO
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from pygount import SourceAnalysis
+from pygount.analysis import has_lexer
+
+logger = logging.getLogger(__name__)
+
+# Same order the per-function readers in parse_code_utils used to try.
+ENCODINGS = ['utf-8', 'utf-16', 'latin-1', 'cp1252', 'iso-8859-1']
+
+# pygount treats a NUL byte in the first 8 KiB as binary unless the file starts with a BOM.
+_BINARY_SNIFF_BYTES = 8192
+_TEXT_BOMS = (
+    codecs.BOM_UTF32_BE, codecs.BOM_UTF32_LE,
+    codecs.BOM_UTF8, codecs.BOM_UTF16_BE, codecs.BOM_UTF16_LE,
+)
+
+
+class SourceFile:
+    """
+    One source file read and decoded exactly once.
+
+    Every stage of parse_code_flow (language detection, import and entity
+    extraction, metrics) consumes this object instead of re-reading the path.
+    `text` matches what Path.read_text() returned with the old encoding fallback
+    chain (universal newlines included), and the code/documentation line counts
+    come from a single pygount pass over that text.
+    """
+
+    __slots__ = ("path", "_raw", "_text", "_encoding", "_line_counts", "_utf8")
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._raw: Optional[bytes] = None
+        self._text: Optional[str] = None
+        self._encoding: Optional[str] = None
+        self._line_counts: Optional[Tuple[int, int]] = None
+        self._utf8: Optional[bytes] = None
+
+    @classmethod
+    def coerce(cls, source: Union[str, Path, "SourceFile"]) -> "SourceFile":
+        """Wrap a path in a SourceFile; pass SourceFile instances through."""
+        return source if isinstance(source, SourceFile) else cls(source)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def raw(self) -> bytes:
+        """File bytes; raises OSError if the file cannot be read."""
+        if self._raw is None:
+            with open(self.path, "rb") as f:
+                self._raw = f.read()
+        return self._raw
+
+    @property
+    def text(self) -> str:
+        """Decoded content; "" if the file cannot be read at all."""
+        if self._text is None:
+            self._decode()
+        return self._text
+
+    @property
+    def encoding(self) -> Optional[str]:
+        """Encoding that decoded the file (None when it was unreadable)."""
+        if self._text is None:
+            self._decode()
+        return self._encoding
+
+    @property
+    def utf8(self) -> bytes:
+        """UTF-8 encoding of `text`, as fed to tree-sitter."""
+        if self._utf8 is None:
+            self._utf8 = self.text.encode()
+        return self._utf8
+
+    def _decode(self) -> None:
+        try:
+            raw = self.raw
+        except Exception as e:
+            logger.debug(f"Could not read {self.path}: {e}")
+            self._text, self._encoding = "", None
+            return
+
+        for encoding in ENCODINGS:
+            try:
+                self._text = _universal_newlines(raw.decode(encoding))
+                self._encoding = encoding
+                return
+            except UnicodeDecodeError as e:
+                logger.debug(f"Failed to read {self.path} with {encoding}: {e}")
+            except Exception as e:
+                logger.debug(f"Other error reading {self.path} with {encoding}: {e}")
+
+        # Final fallback with error replacement
+        self._text = _universal_newlines(raw.decode("utf-8", errors="replace"))
+        self._encoding = "utf-8"
+
+    def is_binary(self) -> bool:
+        head = self.raw[:_BINARY_SNIFF_BYTES]
+        return not any(head.startswith(bom) for bom in _TEXT_BOMS) and b"\0" in head
+
+    @property
+    def line_counts(self) -> Tuple[int, int]:
+        """(code lines, documentation lines), computed once per file."""
+        if self._line_counts is None:
+            self._line_counts = self._count_lines()
+        return self._line_counts
+
+    def _count_lines(self) -> Tuple[int, int]:
+        try:
+            if not self.raw or self.is_binary() or not has_lexer(str(self.path)):
+                return 0, 0
+            analysis = SourceAnalysis.from_file(
+                str(self.path), "pygount", file_handle=StringIO(self.text)
+            )
+            return analysis.code_count, analysis.documentation_count
+        except Exception as e:
+            logger.debug(f"pygount failed for {self.path}: {e}")
+        return self._count_lines_manually()
+
+    def _count_lines_manually(self) -> Tuple[int, int]:
+        """Fallback when pygount cannot analyse the text: one scan for both counts."""
+        # Imported here: parse_code_utils imports this module.
+        from app.utils.code_analysis.parse_code_utils import _is_comment_line, detect_language
+
+        language = detect_language(self) or 'unknown'
+        code_lines = 0
+        doc_lines = 0
+        for line in self.text.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if _is_comment_line(line, language):
+                doc_lines += 1
+            else:
+                code_lines += 1
+            # Also check for docstring patterns
+            if stripped.startswith(('"""', "'''", '/**', '/*')):
+                doc_lines += 1
+        return code_lines, doc_lines
+
+
+def _universal_newlines(text: str) -> str:
+    """Translate \\r\\n and \\r to \\n, as text-mode reads do."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
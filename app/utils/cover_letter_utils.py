@@ -16,7 +16,7 @@ from typing import Any, Dict, List, Optional
 
 from app.data.db import get_connection
 from app.utils.generate_resume import load_user, load_saved_resume, build_resume_model
-from app.client.llm_client import GeminiLLMClient
+from app.client.llm_client import GeminiLLMClient, is_error_response
 from app.utils.env_utils import check_gemini_api_key
 
 logger = logging.getLogger(__name__)
@@ -485,7 +485,7 @@ Instructions:
     try:
         client = GeminiLLMClient(api_key=api_key)
         raw = client.generate(prompt)
-        if not raw or raw.startswith("Gemini API error"):
+        if not raw or is_error_response(raw):
             logger.warning("Gemini returned an error, falling back to local generation.")
             return generate_local(
                 resume_id=resume_id,
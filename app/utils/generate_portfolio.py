@@ -1,6 +1,8 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
 from app.data.db import get_connection
+from app.utils import portfolio_cache
+import logging
 import sqlite3
 from typing import Any, DefaultDict, Dict, List, Tuple, Optional, Set
 from datetime import datetime
@@ -13,6 +15,8 @@ from app.utils.generate_resume import (
     limit_skills
 )
 
+logger = logging.getLogger(__name__)
+
 def load_projects_with_override(cursor: sqlite3.Cursor, project_ids: Optional[List[str]] = None) -> List[Tuple[str, str, float, str, str, int, Optional[float], Optional[str]]]:
     """Return projects with signature, name, score, created_at, last_modified, score_overridden, score_overridden_value, score_override_exclusions.
     If project_ids are provided, return only those projects.
@@ -58,23 +62,41 @@ def load_projects_with_override(cursor: sqlite3.Cursor, project_ids: Optional[Li
             )
             return [(*row, None) for row in cursor.fetchall()]
 
-def load_project_metrics(cursor: sqlite3.Cursor) -> DefaultDict[str, Dict[str, Any]]:
-    """Return mapping of project_id to metrics (lines of code, commits, etc)."""
+def load_project_metrics(cursor: sqlite3.Cursor, project_ids: Optional[List[str]] = None) -> DefaultDict[str, Dict[str, Any]]:
+    """Return mapping of project_id to metrics (lines of code, commits, etc).
+    If project_ids are provided, load only those projects' metrics.
+    """
     metrics = defaultdict(dict)
     
-    # Get metrics from DASHBOARD_DATA table
-    cursor.execute("""
-        SELECT project_id, metric_name, metric_value
-        FROM DASHBOARD_DATA
-    """)
+    # Get metrics from DASHBOARD_DATA table; metric_number is the typed value of numeric metrics
+    if project_ids:
+        placeholders = ",".join(["?"] * len(project_ids))
+        cursor.execute(f"""
+            SELECT project_id, metric_name, metric_value, metric_number
+            FROM DASHBOARD_DATA
+            WHERE project_id IN ({placeholders})
+            ORDER BY id
+        """, project_ids)
+    else:
+        cursor.execute("""
+            SELECT project_id, metric_name, metric_value, metric_number
+            FROM DASHBOARD_DATA
+            ORDER BY id
+        """)
     
-    for project_id, metric_name, metric_value in cursor.fetchall():
+    for project_id, metric_name, metric_value, metric_number in cursor.fetchall():
         try:
             # Convert numeric values
             if metric_name in ['total_lines', 'files_count', 'total_commits', 'total_files', 'functions', 'components', 'classes', 'code_files_changed', 'doc_files_changed', 'test_files_changed', 'word_count']:
-                metrics[project_id][metric_name] = int(metric_value) if metric_value else 0
+                if isinstance(metric_number, int):
+                    metrics[project_id][metric_name] = metric_number
+                else:
+                    metrics[project_id][metric_name] = int(metric_value) if metric_value else 0
             elif metric_name in ['avg_complexity', 'average_function_length', 'average_comment_ratio', 'completeness_score']:
-                metrics[project_id][metric_name] = float(metric_value) if metric_value else 0.0
+                if metric_number is not None:
+                    metrics[project_id][metric_name] = float(metric_number)
+                else:
+                    metrics[project_id][metric_name] = float(metric_value) if metric_value else 0.0
             elif metric_name in ['languages', 'roles', 'technical_keywords', 'authors', 'collaborators']:
                 # Parse JSON arrays
                 try:
@@ -195,9 +217,10 @@ def get_overview_stats(cursor: sqlite3.Cursor, project_ids: Optional[List[str]]
             SELECT metric_value 
             FROM DASHBOARD_DATA 
             WHERE project_id IN ({placeholders}) AND metric_name = 'languages'
+            ORDER BY id
         """, project_ids)
     else:
-        cursor.execute("SELECT metric_value FROM DASHBOARD_DATA WHERE metric_name = 'languages'")
+        cursor.execute("SELECT metric_value FROM DASHBOARD_DATA WHERE metric_name = 'languages' ORDER BY id")
     
     all_languages = set()
     for (lang_json,) in cursor.fetchall():
@@ -211,13 +234,13 @@ def get_overview_stats(cursor: sqlite3.Cursor, project_ids: Optional[List[str]]
     # Total lines of code
     if project_ids:
         cursor.execute(f"""
-            SELECT SUM(CAST(metric_value AS INTEGER)) 
+            SELECT SUM(CAST(COALESCE(metric_number, metric_value) AS INTEGER)) 
             FROM DASHBOARD_DATA 
             WHERE project_id IN ({placeholders}) AND metric_name = 'total_lines'
         """, project_ids)
     else:
         cursor.execute("""
-            SELECT SUM(CAST(metric_value AS INTEGER)) 
+            SELECT SUM(CAST(COALESCE(metric_number, metric_value) AS INTEGER)) 
             FROM DASHBOARD_DATA 
             WHERE metric_name = 'total_lines'
         """)
@@ -231,12 +254,17 @@ def get_overview_stats(cursor: sqlite3.Cursor, project_ids: Optional[List[str]]
         "total_lines": total_lines
     }
 
-def categorize_projects_by_type(cursor: sqlite3.Cursor, project_ids: List[str]) -> Dict[str, List[str]]:
-    """Categorize projects as GitHub or Local based on metrics."""
+def categorize_projects_by_type(
+    cursor: sqlite3.Cursor,
+    project_ids: List[str],
+    project_metrics: Optional[DefaultDict[str, Dict[str, Any]]] = None,
+) -> Dict[str, List[str]]:
+    """Categorize projects as GitHub or Local based on metrics (loaded unless given)."""
     github_projects = []
     local_projects = []
     
-    project_metrics = load_project_metrics(cursor)
+    if project_metrics is None:
+        project_metrics = load_project_metrics(cursor)
     
     for project_id in project_ids:
         metrics = project_metrics.get(project_id, {})
@@ -273,9 +301,10 @@ def get_language_distribution(cursor: sqlite3.Cursor, project_ids: Optional[List
             SELECT metric_value 
             FROM DASHBOARD_DATA 
             WHERE project_id IN ({placeholders}) AND metric_name = 'languages'
+            ORDER BY id
         """, project_ids)
     else:
-        cursor.execute("SELECT metric_value FROM DASHBOARD_DATA WHERE metric_name = 'languages'")
+        cursor.execute("SELECT metric_value FROM DASHBOARD_DATA WHERE metric_name = 'languages' ORDER BY id")
     
     language_count = defaultdict(int)
     for (lang_json,) in cursor.fetchall():
@@ -297,9 +326,10 @@ def get_project_complexity_distribution(cursor: sqlite3.Cursor, project_ids: Opt
             SELECT project_id, metric_value 
             FROM DASHBOARD_DATA 
             WHERE project_id IN ({placeholders}) AND metric_name = 'total_lines'
+            ORDER BY id
         """, project_ids)
     else:
-        cursor.execute("SELECT project_id, metric_value FROM DASHBOARD_DATA WHERE metric_name = 'total_lines'")
+        cursor.execute("SELECT project_id, metric_value FROM DASHBOARD_DATA WHERE metric_name = 'total_lines' ORDER BY id")
     
     size_distribution = {"small": 0, "medium": 0, "large": 0}
     project_sizes = []
@@ -544,16 +574,41 @@ def _try_live_extraction(
         return []
 
 
+def _resolve_collaborators(
+    project: Dict[str, Any],
+    user: Dict[str, Any],
+    cursor: Optional[sqlite3.Cursor] = None,
+) -> Any:
+    """Collaborators of one portfolio project.
+
+    Falls back to extracting collaborators from the git repo (if still on
+    disk) or from GIT_HISTORY when the ``collaborators`` DASHBOARD_DATA
+    metric is missing.
+    """
+    collaborators = project.get("metrics", {}).get("collaborators", [])
+    if not collaborators or not isinstance(collaborators, list):
+        # ---- Fallback 1: live extraction from git repo on disk ----
+        project_path = project.get("path", "")
+        collaborators = _try_live_extraction(project_path, user)
+
+        # ---- Fallback 2: derive from GIT_HISTORY table ----
+        if (not collaborators) and cursor:
+            collaborators = _extract_collaborators_from_git_history(
+                cursor, project.get("id", ""), user,
+            )
+    return collaborators
+
+
 def _build_collaboration_network(
     projects: List[Dict[str, Any]],
     user: Dict[str, Any],
     cursor: Optional[sqlite3.Cursor] = None,
+    collaborators_by_project: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Build a collaboration network graph from per-project collaborator data.
 
-    Falls back to extracting collaborators from the git repo (if still on
-    disk) or from GIT_HISTORY when the ``collaborators`` DASHBOARD_DATA
-    metric is missing.
+    Collaborators come from ``collaborators_by_project`` when given, else
+    from _resolve_collaborators() (with its git fallbacks).
 
     Returns:
         {
@@ -572,17 +627,10 @@ def _build_collaboration_network(
     primary_key = user.get("name") or user.get("github_user") or "You"
 
     for project in projects:
-        collaborators = project.get("metrics", {}).get("collaborators", [])
-        if not collaborators or not isinstance(collaborators, list):
-            # ---- Fallback 1: live extraction from git repo on disk ----
-            project_path = project.get("path", "")
-            collaborators = _try_live_extraction(project_path, user)
-
-            # ---- Fallback 2: derive from GIT_HISTORY table ----
-            if (not collaborators) and cursor:
-                collaborators = _extract_collaborators_from_git_history(
-                    cursor, project.get("id", ""), user,
-                )
+        if collaborators_by_project is not None:
+            collaborators = collaborators_by_project.get(project.get("id"), [])
+        else:
+            collaborators = _resolve_collaborators(project, user, cursor)
 
         if not collaborators or not isinstance(collaborators, list):
             continue
@@ -673,20 +721,173 @@ def _build_collaboration_network(
     return {"nodes": nodes, "edges": edges}
 
 
-def build_portfolio_model(project_ids: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Return assembled portfolio model built from the database.
-    If project_ids are provided, include only those projects.
+def _build_project_entry(
+    row: Tuple[str, str, float, str, str, int, Optional[float], Optional[str]],
+    metrics: Dict[str, Any],
+    project_skills: List[str],
+    project_summary: str,
+    stored_path: Optional[str],
+    thumbnail_path: Optional[str],
+) -> Dict[str, Any]:
+    """Return one project's entry in the portfolio model."""
+    pid, name, score, created_at, last_modified, score_overridden, score_overridden_value, score_override_exclusions = row
+    project_disk_path = stored_path or ""
+
+    try:
+        parsed_exclusions = json.loads(score_override_exclusions) if score_override_exclusions else []
+        if not isinstance(parsed_exclusions, list):
+            parsed_exclusions = []
+    except (json.JSONDecodeError, TypeError):
+        parsed_exclusions = []
+    
+    # Limit skills for display
+    limited_skills = limit_skills(project_skills, max_count=10)
+    
+    # Determine project type based on if we have commit data
+    is_github = metrics.get("total_commits", 0) > 0
+    
+    # Check for thumbnail
+    thumbnail_url = None
+    if thumbnail_path:
+        thumbnail_url = f"/api/portfolio/project/thumbnail/{pid}"
+    
+    # Extract detailed analysis data
+    complexity_analysis = metrics.get("complexity_analysis", {})
+    commit_patterns = metrics.get("commit_patterns", {})
+    development_patterns = metrics.get("development_patterns", {})
+    code_patterns = metrics.get("code_patterns", {})
+    contribution_activity = metrics.get("contribution_activity", {})
+    
+    return {
+        "id": pid,
+        "title": name,
+        "path": project_disk_path,
+        "score": float(score) if score else 0,
+        "rank": float(score) if score else 0,
+        "score_overridden": bool(score_overridden),
+        "score_overridden_value": float(score_overridden_value) if score_overridden_value is not None else None,
+        "score_override_exclusions": [m for m in parsed_exclusions if isinstance(m, str) and m.strip()],
+        "dates": format_dates(created_at, last_modified),
+        "created_at": created_at,
+        "last_modified": last_modified,
+        "type": "GitHub" if is_github else "Local",
+        "summary": project_summary,
+        "thumbnail_url": thumbnail_url,
+        "metrics": {
+            # Basic metrics
+            "total_lines": metrics.get("total_lines", 0),
+            "total_commits": metrics.get("total_commits", 0),
+            "total_files": metrics.get("total_files", 0),
+            "code_files_changed": metrics.get("code_files_changed", 0),
+            "doc_files_changed": metrics.get("doc_files_changed", 0),
+            "test_files_changed": metrics.get("test_files_changed", 0),
+            "functions": metrics.get("functions", 0),
+            "components": metrics.get("components", 0),
+            "classes": metrics.get("classes", 0),
+            "average_function_length": metrics.get("average_function_length", 0),
+            "average_comment_ratio": metrics.get("average_comment_ratio", 0),
+            "completeness_score": metrics.get("completeness_score", 0),
+            "word_count": metrics.get("word_count", 0),
+            # Lists/Arrays
+            "languages": metrics.get("languages", []),
+            "roles": metrics.get("roles", []),
+            "technical_keywords": metrics.get("technical_keywords", []),
+            "authors": metrics.get("authors", []),
+            "collaborators": metrics.get("collaborators", []),
+            # Complex analysis objects
+            "complexity_analysis": complexity_analysis,
+            "commit_patterns": commit_patterns,
+            "development_patterns": development_patterns,
+            "code_patterns": code_patterns,
+            "contribution_activity": contribution_activity,
+        },
+        "skills": limited_skills,
+        # Editable fields (for UI)
+        "editable": {
+            "rank": True,
+            "summary": True,
+            "dates": True
+        }
+    }
+
+
+def _load_project_entries(
+    cursor: sqlite3.Cursor,
+    projects_raw: List[Tuple[str, str, float, str, str, int, Optional[float], Optional[str]]],
+    skills_map: DefaultDict[str, List[str]],
+    user: Dict[str, Any],
+    use_cache: bool,
+) -> Tuple[Dict[str, Tuple[Dict[str, Any], Any]], Dict[str, Tuple[Dict[str, Any], Any]]]:
+    """Return (entry, collaborators) of every listed project, and the subset that was newly built.
+
+    Projects with a valid PORTFOLIO_PROJECT_CACHE row are not rebuilt; the
+    others load their metrics, summary, path and thumbnail in one query each.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    selected_ids = [pid for pid, *_ in projects_raw]
+    entries = portfolio_cache.load_project_entries(cursor, selected_ids) if use_cache else {}
+    missing = [row for row in projects_raw if row[0] not in entries]
+    built: Dict[str, Tuple[Dict[str, Any], Any]] = {}
+    if not missing:
+        return entries, built
+
+    missing_ids = [row[0] for row in missing]
+    # Large selections are read in one pass rather than through a huge IN clause
+    filter_ids = missing_ids if len(missing_ids) <= portfolio_cache.IN_CLAUSE_LIMIT else None
+    project_metrics = load_project_metrics(cursor, filter_ids)
+    project_summaries = load_project_summaries(cursor, filter_ids)
+
+    # Stored paths (live git fallback) and thumbnails, in one query instead of two per project
+    if filter_ids:
+        placeholders = ",".join(["?"] * len(filter_ids))
+        cursor.execute(f"""
+            SELECT project_signature, path, thumbnail_path
+            FROM PROJECT
+            WHERE project_signature IN ({placeholders})
+        """, filter_ids)
+    else:
+        cursor.execute("SELECT project_signature, path, thumbnail_path FROM PROJECT")
+    project_files = {pid: (path, thumbnail_path) for pid, path, thumbnail_path in cursor.fetchall()}
+
+    for row in missing:
+        pid = row[0]
+        stored_path, thumbnail_path = project_files.get(pid, (None, None))
+        entry = _build_project_entry(
+            row,
+            project_metrics.get(pid, {}),
+            skills_map.get(pid, []),
+            project_summaries.get(pid, ""),
+            stored_path,
+            thumbnail_path,
+        )
+        built[pid] = (entry, _resolve_collaborators(entry, user, cursor))
+    entries.update(built)
+    return entries, built
+
 
+def _assemble_portfolio_model(
+    cursor: sqlite3.Cursor,
+    project_ids: Optional[List[str]],
+    use_cache: bool,
+) -> Tuple[Dict[str, Any], Dict[str, Tuple[Dict[str, Any], Any]]]:
+    """Return the portfolio model read through `cursor`, and the project entries built for it."""
     user = load_user(cursor)
     projects_raw = load_projects_with_override(cursor, project_ids=project_ids)
     skills_map = load_skills(cursor)
     overview_stats = get_overview_stats(cursor, project_ids)
     skills_timeline = get_skills_timeline(cursor, project_ids)
-    project_metrics = load_project_metrics(cursor)
-    project_summaries = load_project_summaries(cursor, project_ids)
+    entries, built = _load_project_entries(cursor, projects_raw, skills_map, user, use_cache)
+    
+    projects = []
+    collaborators_by_project = {}
+    selected_ids = [pid for pid, *_ in projects_raw]
+    for pid in selected_ids:
+        entry, collaborators = entries[pid]
+        projects.append(entry)
+        collaborators_by_project[pid] = collaborators
+    # Commit counts are all the activity and type breakdowns need from the metrics
+    project_metrics = defaultdict(dict, {
+        p["id"]: {"total_commits": p["metrics"]["total_commits"]} for p in projects
+    })
     
     # New data for enhanced graphs
     language_distribution = get_language_distribution(cursor, project_ids)
@@ -695,101 +896,9 @@ def build_portfolio_model(project_ids: Optional[List[str]] = None) -> Dict[str,
     monthly_activity = get_monthly_activity(cursor, project_ids)
     daily_activity = get_daily_activity(cursor, projects_raw, project_metrics)
 
-    projects = []
-    selected_ids = [pid for pid, *_ in projects_raw]
-
-    for pid, name, score, created_at, last_modified, score_overridden, score_overridden_value, score_override_exclusions in projects_raw:
-        metrics = project_metrics.get(pid, {})
-        project_skills = skills_map.get(pid, [])
-        project_summary = project_summaries.get(pid, "")
-
-        # Fetch stored path for live git fallback
-        cursor.execute("SELECT path FROM PROJECT WHERE project_signature = ?", (pid,))
-        _path_row = cursor.fetchone()
-        project_disk_path = (_path_row[0] if _path_row else "") or ""
-
-        try:
-            parsed_exclusions = json.loads(score_override_exclusions) if score_override_exclusions else []
-            if not isinstance(parsed_exclusions, list):
-                parsed_exclusions = []
-        except (json.JSONDecodeError, TypeError):
-            parsed_exclusions = []
-        
-        # Limit skills for display
-        limited_skills = limit_skills(project_skills, max_count=10)
-        
-        # Determine project type based on if we have commit data
-        is_github = metrics.get("total_commits", 0) > 0
-        
-        # Check for thumbnail
-        thumbnail_url = None
-        cursor.execute("SELECT thumbnail_path FROM PROJECT WHERE project_signature = ?", (pid,))
-        thumbnail_row = cursor.fetchone()
-        if thumbnail_row and thumbnail_row[0]:
-            thumbnail_url = f"/api/portfolio/project/thumbnail/{pid}"
-        
-        # Extract detailed analysis data
-        complexity_analysis = metrics.get("complexity_analysis", {})
-        commit_patterns = metrics.get("commit_patterns", {})
-        development_patterns = metrics.get("development_patterns", {})
-        code_patterns = metrics.get("code_patterns", {})
-        contribution_activity = metrics.get("contribution_activity", {})
-        
-        projects.append({
-            "id": pid,
-            "title": name,
-            "path": project_disk_path,
-            "score": float(score) if score else 0,
-            "rank": float(score) if score else 0,
-            "score_overridden": bool(score_overridden),
-            "score_overridden_value": float(score_overridden_value) if score_overridden_value is not None else None,
-            "score_override_exclusions": [m for m in parsed_exclusions if isinstance(m, str) and m.strip()],
-            "dates": format_dates(created_at, last_modified),
-            "created_at": created_at,
-            "last_modified": last_modified,
-            "type": "GitHub" if is_github else "Local",
-            "summary": project_summary,
-            "thumbnail_url": thumbnail_url,
-            "metrics": {
-                # Basic metrics
-                "total_lines": metrics.get("total_lines", 0),
-                "total_commits": metrics.get("total_commits", 0),
-                "total_files": metrics.get("total_files", 0),
-                "code_files_changed": metrics.get("code_files_changed", 0),
-                "doc_files_changed": metrics.get("doc_files_changed", 0),
-                "test_files_changed": metrics.get("test_files_changed", 0),
-                "functions": metrics.get("functions", 0),
-                "components": metrics.get("components", 0),
-                "classes": metrics.get("classes", 0),
-                "average_function_length": metrics.get("average_function_length", 0),
-                "average_comment_ratio": metrics.get("average_comment_ratio", 0),
-                "completeness_score": metrics.get("completeness_score", 0),
-                "word_count": metrics.get("word_count", 0),
-                # Lists/Arrays
-                "languages": metrics.get("languages", []),
-                "roles": metrics.get("roles", []),
-                "technical_keywords": metrics.get("technical_keywords", []),
-                "authors": metrics.get("authors", []),
-                "collaborators": metrics.get("collaborators", []),
-                # Complex analysis objects
-                "complexity_analysis": complexity_analysis,
-                "commit_patterns": commit_patterns,
-                "development_patterns": development_patterns,
-                "code_patterns": code_patterns,
-                "contribution_activity": contribution_activity,
-            },
-            "skills": limited_skills,
-            # Editable fields (for UI)
-            "editable": {
-                "rank": True,
-                "summary": True,
-                "dates": True
-            }
-        })
-
     # Calculate project type analysis if projects selected
     if selected_ids:
-        project_type_analysis = categorize_projects_by_type(cursor, selected_ids)
+        project_type_analysis = categorize_projects_by_type(cursor, selected_ids, project_metrics)
         
         # Calculate stats for each type
         github_stats = {}
@@ -799,7 +908,7 @@ def build_portfolio_model(project_ids: Optional[List[str]] = None) -> Dict[str,
             github_stats = get_overview_stats(cursor, project_type_analysis["github"])
             # Add GitHub-specific metrics
             cursor.execute(f"""
-                SELECT AVG(CAST(metric_value AS INTEGER))
+                SELECT AVG(CAST(COALESCE(metric_number, metric_value) AS INTEGER))
                 FROM DASHBOARD_DATA 
                 WHERE project_id IN ({",".join(["?"] * len(project_type_analysis["github"]))}) 
                 AND metric_name = 'total_commits'
@@ -810,7 +919,7 @@ def build_portfolio_model(project_ids: Optional[List[str]] = None) -> Dict[str,
             local_stats = get_overview_stats(cursor, project_type_analysis["local"])
             # Add local-specific metrics  
             cursor.execute(f"""
-                SELECT AVG(CAST(metric_value AS FLOAT))
+                SELECT AVG(CAST(COALESCE(metric_number, metric_value) AS FLOAT))
                 FROM DASHBOARD_DATA 
                 WHERE project_id IN ({",".join(["?"] * len(project_type_analysis["local"]))}) 
                 AND metric_name = 'completeness_score'
@@ -820,13 +929,17 @@ def build_portfolio_model(project_ids: Optional[List[str]] = None) -> Dict[str,
         project_type_analysis = {"github": [], "local": []}
         github_stats = local_stats = {}
 
-    # Build collaboration network from per-project collaborator data
-    # (before closing conn so cursor is still usable for fallback queries)
-    collaboration_network = _build_collaboration_network(projects, user, cursor)
+    # Number of selected projects using each skill, for the top skills graph
+    skill_project_counts = Counter(
+        skill for p in projects for skill in set(skills_map.get(p["id"], []))
+    )
 
-    conn.close()
+    # Build collaboration network from per-project collaborator data
+    collaboration_network = _build_collaboration_network(
+        projects, user, cursor, collaborators_by_project=collaborators_by_project,
+    )
 
-    return {
+    model = {
         "user": user,
         "overview": overview_stats,
         "projects": projects,
@@ -848,10 +961,10 @@ def build_portfolio_model(project_ids: Optional[List[str]] = None) -> Dict[str,
             "score_distribution": score_distribution,
             "monthly_activity": monthly_activity,
             "daily_activity": daily_activity,
-            "top_skills": dict(list(defaultdict(int, {
-                skill: len([p for p in projects if skill in skills_map.get(p["id"], [])])
+            "top_skills": dict(list({
+                skill: skill_project_counts[skill]
                 for skill in set(skill for project_skills in skills_map.values() for skill in project_skills)
-            }).items())[:10])  # Top 10 most used skills
+            }.items())[:10])  # Top 10 most used skills
         },
         "metadata": {
             "generated_at": datetime.now().isoformat(),
@@ -860,3 +973,48 @@ def build_portfolio_model(project_ids: Optional[List[str]] = None) -> Dict[str,
             "project_ids": project_ids or []
         }
     }
+    return model, built
+
+
+def build_portfolio_model(project_ids: Optional[List[str]] = None, use_cache: bool = True) -> Dict[str, Any]:
+    """Return assembled portfolio model built from the database.
+    If project_ids are provided, include only those projects.
+
+    The model is materialized (see portfolio_cache.py): it is read from
+    PORTFOLIO_CACHE until a write to the rows it was built from invalidates
+    it, and a rebuild reuses the unchanged projects' entries. metadata.generated_at
+    is when the returned model was assembled. use_cache=False rebuilds
+    everything without reading or storing the cache.
+    """
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        key = portfolio_cache.selection_key(project_ids)
+        if use_cache:
+            cached = portfolio_cache.load_model(cursor, key)
+            if cached is not None:
+                return cached
+
+        # Read everything from one snapshot, so the model matches the version it is stored under
+        owns_transaction = not conn.in_transaction
+        if owns_transaction:
+            conn.execute("BEGIN")
+        version = portfolio_cache.cache_version(cursor)
+        model, built = _assemble_portfolio_model(cursor, project_ids, use_cache)
+        if owns_transaction:
+            conn.commit()
+
+        model_json = json.dumps(model)
+        if use_cache:
+            try:
+                portfolio_cache.store(conn, version, key, model_json, built)
+                if owns_transaction:
+                    conn.commit()
+            except sqlite3.Error as e:
+                if owns_transaction:
+                    conn.rollback()
+                logger.warning("Could not store the portfolio model: %s", e)
+        # Decoded like a cache read, so repeat requests return identical data
+        return json.loads(model_json)
+    finally:
+        conn.close()
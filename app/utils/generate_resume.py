@@ -259,6 +259,7 @@ def load_skills(cursor: sqlite3.Cursor) -> DefaultDict[int, List[str]]:
     cursor.execute("""
         SELECT skill, project_id
         FROM SKILL_ANALYSIS
+        ORDER BY rowid
     """)
     skills_by_project = defaultdict(list)
 
@@ -0,0 +1,198 @@
+"""
+Persistent per-repository commit aggregates for incremental git re-analysis.
+
+A re-uploaded repository usually differs from the stored copy by a handful of
+new commits. Each row of GIT_AGGREGATE_CACHE remembers, for one repository and
+one author identity, the ref tips that were analysed and the mergeable
+aggregate states used by aggregate_github_individual_metrics /
+analyze_github_development_patterns.
+On the next run only `git rev-list <new tips> ^<old tips>` is extracted and
+folded into the stored aggregates.
+
+Repositories are identified by their root commit(s), so the same history
+extracted into a different upload directory maps to the same row. The commit
+records live in GIT_AGGREGATE_COMMIT, one row per commit, so an incremental
+run only inserts the new ones.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Set, Union
+
+from app.data.db import get_connection, unit_of_work
+
+# Bump when the shape of cached commit records or aggregate states changes.
+GIT_AGGREGATE_CACHE_VERSION = 1
+
+
+def get_repo_identity(repo) -> Optional[str]:
+    """
+    Stable identity for a repository: a hash of its sorted root commit hashes.
+    Returns None for empty repositories or on git errors.
+    """
+    try:
+        roots = sorted(set(repo.git.rev_list("--max-parents=0", "--all").split()))
+    except Exception:
+        return None
+    if not roots:
+        return None
+    return hashlib.sha1(",".join(roots).encode("utf-8")).hexdigest()
+
+
+def get_ref_tips(repo) -> List[str]:
+    """Sorted commit hashes pointed to by every ref and HEAD (annotated tags peeled)."""
+    try:
+        return sorted(set(repo.git.rev_list("--no-walk", "--all").split()))
+    except Exception:
+        return []
+
+
+def author_cache_key(author: Union[str, List[str]], include_merges: bool = False) -> str:
+    """Cache key for the author identifiers a run filtered on."""
+    identifiers = [author] if isinstance(author, str) else list(author or [])
+    normalized = sorted({(a or "").strip().lower() for a in identifiers if a and a.strip()})
+    return f"v{GIT_AGGREGATE_CACHE_VERSION}|merges={int(bool(include_merges))}|" + "|".join(normalized)
+
+
+def list_new_commits(repo, new_tips: List[str], old_tips: List[str]) -> Optional[Set[str]]:
+    """
+    Commits reachable from `new_tips` but not from `old_tips`.
+
+    Returns None when the stored aggregates cannot be extended: some previously
+    analysed commit is no longer reachable (history rewritten, branch deleted)
+    or an old tip is unknown to this clone.
+    """
+    if not old_tips:
+        return None
+    try:
+        dropped = repo.git.rev_list("--count", *old_tips, *[f"^{t}" for t in new_tips])
+        if int(dropped.strip() or 0) != 0:
+            return None
+        if not new_tips:
+            return set()
+        out = repo.git.rev_list(*new_tips, *[f"^{t}" for t in old_tips])
+    except Exception:
+        return None
+    return set(out.split())
+
+
+def compact_commit_record(commit: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a commit record without per-file patch text, for storage."""
+    record = dict(commit)
+    record["files"] = [
+        {k: v for k, v in f.items() if k != "patch"} for f in commit.get("files", [])
+    ]
+    return record
+
+
+def load_git_aggregates(repo_key: str, author_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the stored aggregates for (repo_key, author_key).
+    Returns {"ref_tips", "commits", "metrics", "patterns", "extraction"} or None;
+    "commits" are in git log order (newest first).
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            """
+            SELECT ref_tips, metrics_state, patterns_state
+            FROM GIT_AGGREGATE_CACHE
+            WHERE repo_key = ? AND author_key = ?
+            """,
+            (repo_key, author_key),
+        ).fetchone()
+        records = conn.execute(
+            """
+            SELECT record FROM GIT_AGGREGATE_COMMIT
+            WHERE repo_key = ? AND author_key = ?
+            ORDER BY seq DESC
+            """,
+            (repo_key, author_key),
+        ).fetchall() if row else []
+    except Exception:
+        return None
+    finally:
+        conn.close()
+
+    if not row:
+        return None
+    try:
+        metrics = json.loads(row[1])
+        return {
+            "ref_tips": json.loads(row[0]),
+            "commits": [json.loads(record) for (record,) in records],
+            "metrics": metrics,
+            "patterns": json.loads(row[2]),
+            "extraction": metrics.pop("extraction", None),
+        }
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def save_git_aggregates(
+    repo_key: str,
+    author_key: str,
+    ref_tips: List[str],
+    commits: List[Dict[str, Any]],
+    metrics_state: Dict[str, Any],
+    patterns_state: Dict[str, Any],
+    extraction: Optional[Dict[str, Any]] = None,
+    append: bool = False,
+) -> None:
+    """
+    Store the aggregates for (repo_key, author_key) in one transaction.
+
+    `commits` (git log order, newest first) replace the stored commit
+    records, or with append=True are added ahead of them: an incremental run
+    passes only its new commits, so the write does not grow with the history.
+    `extraction` (the GitBudget report, if anything was limited) is kept
+    alongside the metrics state.
+    """
+    if extraction:
+        metrics_state = {**metrics_state, "extraction": extraction}
+    with unit_of_work() as conn:
+        conn.execute(
+            """
+            INSERT INTO GIT_AGGREGATE_CACHE
+                (repo_key, author_key, ref_tips, metrics_state, patterns_state, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(repo_key, author_key) DO UPDATE SET
+                ref_tips = excluded.ref_tips,
+                metrics_state = excluded.metrics_state,
+                patterns_state = excluded.patterns_state,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (
+                repo_key,
+                author_key,
+                json.dumps(ref_tips),
+                json.dumps(metrics_state),
+                json.dumps(patterns_state),
+            ),
+        )
+        if append:
+            last_seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM GIT_AGGREGATE_COMMIT WHERE repo_key = ? AND author_key = ?",
+                (repo_key, author_key),
+            ).fetchone()[0]
+        else:
+            conn.execute(
+                "DELETE FROM GIT_AGGREGATE_COMMIT WHERE repo_key = ? AND author_key = ?",
+                (repo_key, author_key),
+            )
+            last_seq = 0
+        rows = []
+        for offset, commit in enumerate(reversed(commits), start=1):
+            seq = last_seq + offset
+            record = compact_commit_record(commit)
+            rows.append((repo_key, author_key, str(record.get("hash") or f"seq:{seq}"), seq, json.dumps(record)))
+        conn.executemany(
+            """
+            INSERT INTO GIT_AGGREGATE_COMMIT (repo_key, author_key, hexsha, seq, record)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(repo_key, author_key, hexsha) DO UPDATE SET
+                seq = excluded.seq,
+                record = excluded.record
+            """,
+            rows,
+        )
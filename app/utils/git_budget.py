@@ -0,0 +1,180 @@
+"""
+Budgets that bound the cost of extracting an author's git history.
+
+A vendored dependency or generated file committed in one go produces a patch
+of many megabytes, and a long-lived repository tens of thousands of author
+commits; every patch used to be decoded and lexed in full. A GitBudget caps
+that work for one extraction:
+
+- GIT_MAX_FILE_PATCH_BYTES: patch text per file that is decoded and used
+  for language detection; the rest is cut off.
+- GIT_MAX_COMMIT_PATCH_BYTES: patch text per commit; later files of the
+  commit are recorded from their paths alone.
+- GIT_MAX_HISTORY_PATCH_BYTES: patch text for the whole extraction; later
+  files are recorded from their paths alone.
+- GIT_MAX_COMMIT_CHANGED_LINES: a commit whose line stats exceed this is
+  diffed without patch text at all, so git never produces the patch.
+- GIT_MAX_SAMPLED_COMMITS: an author with more commits is analysed from a
+  sample stratified over time, so every period of the history is represented.
+
+0 disables a limit. The defaults are far above what hand-written commits
+and typical projects produce, so their results are unchanged; report() says
+what was limited when something was.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+GIT_MAX_FILE_PATCH_BYTES_ENV = "GIT_MAX_FILE_PATCH_BYTES"
+DEFAULT_GIT_MAX_FILE_PATCH_BYTES = 256 * 1024
+GIT_MAX_COMMIT_PATCH_BYTES_ENV = "GIT_MAX_COMMIT_PATCH_BYTES"
+DEFAULT_GIT_MAX_COMMIT_PATCH_BYTES = 2 * 1024 * 1024
+GIT_MAX_HISTORY_PATCH_BYTES_ENV = "GIT_MAX_HISTORY_PATCH_BYTES"
+DEFAULT_GIT_MAX_HISTORY_PATCH_BYTES = 256 * 1024 * 1024
+GIT_MAX_COMMIT_CHANGED_LINES_ENV = "GIT_MAX_COMMIT_CHANGED_LINES"
+DEFAULT_GIT_MAX_COMMIT_CHANGED_LINES = 50_000
+GIT_MAX_SAMPLED_COMMITS_ENV = "GIT_MAX_SAMPLED_COMMITS"
+DEFAULT_GIT_MAX_SAMPLED_COMMITS = 5_000
+
+# Time strata a sampled history is split into.
+SAMPLE_STRATA = 24
+
+_REPORT_COUNTERS = (
+    "commits_available",
+    "commits_sampled",
+    "commits_without_patch",
+    "files_truncated",
+    "files_without_patch",
+)
+
+
+def _env_limit(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def stratified_sample(items: Sequence[Any], timestamps: Sequence[int], k: int, strata: int = SAMPLE_STRATA) -> List[Any]:
+    """
+    Up to `k` of `items`, spread over time: the span of `timestamps` is cut
+    into equal-width strata, each non-empty stratum gets at least one item
+    and the rest are allocated in proportion to stratum size, evenly spaced
+    within the stratum. The chosen items keep their original order.
+    """
+    n = len(items)
+    if k <= 0 or n <= k:
+        return list(items)
+    lo, hi = min(timestamps), max(timestamps)
+    width = (hi - lo) / strata or 1
+    buckets: List[List[int]] = [[] for _ in range(strata)]
+    for pos in sorted(range(n), key=lambda p: (timestamps[p], p)):
+        buckets[min(strata - 1, int((timestamps[pos] - lo) / width))].append(pos)
+    buckets = [b for b in buckets if b]
+
+    if k < len(buckets):
+        # Fewer picks than periods: one each from evenly spaced periods.
+        buckets = [buckets[int((j + 0.5) * len(buckets) / k)] for j in range(k)]
+        counts = [1] * k
+    else:
+        quotas = [k * len(b) / n for b in buckets]
+        counts = [min(len(b), max(1, int(q))) for b, q in zip(buckets, quotas)]
+        # Hand out what is left by largest remainder, then trim any excess from the largest.
+        by_remainder = sorted(range(len(buckets)), key=lambda i: quotas[i] - int(quotas[i]), reverse=True)
+        while sum(counts) < k:
+            grew = False
+            for i in by_remainder:
+                if sum(counts) < k and counts[i] < len(buckets[i]):
+                    counts[i] += 1
+                    grew = True
+            if not grew:
+                break
+        while sum(counts) > k:
+            counts[max(range(len(counts)), key=lambda i: counts[i])] -= 1
+
+    chosen = []
+    for bucket, count in zip(buckets, counts):
+        chosen.extend(bucket[int((j + 0.5) * len(bucket) / count)] for j in range(count))
+    return [items[pos] for pos in sorted(chosen)]
+
+
+class GitBudget:
+    """Limits and usage for one history extraction, which may span several repositories."""
+
+    def __init__(
+        self,
+        max_file_bytes: Optional[int] = None,
+        max_commit_bytes: Optional[int] = None,
+        max_history_bytes: Optional[int] = None,
+        max_commit_lines: Optional[int] = None,
+        max_commits: Optional[int] = None,
+    ):
+        def limit(value, env_name, default):
+            return _env_limit(env_name, default) if value is None else max(0, int(value))
+
+        self.max_file_bytes = limit(max_file_bytes, GIT_MAX_FILE_PATCH_BYTES_ENV, DEFAULT_GIT_MAX_FILE_PATCH_BYTES)
+        self.max_commit_bytes = limit(max_commit_bytes, GIT_MAX_COMMIT_PATCH_BYTES_ENV, DEFAULT_GIT_MAX_COMMIT_PATCH_BYTES)
+        self.max_history_bytes = limit(max_history_bytes, GIT_MAX_HISTORY_PATCH_BYTES_ENV, DEFAULT_GIT_MAX_HISTORY_PATCH_BYTES)
+        self.max_commit_lines = limit(max_commit_lines, GIT_MAX_COMMIT_CHANGED_LINES_ENV, DEFAULT_GIT_MAX_COMMIT_CHANGED_LINES)
+        self.max_commits = limit(max_commits, GIT_MAX_SAMPLED_COMMITS_ENV, DEFAULT_GIT_MAX_SAMPLED_COMMITS)
+        self.patch_bytes = 0
+        self._commit_bytes = 0
+        self.counters = dict.fromkeys(_REPORT_COUNTERS, 0)
+
+    def select(self, items: Sequence[Any], timestamps: Sequence[int]) -> List[Any]:
+        """The commits to analyse out of `items`, sampled when there are more than max_commits."""
+        self.counters["commits_available"] += len(items)
+        chosen = stratified_sample(items, timestamps, self.max_commits)
+        self.counters["commits_sampled"] += len(chosen)
+        return chosen
+
+    def start_commit(self, stats: Dict[str, Dict[str, int]]) -> bool:
+        """Begin a commit; returns False when its patch should not be produced at all."""
+        self._commit_bytes = 0
+        if self.max_commit_lines:
+            lines = sum(s.get("insertions", 0) + s.get("deletions", 0) for s in stats.values())
+            if lines > self.max_commit_lines:
+                self.counters["commits_without_patch"] += 1
+                return False
+        return True
+
+    def exhausted(self) -> bool:
+        """Whether the history budget leaves no patch text for further files."""
+        return bool(self.max_history_bytes) and self.patch_bytes >= self.max_history_bytes
+
+    def take(self, size: int) -> int:
+        """Bytes of a `size`-byte patch to process, charged to the commit and history budgets."""
+        allowed = size
+        if self.max_file_bytes:
+            allowed = min(allowed, self.max_file_bytes)
+        if self.max_commit_bytes:
+            allowed = min(allowed, max(0, self.max_commit_bytes - self._commit_bytes))
+        if self.max_history_bytes:
+            allowed = min(allowed, max(0, self.max_history_bytes - self.patch_bytes))
+        self._commit_bytes += allowed
+        self.patch_bytes += allowed
+        if allowed < size:
+            self.counters["files_truncated" if allowed else "files_without_patch"] += 1
+        return allowed
+
+    def report(self) -> Optional[Dict[str, Any]]:
+        """What was limited, or None when every commit and patch was processed in full."""
+        return _report(self.counters)
+
+
+def _report(counters: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    sampled = counters["commits_sampled"] < counters["commits_available"]
+    if not sampled and not any(
+        counters[name] for name in ("commits_without_patch", "files_truncated", "files_without_patch")
+    ):
+        return None
+    return {"sampled": sampled, **counters}
+
+
+def merge_reports(*reports: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Combine the reports (or GitBudget.counters) of extractions whose commits
+    were merged, e.g. incremental runs; None when none of them was limited.
+    """
+    reports = [r for r in reports if r]
+    return _report({name: sum(r.get(name, 0) for r in reports) for name in _REPORT_COUNTERS})
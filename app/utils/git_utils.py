@@ -1,10 +1,12 @@
 from git import NULL_TREE, InvalidGitRepositoryError, NoSuchPathError, Repo, GitCommandError
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 from datetime import datetime
-import os, json, re, requests
+from array import array
+import os, json, re, requests, sys
 from urllib.parse import quote
-from pygments.lexers import guess_lexer, guess_lexer_for_filename
+from app.utils.git_budget import GitBudget
+from app.utils.lexers import guess_lexer, guess_lexer_for_filename
 from pygments.util import ClassNotFound
 
 
@@ -94,31 +96,7 @@ def author_matches(commit, author: Union[str, List[str]]) -> bool:
     a = commit.author
     if not a:
         return False
-
-    identifiers = _normalize_author_identifiers(author)
-    if not identifiers:
-        return False
-
-    author_name = (a.name or "").strip()
-    author_email = (a.email or "").strip()
-    author_name_folded = author_name.casefold()
-    author_email_folded = author_email.casefold()
-
-    for ident in identifiers:
-        ident_folded = ident.casefold()
-        if author_name_folded == ident_folded or author_email_folded == ident_folded:
-            return True
-
-    noreply_username = _extract_github_noreply_username(author_email)
-    if noreply_username:
-        noreply_folded = noreply_username.casefold()
-        for ident in identifiers:
-            if "@" in ident:
-                continue
-            if noreply_folded == ident.casefold():
-                return True
-
-    return False
+    return identity_matches(a.name or "", a.email or "", author)
 
 def extract_files_changed(path: Union[str, Path], author: str, branches=True) -> int:
     """Returns the total number of files changed by the author in all branches."""
@@ -226,7 +204,229 @@ def _canonical_author_key(author_name: str, author_email: str) -> Optional[str]:
         return f"name:{name.casefold()}"
     return None
 
-def is_collaborative(path: Union[str, Path], author_aliases: Optional[List[str]] = None) -> bool:
+def identity_matches(author_name: str, author_email: str, author: Union[str, List[str]]) -> bool:
+    """Return True if a raw (name, email) pair matches the given author identifier(s).
+
+    Same rules as author_matches(), but usable without a GitPython commit object.
+    """
+    identifiers = _normalize_author_identifiers(author)
+    if not identifiers:
+        return False
+
+    author_name_folded = (author_name or "").strip().casefold()
+    author_email_folded = (author_email or "").strip().casefold()
+
+    for ident in identifiers:
+        ident_folded = ident.casefold()
+        if author_name_folded == ident_folded or author_email_folded == ident_folded:
+            return True
+
+    noreply_username = _extract_github_noreply_username((author_email or "").strip())
+    if noreply_username:
+        noreply_folded = noreply_username.casefold()
+        for ident in identifiers:
+            if "@" in ident:
+                continue
+            if noreply_folded == ident.casefold():
+                return True
+
+    return False
+
+# Field/record separators used in the `git log` format below. The header ends at the
+# first NUL (because of -z), followed by the NUL-terminated numstat entries.
+_LOG_RECORD_SEP = "\x1e"
+_LOG_FIELD_SEP = "\x1f"
+_LOG_FORMAT = _LOG_RECORD_SEP + _LOG_FIELD_SEP.join(["%H", "%P", "%an", "%ae", "%at", "%ct"])
+
+class GitHistoryIndex:
+    """
+    Compact, in-memory index of a repository's full commit history (all refs).
+
+    Built once per analysis from a single `git log --all --numstat` stream, so every
+    stage (collaboration check, contributors, non-code metadata, commit extraction,
+    skill dates) can query history without re-walking it or spawning one
+    `commit.stats` subprocess per commit.
+
+    Commits are stored in `git log` order (newest first, same as
+    `repo.iter_commits(rev="--all")`). Per-commit values live in parallel arrays;
+    commit i's files are the slice file_offsets[i]:file_offsets[i + 1] of the
+    file_* arrays. Paths and authors are interned and referenced by integer id.
+    File stats follow GitPython's `commit.stats` semantics: diff against the first
+    parent, no rename detection, binary files counted as 0 lines.
+    """
+
+    __slots__ = (
+        "repo_root",
+        "hexshas",
+        "parent_counts",
+        "author_ids",
+        "authored_dates",
+        "committed_dates",
+        "authors",
+        "paths",
+        "file_offsets",
+        "file_path_ids",
+        "file_insertions",
+        "file_deletions",
+    )
+
+    def __init__(self, repo_root: Union[str, Path]):
+        self.repo_root = Path(repo_root)
+        self.hexshas: List[str] = []
+        self.parent_counts = array("B")
+        self.author_ids = array("I")
+        self.authored_dates = array("q")
+        self.committed_dates = array("q")
+        self.authors: List[Tuple[str, str]] = []
+        self.paths: List[str] = []
+        self.file_offsets = array("I", [0])
+        self.file_path_ids = array("I")
+        self.file_insertions = array("I")
+        self.file_deletions = array("I")
+
+    def __len__(self) -> int:
+        return len(self.hexshas)
+
+    @classmethod
+    def from_log_output(cls, repo_root: Union[str, Path], raw: str) -> "GitHistoryIndex":
+        """Parse the output of `git log` run with _LOG_FORMAT, -z and --numstat."""
+        index = cls(repo_root)
+        author_lookup: Dict[Tuple[str, str], int] = {}
+        path_lookup: Dict[str, int] = {}
+
+        for record in raw.split(_LOG_RECORD_SEP):
+            if not record:
+                continue
+            header, _, body = record.partition("\0")
+            fields = header.split(_LOG_FIELD_SEP)
+            if len(fields) != 6:
+                continue
+            hexsha, parents, name, email, authored, committed = fields
+
+            author_key = (name, email)
+            author_id = author_lookup.get(author_key)
+            if author_id is None:
+                author_id = author_lookup[author_key] = len(index.authors)
+                index.authors.append(author_key)
+
+            index.hexshas.append(hexsha)
+            index.parent_counts.append(min(len(parents.split()), 255))
+            index.author_ids.append(author_id)
+            index.authored_dates.append(int(authored or 0))
+            index.committed_dates.append(int(committed or 0))
+
+            for entry in body.lstrip("\n").split("\0"):
+                if not entry:
+                    continue
+                parts = entry.split("\t", 2)
+                if len(parts) != 3:
+                    continue
+                insertions, deletions, file_path = parts
+                path_id = path_lookup.get(file_path)
+                if path_id is None:
+                    path_id = path_lookup[file_path] = len(index.paths)
+                    index.paths.append(file_path)
+                index.file_path_ids.append(path_id)
+                # Binary files report "-"; commit.stats counts them as 0.
+                index.file_insertions.append(int(insertions) if insertions.isdigit() else 0)
+                index.file_deletions.append(int(deletions) if deletions.isdigit() else 0)
+
+            index.file_offsets.append(len(index.file_path_ids))
+
+        return index
+
+    def author(self, i: int) -> Tuple[str, str]:
+        """Return the (name, email) of commit i's author."""
+        return self.authors[self.author_ids[i]]
+
+    def is_merge(self, i: int) -> bool:
+        return self.parent_counts[i] > 1
+
+    def files(self, i: int) -> List[Tuple[str, int, int]]:
+        """Return [(path, insertions, deletions), ...] for commit i."""
+        start, end = self.file_offsets[i], self.file_offsets[i + 1]
+        return [
+            (self.paths[self.file_path_ids[j]], self.file_insertions[j], self.file_deletions[j])
+            for j in range(start, end)
+        ]
+
+    def file_stats(self, i: int) -> Dict[str, Dict[str, int]]:
+        """Return commit i's per-file stats in the same shape as `commit.stats.files`."""
+        return {
+            path: {"insertions": added, "deletions": deleted, "lines": added + deleted}
+            for path, added, deleted in self.files(i)
+        }
+
+    def matching_author_ids(self, author: Union[str, List[str], None]) -> Set[int]:
+        """Return the ids of all interned authors matching the given identifier(s)."""
+        if not author:
+            return set()
+        return {
+            author_id
+            for author_id, (name, email) in enumerate(self.authors)
+            if identity_matches(name, email, author)
+        }
+
+    def commits_by_author(
+        self,
+        author: Union[str, List[str]],
+        include_merges: bool = True,
+    ) -> List[int]:
+        """Return indices (newest first) of commits whose author matches `author`."""
+        author_id_set = self.matching_author_ids(author)
+        if not author_id_set:
+            return []
+        return [
+            i for i, author_id in enumerate(self.author_ids)
+            if author_id in author_id_set and (include_merges or self.parent_counts[i] <= 1)
+        ]
+
+    def author_keys(self, author_aliases: Optional[List[str]] = None) -> List[Optional[str]]:
+        """
+        Return a logical author key for every interned author, in author-id order.
+
+        Authors matching `author_aliases` collapse into "__primary__"; everyone else
+        uses _canonical_author_key(). None means the author has no usable identity.
+        """
+        aliases = _normalize_author_identifiers(author_aliases) if author_aliases else []
+        keys: List[Optional[str]] = []
+        for name, email in self.authors:
+            if aliases and identity_matches(name, email, aliases):
+                keys.append("__primary__")
+            else:
+                keys.append(_canonical_author_key(name, email))
+        return keys
+
+def build_git_history_index(path: Union[str, Path]) -> Optional[GitHistoryIndex]:
+    """
+    Build a GitHistoryIndex for the repository containing `path` with a single
+    `git log --all --numstat` call.
+
+    Returns None if the path is not a git repository or git fails; callers then
+    fall back to walking history through GitPython.
+    """
+    try:
+        repo = get_repo(path)
+        repo_root = Path(repo.working_tree_dir or path)
+        if not repo.head.is_valid():
+            return GitHistoryIndex(repo_root)
+        raw = repo.git.log(
+            "--all",
+            "--numstat",
+            "--no-renames",
+            "--diff-merges=first-parent",
+            "-z",
+            f"--format={_LOG_FORMAT}",
+        )
+    except Exception:
+        return None
+    return GitHistoryIndex.from_log_output(repo_root, raw)
+
+def is_collaborative(
+    path: Union[str, Path],
+    author_aliases: Optional[List[str]] = None,
+    history: Optional[GitHistoryIndex] = None,
+) -> bool:
     """
     Determines if a Git repository is a collaborative project.
     A repository is considered collaborative if it has commits from
@@ -234,7 +434,13 @@ def is_collaborative(path: Union[str, Path], author_aliases: Optional[List[str]]
 
     author_aliases allows collapsing multiple identifiers that represent
     the same person (e.g., real email + GitHub username) into one author.
+
+    If a prebuilt GitHistoryIndex is passed as `history`, it is queried instead
+    of walking the commit history again.
     """
+    if history is not None:
+        return len({key for key in history.author_keys(author_aliases) if key}) > 1
+
     try:
         repo = get_repo(path)
         aliases = _normalize_author_identifiers(author_aliases) if author_aliases else []
@@ -271,6 +477,7 @@ def is_collaborative(path: Union[str, Path], author_aliases: Optional[List[str]]
 def extract_all_contributors(
     path: Union[str, Path],
     author_aliases: Optional[List[str]] = None,
+    history: Optional[GitHistoryIndex] = None,
 ) -> List[Dict[str, Any]]:
     """
     Extract all unique contributors from a Git repository.
@@ -280,8 +487,27 @@ def extract_all_contributors(
 
     The primary user's aliases are collapsed under ``is_primary=True``.
     Other contributors are de-duplicated using the same canonical-key logic
-    used by ``is_collaborative()``.
+    used by ``is_collaborative()``. Pass a prebuilt GitHistoryIndex as
+    ``history`` to avoid walking the commit history again.
     """
+    if history is not None:
+        author_keys = history.author_keys(author_aliases)
+        indexed: Dict[str, Dict[str, Any]] = {}
+        for author_id in history.author_ids:
+            key = author_keys[author_id]
+            if not key:
+                continue
+            if key not in indexed:
+                name, email = history.authors[author_id]
+                indexed[key] = {
+                    "name": name,
+                    "email": email,
+                    "commits": 0,
+                    "is_primary": key == "__primary__",
+                }
+            indexed[key]["commits"] += 1
+        return list(indexed.values())
+
     try:
         repo = get_repo(path)
     except (ValueError, GitCommandError, PermissionError, Exception):
@@ -327,75 +553,146 @@ def extract_all_contributors(
 
     return list(contributors.values())
 
-def extract_code_commit_content_by_author(
+def _iter_author_commits(
+    repo,
+    author: Union[str, List[str]],
+    include_merges: bool,
+    history: Optional[GitHistoryIndex] = None,
+    wanted: Optional[Any] = None,
+    only_commits: Optional[Set[str]] = None,
+    select: Optional[Callable[[List[Any], List[int]], List[Any]]] = None,
+):
+    """
+    Yield (commit, is_merge, get_stats) for every commit by `author` across all refs.
+    `only_commits`, if given, restricts the walk to those commit hashes.
+    `select`, if given, is called with the matching commits and their authored
+    timestamps and returns the ones to yield (see GitBudget.select).
+
+    get_stats() returns the commit's per-file stats (``commit.stats.files`` shape).
+    With a GitHistoryIndex the candidate commits and their stats come from the index,
+    so only matching commits are ever materialised; `wanted`, if given, is called
+    with the commit's [(path, insertions, deletions), ...] and lets callers skip
+    commits that cannot contribute before any diff is computed.
+    Without an index, the full history is walked through GitPython.
+    """
+    if history is not None:
+        indices = [
+            i for i in history.commits_by_author(author, include_merges=include_merges)
+            if only_commits is None or history.hexshas[i] in only_commits
+        ]
+        if select is not None:
+            indices = select(indices, [history.authored_dates[i] for i in indices])
+        for i in indices:
+            if wanted is not None and not wanted(history.files(i)):
+                continue
+            commit = repo.commit(history.hexshas[i])
+            yield commit, history.is_merge(i), (lambda i=i: history.file_stats(i))
+        return
+
+    def walk():
+        seen = set()
+        for commit in repo.iter_commits(rev="--all"):
+            #if we've already processed this commit, skip it
+            if commit.hexsha in seen:
+                continue
+            seen.add(commit.hexsha)
+            if only_commits is not None and commit.hexsha not in only_commits:
+                continue
+
+            #only process commits by the specified author
+            if not author_matches(commit, author):
+                continue
+            #prevents double counting merges unless specified
+            is_merge = len(commit.parents) > 1
+            if is_merge and not include_merges:
+                continue
+            yield commit, is_merge
+
+    matching = walk()
+    if select is not None:
+        matching = list(matching)
+        matching = select(matching, [commit.authored_date for commit, _ in matching])
+    for commit, is_merge in matching:
+        yield commit, is_merge, (lambda commit=commit: commit.stats.files)
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def iter_code_commit_records(
     path: Union[str, Path],
     author: Union[str, List[str]],
     include_merges: bool = False,
     max_commits: Optional[int] = None,
-    ) -> str:
+    history: Optional[GitHistoryIndex] = None,
+    only_commits: Optional[Set[str]] = None,
+    include_patch: bool = False,
+    budget: Optional[GitBudget] = None,
+) -> Iterator[Dict[str, Any]]:
     """
-    Assumes that only code/text files are provided - there will be different function that checks for code files only.
-    Extract detailed, per-file commit data (metadata + diff)
-    for all commits by `author` across all branches.
+    Yield one record per commit by `author` across all branches, with
+    per-file metadata for the code/text files it changed.
     `author` can be a string or a list of identifiers.
-    Returns a JSON string.
+
+    Records are produced one commit at a time, so callers that fold them into
+    aggregates never hold the whole history. Each file's patch is decoded only
+    to detect its language and then dropped, unless `include_patch` is set;
+    the analysis stage reads paths, status, language and line counts, never
+    the patch text. Repeated strings (author identity, status, language) are
+    interned so a long history shares one copy of each.
 
     Notes:
-    - Data is granular, with a list of files for each commit.
     - Binary files (images, PDFs, videos, etc.) are automatically skipped
     - Merge commits are skipped by default.
     - Use max_commits to cap output size on large repos.
+    - Pass a prebuilt GitHistoryIndex as `history` to select the author's commits
+      and their line stats from the index instead of re-walking history.
+    - Pass `only_commits` (a set of hashes) to extract just those commits, e.g.
+      the delta since a previous analysis.
+    - Commits whose diff cannot be computed are skipped.
+    - Work is bounded by `budget` (a GitBudget from the GIT_MAX_* settings by
+      default): oversized patches are cut off or skipped, in which case the
+      file's language comes from its name alone, and very long histories are
+      sampled over time. Pass a GitBudget to read its report() afterwards.
     """
+    if budget is None:
+        budget = GitBudget()
     try:
         repo = get_repo(path)  # uses existing helper to get Repo object
     except Exception:
-        return json.dumps([], indent =2)  # on error, return empty list
-    
+        return
+
     # Explicit empty repo check
     if is_repo_empty(path):
-        return json.dumps([], indent=2)
-    
-    seen = set()
-    out = []
-    errors = []
+        return
 
-    # Iterate over all commits in the repo
-    for commit in repo.iter_commits(rev="--all"):
-        
-        #if we've already processed this commit, skip it
-        if commit.hexsha in seen:
-            continue
-        seen.add(commit.hexsha)
-
-        #only process commits by the specified author
-        if not author_matches(commit, author):  
-            continue
-        #prevents double counting merges unless specified
-        is_merge = len(commit.parents) > 1
-        if is_merge and not include_merges:
-            continue
-
-
-        # --- START NEW PER-FILE LOGIC ---
+    produced = 0
+    # Iterate over all commits by the author in the repo
+    for commit, is_merge, get_stats in _iter_author_commits(
+        repo, author, include_merges, history, only_commits=only_commits, select=budget.select
+    ):
         try:
             parent = commit.parents[0] if commit.parents else NULL_TREE
-            diffs = commit.diff(parent, create_patch=True) 
-            
+            stats = get_stats()
+            with_patch = budget.start_commit(stats)
+            diffs = commit.diff(parent, create_patch=with_patch)
+
             files_changed_data = []
-            stats = commit.stats.files 
             for d in diffs:
-                #  # Skip binary files - only process code/text files
-                if not is_code_file(d): 
+                # Skip binary files - only process code/text files
+                if not is_code_file(d, read_content=with_patch and not budget.exhausted()):
                     continue
                 status = "A" if d.new_file else "D" if d.deleted_file else "R" if d.renamed_file else "M"
 
-                patch_text = getattr(d, "diff", b"")
+                patch_text = (getattr(d, "diff", b"") or b"") if with_patch else b""
+                allowed = budget.take(len(patch_text))
                 try:
-                    patch = patch_text.decode("utf-8", errors="replace")
+                    patch = patch_text[:allowed].decode("utf-8", errors="replace")
                 except Exception:
                     patch = "/* Could not decode patch text */"
-                
+
                 filename = d.b_path or d.a_path or ""
+                # An empty patch leaves only the file name to go by.
                 language = detect_language_from_patch(filename, patch)
                 file_stats = stats.get(filename, {})
                 raw_insertions = file_stats.get("insertions", 0)
@@ -404,48 +701,72 @@ def extract_code_commit_content_by_author(
                 except (TypeError, ValueError):
                     lines_added = None
 
-                files_changed_data.append({
-                    "status": status,
+                file_record = {
+                    "status": _intern(status),
                     "path_before": d.a_path,
                     "path_after": d.b_path,
-                    "patch": patch, 
-                    "size_after": getattr(getattr(d, 'b_blob', None), 'size', None),
-                    "language": language,
-                    "code_lines_added": lines_added
-                })
-            # --- END NEW PER-FILE LOGIC ---
-        # Handle potential Git command errors by adding to dictionary
-        except GitCommandError as e:
-            errors.append({
-                "commit_hash": commit.hexsha,
-                "author_name": getattr(commit.author, "name", "") or "",
-                "author_email": getattr(commit.author, "email", "") or "",
-                "committed_datetime": commit.committed_datetime.isoformat(),
-                "message_summary": commit.summary,
-                "error": str(e)
-            })
+                }
+                if include_patch:
+                    file_record["patch"] = patch
+                file_record["size_after"] = getattr(getattr(d, 'b_blob', None), 'size', None)
+                file_record["language"] = _intern(language)
+                file_record["code_lines_added"] = lines_added
+                files_changed_data.append(file_record)
+            # Drop the diff objects (and their patch bytes) before the next commit.
+            del diffs
+        except GitCommandError:
             continue
-        # TODO: Consider informing the user about errors via logging or return value
         if not files_changed_data:
             continue
 
-        out.append({
+        yield {
             "hash": commit.hexsha,
-            "author_name": getattr(commit.author, "name", "") or "",
-            "author_email": getattr(commit.author, "email", "") or "",
+            "author_name": _intern(getattr(commit.author, "name", "") or ""),
+            "author_email": _intern(getattr(commit.author, "email", "") or ""),
             "authored_datetime": commit.authored_datetime.isoformat(),
             "committed_datetime": commit.committed_datetime.isoformat(),
             "message_summary": commit.summary,
             "message_full": commit.message,
             "is_merge": is_merge,
-            "files": files_changed_data 
-        })
-        
+            "files": files_changed_data,
+        }
+
         # --- CRITICAL LIMITING LOGIC ---
-        if max_commits is not None and len(out) >= max_commits:
+        produced += 1
+        if max_commits is not None and produced >= max_commits:
             break
 
-    return json.dumps(out, indent=2)
+
+def extract_code_commit_content_by_author(
+    path: Union[str, Path],
+    author: Union[str, List[str]],
+    include_merges: bool = False,
+    max_commits: Optional[int] = None,
+    history: Optional[GitHistoryIndex] = None,
+    only_commits: Optional[Set[str]] = None,
+    ) -> str:
+    """
+    Assumes that only code/text files are provided - there will be different function that checks for code files only.
+    Extract detailed, per-file commit data (metadata + diff)
+    for all commits by `author` across all branches.
+    `author` can be a string or a list of identifiers.
+    Returns a JSON string, with each file's patch text.
+
+    This is the JSON form of iter_code_commit_records() for callers that
+    export the history; the analysis pipeline consumes the records directly.
+    """
+    return json.dumps(
+        list(iter_code_commit_records(
+            path,
+            author,
+            include_merges=include_merges,
+            max_commits=max_commits,
+            history=history,
+            only_commits=only_commits,
+            include_patch=True,
+        )),
+        indent=2,
+    )
 
 _ALLOWED_EXTS_FOR_README = {"", ".md", ".rst", ".txt", ".markdown", ".adoc", ".org"}
 
@@ -614,7 +935,8 @@ def extract_non_code_content_by_author(
     exclude_readme: bool = True,
     exclude_pdf_docx: bool = True,
     include_merges: bool = False,
-    max_commits: Optional[int] = None
+    max_commits: Optional[int] = None,
+    history: Optional[GitHistoryIndex] = None,
 ) -> str:
     """
     Extract non-code file contributions by author.
@@ -627,6 +949,8 @@ def extract_non_code_content_by_author(
         exclude_pdf_docx: Exclude PDF/DOCX (default: True)
         include_merges: Include merge commits (default: False)
         max_commits: Max commits to process (default: None)
+        history: Prebuilt GitHistoryIndex; when given, commits that touch no
+            matching non-code file are skipped without computing a diff
     
     Returns:
         JSON string with author's non-code contributions
@@ -639,22 +963,22 @@ def extract_non_code_content_by_author(
     non_code_exts = {".md", ".txt", ".markdown"}
     if not exclude_pdf_docx:
         non_code_exts.update({".pdf", ".docx", ".doc"})
+
+    def _touches_non_code(files) -> bool:
+        for file_path, _, _ in files:
+            path_obj = Path(file_path)
+            if path_obj.suffix.lower() not in non_code_exts:
+                continue
+            if exclude_readme and path_obj.name.lower().startswith("readme"):
+                continue
+            return True
+        return False
     
-    seen = set()
     out = []
     
-    for commit in repo.iter_commits(rev="--all"):
-        if commit.hexsha in seen:
-            continue
-        seen.add(commit.hexsha)
-        
-        if not author_matches(commit, author):
-            continue
-        
-        is_merge = len(commit.parents) > 1
-        if is_merge and not include_merges:
-            continue
-        
+    for commit, is_merge, _ in _iter_author_commits(
+        repo, author, include_merges, history, wanted=_touches_non_code
+    ):
         try:
             parent = commit.parents[0] if commit.parents else NULL_TREE
             diffs = commit.diff(parent, create_patch=True)
@@ -738,13 +1062,15 @@ SKIP_DIRS = {
     ".cargo", ".pnpm-store", ".tox", ".pytest_cache"
 }
 
-def is_code_file(diff_object) -> bool:
+def is_code_file(diff_object, read_content: bool = True) -> bool:
     """
     Determines if a diff object represents a code/text file.
     Returns False for binary, vendor, or very large files.
     
     Args:
         diff_object: A GitPython diff object
+        read_content: Whether to sniff the blob for NUL bytes; without it
+            binary files are recognised by extension only.
         
     Returns:
         bool: True if the file is a code/text file, False if binary or non-code
@@ -772,7 +1098,7 @@ def is_code_file(diff_object) -> bool:
         return False  # Too large to be meaningful source code
 
     # --- 5. Optional NUL-byte sniff for unknown extensions ---
-    if not extension or extension.lower() not in BINARY_EXTENSIONS:
+    if read_content and (not extension or extension.lower() not in BINARY_EXTENSIONS):
         try:
             if blob:
                 # Read only first 2 KB for efficiency
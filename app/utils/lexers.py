@@ -0,0 +1,92 @@
+"""
+Cached drop-in replacements for pygments' guess_lexer_for_filename and guess_lexer.
+
+Every call to the pygments functions walks all ~600 lexer classes and
+re-reads the installed packages' entry points looking for plugin lexers,
+which took longer than everything else in git history extraction. Here the
+class list is built once per process and the lexers whose filename patterns
+match a file name are remembered per name. The choice among them repeats
+pygments' own selection, so results are the same; the class list comes from
+pygments' public API. Pygments is pinned in requirements.txt and
+tests/utils/test_lexers.py checks the results against pygments on this
+repository's files, so check both when upgrading it.
+"""
+
+import threading
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from os.path import basename
+from typing import List, Tuple
+
+from pygments.lexers import find_lexer_class, get_all_lexers, get_lexer_by_name
+from pygments.lexers import guess_lexer as _pygments_guess_lexer
+from pygments.modeline import get_filetype_from_buffer
+from pygments.util import ClassNotFound
+
+_lexer_classes: List[type] = []
+_lexer_classes_lock = threading.Lock()
+
+
+def _all_lexer_classes() -> List[type]:
+    """Every lexer class, plugins included, in the order pygments iterates them."""
+    if not _lexer_classes:
+        with _lexer_classes_lock:
+            if not _lexer_classes:
+                _lexer_classes.extend(
+                    cls for cls in (find_lexer_class(name) for name, *_ in get_all_lexers(plugins=True))
+                    if cls is not None
+                )
+    return _lexer_classes
+
+
+@lru_cache(maxsize=4096)
+def _filename_lexers(name: str) -> Tuple[Tuple[type, bool], ...]:
+    """(lexer class, matched a primary pattern) for lexers whose filename patterns match `name`."""
+    primary = {}
+    for lexer in _all_lexer_classes():
+        for pattern in lexer.filenames:
+            if fnmatchcase(name, pattern):
+                primary[lexer] = True
+        for pattern in lexer.alias_filenames:
+            if fnmatchcase(name, pattern):
+                primary[lexer] = False
+    return tuple(primary.items())
+
+
+def guess_lexer_for_filename(_fn, _text, **options):
+    """pygments.lexers.guess_lexer_for_filename, with the filename matching cached."""
+    candidates = _filename_lexers(basename(_fn))
+    if not candidates:
+        raise ClassNotFound(f"no lexer for filename {basename(_fn)!r} found")
+    if len(candidates) == 1:
+        return candidates[0][0](**options)
+    result = []
+    for lexer, primary in candidates:
+        rv = lexer.analyse_text(_text)
+        if rv == 1.0:
+            return lexer(**options)
+        result.append((rv, primary, lexer.priority, lexer.__name__, lexer))
+    result.sort(key=lambda t: t[:4])
+    return result[-1][-1](**options)
+
+
+def guess_lexer(_text, **options):
+    """pygments.lexers.guess_lexer for str input, with the lexer class list cached."""
+    if not isinstance(_text, str):
+        return _pygments_guess_lexer(_text, **options)
+    ft = get_filetype_from_buffer(_text)
+    if ft is not None:
+        try:
+            return get_lexer_by_name(ft, **options)
+        except ClassNotFound:
+            pass
+    best_rv, best_lexer = 0.0, None
+    for lexer in _all_lexer_classes():
+        rv = lexer.analyse_text(_text)
+        if rv == 1.0:
+            return lexer(**options)
+        if rv > best_rv:
+            best_rv, best_lexer = rv, lexer
+    if not best_rv or best_lexer is None:
+        raise ClassNotFound("no lexer matching the text found")
+    return best_lexer(**options)
@@ -0,0 +1,101 @@
+"""
+Process-wide NLP models for non-code analysis.
+
+spaCy's pipeline, KeyBERT (with its sentence-transformer) and sumy's
+tokenizers are loaded once per process, on first use, and shared by every
+caller and thread. Callers name the spaCy pipes they need and the others are
+disabled for that call only, so concurrent callers with different needs do not
+interfere. Batches of documents go through nlp.pipe and a single KeyBERT
+call, which embeds all of them together.
+"""
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+import spacy
+from sumy.nlp.stemmers import Stemmer
+from sumy.nlp.tokenizers import Tokenizer
+from sumy.utils import get_stop_words
+
+SPACY_MODEL = "en_core_web_sm"
+SPACY_BATCH_SIZE = 64
+
+# spaCy pipes per use; names missing from the loaded pipeline are ignored.
+# Sentences and lemmas (pipelines without a parser split with a sentencizer).
+SENTENCE_PIPES = ("tok2vec", "tagger", "attribute_ruler", "lemmatizer", "parser", "sentencizer")
+# Noun chunks need POS tags and the dependency parse.
+NOUN_CHUNK_PIPES = ("tok2vec", "tagger", "attribute_ruler", "parser")
+ENTITY_PIPES = ("tok2vec", "ner")
+
+_load_lock = threading.Lock()
+_spacy_models: dict = {}
+_keybert = None
+
+
+def get_spacy(model: str = SPACY_MODEL):
+    """The shared spaCy pipeline, loaded on first use."""
+    nlp = _spacy_models.get(model)
+    if nlp is None:
+        with _load_lock:
+            nlp = _spacy_models.get(model)
+            if nlp is None:
+                nlp = _spacy_models[model] = spacy.load(model)
+    return nlp
+
+
+def _disabled_pipes(nlp, pipes: Sequence[str]) -> List[str]:
+    return [name for name in nlp.pipe_names if name not in pipes]
+
+
+def pipe_docs(texts: Iterable[str], pipes: Sequence[str], batch_size: int = SPACY_BATCH_SIZE) -> Iterator[Any]:
+    """Docs for `texts`, in order, run through nlp.pipe with only `pipes` enabled."""
+    nlp = get_spacy()
+    return nlp.pipe(texts, batch_size=batch_size, disable=_disabled_pipes(nlp, pipes))
+
+
+def parse_doc(text: str, pipes: Sequence[str]):
+    """A single Doc for `text` with only `pipes` enabled."""
+    nlp = get_spacy()
+    return nlp(text, disable=_disabled_pipes(nlp, pipes))
+
+
+def get_keybert():
+    """The shared KeyBERT model, loaded on first use."""
+    global _keybert
+    if _keybert is None:
+        with _load_lock:
+            if _keybert is None:
+                from keybert import KeyBERT
+                _keybert = KeyBERT()
+    return _keybert
+
+
+def loaded_keybert():
+    """The shared KeyBERT model if something has loaded it already, else None."""
+    return _keybert
+
+
+def extract_keywords_batch(model, docs: Sequence[str], **kwargs) -> List[List[Tuple[str, float]]]:
+    """KeyBERT keywords for each of `docs`, from one extract_keywords call."""
+    if not docs:
+        return []
+    keywords = model.extract_keywords(list(docs), **kwargs)
+    # KeyBERT unwraps the result for a single document.
+    return [keywords] if len(docs) == 1 else keywords
+
+
+@lru_cache(maxsize=None)
+def get_sumy_tokenizer(language: str = "english") -> Tokenizer:
+    return Tokenizer(language)
+
+
+@lru_cache(maxsize=None)
+def get_sumy_stemmer(language: str = "english") -> Stemmer:
+    return Stemmer(language)
+
+
+@lru_cache(maxsize=None)
+def get_sumy_stop_words(language: str = "english") -> frozenset:
+    return get_stop_words(language)
@@ -27,29 +27,35 @@ def _configure_nltk_data() -> None:
 
 _configure_nltk_data()
 
-import spacy
 from nltk.tokenize import sent_tokenize, word_tokenize
 from textblob import TextBlob
 from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lsa import LsaSummarizer
-from keybert import KeyBERT
 from app.utils.user_preference_utils import UserPreferenceStore
 from app.cli.user_preference_cli import UserPreferences
 from app.utils.non_code_analysis.keywords.domain_keywords import (
     build_enhanced_keywords, get_mapped_industry)
+from app.utils.non_code_analysis.nlp_models import (
+    NOUN_CHUNK_PIPES,
+    SENTENCE_PIPES,
+    extract_keywords_batch,
+    get_keybert,
+    get_spacy,
+    get_sumy_tokenizer,
+    loaded_keybert,
+    parse_doc,
+)
 
 SPACY_AVAILABLE = True
 KEYBERT_AVAILABLE = True
-nlp = spacy.load("en_core_web_sm")
-kw_model = None
+
+def get_nlp():
+    """Shared spaCy pipeline (see nlp_models), loaded on first use."""
+    return get_spacy()
 
 def get_keybert_model():
     """Lazy load KeyBERT model only when needed."""
-    global kw_model
-    if kw_model is None:
-        kw_model = KeyBERT()
-    return kw_model
+    return get_keybert()
 
 def classify_document_type(content: str, file_path: Path) -> str:
     """Classify document type based on content and filename."""
@@ -175,7 +181,7 @@ def extract_key_topics_from_content(content: str) -> List[str]:
     if not content or len(content.strip()) < 50:
         return []
     try:
-        doc = nlp(content[:5000])
+        doc = parse_doc(content[:5000], NOUN_CHUNK_PIPES)
         noun_phrases = [chunk.text.lower() for chunk in doc.noun_chunks]
         topic_counts = Counter(noun_phrases)
         top_topics = [topic for topic, _ in topic_counts.most_common(5)]
@@ -189,7 +195,7 @@ def extract_important_sentences(content: str, num_sentences: int = 3) -> List[st
         sentences = content.split(".")[:num_sentences]
         return [s.strip() + "." for s in sentences if s.strip()]
     try:
-        parser = PlaintextParser.from_string(content, Tokenizer("english"))
+        parser = PlaintextParser.from_string(content, get_sumy_tokenizer("english"))
         summarizer = LsaSummarizer()
         summary_sentences = summarizer(parser.document, num_sentences)
         return [str(sentence) for sentence in summary_sentences]
@@ -236,7 +242,7 @@ def extract_contribution_bullets(content: str, doc_type: str, metrics: Dict[str,
     if tech_str:
         bullets.append(f"Documented technical components and workflows involving {tech_str}.")
     if SPACY_AVAILABLE:
-        doc = nlp(limited_content)
+        doc = parse_doc(limited_content, SENTENCE_PIPES)
         action_verbs = {"develop", "design", "create", "build", "implement", "document"}
         banned_keywords = [
             "government", "critic", "echo chamber", "politic",
@@ -266,7 +272,38 @@ def extract_all_skills(content: str) -> Dict[str, List[str]]:
     Extract technical and soft skills from content.
     Domain expertise and tools/technologies intentionally removed.
     """
+    return extract_all_skills_batch([content])[0]
+
+def _keybert_skill_keywords(contents: List[str]) -> List[List[Any]]:
+    """
+    KeyBERT (keyword, score) pairs per document, from one batched call.
 
+    Runs only when a KeyBERT model is already loaded, as before: skill
+    extraction never triggers the sentence-transformer load itself.
+    """
+    keywords: List[List[Any]] = [[] for _ in contents]
+    model = loaded_keybert()
+    if not KEYBERT_AVAILABLE or model is None:
+        return keywords
+    indexes = [i for i, content in enumerate(contents) if len(content) > 100]
+    try:
+        batch = extract_keywords_batch(
+            model, [contents[i] for i in indexes], keyphrase_ngram_range=(1, 2), top_n=20
+        )
+        for i, doc_keywords in zip(indexes, batch):
+            keywords[i] = doc_keywords
+    except Exception:
+        pass
+    return keywords
+
+def extract_all_skills_batch(contents: List[str]) -> List[Dict[str, List[str]]]:
+    """extract_all_skills() for each of `contents`, with KeyBERT run once for the batch."""
+    return [
+        _extract_skills(content, keywords)
+        for content, keywords in zip(contents, _keybert_skill_keywords(contents))
+    ]
+
+def _extract_skills(content: str, keybert_keywords: List[Any]) -> Dict[str, List[str]]:
     skills = {
         "technical_skills": set(),
         "soft_skills": set(),
@@ -312,16 +349,11 @@ def extract_all_skills(content: str) -> Dict[str, List[str]]:
             skills["technical_skills"].add(tech_clean)
 
     # ---- KEYBERT (OPTIONAL TECH EXTRACTION) ----
-    if KEYBERT_AVAILABLE and len(content) > 100:
-        try:
-            keywords = kw_model.extract_keywords(content, keyphrase_ngram_range=(1, 2), top_n=20)
-            for keyword, score in keywords:
-                if score > 0.3:
-                    kw_lower = keyword.lower()
-                    if any(term in kw_lower for term in ["api", "system", "architecture", "design"]):
-                        skills["technical_skills"].add(keyword.title())
-        except Exception:
-            pass
+    for keyword, score in keybert_keywords:
+        if score > 0.3:
+            kw_lower = keyword.lower()
+            if any(term in kw_lower for term in ["api", "system", "architecture", "design"]):
+                skills["technical_skills"].add(keyword.title())
 
     # ---- SOFT SKILLS ----
     soft_skill_patterns = {
@@ -467,6 +499,7 @@ def analyze_project_clean(parsed_files: Dict[str, Any]) -> Dict[str, Any]:
     doc_type_counts: Counter = Counter()
     doc_type_freq: Counter = Counter()
     files_by_doc_type = []
+    file_contents: List[str] = []
 
     for file_data in files:
         if not file_data.get("success", False):
@@ -489,7 +522,9 @@ def analyze_project_clean(parsed_files: Dict[str, Any]) -> Dict[str, Any]:
             "contribution_frequency": freq
         })
         
-        file_skills = extract_all_skills(content)
+        file_contents.append(content)
+
+    for file_skills in extract_all_skills_batch(file_contents):
         for cat, vals in file_skills.items():
             project_skills[cat].update(vals)
 
@@ -3,18 +3,21 @@ import re
 from pathlib import Path
 from typing import List, Dict
 from collections import Counter
-from app.client.llm_client import GeminiLLMClient
+from app.client.llm_client import GeminiLLMClient, is_error_response
 from app.utils.non_code_analysis.non_3rd_party_analysis import (calculate_completeness_score,classify_document_type)
 from app.utils.user_preference_utils import UserPreferenceStore
 from dotenv import load_dotenv, find_dotenv
 from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lsa import LsaSummarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
 import textstat
 import json
-import spacy
+from app.utils.non_code_analysis.nlp_models import (
+    ENTITY_PIPES,
+    get_sumy_stemmer,
+    get_sumy_stop_words,
+    get_sumy_tokenizer,
+    pipe_docs,
+)
 
 load_dotenv(find_dotenv())
 
@@ -141,11 +144,11 @@ def _sumy_lsa_summarize(content: str, num_sentences: int, language: str = "engli
     
     try:
         # Create parser from plain text
-        parser = PlaintextParser.from_string(content, Tokenizer(language))
+        parser = PlaintextParser.from_string(content, get_sumy_tokenizer(language))
         
-        # Create LSA summarizer
-        summarizer = LsaSummarizer(Stemmer(language))
-        summarizer.stop_words = get_stop_words(language)
+        # Create LSA summarizer (tokenizer, stemmer and stop words are loaded once per process)
+        summarizer = LsaSummarizer(get_sumy_stemmer(language))
+        summarizer.stop_words = get_sumy_stop_words(language)
         
         # Generate summary
         summary_sentences = summarizer(parser.document, num_sentences)
@@ -278,12 +281,11 @@ def get_file_type_distribution(llm1_results):
 
 def get_named_entities(llm1_results):
    # TODO: Use NLP to identify named entities in content for optimized LLM context. [REFACTOR LATER]
-    nlp = spacy.load("en_core_web_sm")
     if llm1_results:
         entities = set()
-        for summary in llm1_results:
-            content = summary.get("summary", "")
-            doc = nlp(content)
+        # One batched pass of the shared pipeline, with only the NER pipes enabled
+        contents = (summary.get("summary", "") for summary in llm1_results)
+        for doc in pipe_docs(contents, ENTITY_PIPES):
             entities.update(ent.text for ent in doc.ents)
         return list(entities)
     return []
@@ -513,9 +515,11 @@ def generate_non_code_insights(PROMPT):
     
     return response
 
-def clean_response(response):
+def clean_response(response, reformat=True):
     """
     Clean and parse the response from LLM2 to ensure it is valid JSON.
+    A malformed JSON object is sent back to LLM2 once to be reformatted;
+    error texts are not sent back.
     """
     try:
         # Attempt to parse the response directly
@@ -531,9 +535,15 @@ def clean_response(response):
                 result = json.loads(json_match.group(0))
                 return result
             except json.JSONDecodeError:
-                # Call LLM2 again to reformat response as JSON
-                LLM2 = GeminiLLMClient(api_key=os.getenv("GEMINI_API_KEY"))
-                response = LLM2.generate(response)  
+                # Call LLM2 again to reformat only the broken object as JSON
+                if reformat:
+                    LLM2 = GeminiLLMClient(api_key=os.getenv("GEMINI_API_KEY"))
+                    reformatted = LLM2.generate(
+                        "Rewrite the following as one valid JSON object with the same content. "
+                        "OUTPUT ONLY the JSON object.\n\n" + json_match.group(0)
+                    )
+                    if reformatted and not is_error_response(reformatted):
+                        return clean_response(reformatted, reformat=False)
     raise ValueError("Failed to parse LLM2 response as JSON")
 
 def analyze_non_code_files(parsed_non_code):
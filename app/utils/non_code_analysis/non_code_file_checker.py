@@ -9,7 +9,8 @@ from app.utils.git_utils import (
     detect_git,
     _extract_github_noreply_username,
     _canonical_author_key,  # REUSE from git_utils.py for alias collapsing
-    author_matches
+    author_matches,
+    GitHistoryIndex,
 )
 from app.utils.scan_utils import scan_project_files
 
@@ -73,7 +74,8 @@ def filter_non_code_files(file_paths: List[Union[str, Path]]) -> List[str]:
 def collect_git_non_code_files_with_metadata(
     repo_path: Union[str, Path],
     user_email: str = None,
-    username: str = None
+    username: str = None,
+    history: Optional[GitHistoryIndex] = None
 ) -> Dict[str, Dict[str, Any]]:
     """
     Collect non-code files from a git repository with author and commit metadata.
@@ -86,6 +88,8 @@ def collect_git_non_code_files_with_metadata(
         repo_path: Path to git repository
         user_email: User's email for alias collapsing (optional)
         username: User's username/name for alias collapsing (optional)
+        history: Prebuilt GitHistoryIndex (optional); queried instead of walking
+                 every commit and its stats again
     
     Returns:
         Dictionary mapping file paths to metadata:
@@ -100,16 +104,20 @@ def collect_git_non_code_files_with_metadata(
             }
         }
     """
-    try:
-        repo = get_repo(repo_path)  # REUSED from git_utils.py
-    except Exception:
-        return {}
-    
     # Build author identifiers list for matching (same pattern as git_code_parsing.py)
     author_identifiers = []
     for ident in (user_email, username):
         if ident and ident not in author_identifiers:
             author_identifiers.append(ident)
+
+    if history is not None:
+        file_info = _collect_non_code_file_info_from_index(repo_path, author_identifiers, history)
+        return _summarize_non_code_file_info(file_info)
+
+    try:
+        repo = get_repo(repo_path)  # REUSED from git_utils.py
+    except Exception:
+        return {}
     
     file_info: Dict[str, Dict[str, Any]] = {}
     
@@ -155,7 +163,61 @@ def collect_git_non_code_files_with_metadata(
                     file_info[file_path]["canonical_authors"].add(canonical_key)
             
             file_info[file_path]["commit_count"] += 1
-    
+
+    return _summarize_non_code_file_info(file_info)
+
+
+def _collect_non_code_file_info_from_index(
+    repo_path: Union[str, Path],
+    author_identifiers: List[str],
+    history: GitHistoryIndex
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Index-backed equivalent of the commit loop in collect_git_non_code_files_with_metadata().
+    Author matching and canonical keys are resolved once per distinct author, not per commit.
+    """
+    primary_ids = history.matching_author_ids(author_identifiers) if author_identifiers else set()
+    author_info = []
+    for author_id, (name, email) in enumerate(history.authors):
+        author_email_commit = email or "unknown"
+        author_name_commit = name or "unknown"
+        if author_id in primary_ids:
+            canonical_key = "primary"
+        else:
+            canonical_key = _canonical_author_key(author_name_commit, author_email_commit)
+        author_info.append((author_email_commit, author_name_commit, canonical_key))
+
+    non_code_path_ids = {
+        path_id for path_id, file_path in enumerate(history.paths) if is_non_code_file(file_path)
+    }
+
+    file_info: Dict[str, Dict[str, Any]] = {}
+    for i in range(len(history)):
+        author_email_commit, author_name_commit, canonical_key = author_info[history.author_ids[i]]
+        for j in range(history.file_offsets[i], history.file_offsets[i + 1]):
+            path_id = history.file_path_ids[j]
+            if path_id not in non_code_path_ids:
+                continue
+            file_path = history.paths[path_id]
+            if file_path not in file_info:
+                file_info[file_path] = {
+                    "path": str((Path(repo_path) / file_path).resolve()),
+                    "author_emails": set(),
+                    "author_names": set(),
+                    "canonical_authors": set(),
+                    "commit_count": 0
+                }
+            info = file_info[file_path]
+            info["author_emails"].add(author_email_commit)
+            info["author_names"].add(author_name_commit)
+            if canonical_key:
+                info["canonical_authors"].add(canonical_key)
+            info["commit_count"] += 1
+    return file_info
+
+
+def _summarize_non_code_file_info(file_info: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Convert collected per-file sets into the public metadata shape."""
     # Convert sets to lists and compute is_collaborative based on unique authors
     result = {}
     for file_path, info in file_info.items():
@@ -347,7 +409,8 @@ def get_classified_non_code_file_paths(
 def classify_non_code_files_with_user_verification(
     directory: Union[str, Path],
     user_email: str = None,
-    username:str=None
+    username:str=None,
+    history: Optional[GitHistoryIndex] = None
 ) -> Dict[str, Any]:
     """
     Classify non-code files as collaborative or non-collaborative with user verification.
@@ -364,6 +427,7 @@ def classify_non_code_files_with_user_verification(
     Args:
         directory: Path to directory/repository
         user_email: Email of user (if None, gets from git config for git repos)
+        history: Prebuilt GitHistoryIndex for the repository (optional)
     
     Returns:
         {
@@ -408,7 +472,7 @@ def classify_non_code_files_with_user_verification(
             }
         
         # Collect git metadata with alias collapsing (pass user identity)
-        metadata = collect_git_non_code_files_with_metadata(directory, user_email, username)
+        metadata = collect_git_non_code_files_with_metadata(directory, user_email, username, history=history)
         
         # Verify user in files
         verified = verify_user_in_files(metadata, user_email, username)
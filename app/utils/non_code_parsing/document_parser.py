@@ -100,7 +100,7 @@ def _parse_single_file(file_path, commit_counts):
     return result
 
 
-def parsed_input_text(file_paths_dict, repo_path=None, author=None):
+def parsed_input_text(file_paths_dict, repo_path=None, author=None, history=None):
     """
     Parse non-code files with different strategies based on collaboration status.
     - Non-collaborative files: Extract FULL content + count commits
@@ -110,16 +110,19 @@ def parsed_input_text(file_paths_dict, repo_path=None, author=None):
         file_paths_dict: Dict with "collaborative" and "non_collaborative" keys
         repo_path: Git repository path
         author: Author email
+        history: Prebuilt GitHistoryIndex for repo_path (optional)
         
     Returns:
         Dictionary with parsed_files array with contribution_frequency for each file
     """
     results = []
     
-    # Get commit counts for ALL files once (efficient)
+    # Load the author's commits and commit counts for ALL files once (efficient)
+    commits = []
     commit_counts = {}
     if repo_path and author:
-        commit_counts = _get_all_file_commit_counts(repo_path, author)
+        commits = _get_author_non_code_commits(repo_path, author, history=history)
+        commit_counts = _get_all_file_commit_counts(repo_path, author, commits=commits)
     
     # Parse NON-COLLABORATIVE files - extract FULL content
     for file_path_str in file_paths_dict.get("non_collaborative", []):
@@ -132,7 +135,8 @@ def parsed_input_text(file_paths_dict, repo_path=None, author=None):
                 repo_path, 
                 author, 
                 file_paths_dict["collaborative"],
-                commit_counts
+                commit_counts,
+                commits=commits
             )
             results.extend(author_data)
         except Exception:
@@ -181,16 +185,23 @@ def _extract_text_file(file_path):
     except Exception as e:
         raise Exception(f"Text extraction failed: {e}")
 
-def _get_all_file_commit_counts(repo_path, author):
-    """Get commit counts for ALL non-code files by author (single call)."""
+def _get_author_non_code_commits(repo_path, author, history=None):
+    """Load the author's non-code commits (with patches) from git once per parse."""
     try:
         from app.utils.git_utils import extract_non_code_content_by_author
-        import json
         
         commits_json = extract_non_code_content_by_author(
-            repo_path, author, exclude_readme=True, exclude_pdf_docx=True
+            repo_path, author, exclude_readme=True, exclude_pdf_docx=True, history=history
         )
-        commits = json.loads(commits_json)
+        return json.loads(commits_json)
+    except Exception:
+        return []
+
+def _get_all_file_commit_counts(repo_path, author, commits=None):
+    """Get commit counts for ALL non-code files by author (single call)."""
+    try:
+        if commits is None:
+            commits = _get_author_non_code_commits(repo_path, author)
         
         counts = {}
         # Git returns paths relative to repo root, so resolve relative to repo_path
@@ -207,7 +218,7 @@ def _get_all_file_commit_counts(repo_path, author):
     except Exception:
         return {}
 
-def _parse_collaborative_files(repo_path, author, collaborative_files, commit_counts):
+def _parse_collaborative_files(repo_path, author, collaborative_files, commit_counts, commits=None):
     """Parse collaborative files - extract only author's patches for specified files.
     
     Args:
@@ -215,15 +226,11 @@ def _parse_collaborative_files(repo_path, author, collaborative_files, commit_co
         author: Author identifier(s) - email, username, or list of both
         collaborative_files: List of file paths already verified as collaborative
         commit_counts: Pre-computed commit counts per file
+        commits: Pre-loaded author commits from _get_author_non_code_commits (optional)
     """
     try:
-        from app.utils.git_utils import extract_non_code_content_by_author
-        import json
-        
-        commits_json = extract_non_code_content_by_author(
-            repo_path, author, exclude_readme=True, exclude_pdf_docx=True
-        )
-        commits = json.loads(commits_json)
+        if commits is None:
+            commits = _get_author_non_code_commits(repo_path, author)
         
         repo_base = Path(repo_path).resolve()
         collaborative_set = {str(Path(f).resolve()) for f in collaborative_files}
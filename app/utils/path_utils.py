@@ -43,10 +43,14 @@ def extract_zipped_contents(path: Union[str, Path]) -> str:
     if path is None:
         raise ValueError("path must be provided")
 
+    from app.utils.zip_upload import check_zip_entries
+
     zip_path = Path(path)
-    temp_dir = tempfile.mkdtemp()
 
     with zipfile.ZipFile(zip_path, "r") as z:
+        # Size, entry-count and compression-ratio limits, before writing anything
+        check_zip_entries(z.infolist())
+        temp_dir = tempfile.mkdtemp()
         for info in z.infolist():
             extracted_path = z.extract(info, temp_dir)
 
@@ -0,0 +1,159 @@
+"""
+Bounded on-disk cache of compiled resume PDFs.
+
+PDFs live in the cache directory as <sha256 of the LaTeX source>.pdf. A hit
+refreshes the file's mtime, and after every write the least recently used
+PDFs are evicted until the directory is within PDF_CACHE_MAX_BYTES and
+PDF_CACHE_MAX_ENTRIES. Writes go to a unique temporary file that is renamed
+into place, so readers never see a partial PDF. Concurrent requests for the
+same PDF share a single compile.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Optional
+
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_MAX_BYTES_ENV = "PDF_CACHE_MAX_BYTES"
+DEFAULT_PDF_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PDF_CACHE_MAX_ENTRIES_ENV = "PDF_CACHE_MAX_ENTRIES"
+DEFAULT_PDF_CACHE_MAX_ENTRIES = 500
+
+_compiles = SingleFlight()
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "compiles": 0, "shared_compiles": 0, "evictions": 0}
+
+
+def _resolve(env_name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(env_name, default)))
+    except ValueError:
+        return default
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += n
+
+
+def _read_cached(pdf_path: str) -> Optional[bytes]:
+    """Cached PDF bytes, or None; a hit marks the file as recently used."""
+    if not os.path.isfile(pdf_path) or os.path.islink(pdf_path):
+        return None
+    try:
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        os.utime(pdf_path)
+        return data
+    except OSError:
+        # Evicted or cleared between the check and the read.
+        return None
+
+
+def _write_atomic(pdf_path: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(pdf_path) or ".", prefix=".", suffix=".pdf.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # Never write through a symlink planted at the final path.
+        if os.path.islink(pdf_path):
+            os.unlink(pdf_path)
+        os.replace(tmp_path, pdf_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _cached_entries(cache_dir: str):
+    """(mtime, size, path) of cached PDFs, most recently used first."""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(".pdf") or not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+    entries.sort(key=lambda e: (-e[0], e[2]))
+    return entries
+
+
+def evict(cache_dir: str, max_bytes: Optional[int] = None, max_entries: Optional[int] = None) -> int:
+    """Remove least recently used PDFs beyond the byte and entry limits; returns the number removed."""
+    max_bytes = _resolve(PDF_CACHE_MAX_BYTES_ENV, DEFAULT_PDF_CACHE_MAX_BYTES) if max_bytes is None else max_bytes
+    max_entries = _resolve(PDF_CACHE_MAX_ENTRIES_ENV, DEFAULT_PDF_CACHE_MAX_ENTRIES) if max_entries is None else max_entries
+    removed = 0
+    total = 0
+    for index, (_, size, path) in enumerate(_cached_entries(cache_dir)):
+        total += size
+        if index < max_entries and total <= max_bytes:
+            continue
+        try:
+            os.unlink(path)
+            removed += 1
+        except OSError:
+            pass
+    if removed:
+        _count("evictions", removed)
+    return removed
+
+
+def get_or_compile(pdf_path: str, compile: Callable[[], bytes]) -> bytes:
+    """
+    PDF bytes for `pdf_path` from the cache, or from `compile()`, which is
+    then stored. Only one compile per path runs at a time; concurrent callers
+    wait for it and share its result or its error.
+    """
+    data = _read_cached(pdf_path)
+    if data is not None:
+        _count("hits")
+        return data
+    _count("misses")
+
+    def compile_and_store() -> bytes:
+        # A compile for this path may have finished between the lookup and taking the lead.
+        cached = _read_cached(pdf_path)
+        if cached is not None:
+            return cached
+        _count("compiles")
+        pdf_bytes = compile()
+        try:
+            _write_atomic(pdf_path, pdf_bytes)
+            evict(os.path.dirname(pdf_path) or ".")
+        except OSError as e:
+            logger.warning("Could not cache compiled PDF %s: %s", pdf_path, e)
+        return pdf_bytes
+
+    data, shared = _compiles.do(os.path.abspath(pdf_path), compile_and_store)
+    if shared:
+        _count("shared_compiles")
+    return data
+
+
+def pdf_cache_stats(cache_dir: Optional[str] = None) -> Dict[str, float]:
+    """Hit/miss counters since start-up, plus the cache's current size when `cache_dir` is given."""
+    with _stats_lock:
+        stats: Dict[str, float] = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    if cache_dir and os.path.isdir(cache_dir):
+        entries = _cached_entries(cache_dir)
+        stats["entries"] = len(entries)
+        stats["bytes"] = sum(size for _, size, _ in entries)
+    return stats
+
+
+def reset_pdf_cache_stats() -> None:
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,134 @@
+"""
+Materialized portfolio model.
+
+Assembling the portfolio runs a dozen aggregate queries, decodes the
+projects' DASHBOARD_DATA rows and may fall back to walking a repository's git
+history on disk for collaborators. build_portfolio_model() therefore stores
+what it assembles: the whole model per requested selection in PORTFOLIO_CACHE,
+and each project's entry with its resolved collaborators in
+PORTFOLIO_PROJECT_CACHE, so a rebuild only redoes the projects that changed.
+
+Nothing here invalidates entries. Triggers on the rows the portfolio is built
+from (db.PORTFOLIO_SOURCES) delete the affected project entries and every
+stored model, and bump PORTFOLIO_CACHE_STATE.version, whichever code path
+writes them: analysis, score overrides, chronological edits, thumbnails or
+the user profile. A model is stored only if the version is still the one its
+snapshot was read at, so a build that raced a write is returned but never
+served again.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PORTFOLIO_CACHE_MAX_SELECTIONS_ENV = "PORTFOLIO_CACHE_MAX_SELECTIONS"
+DEFAULT_PORTFOLIO_CACHE_MAX_SELECTIONS = 32
+
+# Larger id lists are read with one full scan instead of an IN clause.
+IN_CLAUSE_LIMIT = 500
+
+
+def _max_selections() -> int:
+    try:
+        return max(1, int(os.environ.get(PORTFOLIO_CACHE_MAX_SELECTIONS_ENV, DEFAULT_PORTFOLIO_CACHE_MAX_SELECTIONS)))
+    except ValueError:
+        return DEFAULT_PORTFOLIO_CACHE_MAX_SELECTIONS
+
+
+def selection_key(project_ids: Optional[Sequence[str]]) -> str:
+    """Cache key of a requested selection; the model echoes the ids in request order."""
+    return json.dumps(list(project_ids)) if project_ids else ""
+
+
+def cache_version(cursor: sqlite3.Cursor) -> Optional[int]:
+    """Current invalidation version, or None on databases without the portfolio cache."""
+    try:
+        cursor.execute("SELECT version FROM PORTFOLIO_CACHE_STATE WHERE id = 1")
+    except sqlite3.OperationalError:
+        return None
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def load_model(cursor: sqlite3.Cursor, key: str) -> Optional[Dict[str, Any]]:
+    """The stored model for a selection, or None."""
+    try:
+        cursor.execute("SELECT model FROM PORTFOLIO_CACHE WHERE selection_key = ?", (key,))
+    except sqlite3.OperationalError:
+        return None
+    row = cursor.fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def load_project_entries(
+    cursor: sqlite3.Cursor, project_ids: Sequence[str]
+) -> Dict[str, Tuple[Dict[str, Any], List[Any]]]:
+    """Stored (entry, collaborators) of the given projects that are still valid."""
+    if not project_ids:
+        return {}
+    try:
+        if len(project_ids) > IN_CLAUSE_LIMIT:
+            cursor.execute("SELECT project_signature, entry, collaborators FROM PORTFOLIO_PROJECT_CACHE")
+        else:
+            placeholders = ",".join(["?"] * len(project_ids))
+            cursor.execute(
+                f"SELECT project_signature, entry, collaborators FROM PORTFOLIO_PROJECT_CACHE "
+                f"WHERE project_signature IN ({placeholders})",
+                list(project_ids),
+            )
+    except sqlite3.OperationalError:
+        return {}
+    wanted = set(project_ids)
+    return {
+        pid: (json.loads(entry), json.loads(collaborators))
+        for pid, entry, collaborators in cursor.fetchall()
+        if pid in wanted
+    }
+
+
+def store(
+    conn: sqlite3.Connection,
+    version: Optional[int],
+    key: str,
+    model_json: str,
+    project_entries: Dict[str, Tuple[Dict[str, Any], List[Any]]],
+) -> bool:
+    """
+    Store a model and newly built project entries if nothing they depend on
+    changed since `version` was read; the caller commits. Returns whether
+    they were stored.
+    """
+    if version is None:
+        return False
+    now = time.time()
+    unchanged = "(SELECT version FROM PORTFOLIO_CACHE_STATE WHERE id = 1) = ?"
+    cursor = conn.execute(
+        f"INSERT OR REPLACE INTO PORTFOLIO_CACHE (selection_key, model, built_at) "
+        f"SELECT ?, ?, ? WHERE {unchanged}",
+        (key, model_json, now, version),
+    )
+    if cursor.rowcount == 0:
+        return False
+    conn.executemany(
+        f"INSERT OR REPLACE INTO PORTFOLIO_PROJECT_CACHE (project_signature, entry, collaborators, built_at) "
+        f"SELECT ?, ?, ?, ? WHERE {unchanged}",
+        [
+            (pid, json.dumps(entry), json.dumps(collaborators), now, version)
+            for pid, (entry, collaborators) in project_entries.items()
+        ],
+    )
+    # Keep the most recently built selections; the full portfolio is always kept.
+    conn.execute(
+        """
+        DELETE FROM PORTFOLIO_CACHE WHERE selection_key IN (
+            SELECT selection_key FROM PORTFOLIO_CACHE
+            WHERE selection_key != ''
+            ORDER BY built_at DESC
+            LIMIT -1 OFFSET ?
+        )
+        """,
+        (_max_selections(),),
+    )
+    return True
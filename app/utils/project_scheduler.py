@@ -0,0 +1,217 @@
+"""
+Concurrent per-project analysis for multi-project uploads.
+
+Projects in one upload are independent until their results are written, so
+run_projects() analyses several of them at once on worker threads (git, LLM and
+file I/O release the GIL; CPU-heavy code parsing fans out to parse_code_flow's
+process pool with a share of the CPUs). Admission is capped twice: by the number
+of projects in flight and by an estimate of the memory each one needs, so a few
+very large projects cannot run the machine out of memory. Projects are started
+largest first, which keeps a 30-project upload close to the time of its slowest
+few projects instead of leaving a big one for the end.
+
+All database writes of concurrent projects go through one DatabaseWriter thread,
+so SQLite only ever sees a single writer.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+from app.data.db import unit_of_work
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+PROJECT_CONCURRENCY_ENV = "ANALYSIS_PROJECT_CONCURRENCY"
+MAX_DEFAULT_PROJECT_CONCURRENCY = 4
+MEMORY_BUDGET_ENV = "ANALYSIS_MEMORY_BUDGET_MB"
+# Used when the available memory cannot be read from the OS.
+DEFAULT_MEMORY_BUDGET_BYTES = 2 * 1024 ** 3
+
+# Rough resident cost of analysing a project: a fixed overhead (git index, NLP
+# documents, parse results) plus a multiple of its source size on disk.
+PROJECT_MEMORY_BASE_BYTES = 64 * 1024 ** 2
+PROJECT_MEMORY_PER_SOURCE_BYTE = 8
+_SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv"}
+
+
+def resolve_project_concurrency(max_concurrency: Optional[int] = None) -> int:
+    """Explicit value, then ANALYSIS_PROJECT_CONCURRENCY, then min(CPU count, 4)."""
+    if max_concurrency is None:
+        raw = os.environ.get(PROJECT_CONCURRENCY_ENV, "").strip()
+        if raw.isdigit():
+            max_concurrency = int(raw)
+        else:
+            max_concurrency = min(os.cpu_count() or 1, MAX_DEFAULT_PROJECT_CONCURRENCY)
+    return max(1, int(max_concurrency))
+
+
+def _available_memory_bytes() -> Optional[int]:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def resolve_memory_budget(memory_budget: Optional[int] = None) -> int:
+    """Bytes concurrent projects may reserve: explicit, ANALYSIS_MEMORY_BUDGET_MB, or half of free memory."""
+    if memory_budget is None:
+        try:
+            memory_budget = int(os.environ[MEMORY_BUDGET_ENV]) * 1024 ** 2
+        except (KeyError, ValueError):
+            available = _available_memory_bytes()
+            memory_budget = available // 2 if available else DEFAULT_MEMORY_BUDGET_BYTES
+    return max(0, int(memory_budget))
+
+
+def estimate_project_memory(project_path: str) -> int:
+    """Memory estimate for analysing `project_path`, from the size of its files."""
+    total = 0
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS]
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return PROJECT_MEMORY_BASE_BYTES + PROJECT_MEMORY_PER_SOURCE_BYTE * total
+
+
+def parse_workers_per_project(concurrency: int) -> Optional[int]:
+    """
+    parse_code_flow workers for each of `concurrency` concurrent projects: an even
+    share of the CPUs, or None (the usual PARSE_CODE_WORKERS default) when projects
+    run one at a time or the environment already fixes the worker count.
+    """
+    from app.utils.code_analysis.parse_code_utils import PARSE_WORKERS_ENV
+
+    if concurrency <= 1 or os.environ.get(PARSE_WORKERS_ENV, "").strip():
+        return None
+    return max(1, (os.cpu_count() or 1) // concurrency)
+
+
+class DatabaseWriter:
+    """
+    Runs database writes one at a time on a dedicated thread.
+
+    run() blocks until the write has finished and returns its result (or raises
+    its exception). Calls made from the writer thread itself run inline, so a
+    write may call other helpers that also go through the writer.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._thread_id: Optional[int] = None
+
+    def _call(self, fn: Callable[..., R], args, kwargs) -> R:
+        self._thread_id = threading.get_ident()
+        # Each write is one transaction on the writer thread's pooled connection.
+        with unit_of_work():
+            return fn(*args, **kwargs)
+
+    def run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        if threading.get_ident() == self._thread_id:
+            return fn(*args, **kwargs)
+        return self._executor.submit(self._call, fn, args, kwargs).result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def write_through(writer: Optional[DatabaseWriter], fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """Call `fn` on `writer` when projects run concurrently, directly otherwise."""
+    if writer is None:
+        return fn(*args, **kwargs)
+    return writer.run(fn, *args, **kwargs)
+
+
+def run_projects(
+    items: Sequence[T],
+    work: Callable[[T, Optional[DatabaseWriter]], R],
+    max_concurrency: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    estimate: Callable[[T], int] = estimate_project_memory,
+) -> List[R]:
+    """
+    Run `work(item, writer)` for every item and return the results in input order.
+
+    With a concurrency of 1 (or a single item) the items run one after another on
+    the calling thread and `writer` is None. Otherwise items start largest
+    estimate first, at most `max_concurrency` at a time and only while the
+    estimates of running items fit in `memory_budget` (one item is always
+    admitted, however large). If an item raises, no further items are started
+    and the first exception, in input order, is re-raised once the running ones
+    have finished.
+    """
+    items = list(items)
+    concurrency = min(resolve_project_concurrency(max_concurrency), len(items))
+    if concurrency <= 1:
+        return [work(item, None) for item in items]
+
+    budget = resolve_memory_budget(memory_budget)
+    estimates = []
+    for item in items:
+        try:
+            estimates.append(max(0, int(estimate(item))))
+        except Exception:
+            estimates.append(PROJECT_MEMORY_BASE_BYTES)
+    order = sorted(range(len(items)), key=lambda i: estimates[i], reverse=True)
+
+    admission = threading.Condition()
+    state = {"running": 0, "reserved": 0, "failed": False}
+    futures: List[Optional[Future]] = [None] * len(items)
+    writer = DatabaseWriter()
+
+    def _release(index: int, future: Future) -> None:
+        with admission:
+            state["running"] -= 1
+            state["reserved"] -= estimates[index]
+            if future.exception() is not None:
+                state["failed"] = True
+            admission.notify_all()
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="project") as pool:
+            for index in order:
+                with admission:
+                    admission.wait_for(
+                        lambda: state["failed"]
+                        or state["running"] == 0
+                        or (
+                            state["running"] < concurrency
+                            and state["reserved"] + estimates[index] <= budget
+                        )
+                    )
+                    if state["failed"]:
+                        break
+                    state["running"] += 1
+                    state["reserved"] += estimates[index]
+                logger.debug(
+                    "Starting project %d/%d (estimated %d MiB)",
+                    index + 1, len(items), estimates[index] // 1024 ** 2,
+                )
+                future = pool.submit(work, items[index], writer)
+                future.add_done_callback(lambda f, i=index: _release(i, f))
+                futures[index] = future
+    finally:
+        writer.close()
+
+    results: List[R] = []
+    for future in futures:
+        if future is not None and future.exception() is not None:
+            raise future.exception()
+    for future in futures:
+        results.append(future.result())
+    return results
@@ -1,10 +1,16 @@
-from pathlib import Path
+from pathlib import Path, PurePath
 from typing import Union, List, Dict, Optional, Sequence, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import fnmatch
 import hashlib
 import json
+import os
+import re
 import time 
 from datetime import datetime
-from app.data.db import get_connection
+from app.data.db import get_connection, shared_connection, unit_of_work
+from app.utils.project_scheduler import DatabaseWriter, write_through
 from app.cli.similarity_manager import prompt_update_confirmation
 
 
@@ -88,24 +94,90 @@ EXCLUDE_PATTERNS = [
     "*.zip", "*.tar", "*.gz", "*.rar",
 ]
 
+# Path.match ignores case where the platform's paths do (Windows).
+CASE_INSENSITIVE_PATHS = os.path.normcase("A") == "a"
+
+
+class ExclusionMatcher:
+    """
+    Exclusion patterns compiled once for scanning.
+
+    A path is excluded when any of its parts equals a pattern, or when the path
+    matches a pattern in the Path.match sense. Single-component glob patterns
+    (the usual "*.pyc") are matched against the file name with one combined
+    regex, case-insensitively where Path.match is; patterns containing a
+    separator fall back to Path.match.
+    """
+
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = CASE_INSENSITIVE_PATHS):
+        patterns = [p for p in patterns if p]
+        self.names = frozenset(patterns)
+        single = [p for p in patterns if "/" not in p]
+        flags = re.IGNORECASE if ignore_case else 0
+        self._name_regex = re.compile("|".join(fnmatch.translate(p) for p in single), flags) if single else None
+        self._path_patterns = [p for p in patterns if "/" in p]
+
+    def excludes_dir(self, name: str) -> bool:
+        """True if every path below a directory called `name` is excluded."""
+        return name in self.names
+
+    def excludes_file(self, path: PurePath) -> bool:
+        """True if `path` is excluded, given that none of its parent directories is."""
+        name = path.name
+        if name in self.names:
+            return True
+        if self._name_regex is not None and self._name_regex.match(name):
+            return True
+        return any(path.match(pattern) for pattern in self._path_patterns)
+
+    def excludes(self, path: PurePath) -> bool:
+        return any(part in self.names for part in path.parts[:-1]) or self.excludes_file(path)
+
+
+@lru_cache(maxsize=32)
+def _exclusion_matcher(patterns: tuple) -> ExclusionMatcher:
+    return ExclusionMatcher(patterns)
+
+
 def should_exclude(path: Path, patterns: List[str] = EXCLUDE_PATTERNS) -> bool:
     """Return True if path matches any exclusion pattern."""
-    for pattern in patterns:
-        if path.match(pattern) or pattern in path.parts:
-            return True
-    return False
+    return _exclusion_matcher(tuple(patterns)).excludes(Path(path))
 
 def scan_project_files(root: Union[str, Path], exclude_patterns: List[str] = EXCLUDE_PATTERNS) -> List[Path]:
     """
     Recursively scan files under root, excluding files/folders matching exclude_patterns.
     Returns a list of file Paths.
+
+    Walks the tree with os.scandir in the same order as Path.rglob and does not
+    descend into excluded directories (node_modules, .venv, ...).
     """
     root_path = Path(root)
     files = []
     try:
-        for p in root_path.rglob("*"):
-            if p.is_file() and not should_exclude(p, exclude_patterns):
-                files.append(p)
+        if not root_path.is_dir():
+            return files
+        matcher = _exclusion_matcher(tuple(exclude_patterns))
+        if any(part in matcher.names for part in root_path.parts):
+            return files
+        stack = [str(root_path)]
+        while stack:
+            directory = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except PermissionError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not matcher.excludes_dir(entry.name):
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    p = Path(entry.path)
+                    if not matcher.excludes_file(p):
+                        files.append(p)
+            # Depth-first, first subdirectory on top: the order Path.rglob yields.
+            stack.extend(reversed(subdirs))
     except Exception as e:
         print(f"Error scanning files in {root}: {e}")
     return files
@@ -254,6 +326,43 @@ def extract_file_signature(file_path: Union[str, Path], project_root: Union[str,
     
     return "ERROR_SIGNATURE"
 
+
+# Files per thread-pool task when hashing signatures; smaller lists are hashed inline.
+SIGNATURE_CHUNK_SIZE = 256
+SIGNATURE_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+
+def _file_signatures_chunk(files: Sequence[Union[str, Path]], project_root: Union[str, Path], root: str) -> List[str]:
+    sigs = []
+    for f in files:
+        try:
+            p = os.path.realpath(os.path.expanduser(f))
+            rel_path = os.path.relpath(p, root)
+            if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+                raise ValueError(f"{p} is not in the subpath of {root}")
+            size = os.stat(p).st_size
+            sigs.append(hashlib.sha256(f"{rel_path}:{size}".encode()).hexdigest())
+        except (OSError, ValueError):
+            # Same retries, messages and ERROR_SIGNATURE as the single-file version.
+            sigs.append(extract_file_signature(f, project_root))
+    return sigs
+
+
+def extract_file_signatures(files: Sequence[Union[str, Path]], project_root: Union[str, Path]) -> List[str]:
+    """
+    extract_file_signature for many files, in order: the root is resolved once
+    and large lists are hashed on a thread pool (the work is mostly stat/realpath
+    system calls, which release the GIL).
+    """
+    files = list(files)
+    root = str(Path(project_root).expanduser().resolve())
+    if len(files) <= SIGNATURE_CHUNK_SIZE:
+        return _file_signatures_chunk(files, project_root, root)
+    chunks = [files[i:i + SIGNATURE_CHUNK_SIZE] for i in range(0, len(files), SIGNATURE_CHUNK_SIZE)]
+    with ThreadPoolExecutor(max_workers=min(SIGNATURE_WORKERS, len(chunks))) as pool:
+        results = pool.map(lambda chunk: _file_signatures_chunk(chunk, project_root, root), chunks)
+        return [sig for chunk_sigs in results for sig in chunk_sigs]
+
 def store_project_in_db(signature: str, name: str, path: str, file_signatures: List[str], size_bytes: int, created_at: datetime = None, last_modified: datetime = None):
     """Store project and its file signatures in the PROJECT table with actual timestamps."""
     conn = get_connection()
@@ -329,7 +438,7 @@ def persist_analyzed_file_signatures(
         conn.commit()
         conn.close()
         return
-    sigs = [extract_file_signature(f, root) for f in analyzed_files]
+    sigs = extract_file_signatures(analyzed_files, root)
     size_bytes = sum(extract_file_metadata(f)["size_bytes"] for f in analyzed_files)
     cursor.execute(
         "UPDATE PROJECT SET file_signatures = ?, size_bytes = ? WHERE project_signature = ?",
@@ -413,7 +522,24 @@ def find_similar_project(
     
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT project_signature, name, file_signatures, path, size_bytes, created_at FROM PROJECT")
+    if threshold > 0 and containment_threshold > 0:
+        # Only projects sharing at least one file can reach either threshold, so the
+        # PROJECT_FILE_SIGNATURE index narrows the exact comparison below to those
+        # candidates (kept in table order, so the first match is the same as in a full scan).
+        cursor.execute(
+            """
+            SELECT project_signature, name, file_signatures, path, size_bytes, created_at
+            FROM PROJECT
+            WHERE project_signature IN (
+                SELECT project_signature FROM PROJECT_FILE_SIGNATURE
+                WHERE file_signature IN (SELECT value FROM json_each(?))
+            )
+            ORDER BY rowid
+            """,
+            (json.dumps(sorted(set(current_signatures))),),
+        )
+    else:
+        cursor.execute("SELECT project_signature, name, file_signatures, path, size_bytes, created_at FROM PROJECT")
     projects = cursor.fetchall()
     conn.close()
     
@@ -476,23 +602,24 @@ def update_existing_project(
     print(f"[DEBUG] Old signature: {old_sig}")
     print(f"[DEBUG] New signature: {new_project_sig}")
     
-    # Delete old project
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM PROJECT WHERE project_signature = ?", (old_sig,))
-    conn.commit()
-    conn.close()
-    
-    # Store updated project (preserve original name and creation date)
-    store_project_in_db(
-        signature=new_project_sig,
-        name=match_info["project_name"],
-        path=new_path,
-        file_signatures=new_file_signatures,
-        size_bytes=new_size_bytes,
-        created_at=match_info["old_created_at"],
-        last_modified=datetime.now()
-    )
+    # Delete the old project and store the updated one in one transaction: the old row
+    # (and its analysis, by cascade) only goes away together with the new row going in.
+    with unit_of_work():
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM PROJECT WHERE project_signature = ?", (old_sig,))
+
+        # Store updated project (preserve original name and creation date)
+        store_project_in_db(
+            signature=new_project_sig,
+            name=match_info["project_name"],
+            path=new_path,
+            file_signatures=new_file_signatures,
+            size_bytes=new_size_bytes,
+            created_at=match_info["old_created_at"],
+            last_modified=datetime.now()
+        )
+        conn.close()
     
     print(f"✅ Successfully updated project '{match_info['project_name']}'")
     return new_project_sig
@@ -506,6 +633,7 @@ def run_scan_flow(
     similarity_decision: Optional[bool] = None,
     exclude_extensions: Optional[List[str]] = None,
     exclude_name_prefixes: Optional[List[str]] = None,
+    writer: Optional[DatabaseWriter] = None,
 ) -> dict:
     """
     Scans the project, stores signatures in DB, and returns analysis info.
@@ -522,7 +650,33 @@ def run_scan_flow(
             - None: prompt user via CLI
         exclude_extensions: Per-project suffixes to omit (e.g. [".md", ".pdf"]).
         exclude_name_prefixes: Per-project filename stem prefixes to omit (e.g. ["readme"]).
+        writer: DatabaseWriter of a concurrent upload. The walk, hashing and similarity
+            check run on the calling thread; only the PROJECT insert/update goes through it.
     """
+    # One pooled connection for the signature lookups, similarity check and PROJECT insert.
+    with shared_connection():
+        return _run_scan_flow(
+            root,
+            exclude=exclude,
+            similarity_threshold=similarity_threshold,
+            base_threshold=base_threshold,
+            similarity_decision=similarity_decision,
+            exclude_extensions=exclude_extensions,
+            exclude_name_prefixes=exclude_name_prefixes,
+            writer=writer,
+        )
+
+
+def _run_scan_flow(
+    root: str,
+    exclude: list = None,
+    similarity_threshold: float = None,
+    base_threshold: float = 65.0,
+    similarity_decision: Optional[bool] = None,
+    exclude_extensions: Optional[List[str]] = None,
+    exclude_name_prefixes: Optional[List[str]] = None,
+    writer: Optional[DatabaseWriter] = None,
+) -> dict:
     patterns = EXCLUDE_PATTERNS.copy()
     if exclude:
         patterns.extend(exclude)
@@ -532,13 +686,14 @@ def run_scan_flow(
         exclude_extensions=exclude_extensions,
         exclude_name_prefixes=exclude_name_prefixes,
     )
+    # Hashed once; the filtered list is a subset of the raw one.
+    raw_file_signatures = extract_file_signatures(raw_files, root)
     if not files:
         if raw_files:
             print("All files excluded by user file-type filters. Skipping analysis.")
             # Same signature as a full scan (pre user exclusions) so the API can clear
             # SKILL_ANALYSIS / DASHBOARD_DATA for the correct PROJECT row.
-            pre_exclusion_sigs = [extract_file_signature(f, root) for f in raw_files]
-            excluded_sig = get_project_signature(pre_exclusion_sigs)
+            excluded_sig = get_project_signature(raw_file_signatures)
             return {
                 "files": [],
                 "skip_analysis": True,
@@ -563,10 +718,10 @@ def run_scan_flow(
     # Extract project timestamps
     timestamps = extract_project_timestamps(root, filtered_files=files)
     
-    file_signatures = [extract_file_signature(f, root) for f in files]
+    signature_by_file = dict(zip(raw_files, raw_file_signatures))
+    file_signatures = [signature_by_file[f] for f in files]
     project_signature = get_project_signature(file_signatures)
 
-    raw_file_signatures = [extract_file_signature(f, root) for f in raw_files]
     full_project_signature = get_project_signature(raw_file_signatures)
     
     # Count files for dynamic threshold calculation
@@ -652,7 +807,9 @@ def run_scan_flow(
         
         if user_wants_update:
             # Update existing project
-            new_sig = update_existing_project(
+            new_sig = write_through(
+                writer,
+                update_existing_project,
                 match_info=match_info,
                 new_project_sig=project_signature,
                 new_file_signatures=file_signatures,
@@ -669,7 +826,9 @@ def run_scan_flow(
             }
         else:
             # Create as new project
-            store_project_in_db(
+            write_through(
+                writer,
+                store_project_in_db,
                 project_signature, 
                 name, 
                 path, 
@@ -688,7 +847,9 @@ def run_scan_flow(
             }
     
     # No similar project - store as new
-    store_project_in_db(
+    write_through(
+            writer,
+            store_project_in_db,
             project_signature, 
             name, 
             path, 
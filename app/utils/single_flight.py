@@ -0,0 +1,95 @@
+"""
+In-process single-flight deduplication.
+
+When several threads ask for the same key at once, only the first runs the
+work; the others wait and share its result (or its exception). Keys are
+forgotten once the work finishes, so a later call runs the work again - the
+callers' own caches decide what is reused after that. AsyncSingleFlight does
+the same for coroutines awaiting on one event loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Flight:
+    """One piece of work in progress that identical concurrent calls wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls per key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run `fn` unless a call for `key` is already in flight, in which case
+        wait for that call instead. Returns (result, shared), where `shared` is
+        True for callers that waited on another thread's call.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+class AsyncSingleFlight:
+    """Deduplicates concurrent awaits per key, among coroutines on the same event loop."""
+
+    def __init__(self):
+        # Futures belong to one loop, so flights are kept per (loop, key). A
+        # loop's entries are only touched from that loop's thread.
+        self._flights: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await `fn()` unless a call for `key` is already in flight on this loop,
+        in which case wait for that call instead. Returns (result, shared) like
+        SingleFlight.do().
+        """
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        flight = self._flights.get(slot)
+        if flight is not None:
+            # Shielded: a cancelled waiter must not cancel the leader's call.
+            return await asyncio.shield(flight), True
+
+        flight = self._flights[slot] = loop.create_future()
+        try:
+            result = await fn()
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception()  # retrieved here, so an unshared failure is not logged by asyncio
+            raise
+        except BaseException:
+            flight.cancel()
+            raise
+        finally:
+            self._flights.pop(slot, None)
+        flight.set_result(result)
+        return result, False
@@ -0,0 +1,153 @@
+"""
+Per-stage timing of project analysis.
+
+Code marks a stage with `with span("git_extraction") as counts:` and may
+record what the stage covered (`counts["commits"] = len(commits)`). Every
+span feeds the process-wide metrics served at /metrics; spans opened while a
+StageTimer is active (see StageTimer.activate) are also collected per
+project, for the timing breakdown in the analysis response.
+
+Spans nest: a stage's seconds exclude the spans opened inside it, e.g. the
+"llm" calls made while "analysis" runs, so a project's stages add up to
+roughly its wall time. Stages:
+
+- scan: listing and fingerprinting the project's files (run_scan_flow)
+- parse: parsing code files and reading documents
+- git_extraction: the git history index, commit records and contributors
+- nlp: local document analysis (summaries, topics, readability)
+- analysis: code metrics from parsed files or commit records
+- llm: Gemini requests, cache hits included
+- merge: merging code and document results and writing them
+- persist: the remaining writes (file signatures, collaborators)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.utils.metrics import counter, histogram
+
+STAGE_SECONDS = histogram(
+    "analysis_stage_duration_seconds",
+    "Time spent in one analysis stage span, excluding nested spans.",
+)
+STAGE_ITEMS = counter(
+    "analysis_stage_items_total",
+    "Files, documents or commits processed by analysis stages.",
+)
+PROJECT_SECONDS = histogram(
+    "analysis_project_duration_seconds",
+    "Wall time of one project's analysis.",
+)
+PROJECTS = counter(
+    "analysis_projects_total",
+    "Analysed projects by outcome.",
+)
+
+
+class _Span:
+    __slots__ = ("stage", "child_seconds")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.child_seconds = 0.0
+
+
+# Guards _Span.child_seconds: prompts run by generate_many end their spans on
+# pool threads, all adding to the same parent.
+_child_lock = threading.Lock()
+
+# (active timer, innermost open span) for the current thread or task.
+_current: ContextVar[Tuple[Optional["StageTimer"], Optional[_Span]]] = ContextVar(
+    "analysis_stage_span", default=(None, None)
+)
+
+
+class StageTimer:
+    """Stage seconds, call counts and item counts of one project's analysis."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator["StageTimer"]:
+        """Collect the spans opened in this context (and contexts copied from it) here."""
+        token = _current.set((self, None))
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def add(self, stage: str, seconds: float, counts: Dict[str, int]) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+            for unit, n in counts.items():
+                entry[unit] = entry.get(unit, 0) + n
+
+    def finish(self, status: str) -> Dict[str, Any]:
+        """Stop the clock, record the project in the metrics and return breakdown()."""
+        self.finished = time.perf_counter()
+        PROJECT_SECONDS.observe(self.finished - self.started)
+        PROJECTS.inc(status=status)
+        return self.breakdown()
+
+    def breakdown(self) -> Dict[str, Any]:
+        """{"total_seconds": ..., "stages": {stage: {"seconds", "calls", <unit>: n}}}, in stage order."""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        with self._lock:
+            stages = {
+                stage: {**entry, "seconds": round(entry["seconds"], 4)}
+                for stage, entry in self.stages.items()
+            }
+        return {"total_seconds": round(end - self.started, 4), "stages": stages}
+
+
+@contextmanager
+def span(stage: str, **counts: int) -> Iterator[Dict[str, int]]:
+    """
+    Time a stage. The yielded dict holds item counts (e.g. files=12) and can
+    be filled in inside the block; they are recorded even if it raises.
+    """
+    timer, parent = _current.get()
+    current = _Span(stage)
+    token = _current.set((timer, current))
+    started = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        elapsed = time.perf_counter() - started
+        _current.reset(token)
+        if parent is not None:
+            with _child_lock:
+                parent.child_seconds += elapsed
+        # Concurrent children (e.g. parallel LLM prompts) can overlap their parent.
+        own = max(0.0, elapsed - current.child_seconds)
+        STAGE_SECONDS.observe(own, stage=stage)
+        for unit, n in counts.items():
+            STAGE_ITEMS.inc(n, stage=stage, unit=unit)
+        if timer is not None:
+            timer.add(stage, own, counts)
+
+
+def merge_breakdowns(*breakdowns: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum project breakdowns into one, e.g. for all projects of an upload."""
+    total = 0.0
+    stages: Dict[str, Dict[str, Any]] = {}
+    for breakdown in breakdowns:
+        if not breakdown:
+            continue
+        total += breakdown.get("total_seconds", 0.0)
+        for stage, entry in breakdown.get("stages", {}).items():
+            merged = stages.setdefault(stage, {})
+            for key, value in entry.items():
+                merged[key] = merged.get(key, 0) + value
+    for entry in stages.values():
+        entry["seconds"] = round(entry.get("seconds", 0.0), 4)
+    return {"total_seconds": round(total, 4), "stages": stages}
@@ -0,0 +1,211 @@
+"""
+Size-bounded ZIP uploads.
+
+receive_zip_upload() streams the multipart body of an upload straight to disk in
+the chunks the server delivers, so memory stays flat whatever the upload size,
+and stops reading as soon as the byte limit is crossed. check_zip_archive() then
+reads the archive's central directory and rejects it, before anything is
+extracted, when it is not a ZIP or declares too many entries, too many
+uncompressed bytes, or an entry that inflates far beyond normal files (a zip
+bomb).
+
+The declared sizes are a real bound: zipfile never returns more than an entry's
+declared size, and a header that under-declares fails the CRC check with
+BadZipFile, so extraction can never write more than check_zip_archive allowed.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+MAX_UPLOAD_BYTES_ENV = "UPLOAD_MAX_BYTES"
+DEFAULT_MAX_UPLOAD_BYTES = 2 * 1024 ** 3
+MAX_UNCOMPRESSED_BYTES_ENV = "UPLOAD_MAX_UNCOMPRESSED_BYTES"
+DEFAULT_MAX_UNCOMPRESSED_BYTES = 8 * 1024 ** 3
+MAX_ENTRIES_ENV = "UPLOAD_MAX_ZIP_ENTRIES"
+DEFAULT_MAX_ENTRIES = 100_000
+MAX_COMPRESSION_RATIO_ENV = "UPLOAD_MAX_COMPRESSION_RATIO"
+DEFAULT_MAX_COMPRESSION_RATIO = 200.0
+# Small entries are not ratio-checked: tiny, very compressible files are normal.
+RATIO_CHECK_MIN_BYTES = 1024 ** 2
+# Multipart boundaries and part headers on top of the file bytes.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadRejected(ValueError):
+    """The upload is not acceptable; `status_code` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class NotAZipUpload(UploadRejected):
+    """The request carries no file, or a file without a .zip name."""
+
+
+def _limit(env_name: str, default: Union[int, float], value: Optional[Union[int, float]] = None):
+    """Explicit value, then the environment variable, then the default."""
+    if value is not None:
+        return value
+    try:
+        return type(default)(os.environ[env_name])
+    except (KeyError, ValueError):
+        return default
+
+
+def check_zip_entries(
+    infos: List[zipfile.ZipInfo],
+    max_uncompressed_bytes: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    max_ratio: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Check a ZIP's central directory entries against the extraction limits.
+
+    Returns {"entries", "compressed_bytes", "uncompressed_bytes"}; raises
+    UploadRejected (status 413) when a limit is exceeded.
+    """
+    max_uncompressed_bytes = _limit(MAX_UNCOMPRESSED_BYTES_ENV, DEFAULT_MAX_UNCOMPRESSED_BYTES, max_uncompressed_bytes)
+    max_entries = _limit(MAX_ENTRIES_ENV, DEFAULT_MAX_ENTRIES, max_entries)
+    max_ratio = _limit(MAX_COMPRESSION_RATIO_ENV, DEFAULT_MAX_COMPRESSION_RATIO, max_ratio)
+    if len(infos) > max_entries:
+        raise UploadRejected(f"ZIP has {len(infos)} entries; the limit is {max_entries}", 413)
+    compressed = uncompressed = 0
+    for info in infos:
+        compressed += info.compress_size
+        uncompressed += info.file_size
+        if uncompressed > max_uncompressed_bytes:
+            raise UploadRejected(
+                f"ZIP expands to more than {max_uncompressed_bytes} bytes", 413
+            )
+        if info.file_size >= RATIO_CHECK_MIN_BYTES and info.file_size > max_ratio * max(info.compress_size, 1):
+            raise UploadRejected(
+                f"ZIP entry '{info.filename}' inflates {info.file_size // max(info.compress_size, 1)}x; "
+                f"the limit is {max_ratio:g}x",
+                413,
+            )
+    return {"entries": len(infos), "compressed_bytes": compressed, "uncompressed_bytes": uncompressed}
+
+
+def check_zip_archive(path: Union[str, Path], **limits) -> Dict[str, int]:
+    """check_zip_entries for the archive at `path`; UploadRejected (400) if it is not a ZIP."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            infos = archive.infolist()
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError, ValueError) as exc:
+        raise UploadRejected(f"file is not a valid ZIP archive ({exc})") from exc
+    return check_zip_entries(infos, **limits)
+
+
+class _FilePartSink:
+    """python-multipart callbacks that route the `field` file part's bytes to `pending`."""
+
+    def __init__(self, field: str, max_bytes: int):
+        self.field = field
+        self.max_bytes = max_bytes
+        self.filename: Optional[str] = None
+        self.received = 0
+        self.pending: List[bytes] = []
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._header_name = b""
+        self._header_value = b""
+        self._active = False
+        self._seen = False
+
+    def on_part_begin(self) -> None:
+        self._headers = []
+        self._active = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers.append((self._header_name.lower(), self._header_value))
+        self._header_name = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        disposition = dict(self._headers).get(b"content-disposition", b"")
+        _, options = parse_options_header(disposition)
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if name != self.field or b"filename" not in options or self._seen:
+            return
+        self._seen = True
+        self.filename = options[b"filename"].decode("utf-8", "replace")
+        if not self.filename or not self.filename.lower().endswith(".zip"):
+            raise NotAZipUpload("not a .zip file")
+        self._active = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._active:
+            return
+        self.received += end - start
+        if self.received > self.max_bytes:
+            raise UploadRejected(f"upload exceeds the {self.max_bytes} byte limit", 413)
+        self.pending.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        self._active = False
+
+
+async def receive_zip_upload(
+    request: Request,
+    dest: Union[str, Path],
+    field: str = "file",
+    max_bytes: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Stream the `field` file part of a multipart request into `dest`.
+
+    Returns the uploaded file name, or None when the request has no such file
+    part (nothing is written then). Raises UploadRejected when the file is not a
+    .zip or grows past `max_bytes`; `dest` may then hold a partial file.
+    """
+    max_bytes = _limit(MAX_UPLOAD_BYTES_ENV, DEFAULT_MAX_UPLOAD_BYTES, max_bytes)
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        return None
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise UploadRejected(f"upload exceeds the {max_bytes} byte limit", 413)
+
+    sink = _FilePartSink(field, max_bytes)
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": sink.on_part_begin,
+        "on_part_data": sink.on_part_data,
+        "on_part_end": sink.on_part_end,
+        "on_header_field": sink.on_header_field,
+        "on_header_value": sink.on_header_value,
+        "on_header_end": sink.on_header_end,
+        "on_headers_finished": sink.on_headers_finished,
+    })
+    out = None
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if sink.pending:
+                if out is None:
+                    out = open(dest, "wb")
+                # At most one network chunk is held in memory at a time.
+                data, sink.pending = b"".join(sink.pending), []
+                await run_in_threadpool(out.write, data)
+        parser.finalize()
+    except MultipartParseError as exc:
+        raise UploadRejected(f"malformed multipart body ({exc})") from exc
+    finally:
+        if out is not None:
+            out.close()
+    if sink.filename is None:
+        return None
+    if out is None:
+        Path(dest).touch()
+    return sink.filename
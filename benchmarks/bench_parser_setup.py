@@ -0,0 +1,92 @@
+"""
+Per-file tree-sitter setup cost: grammar scan + classify + fresh Parser (old path)
+versus the precompiled node registry + cached parser (language_registry).
+
+Run from the repo root:
+
+    python -m benchmarks.bench_parser_setup [--files-per-language N]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from tree_sitter import Parser
+
+from app.utils.code_analysis.file_entity_utils import classify_node_types
+from app.utils.code_analysis.grammar_loader import extract_rule_names
+from app.utils.code_analysis.language_registry import get_node_types, get_ts_language, get_ts_parser
+from app.utils.code_analysis.parse_code_utils import _shared_package_dir, parse_code_flow
+
+# (tree-sitter language, file suffix, source) for the multi-language fixture.
+FIXTURE_SOURCES = [
+    ("python", ".py", "import os\n\nclass Greeter:\n    def greet(self, name):\n        return os.path.join(name)\n"),
+    ("javascript", ".js", "import fs from 'fs';\nclass A { run(x) { return fs.readFileSync(x); } }\nfunction b(y) { return y + 1; }\n"),
+    ("typescript", ".ts", "import { x } from './x';\nexport class S { get(id: number): number { return x(id); } }\n"),
+    ("java", ".java", "import java.util.List;\npublic class Main { public int size(List<String> xs) { return xs.size(); } }\n"),
+    ("go", ".go", "package main\nimport \"fmt\"\nfunc main() { fmt.Println(\"hi\") }\n"),
+    ("rust", ".rs", "use std::fmt;\nstruct P { x: i32 }\nimpl P { fn new(x: i32) -> Self { P { x } } }\n"),
+    ("c", ".c", "#include <stdio.h>\nint add(int a, int b) { return a + b; }\n"),
+    ("ruby", ".rb", "require 'json'\nclass Foo\n  def bar(x)\n    JSON.parse(x)\n  end\nend\n"),
+]
+
+
+def write_fixture(root: Path, files_per_language: int) -> list:
+    project = root / "bench_project"
+    project.mkdir()
+    paths = []
+    for language, suffix, source in FIXTURE_SOURCES:
+        for i in range(files_per_language):
+            path = project / f"{language}_{i}{suffix}"
+            path.write_text(source)
+            paths.append((language, path))
+    return paths
+
+
+def old_setup(language: str):
+    grammar_path = _shared_package_dir() / "grammars" / f"{language}.js"
+    classify_node_types(extract_rule_names(grammar_path))
+    parser = Parser()
+    parser.language = get_ts_language(language)
+    return parser
+
+
+def new_setup(language: str):
+    get_node_types(language)
+    return get_ts_parser(language)
+
+
+def time_setup(setup, files) -> float:
+    start = time.perf_counter()
+    for language, _ in files:
+        setup(language)
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--files-per-language", type=int, default=25)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_fixture(Path(tmp), args.files_per_language)
+        n = len(files)
+        # Warm both paths so one-off imports and registry load are not attributed per file.
+        for language, _, _ in FIXTURE_SOURCES:
+            old_setup(language)
+            new_setup(language)
+
+        old = time_setup(old_setup, files)
+        new = time_setup(new_setup, files)
+        print(f"{n} files, {len(FIXTURE_SOURCES)} languages")
+        print(f"per-file setup, grammar scan + new Parser: {old / n * 1e6:9.1f} us")
+        print(f"per-file setup, registry + cached Parser:  {new / n * 1e6:9.1f} us")
+
+        start = time.perf_counter()
+        results = parse_code_flow([p for _, p in files], ["bench_project"], workers=1)
+        elapsed = time.perf_counter() - start
+        print(f"parse_code_flow: {len(results)} files in {elapsed:.2f}s ({elapsed / n * 1e3:.1f} ms/file)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Read-path latency of GET /api/portfolio, GET /api/projects and GET /api/skills
+against a seeded database with thousands of analysed projects.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_portfolio_queries [--projects N] [--repeat R]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import app.data.db as dbmod
+from benchmarks.corpora import seed_database
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--projects", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dbmod.DB_PATH = Path(tmp) / "bench.sqlite3"
+        start = time.perf_counter()
+        seed_database(args.projects)
+        print(f"seeded {args.projects} projects in {time.perf_counter() - start:.1f}s")
+
+        # Imported after DB_PATH is set; the routes read it on every call.
+        from app.api.routes.projects import get_projects
+        from app.api.routes.skills import get_skills
+        from app.utils.generate_portfolio import build_portfolio_model
+
+        for label, fn in (
+            ("GET /api/portfolio (build_portfolio_model)", build_portfolio_model),
+            ("GET /api/projects", get_projects),
+            ("GET /api/skills", get_skills),
+        ):
+            print(f"{label:45s} {_time(fn, args.repeat) * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
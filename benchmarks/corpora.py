@@ -0,0 +1,257 @@
+"""
+Deterministic synthetic inputs for the benchmarks: source trees, git
+repositories, document sets and seeded SQLite databases.
+
+Every generator takes a seed and produces the same bytes (and, for git
+repositories, the same commit hashes) for the same arguments, so timings
+taken on different commits of this repository measure the same work.
+"""
+import json
+import random
+import subprocess
+from pathlib import Path
+from typing import List
+
+import app.data.db as dbmod
+
+BENCH_USER_EMAIL = "dev@example.com"
+BENCH_USER_GITHUB = "benchuser"
+
+TECH_SKILLS = [f"tech_skill_{i}" for i in range(300)]
+SOFT_SKILLS = [f"soft_skill_{i}" for i in range(40)]
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Java", "Go", "Rust", "C", "C++", "Ruby", "Kotlin"]
+
+# (file suffix, module header, function template) per language; {n} is a
+# per-function index and {name} an identifier drawn from WORDS.
+SOURCE_TEMPLATES = [
+    (".py", "import os\nimport json\n\n",
+     "def {name}_{n}(path, limit={n}):\n    \"\"\"Load {name} records.\"\"\"\n"
+     "    with open(os.path.join(path, '{name}.json')) as f:\n        data = json.load(f)\n"
+     "    return [x for x in data if x.get('size', 0) < limit]\n\n"),
+    (".js", "import fs from 'fs';\n\n",
+     "export function {name}{n}(items) {{\n  // filter {name}\n"
+     "  return items.filter((x) => x.size < {n}).map((x) => fs.existsSync(x.path));\n}}\n\n"),
+    (".ts", "import {{ readFileSync }} from 'fs';\n\n",
+     "export class {Name}{n} {{\n  load(path: string): number {{\n"
+     "    return readFileSync(path).length + {n};\n  }}\n}}\n\n"),
+    (".java", "import java.util.List;\n\n",
+     "class {Name}{n} {{\n    int count(List<String> xs) {{\n"
+     "        return xs.size() + {n};\n    }}\n}}\n\n"),
+    (".go", "package main\n\nimport \"fmt\"\n\n",
+     "func {name}{n}(xs []int) int {{\n\ttotal := {n}\n\tfor _, x := range xs {{\n"
+     "\t\ttotal += x\n\t}}\n\tfmt.Println(total)\n\treturn total\n}}\n\n"),
+    (".rs", "use std::collections::HashMap;\n\n",
+     "fn {name}_{n}(m: &HashMap<String, i32>) -> i32 {{\n"
+     "    m.values().sum::<i32>() + {n}\n}}\n\n"),
+]
+
+WORDS = (
+    "account analysis batch cache client config data document event export feature file graph "
+    "index job layout metric model parser pipeline portfolio project query record report "
+    "resume schema score session signal skill storage summary task timeline token upload user "
+    "worker"
+).split()
+
+SENTENCE_VERBS = "builds stores reports improves tracks summarises validates measures loads ranks".split()
+
+
+def _module_source(rng: random.Random, template, functions: int) -> str:
+    _, header, body = template
+    parts = [header]
+    for n in range(functions):
+        name = rng.choice(WORDS)
+        parts.append(body.format(name=name, Name=name.capitalize(), n=n))
+    return "".join(parts)
+
+
+def write_source_tree(root: Path, files: int, seed: int = 0, functions_per_file: int = 12) -> List[Path]:
+    """
+    A multi-language project of `files` source files spread over nested
+    packages, plus a README. Returns the source file paths.
+    """
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(files):
+        template = SOURCE_TEMPLATES[i % len(SOURCE_TEMPLATES)]
+        package = root / "src" / f"pkg{i % 8}" / f"mod{i % 3}"
+        package.mkdir(parents=True, exist_ok=True)
+        path = package / f"{rng.choice(WORDS)}_{i}{template[0]}"
+        path.write_text(_module_source(rng, template, rng.randint(1, functions_per_file)))
+        paths.append(path)
+    (root / "README.md").write_text(_document(rng, paragraphs=4))
+    return paths
+
+
+def write_git_repo(
+    root: Path,
+    commits: int,
+    authors: int = 3,
+    files: int = 40,
+    seed: int = 0,
+    user_share: float = 0.6,
+) -> List[Path]:
+    """
+    A git repository with `commits` commits by `authors` authors over
+    `files` source files, built with git fast-import. About `user_share` of
+    the commits are by BENCH_USER_EMAIL (author 0); authored dates are one
+    to three days apart from 2021-01-01. Returns the checked-out file paths.
+    """
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    people = [("Bench User", BENCH_USER_EMAIL)] + [
+        (f"Peer {i}", f"peer{i}@example.com") for i in range(1, max(1, authors))
+    ]
+    names = [
+        f"src/pkg{i % 4}/{WORDS[i % len(WORDS)]}_{i}{SOURCE_TEMPLATES[i % len(SOURCE_TEMPLATES)][0]}"
+        for i in range(files)
+    ]
+    sizes = [0] * files
+
+    def data(text: str) -> bytes:
+        raw = text.encode("utf-8")
+        return b"data %d\n%s\n" % (len(raw), raw)
+
+    stream = []
+    timestamp = 1609459200  # 2021-01-01T00:00:00Z
+    for mark in range(1, commits + 1):
+        timestamp += rng.randint(1, 3) * 86400
+        if len(people) == 1 or rng.random() < user_share:
+            name, email = people[0]
+        else:
+            name, email = rng.choice(people[1:])
+        touched = sorted(rng.sample(range(files), min(files, rng.randint(1, 3))))
+        message = f"{rng.choice(['feat', 'fix', 'refactor', 'test', 'docs'])}: {rng.choice(SENTENCE_VERBS)} {rng.choice(WORDS)}"
+        stream.append(b"commit refs/heads/main\nmark :%d\n" % mark)
+        stream.append(f"author {name} <{email}> {timestamp} +0000\n".encode())
+        stream.append(f"committer {name} <{email}> {timestamp} +0000\n".encode())
+        stream.append(data(message))
+        if mark > 1:
+            stream.append(b"from :%d\n" % (mark - 1))
+        for i in touched:
+            # Files grow by a few functions per change, up to ~40, then restart.
+            sizes[i] = sizes[i] + rng.randint(1, 4) if sizes[i] < 40 else 1
+            template = SOURCE_TEMPLATES[i % len(SOURCE_TEMPLATES)]
+            stream.append(f"M 100644 inline {names[i]}\n".encode())
+            stream.append(data(_module_source(random.Random(seed * 1_000_003 + i), template, sizes[i])))
+        stream.append(b"\n")
+
+    subprocess.run(["git", "-c", "init.defaultBranch=main", "init", "-q", str(root)], check=True)
+    subprocess.run(["git", "-C", str(root), "fast-import", "--quiet"], input=b"".join(stream), check=True)
+    subprocess.run(["git", "-C", str(root), "reset", "-q", "--hard", "main"], check=True)
+    return [root / name for name in names if (root / name).exists()]
+
+
+def _document(rng: random.Random, paragraphs: int) -> str:
+    out = [f"# {rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} notes\n"]
+    for _ in range(paragraphs):
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(4, 12))]
+            sentences.append(f"The {words[0]} {rng.choice(SENTENCE_VERBS)} {' '.join(words[1:])}.")
+        out.append(" ".join(sentences) + "\n")
+    return "\n".join(out)
+
+
+def write_document_set(root: Path, documents: int, seed: int = 0) -> List[Path]:
+    """`documents` Markdown and plain-text files of 2-20 paragraphs each."""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(documents):
+        path = root / f"{rng.choice(WORDS)}_{i}{'.md' if i % 2 else '.txt'}"
+        path.write_text(_document(rng, paragraphs=rng.randint(2, 20)))
+        paths.append(path)
+    return paths
+
+
+def _project_metrics(rng: random.Random, is_git: bool) -> dict:
+    metrics = {
+        "total_lines": rng.randint(50, 50_000),
+        "total_files": rng.randint(1, 800),
+        "functions": rng.randint(0, 2_000),
+        "classes": rng.randint(0, 300),
+        "components": rng.randint(0, 100),
+        "average_function_length": round(rng.uniform(3, 60), 2),
+        "average_comment_ratio": round(rng.uniform(0, 0.5), 3),
+        "completeness_score": round(rng.uniform(0, 100), 1),
+        "word_count": rng.randint(0, 20_000),
+        "languages": rng.sample(LANGUAGES, rng.randint(1, 4)),
+        "roles": ["Backend Developer"],
+        "technical_keywords": rng.sample(TECH_SKILLS, 8),
+        "complexity_analysis": {"maintainability": {"score": rng.randint(0, 100)}},
+        "code_patterns": {"design_patterns": ["Factory"], "data_structures": ["dict", "list"]},
+    }
+    if is_git:
+        metrics.update({
+            "total_commits": rng.randint(1, 2_000),
+            "code_files_changed": rng.randint(0, 500),
+            "doc_files_changed": rng.randint(0, 50),
+            "test_files_changed": rng.randint(0, 100),
+            "authors": [BENCH_USER_EMAIL],
+            "commit_patterns": {"frequency": {"commits_per_week": rng.uniform(0, 30)}},
+            "collaborators": [{"name": f"peer{rng.randint(0, 50)}", "commits": rng.randint(1, 40)}],
+        })
+    return metrics
+
+
+def _insert_bench_user(cur) -> None:
+    cur.execute(
+        "INSERT INTO USER_PREFERENCES (name, email, github_user, education, industry, job_title) "
+        "VALUES ('Bench User', ?, ?, 'BSc', 'Software', 'Engineer')",
+        (BENCH_USER_EMAIL, BENCH_USER_GITHUB),
+    )
+
+
+def seed_database(projects: int, seed: int = 0, commits_per_git_project: int = 40) -> None:
+    """Fill the current DB_PATH with `projects` analysed projects (about half of them git)."""
+    rng = random.Random(seed)
+    dbmod.init_db()
+    conn = dbmod.get_connection()
+    cur = conn.cursor()
+    _insert_bench_user(cur)
+    for i in range(projects):
+        signature = f"sig{i:06d}"
+        is_git = i % 2 == 0
+        created = f"20{20 + i % 5}-{1 + i % 12:02d}-{1 + i % 28:02d} 10:00:00"
+        cur.execute(
+            "INSERT INTO PROJECT (project_signature, name, path, score, created_at, last_modified, summary) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (signature, f"project-{i}", f"/nonexistent/project-{i}", round(rng.uniform(0, 1), 3),
+             created, created, f"Summary of project {i}."),
+        )
+        skills = [(signature, s, "technical_skill", created[:10]) for s in rng.sample(TECH_SKILLS, 15)]
+        skills += [(signature, s, "soft_skill", created[:10]) for s in rng.sample(SOFT_SKILLS, 5)]
+        cur.executemany("INSERT INTO SKILL_ANALYSIS (project_id, skill, source, date) VALUES (?, ?, ?, ?)", skills)
+        cur.executemany(
+            "INSERT INTO DASHBOARD_DATA (project_id, metric_name, metric_value) VALUES (?, ?, ?)",
+            [
+                (signature, name, json.dumps(value) if isinstance(value, (dict, list)) else value)
+                for name, value in _project_metrics(rng, is_git).items()
+            ],
+        )
+        cur.execute(
+            "INSERT INTO RESUME_SUMMARY (project_id, summary_text) VALUES (?, ?)",
+            (signature, json.dumps([f"Built feature {j} of project {i}" for j in range(3)])),
+        )
+        if is_git:
+            cur.executemany(
+                "INSERT INTO GIT_HISTORY (project_id, commit_hash, author_name, author_email, commit_date, message) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (signature, f"{i:06d}{j:04d}", "Bench User", BENCH_USER_EMAIL,
+                     f"2024-{1 + j % 12:02d}-{1 + j % 28:02d}T12:00:00", f"commit {j}")
+                    for j in range(commits_per_git_project)
+                ],
+            )
+    conn.commit()
+    conn.close()
+
+
+def seed_user() -> None:
+    """Initialise DB_PATH with just the benchmark user's preferences (the git author to analyse)."""
+    dbmod.init_db()
+    conn = dbmod.get_connection()
+    _insert_bench_user(conn.cursor())
+    conn.commit()
+    conn.close()
@@ -0,0 +1,341 @@
+"""
+Throughput of each analysis pipeline stage on deterministic synthetic inputs,
+written as JSON that can be compared across commits.
+
+Run from the repo root:
+
+    python -m benchmarks.run [--scale small|large] [--stages scan,git_parsing]
+                             [--repeat R] [--output results.json]
+                             [--baseline benchmarks/baseline.json] [--threshold 0.25]
+                             [--update-baseline]
+
+Each stage runs once untimed (imports, model loads, warm caches; reported as
+first_s) and then `repeat` timed times; median_s is what is compared. With a
+baseline of the same scale, stages whose median grew by more than
+`threshold` are reported as regressions and the exit status is 1. The
+tracked benchmarks/baseline.json holds the small scale; timings depend on
+the machine, so regenerate it with --update-baseline where results are
+compared (e.g. on the CI runner) rather than comparing across machines.
+
+The non_code stage needs NLTK's punkt tokenizer data; it is downloaded into
+app/utils/non_code_analysis/nltk_data when missing, and without it the stage
+processes nothing and is left out of --update-baseline.
+
+The inputs come from benchmarks.corpora. bench_parser_setup and
+bench_portfolio_queries remain as focused benchmarks of single code paths.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import app.data.db as dbmod
+from benchmarks import corpora
+
+RESULTS_SCHEMA = 1
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Where non_3rd_party_analysis looks for the punkt tokenizer (see the README).
+NLTK_DATA_DIR = Path(__file__).resolve().parent.parent / "app" / "utils" / "non_code_analysis" / "nltk_data"
+
+SCALES = {
+    "small": {"source_files": 120, "commits": 300, "authors": 3, "documents": 20, "projects": 300},
+    "large": {"source_files": 1500, "commits": 3000, "authors": 8, "documents": 200, "projects": 3000},
+}
+
+
+class StageCase(NamedTuple):
+    """
+    A prepared stage: `run` does the measured work on `items` inputs,
+    `processed` counts what its result covers (so a stage that silently does
+    nothing, e.g. for a missing model, is not mistaken for a fast one) and
+    `reset` (untimed) restores its starting state.
+    """
+
+    run: Callable[[], Any]
+    items: int
+    unit: str
+    processed: Callable[[Any], int] = len
+    reset: Optional[Callable[[], None]] = None
+
+
+def _use_database(path: Path) -> None:
+    dbmod.close_pooled_connections()
+    dbmod.DB_PATH = path
+    if path.exists():
+        path.unlink()
+
+
+def prepare_scan(workdir: Path, params: Dict[str, int], seed: int) -> StageCase:
+    from app.utils.scan_utils import run_scan_flow
+
+    root = workdir / "scan_project"
+    files = corpora.write_source_tree(root, params["source_files"], seed=seed)
+
+    def reset():
+        # A fresh database each time, so every run stores the project as new.
+        _use_database(workdir / "scan.sqlite3")
+        dbmod.init_db()
+
+    return StageCase(
+        run=lambda: run_scan_flow(str(root), similarity_decision=False),
+        items=len(files) + 1,
+        unit="files",
+        processed=lambda result: len(result["files"]),
+        reset=reset,
+    )
+
+
+def prepare_parse_code(workdir: Path, params: Dict[str, int], seed: int) -> StageCase:
+    from app.utils.code_analysis.parse_code_utils import parse_code_flow
+
+    root = workdir / "parse_project"
+    files = corpora.write_source_tree(root, params["source_files"], seed=seed)
+    # One worker: comparable across machines with different core counts.
+    return StageCase(run=lambda: parse_code_flow(files, [root.name], workers=1), items=len(files), unit="files")
+
+
+def prepare_git_parsing(workdir: Path, params: Dict[str, int], seed: int) -> StageCase:
+    from app.cli.git_code_parsing import run_git_parsing_from_files
+
+    files = corpora.write_git_repo(workdir / "git_repo", params["commits"], authors=params["authors"], seed=seed)
+    _use_database(workdir / "git.sqlite3")
+    corpora.seed_user()
+    return StageCase(
+        run=lambda: run_git_parsing_from_files([str(f) for f in files]),
+        items=params["commits"],
+        unit="commits",
+        processed=lambda result: len(json.loads(result)),
+    )
+
+
+def ensure_nltk_tokenizers() -> bool:
+    """
+    Download the punkt data the document analysis needs into NLTK_DATA_DIR
+    when NLTK cannot find it. Without it every document fails to tokenize
+    and the non_code stage processes nothing.
+    """
+    import nltk
+    from nltk.tokenize import punkt
+
+    # nltk 3.8.2 replaced the pickled punkt models with punkt_tab (and PunktTokenizer).
+    package = "punkt_tab" if hasattr(punkt, "PunktTokenizer") else "punkt"
+    if str(NLTK_DATA_DIR) not in nltk.data.path:
+        nltk.data.path.append(str(NLTK_DATA_DIR))
+    try:
+        nltk.data.find(f"tokenizers/{package}")
+        return True
+    except LookupError:
+        pass
+    if nltk.download(package, download_dir=str(NLTK_DATA_DIR), quiet=True):
+        return True
+    print(f"could not download NLTK {package} data; the non_code stage will process nothing", file=sys.stderr)
+    return False
+
+
+def prepare_non_code(workdir: Path, params: Dict[str, int], seed: int) -> StageCase:
+    ensure_nltk_tokenizers()
+    from app.utils.non_code_analysis.non_code_analysis_utils import pre_process_non_code_files
+    from app.utils.non_code_parsing.document_parser import parse_documents_to_json
+
+    docs = corpora.write_document_set(workdir / "documents", params["documents"], seed=seed)
+    parsed = parse_documents_to_json([str(d) for d in docs], workdir / "documents.json")
+    return StageCase(run=lambda: pre_process_non_code_files(parsed), items=len(docs), unit="documents")
+
+
+def prepare_portfolio(workdir: Path, params: Dict[str, int], seed: int) -> StageCase:
+    from app.utils.generate_portfolio import build_portfolio_model
+
+    _use_database(workdir / "portfolio.sqlite3")
+    corpora.seed_database(params["projects"], seed=seed)
+    return StageCase(
+        run=lambda: build_portfolio_model(use_cache=False),
+        items=params["projects"],
+        unit="projects",
+        processed=lambda result: len(result["projects"]),
+    )
+
+
+# Pipeline order: scan, then code / git / document parsing, then the portfolio read.
+STAGES: Dict[str, Callable[[Path, Dict[str, int], int], StageCase]] = {
+    "scan": prepare_scan,
+    "parse_code": prepare_parse_code,
+    "git_parsing": prepare_git_parsing,
+    "non_code": prepare_non_code,
+    "portfolio": prepare_portfolio,
+}
+
+
+def _timed(case: StageCase) -> Tuple[float, Any]:
+    # Stages print progress for the CLI; keep it out of the results.
+    with contextlib.redirect_stdout(io.StringIO()):
+        if case.reset:
+            case.reset()
+        start = time.perf_counter()
+        result = case.run()
+        return time.perf_counter() - start, result
+
+
+def run_stage(name: str, workdir: Path, params: Dict[str, int], seed: int, repeat: int) -> Dict[str, Any]:
+    stage_dir = workdir / name
+    stage_dir.mkdir()
+    with contextlib.redirect_stdout(io.StringIO()):
+        case = STAGES[name](stage_dir, params, seed)
+    first, result = _timed(case)
+    times = [_timed(case)[0] for _ in range(max(1, repeat))]
+    median = statistics.median(times)
+    return {
+        "items": case.items,
+        "unit": case.unit,
+        "processed": case.processed(result),
+        "first_s": round(first, 4),
+        "best_s": round(min(times), 4),
+        "median_s": round(median, 4),
+        "items_per_s": round(case.items / median, 1) if median else None,
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    root = Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(
+            ["git", "-C", str(root), "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "-C", str(root), "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {
+        "git_commit": commit,
+        "git_dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(stages: List[str], scale: str = "small", seed: int = 0, repeat: int = 3) -> Dict[str, Any]:
+    """Run `stages` at `scale` in a scratch directory and return the results document."""
+    params = SCALES[scale]
+    saved_db_path = dbmod.DB_PATH
+    results: Dict[str, Any] = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+            for name in stages:
+                results[name] = run_stage(name, Path(tmp), params, seed, repeat)
+                print(f"{name:12s} {results[name]['median_s']:9.3f}s  "
+                      f"{results[name]['items_per_s'] or 0:9.1f} {results[name]['unit']}/s", file=sys.stderr)
+    finally:
+        dbmod.close_pooled_connections()
+        dbmod.DB_PATH = saved_db_path
+    return {
+        "schema": RESULTS_SCHEMA,
+        "scale": scale,
+        "params": params,
+        "seed": seed,
+        "repeat": repeat,
+        "environment": _environment(),
+        "stages": results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Per-stage comparison of median times against `baseline`. status is
+    "regression" when the median grew by more than `threshold`, "improvement"
+    when it shrank by as much, "ok" otherwise and "incomparable" when the
+    inputs or outputs differ (scale, seed, the number of results processed,
+    or the stage is missing from the baseline).
+    """
+    same_inputs = (
+        results.get("schema") == baseline.get("schema")
+        and results.get("params") == baseline.get("params")
+        and results.get("seed") == baseline.get("seed")
+    )
+    rows = []
+    for name, stage in results["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        row = {"stage": name, "median_s": stage["median_s"], "baseline_s": base and base["median_s"], "ratio": None}
+        if (
+            not same_inputs
+            or not base
+            or not base["median_s"]
+            or (base["items"], base.get("processed")) != (stage["items"], stage.get("processed"))
+        ):
+            row["status"] = "incomparable"
+        else:
+            row["ratio"] = round(stage["median_s"] / base["median_s"], 3)
+            if row["ratio"] > 1 + threshold:
+                row["status"] = "regression"
+            elif row["ratio"] < 1 / (1 + threshold):
+                row["status"] = "improvement"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def _print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'stage':12s} {'baseline':>10s} {'current':>10s} {'ratio':>7s}  status")
+    for row in rows:
+        base = f"{row['baseline_s']:.3f}s" if row["baseline_s"] else "-"
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] else "-"
+        print(f"{row['stage']:12s} {base:>10s} {row['median_s']:9.3f}s {ratio:>7s}  {row['status']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--scale", choices=sorted(SCALES), default="small")
+    ap.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of: " + ", ".join(STAGES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--output", type=Path, help="write the results JSON here")
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    ap.add_argument("--update-baseline", action="store_true", help="write the results to --baseline")
+    args = ap.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        ap.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    results = run_benchmarks(stages, scale=args.scale, seed=args.seed, repeat=args.repeat)
+    document = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        args.output.write_text(document)
+    if args.update_baseline:
+        for name in [n for n, stage in results["stages"].items() if not stage["processed"]]:
+            print(f"not writing {name} to the baseline: it processed nothing")
+            del results["stages"][name]
+        if args.baseline.exists():
+            # Stages not rerun keep their baseline when the inputs are the same.
+            previous = json.loads(args.baseline.read_text())
+            if all(previous.get(k) == results[k] for k in ("schema", "params", "seed")):
+                results["stages"] = {**previous.get("stages", {}), **results["stages"]}
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(document, end="")
+        return 0
+    rows = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    _print_comparison(rows)
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -148,6 +148,14 @@ def test_run_analysis_non_interactive_flow(
     assert first_call.kwargs.get("similarity_decision") is False
     assert second_call.kwargs.get("similarity_decision") is True
 
+    # Per-project stage timings, summed over the upload.
+    assert list(skipped["timings"]["stages"]) == ["scan"]
+    stages = analyzed["timings"]["stages"]
+    assert list(stages) == ["scan", "parse", "nlp", "analysis", "merge", "persist"]
+    assert stages["scan"]["files"] == 1 and stages["parse"]["files"] == 1
+    assert analyzed["timings"]["total_seconds"] >= sum(entry["seconds"] for entry in stages.values()) - 1e-3
+    assert data["timings"]["stages"]["scan"]["calls"] == 2
+
 
 # Tests for /scan-project endpoint
 @patch("app.api.routes.analysis.scan_project_files")
@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.data.db as dbmod
+import app.api.routes.analysis as analysis_mod
+import app.utils.analysis_jobs as jobs_mod
+from app.api.routes.analysis import ProjectAnalysisResult, router
+from app.utils.analysis_jobs import AnalysisJobManager, load_job
+
+
+app = FastAPI()
+app.include_router(router, prefix="/api")
+client = TestClient(app)
+
+PROJECTS = ["/tmp/extracted/alpha", "/tmp/extracted/beta"]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbmod, "DB_PATH", tmp_path / "test.sqlite3")
+    monkeypatch.setenv("ANALYSIS_PROJECT_CONCURRENCY", "1")
+    dbmod.init_db()
+    manager = AnalysisJobManager(max_workers=1)
+    monkeypatch.setattr(jobs_mod, "_manager", manager)
+    monkeypatch.setattr(analysis_mod.os.path, "exists", lambda path: True)
+    monkeypatch.setattr(
+        analysis_mod,
+        "_load_projects_from_upload",
+        lambda upload_id: {"project_paths": list(PROJECTS), "extracted_dir": "/tmp/extracted"},
+    )
+    monkeypatch.setattr(analysis_mod, "check_gemini_api_key", lambda: (False, "missing"))
+    monkeypatch.setattr(analysis_mod, "cleanup_upload", lambda **kwargs: {"status": "ok"})
+    yield manager
+    manager.shutdown()
+
+
+def _result(project_path):
+    return ProjectAnalysisResult(
+        project_name=project_path.rsplit("/", 1)[-1],
+        project_path=project_path,
+        requested_analysis_type="local",
+        effective_analysis_type="local",
+        status="analyzed",
+    )
+
+
+def _fake_analyze(calls, gate=None):
+    def analyze(payload, project_path, llm_client, progress=None, **kwargs):
+        calls.append(project_path)
+        for stage in ("scanning", "parsing", "analyzing"):
+            if gate is not None:
+                gate.wait(5)
+            progress(stage)
+        return _result(project_path)
+    return analyze
+
+
+def _wait_for_status(manager, job_id, statuses, timeout=10):
+    deadline = time.monotonic() + timeout
+    job = manager.get(job_id)
+    while job["status"] not in statuses and time.monotonic() < deadline:
+        job = manager.wait_for_change(job_id, job["version"], timeout=0.5)
+    return job
+
+
+def test_job_runs_projects_and_reports_progress(manager, monkeypatch):
+    calls = []
+    monkeypatch.setattr(analysis_mod, "_analyze_project", _fake_analyze(calls))
+
+    response = client.post("/api/analysis/jobs", json={"upload_id": "upload-1"})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    _wait_for_status(manager, job_id, {"completed"})
+    data = client.get(f"/api/analysis/jobs/{job_id}").json()
+
+    assert data["status"] == "completed"
+    assert calls == PROJECTS
+    assert [p["stage"] for p in data["projects"]] == ["done", "done"]
+    assert data["result"]["analyzed_projects"] == 2
+    # Persisted, so the status survives a new manager / process.
+    assert load_job(job_id)["status"] == "completed"
+    # Finished jobs are not kept in memory; reads fall back to ANALYSIS_JOB.
+    assert job_id not in manager._jobs
+    assert manager.get(job_id)["result"]["analyzed_projects"] == 2
+    assert client.post(f"/api/analysis/jobs/{job_id}/cancel").json()["status"] == "completed"
+
+
+def test_job_events_stream_ends_with_final_snapshot(manager, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(analysis_mod, "_analyze_project", _fake_analyze([], gate))
+    job_id = client.post("/api/analysis/jobs", json={"upload_id": "upload-1"}).json()["job_id"]
+    # Keep the job running until the stream is open.
+    threading.Timer(0.2, gate.set).start()
+
+    body = client.get(f"/api/analysis/jobs/{job_id}/events").text
+
+    assert "event: progress" in body
+    assert body.rstrip().split("\n\n")[-1].startswith("event: end")
+    assert '"status": "completed"' in body.rstrip().split("\n\n")[-1]
+
+
+def test_cancel_stops_job_before_next_stage(manager, monkeypatch):
+    gate = threading.Event()
+    calls = []
+    monkeypatch.setattr(analysis_mod, "_analyze_project", _fake_analyze(calls, gate))
+
+    job_id = client.post("/api/analysis/jobs", json={"upload_id": "upload-1"}).json()["job_id"]
+    _wait_for_status(manager, job_id, {"running"})
+    assert client.post(f"/api/analysis/jobs/{job_id}/cancel").json()["cancel_requested"] is True
+    gate.set()
+
+    job = _wait_for_status(manager, job_id, {"cancelled", "completed", "failed"})
+    assert job["status"] == "cancelled"
+    assert calls == PROJECTS[:1]
+
+
+def test_unknown_job_returns_404(manager):
+    assert client.get("/api/analysis/jobs/nope").status_code == 404
+    assert client.post("/api/analysis/jobs/nope/cancel").status_code == 404
+
+
+def test_resume_skips_projects_finished_before_restart(manager, monkeypatch):
+    job = {
+        "job_id": "interrupted",
+        "upload_id": "upload-1",
+        "payload": {"upload_id": "upload-1"},
+        "status": "running",
+        "projects": [
+            {"project_name": "alpha", "project_path": PROJECTS[0], "stage": "done",
+             "status": "analyzed", "result": _result(PROJECTS[0]).model_dump()},
+            {"project_name": "beta", "project_path": PROJECTS[1], "stage": "parsing",
+             "status": "running", "result": None},
+        ],
+        "result": None,
+        "error": None,
+        "cancel_requested": False,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+    }
+    jobs_mod.save_job(job)
+    calls = []
+    monkeypatch.setattr(analysis_mod, "_analyze_project", _fake_analyze(calls))
+
+    assert analysis_mod.resume_analysis_jobs() == ["interrupted"]
+    resumed = _wait_for_status(manager, "interrupted", {"completed", "failed"})
+
+    assert resumed["status"] == "completed"
+    assert calls == PROJECTS[1:]
+    assert resumed["result"]["analyzed_projects"] == 2
+
+
+def test_seeded_job_payload_is_a_valid_request(manager):
+    dbmod.seed_db()
+    payload = load_job("seed_job")["payload"]
+    assert set(payload) <= set(analysis_mod.AnalyzeUploadRequest.model_fields)
+    assert analysis_mod.AnalyzeUploadRequest(**payload).upload_id == "seed_upload"
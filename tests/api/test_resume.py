@@ -5,7 +5,10 @@ from unittest.mock import patch, MagicMock
 from app.api.routes.resume import router, compile_pdf, get_or_compile_pdf
 from app.utils.generate_resume import ResumeServiceError, ResumeNotFoundError, ResumePersistenceError
 from app.api.routes import resume as resume_mod
+from app.utils import pdf_cache
+from concurrent.futures import ThreadPoolExecutor
 import os
+import time
 
 @pytest.fixture
 def client():
@@ -245,6 +248,73 @@ def test_get_or_compile_pdf_cache(tmp_path, monkeypatch):
         mock_compile2.assert_not_called()
 
 
+def test_concurrent_exports_share_one_compile(tmp_path, monkeypatch):
+    """N simultaneous exports of one resume run pdflatex once and all get the PDF."""
+    monkeypatch.setattr(resume_mod, "PDF_CACHE_DIR", str(tmp_path))
+    pdf_cache.reset_pdf_cache_stats()
+    compiles = []
+
+    def slow_compile(tex):
+        compiles.append(tex)
+        time.sleep(0.2)
+        return b"%PDF-1.4 shared"
+
+    monkeypatch.setattr(resume_mod, "compile_pdf", slow_compile)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: get_or_compile_pdf("SAME TEX"), range(8)))
+
+    assert compiles == ["SAME TEX"]
+    assert results == [b"%PDF-1.4 shared"] * 8
+    assert [p.name for p in tmp_path.iterdir()] == [f"{resume_mod.tex_hash('SAME TEX')}.pdf"]
+
+    get_or_compile_pdf("SAME TEX")
+    stats = pdf_cache.pdf_cache_stats(str(tmp_path))
+    assert stats["compiles"] == 1
+    assert stats["hits"] + stats["misses"] == 9 and stats["hits"] >= 1
+    assert stats["entries"] == 1 and stats["bytes"] == len(b"%PDF-1.4 shared")
+
+
+def test_failed_compile_is_shared_and_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_mod, "PDF_CACHE_DIR", str(tmp_path))
+    with patch("app.api.routes.resume.compile_pdf", side_effect=HTTPException(422, "bad")) as mock_compile:
+        with pytest.raises(HTTPException):
+            get_or_compile_pdf("BROKEN")
+        with pytest.raises(HTTPException):
+            get_or_compile_pdf("BROKEN")
+    assert mock_compile.call_count == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pdf_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_mod, "PDF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv(pdf_cache.PDF_CACHE_MAX_ENTRIES_ENV, "2")
+    monkeypatch.setattr(resume_mod, "compile_pdf", lambda tex: f"%PDF {tex}".encode())
+
+    def cached(tex):
+        return (tmp_path / f"{resume_mod.tex_hash(tex)}.pdf").exists()
+
+    get_or_compile_pdf("A")
+    get_or_compile_pdf("B")
+    os.utime(tmp_path / f"{resume_mod.tex_hash('A')}.pdf", (1, 1))
+    os.utime(tmp_path / f"{resume_mod.tex_hash('B')}.pdf", (2, 2))
+    get_or_compile_pdf("A")  # hit: A becomes most recently used
+    get_or_compile_pdf("C")
+    assert (cached("A"), cached("B"), cached("C")) == (True, False, True)
+
+    # The byte budget applies too: only the newest PDF fits in 10 bytes.
+    os.utime(tmp_path / f"{resume_mod.tex_hash('A')}.pdf", (3, 3))
+    os.utime(tmp_path / f"{resume_mod.tex_hash('C')}.pdf", (4, 4))
+    assert pdf_cache.evict(str(tmp_path), max_bytes=10, max_entries=10) == 1
+    assert (cached("A"), cached("C")) == (False, True)
+
+
+def test_pdf_cache_stats_endpoint(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_mod, "PDF_CACHE_DIR", str(tmp_path))
+    response = client.get("/resume/export/pdf/cache-stats")
+    assert response.status_code == 200
+    assert {"hits", "misses", "compiles", "hit_ratio", "entries", "bytes"} <= set(response.json())
+
+
 @patch("app.api.routes.resume.remove_project_from_resume")
 def test_delete_project_from_resume_success(mock_remove, client):
     """Verify DELETE /resume/{resume_id}/project/{project_id} successfully removes a project from a resume."""
@@ -1,10 +1,30 @@
+import io
 import os
+import zipfile
+
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 import app.api.routes.upload_page as upload_module
 from app.api.routes.upload_page import router
 
 
+def _zip_bytes(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _client(tmp_path, monkeypatch):
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+    monkeypatch.setattr(upload_module, "UPLOAD_DIR", str(upload_dir))
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), upload_dir
+
+
 def test_upload_page_renders():
     app = FastAPI()
     app.include_router(router)
@@ -33,9 +53,10 @@ def test_upload_file_success(tmp_path, monkeypatch):
     app.include_router(router)
     client = TestClient(app)
 
-    # Create fake file-like ZIP data
+    # Create a small ZIP archive in memory
+    zip_bytes = _zip_bytes({"project/main.py": b"print('hello')"})
     files = {
-        "file": ("test.zip", b"dummy zip contents", "application/zip")
+        "file": ("test.zip", zip_bytes, "application/zip")
     }
 
     resp = client.post("/upload-file", files=files)
@@ -49,7 +70,8 @@ def test_upload_file_success(tmp_path, monkeypatch):
     upload_id = data["upload_id"]
     saved_path = upload_dir / f"{upload_id}.zip"
     assert saved_path.exists()
-    assert saved_path.read_bytes() == b"dummy zip contents"
+    assert saved_path.read_bytes() == zip_bytes
+    assert os.listdir(upload_dir) == [f"{upload_id}.zip"]
 
 
 def test_upload_file_invalid_extension(tmp_path, monkeypatch):
@@ -90,3 +112,52 @@ def test_upload_file_missing_file():
 
     assert resp.status_code == 400
     assert "Please upload a ZIP file" in resp.text
+
+
+def test_upload_file_rejects_invalid_zip_content(tmp_path, monkeypatch):
+    client, upload_dir = _client(tmp_path, monkeypatch)
+
+    resp = client.post("/upload-file", files={"file": ("test.zip", b"dummy zip contents", "application/zip")})
+
+    assert resp.status_code == 400
+    assert "not a valid ZIP archive" in resp.text
+    assert os.listdir(upload_dir) == []
+
+
+def test_upload_file_enforces_byte_limit(tmp_path, monkeypatch):
+    client, upload_dir = _client(tmp_path, monkeypatch)
+    monkeypatch.setenv("UPLOAD_MAX_BYTES", "1000")
+    zip_bytes = _zip_bytes({"data.bin": os.urandom(4000)})
+
+    resp = client.post("/upload-file", files={"file": ("big.zip", zip_bytes, "application/zip")})
+
+    assert resp.status_code == 413
+    assert "byte limit" in resp.text
+    assert os.listdir(upload_dir) == []
+
+    # Chunked body without Content-Length: the limit is enforced while streaming.
+    boundary = "limit-boundary"
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="big.zip"\r\n'
+        f"Content-Type: application/zip\r\n\r\n"
+    ).encode() + zip_bytes + f"\r\n--{boundary}--\r\n".encode()
+    resp = client.post(
+        "/upload-file",
+        content=(body[i:i + 512] for i in range(0, len(body), 512)),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert resp.status_code == 413
+    assert os.listdir(upload_dir) == []
+
+
+def test_upload_file_rejects_zip_bomb(tmp_path, monkeypatch):
+    client, upload_dir = _client(tmp_path, monkeypatch)
+    # 64 MiB of zeros deflates to about 64 KiB: far past the compression-ratio limit.
+    zip_bytes = _zip_bytes({"zeros.txt": bytes(64 * 1024 * 1024)})
+
+    resp = client.post("/upload-file", files={"file": ("bomb.zip", zip_bytes, "application/zip")})
+
+    assert resp.status_code == 413
+    assert "inflates" in resp.text
+    assert os.listdir(upload_dir) == []
@@ -0,0 +1,111 @@
+"""
+A local stand-in for the Gemini generateContent REST endpoint.
+
+It answers on 127.0.0.1 with a configurable reply, can add latency to every
+request and fail the next requests with a given status (429s with a
+retryDelay, 500s, 400s) or body, and records what it was sent and the most requests
+it had in flight at once.
+"""
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.client import llm_client
+
+
+class FakeGeminiServer:
+    def __init__(self, reply=None, latency=0.0):
+        self.reply = reply or (lambda prompt: f"• Response number {len(self.requests)} for a prompt of {len(prompt)} chars")
+        self.latency = latency
+        self.requests = []
+        self.failures = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, status, times=1, retry_delay=None, message="injected failure"):
+        error = {"code": status, "message": message}
+        if retry_delay is not None:
+            error["details"] = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{retry_delay}s"}]
+        self.respond_next(status, {"error": error}, times=times)
+
+    def respond_next(self, status, payload, times=1):
+        """Answer the next requests with `payload` (any JSON value) instead of a reply."""
+        self.failures.extend([(status, payload)] * times)
+
+    def _respond(self, model, body, api_key):
+        with self._lock:
+            self.requests.append((model, body, api_key))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            with self._lock:
+                failure = self.failures.pop(0) if self.failures else None
+            if failure:
+                return failure
+            text = self.reply(body["contents"][0]["parts"][0]["text"])
+            return 200, {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}]}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                match = re.fullmatch(r"/v1beta/models/([^/:]+):generateContent", self.path)
+                if not match:
+                    status, payload = 404, {"error": {"code": 404, "message": "not found"}}
+                else:
+                    status, payload = fake._respond(match.group(1), body, self.headers.get("x-goog-api-key"))
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@contextmanager
+def fake_gemini_backend(monkeypatch, **kwargs):
+    """Point the Gemini client at a FakeGeminiServer, with fast retries and no rate limit."""
+    server = FakeGeminiServer(**kwargs).start()
+    monkeypatch.setenv(llm_client.GEMINI_API_BASE_URL_ENV, server.url)
+    monkeypatch.setenv(llm_client.GEMINI_BACKOFF_BASE_ENV, "0.01")
+    monkeypatch.setenv(llm_client.GEMINI_REQUESTS_PER_MINUTE_ENV, "0")
+    llm_client.reset_gemini_runtime()
+    try:
+        yield server
+    finally:
+        llm_client.reset_gemini_runtime()
+        server.stop()
@@ -0,0 +1,120 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from app.data import db as dbmod
+from app.data.db import unit_of_work
+from app.data.analysis_store import git_history_rows
+from app.utils.analysis_merger_utils import store_results_in_db
+from app.utils.scan_utils import store_project_in_db, update_existing_project
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "analysis_store.sqlite3"
+    monkeypatch.setattr(dbmod, "DB_PATH", path)
+    dbmod.init_db()
+    yield path
+    dbmod.close_pooled_connections()
+
+
+def _results(tag, metrics=None):
+    return {
+        "summary": f"Summary {tag}.",
+        "skills": {"technical_skills": [f"Python {tag}", "SQL"], "soft_skills": ["Teamwork"]},
+        "resume_bullets": [f"Built {tag}."],
+        "metrics": metrics if metrics is not None else {"total_lines": 100, "languages": ["Python"]},
+    }
+
+
+def _commits(n):
+    return [
+        {"hash": f"h{i}", "authored_datetime": f"2024-01-{1 + i % 28:02d}T10:00:00", "author_name": "Dev",
+         "author_email": "dev@example.com", "message_summary": f"commit {i}"}
+        for i in range(n)
+    ] + [{"hash": "no-date"}]
+
+
+def _snapshot(db_path, signature):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(
+                f"SELECT * FROM {table} WHERE {key} = ? ORDER BY 1", (signature,)
+            ).fetchall()
+            for table, key in (
+                ("PROJECT", "project_signature"),
+                ("SKILL_ANALYSIS", "project_id"),
+                ("RESUME_SUMMARY", "project_id"),
+                ("DASHBOARD_DATA", "project_id"),
+                ("GIT_HISTORY", "project_id"),
+            )
+        }
+    finally:
+        conn.close()
+
+
+def test_git_history_rows_keep_commits_with_hash_and_date():
+    rows = git_history_rows("p1", _commits(2) + ["not a commit"])
+    assert rows == [
+        ("p1", "h0", "Dev", "dev@example.com", "2024-01-01T10:00:00", "commit 0"),
+        ("p1", "h1", "Dev", "dev@example.com", "2024-01-02T10:00:00", "commit 1"),
+    ]
+
+
+def test_rewrite_replaces_every_analysis_table(db_path):
+    store_results_in_db("Project", _results("one"), 0.5, "p1", git_commits=_commits(3))
+    store_results_in_db("Project", _results("two"), 0.6, "p1", git_commits=_commits(2))
+
+    snapshot = _snapshot(db_path, "p1")
+    assert len(snapshot["PROJECT"]) == 1
+    assert sorted(row[2] for row in snapshot["SKILL_ANALYSIS"]) == ["Python two", "SQL", "Teamwork"]
+    assert [row[2] for row in snapshot["RESUME_SUMMARY"]] == ['["Built two."]']
+    assert sorted(row[2] for row in snapshot["DASHBOARD_DATA"]) == ["languages", "total_lines"]
+    assert [row[2] for row in snapshot["GIT_HISTORY"]] == ["h0", "h1"]
+
+    # Without commits the project's git history is cleared, as before.
+    store_results_in_db("Project", _results("three"), 0.6, "p1")
+    assert _snapshot(db_path, "p1")["GIT_HISTORY"] == []
+
+
+def test_failed_write_keeps_previous_analysis(db_path):
+    store_results_in_db("Project", _results("one"), 0.5, "p1", git_commits=_commits(3))
+    before = _snapshot(db_path, "p1")
+
+    # The unbindable metric fails after PROJECT, skills and the resume summary were written.
+    with pytest.raises(sqlite3.Error):
+        store_results_in_db("Renamed", _results("two", {"bad": object()}), 0.9, "p1", git_commits=_commits(1))
+
+    assert _snapshot(db_path, "p1") == before
+
+
+def test_failed_write_inside_outer_unit_is_rolled_back(db_path):
+    store_results_in_db("Project", _results("one"), 0.5, "p1", git_commits=_commits(3))
+    before = _snapshot(db_path, "p1")
+
+    # As a project analysis does: the caller reports the failure and its unit carries on.
+    with unit_of_work():
+        store_results_in_db("Other", _results("other"), 0.4, "p2")
+        with pytest.raises(sqlite3.Error):
+            store_results_in_db("Renamed", _results("two", {"bad": object()}), 0.9, "p1", git_commits=_commits(1))
+
+    assert _snapshot(db_path, "p1") == before
+    assert _snapshot(db_path, "p2")["PROJECT"][0][1] == "Other"
+
+
+def test_update_existing_project_is_atomic(db_path):
+    store_project_in_db("old", "Project", "/p/old", ["a", "b"], 10)
+    store_results_in_db("Project", _results("one"), 0.5, "old")
+    before = _snapshot(db_path, "old")
+    match_info = {"project_name": "Project", "old_project_signature": "old", "old_created_at": "2024-01-01"}
+
+    with patch("app.utils.scan_utils.store_project_in_db", side_effect=sqlite3.OperationalError("disk I/O error")):
+        with pytest.raises(sqlite3.OperationalError):
+            update_existing_project(match_info, "new", ["a", "c"], "/p/new", 20)
+    assert _snapshot(db_path, "old") == before
+
+    assert update_existing_project(match_info, "new", ["a", "c"], "/p/new", 20) == "new"
+    assert _snapshot(db_path, "old")["PROJECT"] == []
+    assert _snapshot(db_path, "new")["PROJECT"][0][1] == "Project"
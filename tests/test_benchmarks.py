@@ -0,0 +1,93 @@
+"""
+Tests for the benchmark corpora and runner (benchmarks/): generators must be
+deterministic for results to be comparable across commits.
+"""
+import subprocess
+
+import app.data.db as dbmod
+from benchmarks import corpora, run
+
+
+def _read_tree(root):
+    return {str(p.relative_to(root)): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_generators_are_deterministic(tmp_path):
+    for name in ("a", "b"):
+        corpora.write_source_tree(tmp_path / name / "src_tree", 12, seed=3)
+        corpora.write_document_set(tmp_path / name / "docs", 4, seed=3)
+        corpora.write_git_repo(tmp_path / name / "repo", 20, authors=2, files=5, seed=3)
+
+    for part in ("src_tree", "docs"):
+        assert _read_tree(tmp_path / "a" / part) == _read_tree(tmp_path / "b" / part)
+    heads = [
+        subprocess.run(["git", "-C", str(tmp_path / n / "repo"), "rev-parse", "HEAD"], capture_output=True, text=True).stdout
+        for n in ("a", "b")
+    ]
+    assert heads[0] == heads[1] and len(heads[0].strip()) == 40
+
+    other = corpora.write_document_set(tmp_path / "c", 4, seed=4)
+    assert [p.read_text() for p in other] != [p.read_text() for p in sorted((tmp_path / "a" / "docs").iterdir())]
+
+
+def test_git_repo_has_the_requested_shape(tmp_path):
+    corpora.write_git_repo(tmp_path / "repo", 30, authors=3, files=6, seed=0)
+    log = subprocess.run(
+        ["git", "-C", str(tmp_path / "repo"), "log", "--format=%ae"], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert len(log) == 30
+    assert corpora.BENCH_USER_EMAIL in log and len(set(log)) == 3
+
+
+def test_run_stage_reports_timings(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbmod, "DB_PATH", dbmod.DB_PATH)
+    try:
+        result = run.run_stage("scan", tmp_path, {"source_files": 10}, seed=0, repeat=2)
+    finally:
+        dbmod.close_pooled_connections()
+    assert result["items"] == result["processed"] == 11
+    assert result["unit"] == "files"
+    assert 0 < result["best_s"] <= result["median_s"]
+
+
+def test_compare_flags_regressions():
+    def doc(**medians):
+        return {
+            "schema": run.RESULTS_SCHEMA,
+            "params": run.SCALES["small"],
+            "seed": 0,
+            "stages": {
+                name: {"median_s": m, "items": 10, "processed": 10} for name, m in medians.items()
+            },
+        }
+
+    rows = run.compare(doc(scan=1.5, parse_code=1.0, portfolio=0.5, non_code=1.0), doc(scan=1.0, parse_code=1.1, portfolio=1.0))
+    assert {r["stage"]: r["status"] for r in rows} == {
+        "scan": "regression",
+        "parse_code": "ok",
+        "portfolio": "improvement",
+        "non_code": "incomparable",
+    }
+    other_seed = dict(doc(scan=1.0), seed=1)
+    assert run.compare(doc(scan=1.0), other_seed)[0]["status"] == "incomparable"
+
+
+def test_missing_nltk_tokenizer_is_downloaded(tmp_path, monkeypatch, capsys):
+    import nltk
+
+    monkeypatch.setattr(run, "NLTK_DATA_DIR", tmp_path / "nltk_data")
+    monkeypatch.setattr(nltk.data, "path", list(nltk.data.path))
+
+    def find(resource):
+        raise LookupError(resource)
+
+    downloads = []
+    monkeypatch.setattr(nltk.data, "find", find)
+    monkeypatch.setattr(nltk, "download", lambda package, download_dir, quiet: downloads.append((package, download_dir)) or True)
+    assert run.ensure_nltk_tokenizers() is True
+    assert downloads and downloads[0][1] == str(tmp_path / "nltk_data")
+    assert str(tmp_path / "nltk_data") in nltk.data.path
+
+    monkeypatch.setattr(nltk, "download", lambda package, download_dir, quiet: False)
+    assert run.ensure_nltk_tokenizers() is False
+    assert "non_code stage will process nothing" in capsys.readouterr().err
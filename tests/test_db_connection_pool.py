@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+
+from app.data import db as dbmod
+from app.data.db import get_connection, shared_connection, unit_of_work
+
+
+@pytest.fixture
+def isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbmod, "DB_PATH", tmp_path / "pool.sqlite3")
+    dbmod.init_db()
+    yield
+    dbmod.close_pooled_connections()
+
+
+def _project_count():
+    conn = get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM PROJECT").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _insert_project(conn, signature):
+    conn.execute(
+        "INSERT INTO PROJECT (project_signature, name, path) VALUES (?, ?, ?)",
+        (signature, signature, "/tmp/" + signature),
+    )
+
+
+def test_connections_are_reused_and_tuned(isolated_db):
+    first = get_connection()
+    raw = first.connection
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert first.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert first.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert first.execute("PRAGMA busy_timeout").fetchone()[0] == dbmod.BUSY_TIMEOUT_MS
+    first.close()
+
+    second = get_connection()
+    assert second.connection is raw
+    second.close()
+
+
+def test_close_discards_uncommitted_changes(isolated_db):
+    conn = get_connection()
+    _insert_project(conn, "uncommitted")
+    conn.close()
+
+    assert _project_count() == 0
+    with pytest.raises(Exception):
+        conn.execute("SELECT 1")
+
+
+def test_unit_of_work_shares_one_connection_and_commits(isolated_db):
+    with unit_of_work() as uow:
+        inner = get_connection()
+        assert inner.connection is uow.connection
+        _insert_project(inner, "p1")
+        inner.close()  # no-op inside the unit
+        _insert_project(get_connection(), "p2")
+
+    assert _project_count() == 2
+
+
+def test_unit_of_work_rolls_back_on_error(isolated_db):
+    with pytest.raises(RuntimeError):
+        with unit_of_work() as conn:
+            _insert_project(conn, "p1")
+            raise RuntimeError("boom")
+
+    assert _project_count() == 0
+
+
+def test_commits_inside_unit_of_work_are_deferred_to_its_end(isolated_db):
+    def helper(signature):
+        # A helper that commits its own write, as the legacy store functions do.
+        conn = get_connection()
+        _insert_project(conn, signature)
+        conn.commit()
+        conn.close()
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            helper("p1")
+            with get_connection() as conn:
+                _insert_project(conn, "p2")
+            raise RuntimeError("boom")
+
+    assert _project_count() == 0
+
+
+def test_rollback_inside_unit_of_work_keeps_changes_made_before_it(isolated_db):
+    with shared_connection() as conn:
+        _insert_project(conn, "before")
+        with unit_of_work():
+            inner = get_connection()
+            _insert_project(inner, "inside")
+            inner.rollback()
+            _insert_project(inner, "after-rollback")
+
+    assert _project_count() == 2
+
+
+def test_shared_connection_commits_only_what_callers_commit(isolated_db):
+    with pytest.raises(RuntimeError):
+        with shared_connection() as shared:
+            conn = get_connection()
+            assert conn.connection is shared.connection
+            _insert_project(conn, "committed")
+            conn.commit()
+            _insert_project(conn, "pending")
+            raise RuntimeError("boom")
+
+    assert _project_count() == 1
+
+    with shared_connection() as conn:
+        _insert_project(conn, "left-uncommitted")
+    assert _project_count() == 1
+
+
+def test_readers_do_not_block_behind_open_write_transaction(isolated_db):
+    writing = threading.Event()
+    done = threading.Event()
+
+    def writer():
+        with unit_of_work() as conn:
+            _insert_project(conn, "in-flight")
+            writing.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert writing.wait(5)
+        # WAL: the reader sees the last committed state instead of waiting for the writer.
+        assert _project_count() == 0
+    finally:
+        done.set()
+        thread.join()
+
+    assert _project_count() == 1
@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+
+from app.data import db as dbmod
+from app.utils.generate_portfolio import load_project_metrics
+
+ANALYSIS_INDEXES = {
+    "idx_skill_analysis_project",
+    "idx_skill_analysis_skill",
+    "idx_dashboard_data_project",
+    "idx_dashboard_data_metric",
+    "idx_resume_summary_project",
+    "idx_git_history_project",
+}
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "migrations.sqlite3"
+    monkeypatch.setattr(dbmod, "DB_PATH", path)
+    yield path
+    dbmod.close_pooled_connections()
+
+
+def _index_names(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_fresh_database_is_at_current_schema_version(db_path):
+    dbmod.init_db()
+    dbmod.init_db()  # idempotent
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == dbmod.SCHEMA_VERSION
+        assert ANALYSIS_INDEXES <= _index_names(conn)
+    finally:
+        conn.close()
+
+
+def test_migration_upgrades_dashboard_data_without_metric_number(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE DASHBOARD_DATA (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id TEXT,
+            metric_name TEXT,
+            metric_value TEXT,
+            chart_type TEXT DEFAULT NONE,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO DASHBOARD_DATA (project_id, metric_name, metric_value) VALUES ('p1', 'total_lines', '1200');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    dbmod.init_db()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == dbmod.SCHEMA_VERSION
+        assert ANALYSIS_INDEXES <= _index_names(conn)
+        assert conn.execute("SELECT metric_number FROM DASHBOARD_DATA").fetchone()[0] == 1200
+    finally:
+        conn.close()
+
+
+def test_metric_number_types_numeric_metrics_only(db_path):
+    dbmod.init_db()
+    conn = sqlite3.connect(db_path)
+    rows = [
+        ("p1", "total_lines", "1200"),
+        ("p1", "average_comment_ratio", "0.25"),
+        ("p1", "languages", '["Python"]'),
+        ("p1", "total_commits", "not a number"),
+    ]
+    conn.executemany("INSERT INTO DASHBOARD_DATA (project_id, metric_name, metric_value) VALUES (?, ?, ?)", rows)
+    conn.commit()
+    try:
+        typed = dict(conn.execute("SELECT metric_name, metric_number FROM DASHBOARD_DATA").fetchall())
+        assert typed == {
+            "total_lines": 1200,
+            "average_comment_ratio": 0.25,
+            "languages": None,
+            "total_commits": None,
+        }
+        metrics = load_project_metrics(conn.cursor())["p1"]
+    finally:
+        conn.close()
+
+    assert metrics["total_lines"] == 1200
+    assert metrics["average_comment_ratio"] == 0.25
+    assert metrics["languages"] == ["Python"]
+    # Non-numeric text keeps the previous fallback of returning the raw value.
+    assert metrics["total_commits"] == "not a number"
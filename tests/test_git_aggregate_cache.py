@@ -0,0 +1,159 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from git import Actor, Repo
+
+import app.cli.git_code_parsing as git_code_parsing
+import app.data.db as dbmod
+from app.utils import git_aggregate_cache
+from app.utils.code_analysis.code_analysis_utils import (
+    aggregate_github_individual_metrics,
+    analyze_github_development_patterns,
+    analyze_github_project,
+)
+
+
+ALICE = Actor("Alice", "alice@example.com")
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbmod, "DB_PATH", tmp_path / "test.sqlite3")
+    dbmod.init_db()
+    monkeypatch.setattr(
+        git_code_parsing,
+        "_get_preferred_author_email",
+        lambda: ("alice", "alice@example.com"),
+    )
+
+
+def _commit(repo: Repo, root: Path, name: str, content: str, message: str):
+    (root / name).write_text(content)
+    repo.index.add([name])
+    repo.index.commit(message, author=ALICE, committer=ALICE)
+
+
+def _make_repo(root: Path) -> Repo:
+    root.mkdir()
+    repo = Repo.init(root)
+    _commit(repo, root, "app.py", "print('a')\n", "Initial commit")
+    _commit(repo, root, "test_app.py", "def test_a():\n    pass\n", "test: add tests")
+    return repo
+
+
+def test_incremental_parsing_only_extracts_new_commits(tmp_path, temp_db, monkeypatch):
+    root = tmp_path / "repo"
+    repo = _make_repo(root)
+    files = [str(root / "app.py")]
+
+    first_commits, first_aggregates = git_code_parsing.run_incremental_git_parsing_from_files(files)
+    assert len(first_commits) == 2
+    assert aggregate_github_individual_metrics(first_commits) == aggregate_github_individual_metrics(
+        [], first_aggregates["metrics"]
+    )
+
+    _commit(repo, root, "app.py", "print('a')\nprint('b')\n", "feat: extend app")
+
+    calls = []
+    original = git_code_parsing.iter_code_commit_records
+
+    def spy(*args, **kwargs):
+        calls.append(kwargs.get("only_commits"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(git_code_parsing, "iter_code_commit_records", spy)
+    commits, aggregates = git_code_parsing.run_incremental_git_parsing_from_files(files)
+
+    assert calls == [{repo.head.commit.hexsha}]
+    assert [c["hash"] for c in commits] == [c.hexsha for c in repo.iter_commits()]
+    # Merged aggregates match a from-scratch run over the full history.
+    assert aggregate_github_individual_metrics([], aggregates["metrics"]) == aggregate_github_individual_metrics(commits)
+    assert analyze_github_development_patterns([], aggregates["patterns"]) == analyze_github_development_patterns(commits)
+
+
+def _stored_commit_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT hexsha, seq FROM GIT_AGGREGATE_COMMIT ORDER BY seq").fetchall()
+    finally:
+        conn.close()
+
+
+def test_incremental_run_only_appends_new_commit_records(tmp_path, temp_db):
+    root = tmp_path / "repo"
+    repo = _make_repo(root)
+    files = [str(root / "app.py")]
+    git_code_parsing.run_incremental_git_parsing_from_files(files)
+    first_rows = _stored_commit_rows(dbmod.DB_PATH)
+    assert [sha for sha, _ in first_rows] == [c.hexsha for c in reversed(list(repo.iter_commits()))]
+
+    _commit(repo, root, "app.py", "print('a')\nprint('b')\n", "feat: extend app")
+    git_code_parsing.run_incremental_git_parsing_from_files(files)
+
+    # The stored rows are untouched; the new commit is added after them.
+    assert _stored_commit_rows(dbmod.DB_PATH) == first_rows + [(repo.head.commit.hexsha, 3)]
+
+
+def test_init_db_replaces_the_commit_blob_table(tmp_path, monkeypatch):
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE GIT_AGGREGATE_CACHE (repo_key TEXT NOT NULL, author_key TEXT NOT NULL, "
+        "ref_tips JSON NOT NULL, commits JSON NOT NULL, metrics_state JSON NOT NULL, "
+        "patterns_state JSON NOT NULL, updated_at TIMESTAMP, PRIMARY KEY (repo_key, author_key))"
+    )
+    conn.execute("INSERT INTO GIT_AGGREGATE_CACHE VALUES ('r', 'a', '[]', '[]', '{}', '{}', NULL)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(dbmod, "DB_PATH", path)
+
+    dbmod.init_db()
+
+    assert git_aggregate_cache.load_git_aggregates("r", "a") is None
+    git_aggregate_cache.save_git_aggregates("r", "a", ["t"], [{"hash": "h1", "files": []}], {}, {})
+    assert git_aggregate_cache.load_git_aggregates("r", "a")["commits"] == [{"hash": "h1", "files": []}]
+
+
+def test_incremental_parsing_reuses_aggregates_when_tips_unchanged(tmp_path, temp_db, monkeypatch):
+    root = tmp_path / "repo"
+    _make_repo(root)
+    files = [str(root / "app.py")]
+    first_commits, _ = git_code_parsing.run_incremental_git_parsing_from_files(files)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no extraction expected")
+
+    monkeypatch.setattr(git_code_parsing, "iter_code_commit_records", fail)
+    commits, _ = git_code_parsing.run_incremental_git_parsing_from_files(files)
+    assert [c["hash"] for c in commits] == [c["hash"] for c in first_commits]
+
+
+def test_sampling_report_survives_incremental_runs(tmp_path, temp_db, monkeypatch):
+    root = tmp_path / "repo"
+    repo = _make_repo(root)
+    files = [str(root / "app.py")]
+    monkeypatch.setenv("GIT_MAX_SAMPLED_COMMITS", "1")
+
+    commits, aggregates = git_code_parsing.run_incremental_git_parsing_from_files(files)
+    assert len(commits) == 1
+    assert aggregates["extraction"]["sampled"] and aggregates["extraction"]["commits_available"] == 2
+
+    _commit(repo, root, "app.py", "print('a')\nprint('b')\n", "feat: extend app")
+    commits, aggregates = git_code_parsing.run_incremental_git_parsing_from_files(files)
+    assert len(commits) == 2
+    assert aggregates["extraction"]["commits_available"] == 3
+    assert "extraction" not in aggregates["metrics"]
+    result = analyze_github_project(commits, aggregates=aggregates)
+    assert result["Metrics"]["git_extraction"] == aggregates["extraction"]
+
+
+def test_list_new_commits_rejects_rewritten_history(tmp_path):
+    root = tmp_path / "repo"
+    repo = _make_repo(root)
+    old_tips = git_aggregate_cache.get_ref_tips(repo)
+
+    repo.git.reset("--hard", "HEAD~1")
+    _commit(repo, root, "other.py", "x = 1\n", "Rewrite")
+
+    assert git_aggregate_cache.list_new_commits(repo, git_aggregate_cache.get_ref_tips(repo), old_tips) is None
@@ -102,6 +102,7 @@ def test_run_git_parsing_uses_email_and_calls_extraction(tmp_path, monkeypatch):
         mock_collab.assert_called_once_with(
             repo_root,
             author_aliases=["testuser@example.com", "testuser"],
+            history=None,
         )
 
         # extract_code_commit_content_by_author called with the correct args
@@ -110,6 +111,7 @@ def test_run_git_parsing_uses_email_and_calls_extraction(tmp_path, monkeypatch):
             author=["testuser@example.com", "testuser"],
             include_merges=False,
             max_commits=10,
+            history=None,
         )
 def test_run_git_parsing_no_user_prefs_skips_extraction(tmp_path, monkeypatch):
     
@@ -160,12 +162,14 @@ def test_run_git_parsing_uses_email_when_username_missing(tmp_path, monkeypatch,
         mock_collab.assert_called_once_with(
             repo_root,
             author_aliases=["testuser@example.com"],
+            history=None,
         )
         mock_extract.assert_called_once_with(
             path=repo_root,
             author=["testuser@example.com"],
             include_merges=False,
             max_commits=10,
+            history=None,
         )
 
         out = capsys.readouterr().out
@@ -200,12 +204,14 @@ def test_run_git_parsing_uses_username_when_email_missing(tmp_path, monkeypatch,
         mock_collab.assert_called_once_with(
             repo_root,
             author_aliases=["testuser"],
+            history=None,
         )
         mock_extract.assert_called_once_with(
             path=repo_root,
             author=["testuser"],
             include_merges=False,
             max_commits=10,
+            history=None,
         )
 
         out = capsys.readouterr().out
@@ -316,6 +322,7 @@ def test_run_git_parsing_skips_non_repo_then_finds_repo(tmp_path, monkeypatch):
             author=["testuser"],
             include_merges=False,
             max_commits=10,
+            history=None,
         )
 
 
@@ -350,6 +357,7 @@ def test_run_git_parsing_resolves_nested_path_to_repo_root(tmp_path, monkeypatch
             author=["testuser"],
             include_merges=False,
             max_commits=10,
+            history=None,
         )
 
 
@@ -387,3 +395,23 @@ def test_run_git_parsing_relative_paths_fail_without_project_root(tmp_path, monk
 
     out = capsys.readouterr().out
     assert "No Git repositories detected in provided paths" in out
+
+
+def test_iter_git_commit_records_streams_every_repo(tmp_path, monkeypatch):
+    from git import Actor, Repo
+
+    roots = [tmp_path / "outer", tmp_path / "outer" / "nested"]
+    dev = Actor("Dev", "dev@example.com")
+    for root in roots:
+        root.mkdir(parents=True, exist_ok=True)
+        repo = Repo.init(root)
+        (root / "main.py").write_text(f"print({root.name!r})\n")
+        repo.index.add(["main.py"])
+        repo.index.commit(f"Add {root.name}", author=dev, committer=dev)
+
+    monkeypatch.setattr(git_code_parsing, "_get_preferred_author_email", lambda: (None, "dev@example.com"))
+    records = git_code_parsing.iter_git_commit_records([str(root / "main.py") for root in roots])
+    assert not isinstance(records, (list, str))
+    records = list(records)
+    assert [r["message_summary"] for r in records] == ["Add outer", "Add nested"]
+    assert all("patch" not in f for r in records for f in r["files"])
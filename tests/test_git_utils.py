@@ -970,3 +970,133 @@ def test_detect_language_from_patch_returns_none_when_both_detectors_fail(
     assert result is None
     mock_guess_lexer_for_filename.assert_called_once_with("unknown.ext", patch)
     mock_guess_lexer.assert_called_once_with(patch)
+
+# --- GitHistoryIndex ---
+
+def create_mixed_history_repo(tmp_path: Path) -> Repo:
+    """
+    Helper to build a repo with two authors, code + doc files, a binary file,
+    a side branch and a merge commit.
+    """
+    repo = Repo.init(tmp_path)
+    repo.config_writer().set_value("user", "name", "Alice").release()
+    repo.config_writer().set_value("user", "email", "alice@example.com").release()
+    alice = Actor("Alice", "alice@example.com")
+    bob = Actor("Bob", "99+bob@users.noreply.github.com")
+
+    (tmp_path / "app.py").write_text("print('a')\n")
+    (tmp_path / "notes.md").write_text("# Notes\n")
+    (tmp_path / "logo.bin").write_bytes(b"\x00\x01\x02")
+    repo.index.add(["app.py", "notes.md", "logo.bin"])
+    repo.index.commit("Initial commit", author=alice, committer=alice)
+
+    base = repo.head.reference
+    feature = repo.create_head("feature")
+    repo.head.reference = feature
+    repo.head.reset(index=True, working_tree=True)
+    (tmp_path / "design doc.md").write_text("Design\nmore\n")
+    repo.index.add(["design doc.md"])
+    repo.index.commit("Add design doc", author=bob, committer=bob)
+
+    repo.head.reference = base
+    repo.head.reset(index=True, working_tree=True)
+    (tmp_path / "app.py").write_text("print('a')\nprint('b')\n")
+    repo.index.add(["app.py"])
+    repo.index.commit("Extend app", author=alice, committer=alice)
+    repo.git.merge("feature", "--no-ff", "-m", "Merge feature")
+    return repo
+
+def test_build_git_history_index_matches_commit_stats(tmp_path):
+    repo = create_mixed_history_repo(tmp_path)
+    history = git_utils.build_git_history_index(tmp_path)
+
+    commits = list(repo.iter_commits(rev="--all"))
+    assert history.hexshas == [c.hexsha for c in commits]
+    for i, commit in enumerate(commits):
+        assert history.author(i) == (commit.author.name, commit.author.email)
+        assert history.is_merge(i) == (len(commit.parents) > 1)
+        assert history.committed_dates[i] == commit.committed_date
+        expected = {path: (s["insertions"], s["deletions"]) for path, s in commit.stats.files.items()}
+        actual = {path: (s["insertions"], s["deletions"]) for path, s in history.file_stats(i).items()}
+        assert actual == expected
+
+def test_build_git_history_index_non_repo_and_empty_repo(tmp_path):
+    assert git_utils.build_git_history_index(tmp_path) is None
+    Repo.init(tmp_path)
+    history = git_utils.build_git_history_index(tmp_path)
+    assert history is not None and len(history) == 0
+
+def test_history_index_queries_match_history_walk(tmp_path):
+    create_mixed_history_repo(tmp_path)
+    history = git_utils.build_git_history_index(tmp_path)
+
+    assert is_collaborative(tmp_path, history=history) is is_collaborative(tmp_path)
+    assert is_collaborative(tmp_path, ["alice@example.com", "bob"], history=history) is False
+    for aliases in (None, ["alice@example.com"], ["bob"]):
+        assert git_utils.extract_all_contributors(tmp_path, aliases, history=history) == \
+            git_utils.extract_all_contributors(tmp_path, aliases)
+
+    for author in ("alice@example.com", ["bob"]):
+        assert extract_code_commit_content_by_author(tmp_path, author, history=history) == \
+            extract_code_commit_content_by_author(tmp_path, author)
+        assert git_utils.extract_non_code_content_by_author(tmp_path, author, history=history) == \
+            git_utils.extract_non_code_content_by_author(tmp_path, author)
+
+def test_history_index_commits_by_author(tmp_path):
+    create_mixed_history_repo(tmp_path)
+    history = git_utils.build_git_history_index(tmp_path)
+
+    alice_all = history.commits_by_author("alice@example.com")
+    alice_no_merges = history.commits_by_author("alice@example.com", include_merges=False)
+    assert len(alice_all) == 3
+    assert len(alice_no_merges) == 2
+    assert len(history.commits_by_author("bob")) == 1
+    assert history.commits_by_author("nobody@example.com") == []
+
+def test_commit_records_match_the_json_export_without_patches(tmp_path):
+    create_mixed_history_repo(tmp_path)
+    history = git_utils.build_git_history_index(tmp_path)
+
+    exported = json.loads(extract_code_commit_content_by_author(tmp_path, "alice@example.com"))
+    records = list(git_utils.iter_code_commit_records(tmp_path, "alice@example.com", history=history))
+    assert [f["patch"] for c in exported for f in c["files"]]
+    for commit in exported:
+        commit["files"] = [{k: v for k, v in f.items() if k != "patch"} for f in commit["files"]]
+    assert records == exported
+
+    records = git_utils.iter_code_commit_records(tmp_path, "alice@example.com", max_commits=1)
+    assert next(records)["hash"] == exported[0]["hash"]
+    assert next(records, None) is None
+
+def test_commit_records_within_budget(tmp_path):
+    create_mixed_history_repo(tmp_path)
+    history = git_utils.build_git_history_index(tmp_path)
+    full = list(git_utils.iter_code_commit_records(tmp_path, "alice@example.com", history=history))
+
+    budget = git_utils.GitBudget()
+    records = list(git_utils.iter_code_commit_records(tmp_path, "alice@example.com", history=history, budget=budget))
+    assert records == full and budget.report() is None
+
+    # Patches cut to a few bytes, then none at all: files are still recorded from their paths.
+    budget = git_utils.GitBudget(max_file_bytes=8, max_history_bytes=12)
+    records = list(git_utils.iter_code_commit_records(tmp_path, "alice@example.com", history=history, budget=budget))
+    assert [[f["path_after"] for f in c["files"]] for c in records] == [[f["path_after"] for f in c["files"]] for c in full]
+    assert {f["language"] for c in records for f in c["files"] if f["path_after"] == "app.py"} == {"Python"}
+    report = budget.report()
+    assert report["files_truncated"] >= 1 and report["files_without_patch"] >= 1 and not report["sampled"]
+
+    budget = git_utils.GitBudget(max_commit_lines=1)
+    records = list(git_utils.iter_code_commit_records(tmp_path, "alice@example.com", history=history, budget=budget))
+    assert len(records) == len(full) and budget.report()["commits_without_patch"] >= 1
+
+    budget = git_utils.GitBudget(max_commits=1)
+    records = list(git_utils.iter_code_commit_records(tmp_path, "alice@example.com", budget=budget))
+    assert len(records) == 1 and records[0]["hash"] in {c["hash"] for c in full}
+    assert budget.report() == {
+        "sampled": True,
+        "commits_available": 2,
+        "commits_sampled": 1,
+        "commits_without_patch": 0,
+        "files_truncated": 0,
+        "files_without_patch": 0,
+    }
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import app.data.db as dbmod
+from app.api.routes import ats
+from app.client import llm_cache
+from app.client.llm_client import GeminiLLMClient
+from app.utils.code_analysis.code_analysis_utils import analyze_parsed_project
+from app.utils.code_analysis.parse_code_utils import parse_code_flow
+from tests.fixtures.fake_gemini import fake_gemini_backend
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbmod, "DB_PATH", tmp_path / "test.sqlite3")
+    dbmod.init_db()
+    yield
+    dbmod.close_pooled_connections()
+
+
+@pytest.fixture
+def fake_gemini(temp_db, monkeypatch):
+    with fake_gemini_backend(monkeypatch) as server:
+        yield server
+
+
+def test_repeat_analysis_makes_no_model_calls(tmp_path, fake_gemini):
+    project = tmp_path / "app"
+    project.mkdir()
+    (project / "service.py").write_text("import os\n\nclass Service:\n    def run(self, x):\n        return os.path.join(x, 'y')\n")
+    parsed = parse_code_flow([project / "service.py"], ["app"])
+
+    first = analyze_parsed_project(parsed, GeminiLLMClient(api_key="key"))
+    assert len(fake_gemini.requests) == 1
+    second = analyze_parsed_project(parsed, GeminiLLMClient(api_key="key"))
+    assert len(fake_gemini.requests) == 1
+    assert second["Resume_bullets"] == first["Resume_bullets"]
+
+
+def test_key_covers_model_prompt_and_parameters(fake_gemini):
+    GeminiLLMClient(api_key="key").generate("Summarise this.\r\n")
+    GeminiLLMClient(api_key="key").generate("  Summarise this.  ")
+    assert len(fake_gemini.requests) == 1
+
+    GeminiLLMClient(api_key="key", model="gemini-other").generate("Summarise this.")
+    GeminiLLMClient(api_key="key", generation_config={"temperature": 0.2}).generate("Summarise this.")
+    GeminiLLMClient(api_key="key").generate("Summarise that.")
+    assert len(fake_gemini.requests) == 4
+
+
+def test_errors_are_not_cached(fake_gemini):
+    fake_gemini.fail_next(400, times=2)
+    client = GeminiLLMClient(api_key="key")
+    assert client.generate("prompt").startswith("Gemini API error: 400")
+    assert client.generate("prompt").startswith("Gemini API error: 400")
+    assert len(fake_gemini.requests) == 2
+    assert client.generate("prompt").startswith("•")
+    assert client.generate("prompt").startswith("•")
+    assert len(fake_gemini.requests) == 3
+
+
+def test_entries_expire_after_ttl(fake_gemini, monkeypatch):
+    client = GeminiLLMClient(api_key="key")
+    client.generate("prompt")
+    monkeypatch.setenv(llm_cache.LLM_CACHE_TTL_ENV, "0")
+    time.sleep(0.01)
+    client.generate("prompt")
+    assert len(fake_gemini.requests) == 2
+
+
+def test_size_limit_evicts_least_recently_used(temp_db):
+    keys = [llm_cache.cache_key("m", f"prompt {i}") for i in range(3)]
+    for key in keys:
+        llm_cache.save_cached_response(key, "m", "x" * 100, max_bytes=250)
+        time.sleep(0.01)
+    assert llm_cache.load_cached_response(keys[0]) is None
+    assert llm_cache.load_cached_response(keys[1]) == "x" * 100
+    assert llm_cache.load_cached_response(keys[2]) == "x" * 100
+
+
+def test_zero_max_bytes_disables_cache(fake_gemini, monkeypatch):
+    monkeypatch.setenv(llm_cache.LLM_CACHE_MAX_BYTES_ENV, "0")
+    client = GeminiLLMClient(api_key="key")
+    client.generate("prompt")
+    client.generate("prompt")
+    assert len(fake_gemini.requests) == 2
+
+
+def test_concurrent_identical_requests_make_one_call(fake_gemini):
+    fake_gemini.latency = 0.2
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(GeminiLLMClient(api_key="key").generate("same prompt")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fake_gemini.requests) == 1
+    assert len(set(results)) == 1 and len(results) == 5
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_async_requests_make_one_call(fake_gemini):
+    fake_gemini.latency = 0.2
+    client = GeminiLLMClient(api_key="key")
+    results = await asyncio.gather(client.generate_async("same prompt"), client.generate_async("same prompt"))
+    assert len(fake_gemini.requests) == 1
+    assert results[0] == results[1]
+
+
+@pytest.mark.anyio
+async def test_failed_async_leader_is_shared_and_not_remembered(temp_db):
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("backend down")
+
+    outcomes = await asyncio.gather(
+        llm_cache.cached_generate_async("model", "p", generate),
+        llm_cache.cached_generate_async("model", "p", generate),
+        return_exceptions=True,
+    )
+    assert len(calls) == 1
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+
+    async def ok():
+        return "fine"
+
+    assert await llm_cache.cached_generate_async("model", "p", ok) == "fine"
+
+
+def test_ats_keywords_for_a_repeated_jd_come_from_cache(fake_gemini, monkeypatch):
+    fake_gemini.reply = lambda prompt: '```json\n["Python", "Docker"]\n```'
+    monkeypatch.setenv("GEMINI_API_KEY", "key")
+    jd = "We need a Python engineer who knows Docker."
+    assert ats._gemini_extract_jd_keywords(jd) == ["python", "docker"]
+    assert ats._gemini_extract_jd_keywords(jd) == ["python", "docker"]
+    assert len(fake_gemini.requests) == 1
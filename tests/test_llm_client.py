@@ -0,0 +1,126 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.client import llm_cache, llm_client
+from app.client.llm_client import GeminiLLMClient, LLMError, TokenBucket
+from tests.fixtures.fake_gemini import fake_gemini_backend
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    # Every request reaches the server: the response cache is covered by test_llm_cache.py.
+    monkeypatch.setenv(llm_cache.LLM_CACHE_MAX_BYTES_ENV, "0")
+    with fake_gemini_backend(monkeypatch) as server:
+        yield server
+
+
+def test_request_reaches_the_rest_endpoint(fake_gemini):
+    fake_gemini.reply = lambda prompt: f"echo: {prompt}"
+    client = GeminiLLMClient(
+        api_key="secret", model="gemini-test", generation_config={"temperature": 0.2, "max_output_tokens": 64}
+    )
+    assert client.complete("Hello") == "echo: Hello"
+
+    model, body, api_key = fake_gemini.requests[0]
+    assert (model, api_key) == ("gemini-test", "secret")
+    assert body["generationConfig"] == {"temperature": 0.2, "maxOutputTokens": 64}
+
+
+def test_rate_limited_requests_are_retried(fake_gemini):
+    fake_gemini.fail_next(429, times=2, retry_delay=0.05)
+    started = time.monotonic()
+    assert GeminiLLMClient(api_key="key").complete("prompt").startswith("•")
+    assert len(fake_gemini.requests) == 3
+    assert time.monotonic() - started >= 0.1  # the server's retryDelay is honoured
+
+
+def test_client_errors_are_not_retried(fake_gemini):
+    fake_gemini.fail_next(400, message="API key not valid")
+    with pytest.raises(LLMError) as excinfo:
+        GeminiLLMClient(api_key="key").complete("prompt")
+    assert excinfo.value.status_code == 400 and not excinfo.value.retryable
+    assert "API key not valid" in str(excinfo.value)
+    assert len(fake_gemini.requests) == 1
+
+
+def test_retries_are_bounded(fake_gemini, monkeypatch):
+    monkeypatch.setenv(llm_client.GEMINI_MAX_RETRIES_ENV, "2")
+    fake_gemini.fail_next(503, times=5)
+    response = GeminiLLMClient(api_key="key").generate("prompt")
+    assert response.startswith("Gemini API error: 503")
+    assert llm_client.is_error_response(response)
+    assert len(fake_gemini.requests) == 3
+
+
+@pytest.mark.parametrize("payload", [["not", "an", "object"], "text", {"candidates": ["text"]}])
+def test_malformed_response_bodies_become_error_texts(fake_gemini, payload):
+    fake_gemini.respond_next(200, payload)
+    with pytest.raises(LLMError):
+        GeminiLLMClient(api_key="key").complete("prompt")
+
+    fake_gemini.respond_next(200, payload)
+    response = GeminiLLMClient(api_key="key").generate("prompt")
+    assert llm_client.is_error_response(response)
+    assert len(fake_gemini.requests) == 2  # not retried
+
+
+def test_generate_never_raises(fake_gemini, monkeypatch):
+    def broken_runtime():
+        raise RuntimeError("event loop closed")
+
+    monkeypatch.setattr(llm_client, "get_runtime", broken_runtime)
+    response = GeminiLLMClient(api_key="key").generate("prompt")
+    assert response == "Gemini API error: event loop closed"
+
+
+def test_missing_api_key_makes_no_request(fake_gemini):
+    assert GeminiLLMClient(api_key=None).generate("prompt").startswith("Gemini API error")
+    assert fake_gemini.requests == []
+
+
+def test_prompts_run_concurrently_under_one_cap(fake_gemini, monkeypatch):
+    monkeypatch.setenv(llm_client.GEMINI_MAX_CONCURRENCY_ENV, "3")
+    fake_gemini.latency = 0.1
+    fake_gemini.reply = lambda prompt: f"answer to {prompt}"
+    prompts = [f"project {i}" for i in range(9)]
+
+    # Two clients, as for two projects analysed side by side, share the cap.
+    clients = [GeminiLLMClient(api_key="key") for _ in range(2)]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        batches = list(pool.map(lambda c: c.generate_many(prompts), clients))
+    assert batches == [[f"answer to {p}" for p in prompts]] * 2
+    assert fake_gemini.max_in_flight == 3
+
+
+@pytest.mark.anyio
+async def test_complete_async_gathers_prompts(fake_gemini, monkeypatch):
+    monkeypatch.setenv(llm_client.GEMINI_MAX_CONCURRENCY_ENV, "2")
+    fake_gemini.latency = 0.05
+    fake_gemini.reply = lambda prompt: prompt.upper()
+    fake_gemini.fail_next(429, retry_delay=0)
+    client = GeminiLLMClient(api_key="key")
+    results = await asyncio.gather(*(client.complete_async(f"p{i}") for i in range(6)))
+    assert results == [f"P{i}" for i in range(6)]
+    assert fake_gemini.max_in_flight == 2
+    assert len(fake_gemini.requests) == 7
+
+
+def test_token_bucket_paces_after_the_burst():
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)  # queued behind the previous caller
+    now[0] = 10.0
+    assert bucket.reserve() == 0.0  # refilled, but never above capacity
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert TokenBucket(rate=0, capacity=1).reserve() == 0.0
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 import os
 import sys
 from app.main import main
@@ -448,7 +448,7 @@ def test_main_integrates_non_code_file_checker():
         main()
         
         # Note: function signature is (project_path, email, username)
-        mock_non_code_checker.assert_called_once_with("/tmp/project1", "test_enhanced@example.com", "testuser")
+        mock_non_code_checker.assert_called_once_with("/tmp/project1", "test_enhanced@example.com", "testuser", history=None)
 
 
 # ============================================================================
@@ -497,7 +497,7 @@ def test_main_calls_parsing_with_classification_results():
         main()
         
         # Note: function signature is (project_path, email, username)
-        mock_classify.assert_called_once_with("/tmp/project1", 'test_enhanced@example.com', 'testuser')
+        mock_classify.assert_called_once_with("/tmp/project1", 'test_enhanced@example.com', 'testuser', history=None)
         mock_parse.assert_called_once()
         call_args = mock_parse.call_args
         assert call_args[1]['file_paths_dict']['collaborative'] == ['/path/file1.md']
@@ -843,7 +843,7 @@ def test_main_skips_cleanup_when_no_upload_id():
 # tests for Git-based code parsing through main()
 # ============================================================================
 def test_main_invokes_git_parsing_for_git_projects():
-    """Test that run_git_parsing_from_files is invoked for Git-based projects."""
+    """Test that iter_git_commit_records is invoked for Git-based projects."""
     with patch('app.main.init_db'), \
          patch('app.main.seed_db'), \
          patch('app.main.display_startup_info'), \
@@ -853,7 +853,7 @@ def test_main_invokes_git_parsing_for_git_projects():
          patch('app.main.run_scan_flow') as mock_scan, \
          patch('app.main.classify_non_code_files_with_user_verification') as mock_classify, \
          patch('app.main.detect_git', return_value=True), \
-         patch('app.main.run_git_parsing_from_files') as mock_git_parse, \
+         patch('app.main.iter_git_commit_records') as mock_git_parse, \
          patch('app.main.parse_code_flow') as mock_parse_code, \
          patch('app.main.LLMConsentManager') as mock_llm_manager, \
          patch('builtins.input', return_value='exit'), \
@@ -897,6 +897,8 @@ def test_main_invokes_git_parsing_for_git_projects():
             file_paths=["/proj/a.py", "/proj/b.py"],
             include_merges=False,
             max_commits=None,
+            history=None,
+            budget=ANY,
         )
 
         # ✅ Local non-git parse_code_flow should NOT be used in this branch
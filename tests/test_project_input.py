@@ -12,20 +12,22 @@ from app.utils.scan_utils import (
     calculate_dynamic_threshold,
     calculate_containment_ratio,
     EXCLUDE_PATTERNS,
+    ExclusionMatcher,
 )
-from pathlib import Path
+from pathlib import Path, PurePosixPath, PureWindowsPath
 from unittest.mock import patch
 from datetime import datetime
 from app.data.db import get_connection
 
 
 @pytest.fixture(scope="function", autouse=True)
-def isolated_db(tmp_path, monkeypatch):
+def isolated_db(tmp_path_factory, monkeypatch):
     """Route all DB calls in this test file to a per-test SQLite file.
     Ensures schema creation and writes do not affect the app's real database.
+    Kept outside tmp_path, which the tests scan (WAL mode adds -wal/-shm files).
     """
     from app.data import db as dbmod
-    test_db = tmp_path / "project_input.sqlite3"
+    test_db = tmp_path_factory.mktemp("db") / "project_input.sqlite3"
     monkeypatch.setattr(dbmod, "DB_PATH", test_db)
     dbmod.init_db()
     yield
@@ -79,6 +81,57 @@ def test_scan_project_files_excludes_by_folder(tmp_path):
     assert "main.py" in file_names
     assert "lib.js" not in file_names
 
+@pytest.mark.parametrize("path_cls, ignore_case", [(PureWindowsPath, True), (PurePosixPath, False)])
+def test_exclusion_matcher_follows_path_match_case_rules(path_cls, ignore_case):
+    """Windows paths match exclusion globs case-insensitively, as Path.match does there."""
+    patterns = EXCLUDE_PATTERNS + ["docs/*"]
+    matcher = ExclusionMatcher(patterns, ignore_case=ignore_case)
+    for rel in ["BUILD.ZIP", "Foo.PYC", "clip.Mp4", "main.py", "README.md", "DOCS/Guide.md", "src/App.JS"]:
+        path = path_cls(rel)
+        expected = any(path.match(pat) or pat in path.parts for pat in patterns)
+        assert matcher.excludes(path) == expected, rel
+
+
+def test_scan_project_files_matches_rglob_walk(tmp_path):
+    """The scandir walk returns the same files, in the same order, as rglob + per-path matching."""
+    root = tmp_path / "proj"
+    for rel in ["a.py", "z.pyc", "build", "src/b.py", "src/deep/c.md", "src/deep/d.png",
+                "docs/guide.md", "docs/sub/more.md", "node_modules/x/y.js", "pkg/.venv/lib.py",
+                "pkg/mod.py"]:
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text("x")
+    (root / "linked.py").symlink_to(root / "src" / "b.py")
+    (root / "linked_dir").symlink_to(root / "src", target_is_directory=True)
+    patterns = EXCLUDE_PATTERNS + ["docs/*"]
+
+    expected = [
+        p for p in root.rglob("*")
+        if p.is_file() and not any(p.match(pat) or pat in p.parts for pat in patterns)
+    ]
+    files = scan_project_files(root, exclude_patterns=patterns)
+
+    assert files == expected
+    assert {f.relative_to(root).as_posix() for f in files} == {
+        "a.py", "src/b.py", "src/deep/c.md", "docs/sub/more.md", "pkg/mod.py", "linked.py"
+    }
+    # An excluded name anywhere in the root path excludes everything, as before.
+    assert scan_project_files(root / "node_modules") == []
+
+
+def test_extract_file_signatures_matches_single_file_version(tmp_path, monkeypatch):
+    from app.utils import scan_utils
+
+    monkeypatch.setattr(scan_utils, "SIGNATURE_CHUNK_SIZE", 2)
+    for i in range(7):
+        (tmp_path / f"f{i}.txt").write_text("x" * i)
+    files = sorted(tmp_path.iterdir())
+    missing = tmp_path / "missing.txt"
+
+    sigs = scan_utils.extract_file_signatures(files + [missing], tmp_path)
+
+    assert sigs[:-1] == [extract_file_signature(f, tmp_path) for f in files]
+    assert sigs[-1] == "ERROR_SIGNATURE"
+
 def test_extract_file_metadata(tmp_path):
     """Test metadata extraction for a single file."""
     file = tmp_path / "test.txt"
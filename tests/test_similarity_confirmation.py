@@ -2,6 +2,8 @@
 Tests for the user confirmation flow when similar projects are detected.
 """
 
+import threading
+
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -13,6 +15,7 @@ from app.utils.scan_utils import (
     run_scan_flow
 )
 from app.cli.similarity_manager import prompt_update_confirmation
+from app.utils.project_scheduler import DatabaseWriter
 
 
 class TestFindSimilarProject:
@@ -249,4 +252,30 @@ class TestRunScanFlowWithConfirmation:
             
             # Should store as new project
             mock_store.assert_called_once()
-            assert result["reason"] == "new_project"
\ No newline at end of file
+            assert result["reason"] == "new_project"
+
+    def test_only_project_write_runs_on_writer(self, tmp_path):
+        """With a writer, hashing and the similarity check stay on the caller's thread."""
+        (tmp_path / "test.py").write_text("print('hello')")
+        threads = {}
+
+        def record(name, result=None):
+            def fn(*args, **kwargs):
+                threads[name] = threading.current_thread().name
+                return result
+            return fn
+
+        writer = DatabaseWriter()
+        try:
+            with patch('app.utils.scan_utils.project_signature_exists', side_effect=record("exists", False)), \
+                 patch('app.utils.scan_utils.find_similar_project', side_effect=record("similar")), \
+                 patch('app.utils.scan_utils.store_project_in_db', side_effect=record("store")):
+                result = run_scan_flow(str(tmp_path), writer=writer)
+        finally:
+            writer.close()
+
+        assert result["reason"] == "new_project"
+        caller = threading.current_thread().name
+        assert threads["exists"] == caller
+        assert threads["similar"] == caller
+        assert threads["store"].startswith("db-writer")
@@ -0,0 +1,119 @@
+import json
+import random
+import sqlite3
+
+import pytest
+
+from app.data import db as dbmod
+from app.utils.scan_utils import (
+    calculate_containment_ratio,
+    calculate_dynamic_threshold,
+    calculate_project_similarity,
+    find_similar_project,
+    persist_analyzed_file_signatures,
+    store_project_in_db,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "similarity.sqlite3"
+    monkeypatch.setattr(dbmod, "DB_PATH", path)
+    yield path
+    dbmod.close_pooled_connections()
+
+
+def _child_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT project_signature, file_signature FROM PROJECT_FILE_SIGNATURE ORDER BY 1, 2"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _brute_force_match(db_path, current, threshold, containment_threshold=90.0):
+    """The previous find_similar_project: compare against every stored project in table order."""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT project_signature, file_signatures FROM PROJECT").fetchall()
+    finally:
+        conn.close()
+    for signature, sigs_json in rows:
+        existing = json.loads(sigs_json) if sigs_json else []
+        if (
+            calculate_project_similarity(current, existing) >= threshold
+            or calculate_containment_ratio(current, existing) >= containment_threshold
+        ):
+            return signature
+    return None
+
+
+def test_matches_brute_force_on_regression_corpus(db_path):
+    dbmod.init_db()
+    rng = random.Random(7)
+    universe = [f"file{i}" for i in range(400)]
+    stored = []
+    for i in range(150):
+        files = rng.sample(universe, rng.randint(0, 40))
+        stored.append(files)
+        store_project_in_db(f"project{i}", f"Project {i}", f"/p/{i}", files, 100)
+
+    uploads = []
+    for files in rng.sample(stored, 60):
+        # Incremental edits of stored projects: drop some files, add some new ones.
+        kept = [f for f in files if rng.random() > rng.choice([0.05, 0.3, 0.6])]
+        uploads.append(kept + rng.sample(universe, rng.randint(0, 15)))
+    uploads += [rng.sample(universe, rng.randint(1, 60)) for _ in range(40)]
+    uploads.append([])
+
+    matched = 0
+    for current in uploads:
+        threshold = calculate_dynamic_threshold(len(current))
+        result = find_similar_project(current, "new", file_count=len(current))
+        expected = _brute_force_match(db_path, current, threshold)
+        assert (result or {}).get("old_project_signature") == expected
+        matched += expected is not None
+    assert matched > 20  # the corpus exercises matches as well as misses
+
+
+def test_file_signature_rows_follow_project_writes(db_path, tmp_path):
+    dbmod.init_db()
+    store_project_in_db("p1", "One", "/p/1", ["a", "b", "b"], 10)
+    store_project_in_db("p1", "One", "/p/1", ["b", "c"], 10)  # INSERT OR REPLACE
+    assert _child_rows(db_path) == [("p1", "b"), ("p1", "c")]
+
+    project_root = tmp_path / "proj"
+    project_root.mkdir()
+    (project_root / "main.py").write_text("print('hi')")
+    persist_analyzed_file_signatures("p1", str(project_root), [project_root / "main.py"])
+    rows = _child_rows(db_path)
+    assert len(rows) == 1 and rows[0][1] not in {"b", "c"}
+
+    conn = dbmod.get_connection()
+    conn.execute("DELETE FROM PROJECT WHERE project_signature = 'p1'")
+    conn.commit()
+    conn.close()
+    assert _child_rows(db_path) == []
+
+
+def test_migration_backfills_existing_projects(db_path):
+    dbmod.init_db()
+    # Roll back to schema version 1: no triggers, projects written without child rows.
+    conn = sqlite3.connect(db_path)
+    for trigger in ("insert", "update", "delete"):
+        conn.execute(f"DROP TRIGGER project_file_signature_{trigger}")
+    conn.executemany(
+        "INSERT INTO PROJECT (project_signature, name, file_signatures) VALUES (?, ?, ?)",
+        [("old", "Old", '["x", "y"]'), ("legacy", "Legacy", None), ("broken", "Broken", "not json")],
+    )
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    assert _child_rows(db_path) == []
+
+    dbmod.init_db()
+
+    assert _child_rows(db_path) == [("old", "x"), ("old", "y")]
+    assert find_similar_project(["x", "y", "z"], "new", threshold=60.0)["old_project_signature"] == "old"
@@ -0,0 +1,53 @@
+import json
+import threading
+
+from app.utils.code_analysis import language_registry
+from app.utils.code_analysis.file_entity_utils import classify_node_types
+from app.utils.code_analysis.grammar_loader import extract_rule_names
+from app.utils.code_analysis.language_registry import (
+    NODE_REGISTRY_FILENAME,
+    build_node_registry,
+    get_node_types,
+    get_ts_parser,
+)
+from app.utils.code_analysis.parse_code_utils import _shared_package_dir
+
+
+def test_committed_registry_matches_grammars():
+    """The artifact in app/shared must be regenerated when grammars or the classifier change."""
+    committed = json.loads((_shared_package_dir() / NODE_REGISTRY_FILENAME).read_text(encoding="utf-8"))
+    assert committed == build_node_registry()
+
+
+def test_get_node_types_matches_grammar_classification():
+    grammar = _shared_package_dir() / "grammars" / "python.js"
+    class_nodes, func_nodes, component_nodes = classify_node_types(extract_rule_names(grammar))
+
+    node_types = get_node_types("python")
+
+    assert list(node_types.class_types) == class_nodes
+    assert list(node_types.function_types) == func_nodes
+    assert list(node_types.component_types) == component_nodes
+    assert "import_statement" in node_types.import_types
+
+
+def test_get_node_types_falls_back_to_grammar_when_registry_missing(monkeypatch):
+    monkeypatch.setattr(language_registry, "load_node_registry", lambda: {})
+    get_node_types.cache_clear()
+    try:
+        grammar = _shared_package_dir() / "grammars" / "java.js"
+        assert list(get_node_types("java").class_types) == classify_node_types(extract_rule_names(grammar))[0]
+    finally:
+        get_node_types.cache_clear()
+
+
+def test_parser_is_reused_per_language_and_thread():
+    parser = get_ts_parser("python")
+    assert get_ts_parser("python") is parser
+    assert get_ts_parser("javascript") is not parser
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_ts_parser("python")))
+    thread.start()
+    thread.join()
+    assert other[0] is not parser
@@ -0,0 +1,78 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+import app.data.db as dbmod
+import app.utils.code_analysis.parse_code_utils as pcu
+from app.utils.code_analysis import parse_cache
+from app.utils.code_analysis.parse_code_utils import parse_code_flow
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbmod, "DB_PATH", tmp_path / "test.sqlite3")
+    dbmod.init_db()
+
+
+def _make_project(tmp_path, count=6):
+    project = tmp_path / "app"
+    project.mkdir()
+    paths = []
+    for i in range(count):
+        path = project / f"module_{i}.py"
+        path.write_text(f"import os\n\nclass C{i}:\n    def run(self, x):\n        return os.path.join(x, '{i}')\n")
+        paths.append(path)
+    return paths
+
+
+def _count_parses(monkeypatch):
+    parsed = []
+    original = pcu._parse_single_file
+
+    def counting(file_path, top_level_dirs):
+        parsed.append(file_path)
+        return original(file_path, top_level_dirs)
+
+    monkeypatch.setattr(pcu, "_parse_single_file", counting)
+    return parsed
+
+
+def test_cached_parse_only_reparses_changed_files(tmp_path, temp_db, monkeypatch):
+    paths = _make_project(tmp_path)
+    first = parse_code_flow(paths, ["app"], use_cache=True)
+    assert first == parse_code_flow(paths, ["app"])
+
+    paths[2].write_text("def changed(a, b):\n    return max(a, b)\n")
+    parsed = _count_parses(monkeypatch)
+    second = parse_code_flow(paths, ["app"], use_cache=True)
+
+    assert parsed == [paths[2]]
+    assert second == parse_code_flow(paths, ["app"])
+    assert [entry["file_path"] for entry in second] == [f"app/{p.name}" for p in paths]
+
+
+def test_cache_key_depends_on_content_name_and_project():
+    key = parse_cache.content_key(b"x = 1\n", "a.py", ["app"])
+    assert len(key) == 20
+    assert key == parse_cache.content_key(b"x = 1\n", "a.py", ["app"])
+    assert key != parse_cache.content_key(b"x = 2\n", "a.py", ["app"])
+    assert key != parse_cache.content_key(b"x = 1\n", "a.js", ["app"])
+    assert key != parse_cache.content_key(b"x = 1\n", "a.py", ["src"])
+
+
+def test_cache_evicts_least_recently_used_beyond_budget(temp_db, monkeypatch):
+    entry = {"language": "Python", "lines_of_code": 1, "imports": ["os"] * 20}
+    size = len(parse_cache.encode_entry(entry))
+    clock = itertools.count(100)
+    monkeypatch.setattr(parse_cache, "time", SimpleNamespace(time=lambda: float(next(clock))))
+
+    parse_cache.save_parse_cache_entries({b"a" * 20: entry}, max_bytes=2 * size)
+    parse_cache.save_parse_cache_entries({b"b" * 20: entry}, max_bytes=2 * size)
+    # Touch "a" so "b" becomes the least recently used row.
+    assert b"a" * 20 in parse_cache.load_parse_cache_entries([b"a" * 20])
+    parse_cache.save_parse_cache_entries({b"c" * 20: entry}, max_bytes=2 * size)
+
+    remaining = parse_cache.load_parse_cache_entries([b"a" * 20, b"b" * 20, b"c" * 20])
+    assert set(remaining) == {b"a" * 20, b"c" * 20}
+    assert remaining[b"a" * 20] == entry
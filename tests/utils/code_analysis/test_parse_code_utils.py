@@ -396,3 +396,116 @@ def test_parse_code_flow_non_matching_top_level(tmp_path, python_import_patterns
     entry = results[0]
     assert entry["file_path"] == "standalone.py", "Should fallback to bare filename when no top-level dir matches"
     assert entry["language"].lower() == "python"
+
+
+def _make_parallel_fixture(tmp_path, count=12):
+    """Create a small mixed-language project."""
+    app_dir = tmp_path / "proj" / "app"
+    app_dir.mkdir(parents=True)
+    paths = []
+    for i in range(count):
+        if i % 3 == 0:
+            path = app_dir / f"widget_{i}.js"
+            path.write_text(f"import React from 'react';\n// widget {i}\nfunction Widget{i}() {{ return null; }}\n")
+        else:
+            path = app_dir / f"module_{i}.py"
+            path.write_text(f'"""Module {i}."""\nimport os\n\ndef func_{i}(x):\n    return x + {i}\n')
+        paths.append(path)
+    return paths
+
+
+def test_parse_code_flow_parallel_matches_sequential(tmp_path, monkeypatch):
+    """Process-pool parsing returns the same list, in the same order, as the sequential run."""
+    import app.utils.code_analysis.parse_code_utils as pcu
+
+    monkeypatch.setattr(pcu, "_MIN_FILES_FOR_POOL", 2)
+    monkeypatch.setattr(pcu, "_CHUNK_SIZE", 5)
+    paths = _make_parallel_fixture(tmp_path)
+
+    sequential = parse_code_flow(paths, ["app"], workers=1)
+    parallel = parse_code_flow(paths, ["app"], workers=3)
+
+    assert len(sequential) == len(paths)
+    assert parallel == sequential
+
+
+def test_parse_code_flow_parallel_skips_file_that_times_out(tmp_path, monkeypatch):
+    """A file that overruns its per-file budget is dropped without stalling the rest."""
+    import time
+    import app.utils.code_analysis.parse_code_utils as pcu
+
+    monkeypatch.setattr(pcu, "_MIN_FILES_FOR_POOL", 2)
+    monkeypatch.setattr(pcu, "_CHUNK_SIZE", 5)
+    paths = _make_parallel_fixture(tmp_path)
+    expected = parse_code_flow(paths, ["app"], workers=1)
+    slow = paths[5]
+    original = pcu._parse_single_file
+
+    def sometimes_slow(file_path, top_level_dirs):
+        if file_path == slow:
+            time.sleep(30)
+        return original(file_path, top_level_dirs)
+
+    monkeypatch.setattr(pcu, "_parse_single_file", sometimes_slow)
+    started = time.monotonic()
+    results = parse_code_flow(paths, ["app"], workers=2, file_timeout=1)
+
+    assert time.monotonic() - started < 20
+    assert results == [entry for entry in expected if entry["file_path"] != "app/" + slow.name]
+
+
+def test_resolve_parse_workers_reads_env(monkeypatch):
+    from app.utils.code_analysis.parse_code_utils import resolve_parse_workers
+
+    monkeypatch.delenv("PARSE_CODE_WORKERS", raising=False)
+    assert resolve_parse_workers() == 1
+    monkeypatch.setenv("PARSE_CODE_WORKERS", "4")
+    assert resolve_parse_workers() == 4
+    assert resolve_parse_workers(2) == 2
+
+
+def test_extract_imports_and_entities_parses_once(tmp_path):
+    """Imports and entities come from one parse and match the separate extractors."""
+    import app.utils.code_analysis.parse_code_utils as pcu
+    from app.utils.code_analysis.file_entity_utils import extract_entities, get_parser
+    from app.utils.code_analysis.language_registry import get_node_types, get_ts_language
+    from app.utils.code_analysis.source_file import SourceFile
+
+    file_path = tmp_path / "module.py"
+    file_path.write_text(
+        "import os\nfrom typing import List\n\n"
+        "class Greeter:\n    def greet(self, name):\n        return os.path.join(name)\n\n"
+        "def helper(items: List[str]):\n    return len(items)\n"
+    )
+    contents = file_path.read_text()
+
+    with patch.object(pcu, "parse_source", wraps=pcu.parse_source) as parse:
+        imports, entities = pcu.extract_imports_and_entities(SourceFile(file_path), "Python")
+    parse.assert_called_once()
+
+    node_types = get_node_types("python")
+    tree = get_parser(contents, get_ts_language("python"))
+    expected = extract_entities(
+        tree, contents, list(node_types.class_types), list(node_types.function_types),
+        list(node_types.component_types), file_path,
+    )
+    assert imports == extract_imports(contents, "Python") == ["import os", "from typing import List"]
+    assert entities == expected
+    assert [c["name"] for c in entities["classes"]] == ["Greeter"]
+    assert [f["name"] for f in entities["functions"]] == ["helper"]
+
+
+def test_extract_imports_and_entities_handles_deep_nesting(tmp_path):
+    """Nesting far deeper than the recursion limit still yields imports and entities."""
+    import sys
+    from app.utils.code_analysis.parse_code_utils import extract_imports_and_entities
+    from app.utils.code_analysis.source_file import SourceFile
+
+    depth = sys.getrecursionlimit() + 200
+    file_path = tmp_path / "deep.py"
+    file_path.write_text("import os\n\ndef f(x):\n    return " + "[" * depth + "x" + "]" * depth + "\n")
+
+    imports, entities = extract_imports_and_entities(SourceFile(file_path), "Python")
+
+    assert imports == ["import os"]
+    assert [f["name"] for f in entities["functions"]] == ["f"]
@@ -0,0 +1,50 @@
+import builtins
+from unittest.mock import patch
+
+from pygount import SourceAnalysis
+
+from app.utils.code_analysis.parse_code_utils import parse_code_flow
+from app.utils.code_analysis.source_file import SourceFile
+
+
+def test_source_file_line_counts_match_pygount(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text('"""\nDoc line\n"""\n# comment\nimport os\n\ndef f(x):\n    return x\n')
+
+    source = SourceFile(file_path)
+    expected = SourceAnalysis.from_file(str(file_path), "pygount", encoding="utf-8")
+
+    assert source.line_counts == (expected.code_count, expected.documentation_count)
+
+
+def test_source_file_decodes_with_fallback_and_universal_newlines(tmp_path):
+    file_path = tmp_path / "latin.py"
+    # Odd byte count so the utf-16 attempt fails as well as utf-8.
+    file_path.write_bytes("x = 'caf\xe9'\r\ny = 1\r\n".encode("latin-1"))
+
+    source = SourceFile(file_path)
+
+    assert source.encoding == "latin-1"
+    assert source.text == "x = 'caf\xe9'\ny = 1\n"
+    assert source.text == file_path.read_text(encoding="latin-1")
+
+
+def test_parse_code_flow_opens_each_file_once(tmp_path):
+    project = tmp_path / "app"
+    project.mkdir()
+    file_path = project / "module.py"
+    file_path.write_text('"""Doc."""\nimport os\n\ndef f(x):\n    return os.path.join(x)\n')
+
+    real_open = builtins.open
+    opened = []
+
+    def counting_open(file, *args, **kwargs):
+        if str(file) == str(file_path):
+            opened.append(file)
+        return real_open(file, *args, **kwargs)
+
+    with patch("builtins.open", side_effect=counting_open):
+        results = parse_code_flow([file_path], ["app"])
+
+    assert len(results) == 1
+    assert len(opened) == 1
@@ -0,0 +1,102 @@
+"""
+Unit tests for nlp_models.py - the shared NLP model service.
+"""
+import pytest
+import spacy
+from spacy.language import Language
+
+from app.utils.non_code_analysis import nlp_models
+from app.utils.non_code_analysis.nlp_models import (
+    ENTITY_PIPES,
+    SENTENCE_PIPES,
+    extract_keywords_batch,
+    get_spacy,
+    pipe_docs,
+)
+from app.utils.non_code_analysis.non_3rd_party_analysis import extract_all_skills, extract_all_skills_batch
+from app.utils.non_code_analysis.non_code_analysis_utils import get_named_entities
+
+CALLS = []
+
+
+@Language.component("record_calls")
+def record_calls(doc):
+    CALLS.append(doc.text)
+    return doc
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    """A small pipeline with a sentencizer, a rule-based "ner" and a call recorder."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns([{"label": "ORG", "pattern": "Acme"}, {"label": "PRODUCT", "pattern": "FastAPI"}])
+    nlp.add_pipe("record_calls")
+    loads = []
+
+    def load(name):
+        loads.append(name)
+        return nlp
+
+    CALLS.clear()
+    monkeypatch.setattr(nlp_models, "_spacy_models", {})
+    monkeypatch.setattr(nlp_models.spacy, "load", load)
+    yield nlp, loads
+
+
+class FakeKeyBERT:
+    def __init__(self):
+        self.calls = []
+
+    def extract_keywords(self, docs, **kwargs):
+        self.calls.append(docs)
+        keywords = [[("system design", 0.5), ("misc", 0.9)] for _ in docs]
+        return keywords[0] if len(keywords) == 1 else keywords
+
+
+def test_spacy_model_is_loaded_once(fake_pipeline):
+    nlp, loads = fake_pipeline
+    assert get_spacy() is nlp
+    assert get_spacy() is nlp
+    assert loads == [nlp_models.SPACY_MODEL]
+
+
+def test_pipe_docs_runs_only_the_requested_pipes(fake_pipeline):
+    docs = list(pipe_docs(["Acme ships FastAPI. Then it rests.", "Nothing here."], ENTITY_PIPES))
+    assert [[ent.text for ent in doc.ents] for doc in docs] == [["Acme", "FastAPI"], []]
+    assert CALLS == []  # record_calls is not an entity pipe
+
+    doc = next(iter(pipe_docs(["One sentence here. Another one."], SENTENCE_PIPES)))
+    assert len(list(doc.sents)) == 2
+
+
+def test_named_entities_come_from_one_batched_pass(fake_pipeline):
+    results = [{"summary": "Acme built it."}, {"summary": "Written with FastAPI."}, {}]
+    assert sorted(get_named_entities(results)) == ["Acme", "FastAPI"]
+
+
+def test_extract_keywords_batch_keeps_one_list_per_document():
+    model = FakeKeyBERT()
+    assert extract_keywords_batch(model, []) == []
+    assert extract_keywords_batch(model, ["only"]) == [[("system design", 0.5), ("misc", 0.9)]]
+    assert len(extract_keywords_batch(model, ["a", "b", "c"])) == 3
+    assert model.calls == [["only"], ["a", "b", "c"]]
+
+
+def test_skill_extraction_batches_keybert_when_loaded(monkeypatch):
+    long_doc = "We wrote the Python service and documented it for the team. " * 3
+    contents = [long_doc, "short python note", long_doc]
+
+    # Not loaded: skills come from keyword matching only, and no model is loaded.
+    monkeypatch.setattr(nlp_models, "_keybert", None)
+    assert extract_all_skills(long_doc)["technical_skills"] == ["Python"]
+    assert nlp_models.loaded_keybert() is None
+
+    model = FakeKeyBERT()
+    monkeypatch.setattr(nlp_models, "_keybert", model)
+    results = extract_all_skills_batch(contents)
+    assert model.calls == [[long_doc, long_doc]]  # one call; short documents are skipped
+    assert results[0]["technical_skills"] == ["Python", "System Design"]
+    assert results[1]["technical_skills"] == ["Python"]
+    assert results[0]["soft_skills"] == ["Collaboration", "Communication"]
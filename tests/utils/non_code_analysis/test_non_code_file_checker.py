@@ -485,6 +485,38 @@ def test_collect_git_non_code_files_only_code_in_repo():
         assert result == {}
 
 
+def test_collect_git_non_code_files_with_history_index_matches_walk(tmp_path):
+    """Index-backed collection returns the same metadata as the commit walk."""
+    from git import Repo, Actor
+    from app.utils.git_utils import build_git_history_index
+
+    repo = Repo.init(tmp_path)
+    alice = Actor("Alice", "alice@example.com")
+    alice_noreply = Actor("alice-gh", "7+alice-gh@users.noreply.github.com")
+    bob = Actor("Bob", "bob@example.com")
+    for author, content in ((alice, "one"), (bob, "two"), (alice_noreply, "three")):
+        (tmp_path / "guide.md").write_text(content)
+        (tmp_path / "main.py").write_text(content)
+        repo.index.add(["guide.md", "main.py"])
+        repo.index.commit(f"edit {content}", author=author, committer=author)
+    (tmp_path / "solo.txt").write_text("solo")
+    repo.index.add(["solo.txt"])
+    repo.index.commit("solo", author=alice, committer=alice)
+
+    history = build_git_history_index(tmp_path)
+    for identity in ((None, None), ("alice@example.com", "alice-gh")):
+        expected = collect_git_non_code_files_with_metadata(tmp_path, *identity)
+        actual = collect_git_non_code_files_with_metadata(tmp_path, *identity, history=history)
+        assert actual == expected
+
+    result = collect_git_non_code_files_with_metadata(
+        tmp_path, "alice@example.com", "alice-gh", history=history
+    )
+    assert set(result) == {"guide.md", "solo.txt"}
+    assert result["guide.md"]["unique_authors"] == 2
+    assert result["solo.txt"]["is_collaborative"] is False
+
+
 # ============================================================================
 # Tests for filter_non_code_files_by_collaboration() 
 # ============================================================================
@@ -3,10 +3,17 @@ Tests for analysis_merger_utils.py - Skill date inference functions.
 """
 
 import pytest
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 from git import Repo
-from app.utils.analysis_merger_utils import _get_skill_extensions, _infer_skill_dates_from_git
+from app.utils.analysis_merger_utils import (
+    SKILL_TO_EXTENSIONS,
+    SkillTouchIndex,
+    _get_skill_extensions,
+    _infer_skill_dates_from_git,
+)
+from app.utils.git_utils import build_git_history_index
 
 
 class TestGetSkillExtensions:
@@ -103,3 +110,48 @@ class TestInferSkillDatesFromGit:
         
         assert result["backend"] is None
         assert result["frontend"] is None
+
+    def test_exact_first_dates_with_one_history_walk(self, git_repo):
+        """All skills are dated from a single walk of the history."""
+        repo_path = Path(git_repo)
+        repo = Repo(git_repo)
+        (repo_path / "Dockerfile").write_text("FROM python:3.11")
+        (repo_path / "util.py").write_text("x = 1")
+        repo.index.add(["Dockerfile", "util.py"])
+        repo.index.commit("Add Dockerfile")
+        day = {
+            commit.message: datetime.fromtimestamp(commit.committed_date).strftime("%Y-%m-%d")
+            for commit in repo.iter_commits()
+        }
+
+        skills = list(SKILL_TO_EXTENSIONS)
+        with patch.object(Repo, "iter_commits", autospec=True, side_effect=Repo.iter_commits) as iter_commits:
+            result = _infer_skill_dates_from_git(git_repo, skills)
+        assert iter_commits.call_count == 1
+
+        assert result["Python"] == day["Add Python file"]
+        assert result["Django"] == result["Python"]
+        assert result["Java"] == day["Add Java file"]
+        assert result["Dockerfile"] == day["Add Dockerfile"]
+        assert result["Rust"] is None
+
+        # The prebuilt history index gives the same answers without walking the repo.
+        history = build_git_history_index(git_repo)
+        assert _infer_skill_dates_from_git(git_repo, skills, history=history) == result
+
+
+class TestSkillTouchIndex:
+    """Test first/last touch bookkeeping of SkillTouchIndex."""
+
+    def test_date_range_per_extension_and_path(self):
+        touches = SkillTouchIndex()
+        touches.add_commit(100, ["src/a.py", "docs/readme.md"])
+        touches.add_commit(200, ["src/b.py", "docker/Dockerfile"])
+        touches.add_commit(150, ["src/a.py"])  # walk order wins over timestamps
+
+        assert touches.date_range([".py"]) == (100, 150)
+        assert touches.date_range([".md", ".py"]) == (100, 150)
+        assert touches.date_range(["Dockerfile"]) == (200, 200)
+        assert touches.date_range([".rs"]) is None
+        assert touches.by_path["src/a.py"] == [0, 100, 2, 150]
+
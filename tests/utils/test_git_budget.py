@@ -0,0 +1,58 @@
+"""
+Tests for the git extraction budgets and time-stratified sampling (git_budget.py).
+"""
+from app.utils.git_budget import GitBudget, merge_reports, stratified_sample
+
+
+def test_stratified_sample_covers_every_period():
+    # A burst of 900 commits in the first day, then one a week for ~2 years.
+    day, week = 86400, 7 * 86400
+    timestamps = [i * 60 for i in range(900)] + [day + i * week for i in range(100)]
+    items = list(range(len(timestamps)))
+
+    chosen = stratified_sample(items, timestamps, 50, strata=10)
+    assert len(chosen) == 50
+    assert chosen == sorted(set(chosen))
+    # Every later period keeps commits even though the burst dominates the count.
+    periods = {(timestamps[i] - timestamps[0]) * 10 // (timestamps[-1] - timestamps[0] + 1) for i in chosen}
+    assert periods == set(range(10))
+
+    # Fewer picks than periods: one from each of evenly spaced periods.
+    few = stratified_sample(items, timestamps, 3, strata=10)
+    assert len({(timestamps[i] - timestamps[0]) * 10 // (timestamps[-1] - timestamps[0] + 1) for i in few}) == 3
+    assert stratified_sample(items, timestamps, 0) == items
+    assert stratified_sample(items[:5], timestamps[:5], 10) == items[:5]
+
+
+def test_take_charges_file_commit_and_history_budgets():
+    budget = GitBudget(max_file_bytes=100, max_commit_bytes=150, max_history_bytes=220, max_commit_lines=0, max_commits=0)
+
+    assert budget.start_commit({})
+    assert [budget.take(80), budget.take(500), budget.take(10)] == [80, 70, 0]
+    assert budget.start_commit({})
+    assert [budget.take(60), budget.take(60)] == [60, 10]
+    assert budget.exhausted()
+    assert budget.report() == {
+        "sampled": False,
+        "commits_available": 0,
+        "commits_sampled": 0,
+        "commits_without_patch": 0,
+        "files_truncated": 2,
+        "files_without_patch": 1,
+    }
+
+
+def test_unlimited_budget_reports_nothing():
+    budget = GitBudget(max_commit_lines=10)
+    assert budget.select(["a", "b"], [1, 2]) == ["a", "b"]
+    assert budget.start_commit({"big.py": {"insertions": 5, "deletions": 5}})
+    assert budget.take(10_000) == 10_000
+    assert budget.report() is None
+
+    assert not budget.start_commit({"big.py": {"insertions": 11, "deletions": 0}})
+    report = budget.report()
+    assert report["commits_without_patch"] == 1 and not report["sampled"]
+
+    merged = merge_reports(None, report, {"sampled": True, "commits_available": 9, "commits_sampled": 4})
+    assert merged["sampled"] and merged["commits_available"] == 11 and merged["commits_without_patch"] == 1
+    assert merge_reports(None, None) is None
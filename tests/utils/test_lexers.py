@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pygments
+import pytest
+from pygments import lexers as pygments_lexers
+from pygments.util import ClassNotFound
+
+from app.utils import lexers
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SKIP_DIRS = {"__pycache__", ".git", "node_modules", ".venv", "venv", "data"}
+
+# Names several lexers claim, where pygments picks by content.
+AMBIGUOUS_SAMPLES = [
+    ("util.h", "#include <stdio.h>\nint add(int a, int b);\n"),
+    ("widget.h", "#include <vector>\nnamespace ui { class Widget { public: virtual ~Widget(); }; }\n"),
+    ("view.h", "#import <Foundation/Foundation.h>\n@interface View : NSObject\n@end\n"),
+    ("model.m", "#import \"Model.h\"\n@implementation Model\n- (void)run {}\n@end\n"),
+    ("solve.m", "function x = solve(a, b)\n  x = a \\ b;\nend\n"),
+    ("tool.pl", "#!/usr/bin/perl\nuse strict;\nmy $x = 1;\nprint \"$x\\n\";\n"),
+    ("facts.pl", "parent(tom, bob).\nancestor(X, Y) :- parent(X, Y).\n"),
+    ("page.inc", "<?php echo 'hi'; ?>\n"),
+    ("query.sql", "SELECT id FROM project WHERE name = 'x';\n"),
+    ("LICENSE", "Permission is hereby granted, free of charge\n"),
+    ("notes.unknownext", "plain words\n"),
+]
+
+
+def _repo_samples(limit=400):
+    samples = []
+    for path in sorted(REPO_ROOT.rglob("*")):
+        if len(samples) >= limit:
+            break
+        rel = path.relative_to(REPO_ROOT)
+        if not path.is_file() or SKIP_DIRS.intersection(rel.parts) or path.stat().st_size > 200_000:
+            continue
+        raw = path.read_bytes()
+        if b"\0" in raw[:4096]:
+            continue
+        samples.append((path.name, raw.decode("utf-8", errors="replace")))
+    return samples
+
+
+def _lexer_class(guess, *args):
+    try:
+        return type(guess(*args))
+    except ClassNotFound:
+        return None
+
+
+def test_pygments_version_is_the_pinned_one():
+    requirements = (REPO_ROOT / "requirements.txt").read_text()
+    assert f"Pygments=={pygments.__version__}" in requirements
+
+
+@pytest.mark.parametrize("load_samples", [lambda: AMBIGUOUS_SAMPLES, _repo_samples], ids=["ambiguous", "repo_files"])
+def test_guess_lexer_for_filename_matches_pygments(load_samples):
+    samples = load_samples()
+    assert samples
+    for name, text in samples:
+        expected = _lexer_class(pygments_lexers.guess_lexer_for_filename, name, text)
+        assert _lexer_class(lexers.guess_lexer_for_filename, name, text) is expected, name
+
+
+def test_guess_lexer_matches_pygments():
+    samples = AMBIGUOUS_SAMPLES + _repo_samples(limit=60)
+    for name, text in samples:
+        expected = _lexer_class(pygments_lexers.guess_lexer, text)
+        assert _lexer_class(lexers.guess_lexer, text) is expected, name
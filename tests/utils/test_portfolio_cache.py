@@ -0,0 +1,150 @@
+"""
+Tests for the materialized portfolio model (portfolio_cache.py) and the
+triggers that invalidate it.
+"""
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+import app.data.db as dbmod
+from app.utils import generate_portfolio, portfolio_cache
+from app.utils.analysis_merger_utils import store_results_in_db
+from app.utils.chronological_utils import ChronologicalManager
+from app.utils.generate_portfolio import build_portfolio_model
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "portfolio.sqlite3"
+    monkeypatch.setattr(dbmod, "DB_PATH", path)
+    dbmod.init_db()
+    for i, lines in enumerate((1200, 300, 5000)):
+        store_results_in_db(
+            f"Project {i}",
+            {
+                "summary": f"Summary {i}.",
+                "skills": {"technical_skills": ["Python", f"Skill {i}"], "soft_skills": []},
+                "resume_bullets": [f"Built {i}."],
+                "metrics": {"total_lines": lines, "languages": ["Python"]},
+            },
+            0.5 + i / 10,
+            f"p{i}",
+        )
+    yield path
+    dbmod.close_pooled_connections()
+
+
+def _execute(sql, params=()):
+    conn = dbmod.get_connection()
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _cached_project_ids():
+    conn = dbmod.get_connection()
+    try:
+        return sorted(pid for (pid,) in conn.execute("SELECT project_signature FROM PORTFOLIO_PROJECT_CACHE"))
+    finally:
+        conn.close()
+
+
+def _without_timestamp(model):
+    model["metadata"].pop("generated_at")
+    return model
+
+
+def _assert_fresh(model, project_ids=None):
+    """The cached model matches one rebuilt from scratch."""
+    rebuilt = build_portfolio_model(project_ids, use_cache=False)
+    assert _without_timestamp(model) == _without_timestamp(rebuilt)
+
+
+def test_repeat_reads_come_from_the_cache(db_path):
+    first = build_portfolio_model()
+    original = generate_portfolio._assemble_portfolio_model
+    with patch.object(generate_portfolio, "_assemble_portfolio_model", wraps=original) as assemble:
+        assert build_portfolio_model() == first
+        assert build_portfolio_model(["p2", "p0"]) != first  # other selections are built once
+        assemble.assert_called_once()
+    _assert_fresh(build_portfolio_model())
+    assert [p["id"] for p in first["projects"]] == ["p2", "p1", "p0"]
+
+
+def test_writes_invalidate_only_the_affected_project(db_path):
+    build_portfolio_model()
+    assert _cached_project_ids() == ["p0", "p1", "p2"]
+
+    # Score override
+    _execute("UPDATE PROJECT SET score_overridden = 1, score_overridden_value = 0.95 WHERE project_signature = 'p0'")
+    assert _cached_project_ids() == ["p1", "p2"]
+    model = build_portfolio_model()
+    assert next(p for p in model["projects"] if p["id"] == "p0")["score_overridden_value"] == 0.95
+    _assert_fresh(model)
+
+    # Thumbnail
+    _execute("UPDATE PROJECT SET thumbnail_path = 'data/thumbnails/p1.png' WHERE project_signature = 'p1'")
+    assert _cached_project_ids() == ["p0", "p2"]
+    model = build_portfolio_model()
+    assert next(p for p in model["projects"] if p["id"] == "p1")["thumbnail_url"].endswith("/p1")
+
+    # Chronological edits
+    manager = ChronologicalManager()
+    manager.update_project_dates("p2", "2021-03-01T00:00:00", "2022-04-01T00:00:00")
+    assert _cached_project_ids() == ["p0", "p1"]
+    model = build_portfolio_model()
+    assert next(p for p in model["projects"] if p["id"] == "p2")["created_at"] == "2021-03-01T00:00:00"
+    _assert_fresh(model)
+
+    # Skill dates are not part of the portfolio, so editing them keeps the cache
+    skill_id = manager.get_chronological_skills("p2")[0]["id"]
+    manager.update_skill_date(skill_id, "2020-01-01")
+    assert _cached_project_ids() == ["p0", "p1", "p2"]
+    assert portfolio_cache.load_model(dbmod.get_connection().cursor(), "") is not None
+
+    # Re-analysis replaces the project's metrics
+    store_results_in_db("Project 1", {"summary": "New.", "skills": {"technical_skills": [], "soft_skills": []}, "resume_bullets": [], "metrics": {"total_lines": 9}}, 0.6, "p1")
+    assert _cached_project_ids() == ["p0", "p2"]
+    model = build_portfolio_model()
+    assert next(p for p in model["projects"] if p["id"] == "p1")["metrics"]["total_lines"] == 9
+    _assert_fresh(model)
+
+
+def test_user_profile_changes_rebuild_everything(db_path):
+    build_portfolio_model()
+    _execute("INSERT INTO USER_PREFERENCES (user_id, name, email) VALUES (1, 'New Name', 'new@example.com')")
+    assert _cached_project_ids() == []
+    assert build_portfolio_model()["user"]["name"] == "New Name"
+
+
+def test_model_built_during_a_write_is_not_stored(db_path):
+    original = generate_portfolio._assemble_portfolio_model
+
+    def assemble_then_write(cursor, project_ids, use_cache):
+        result = original(cursor, project_ids, use_cache)
+        # Another connection commits while this build is running
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE PROJECT SET name = 'Renamed' WHERE project_signature = 'p0'")
+        conn.commit()
+        conn.close()
+        return result
+
+    with patch.object(generate_portfolio, "_assemble_portfolio_model", side_effect=assemble_then_write):
+        stale = build_portfolio_model()
+    assert "Renamed" not in {p["title"] for p in stale["projects"]}
+    assert _cached_project_ids() == []
+    assert "Renamed" in {p["title"] for p in build_portfolio_model()["projects"]}
+
+
+def test_selection_cache_is_bounded(db_path, monkeypatch):
+    monkeypatch.setenv(portfolio_cache.PORTFOLIO_CACHE_MAX_SELECTIONS_ENV, "2")
+    build_portfolio_model()
+    for ids in (["p0"], ["p1"], ["p2"]):
+        build_portfolio_model(ids)
+    conn = dbmod.get_connection()
+    keys = sorted(key for (key,) in conn.execute("SELECT selection_key FROM PORTFOLIO_CACHE"))
+    conn.close()
+    assert keys == ["", '["p1"]', '["p2"]']
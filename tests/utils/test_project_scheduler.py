@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.project_scheduler import DatabaseWriter, run_projects, write_through
+
+
+def test_run_projects_sequential_keeps_order_without_writer():
+    seen = []
+
+    def work(item, writer):
+        seen.append((item, writer, threading.current_thread()))
+        return item * 2
+
+    assert run_projects([1, 2, 3], work, max_concurrency=1) == [2, 4, 6]
+    assert [item for item, _, _ in seen] == [1, 2, 3]
+    assert all(writer is None and thread is threading.current_thread() for _, writer, thread in seen)
+
+
+def test_run_projects_overlaps_projects_and_returns_input_order():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(item, writer):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return item
+
+    results = run_projects(list(range(6)), work, max_concurrency=3, estimate=lambda item: 1)
+
+    assert results == list(range(6))
+    assert peak == 3
+
+
+def test_run_projects_memory_admission_and_largest_first():
+    started = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    sizes = {"small": 10, "big": 80, "medium": 40}
+
+    def work(item, writer):
+        nonlocal active, peak
+        with lock:
+            started.append(item)
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return item
+
+    results = run_projects(
+        ["small", "big", "medium"], work, max_concurrency=3, memory_budget=100, estimate=sizes.get
+    )
+
+    assert results == ["small", "big", "medium"]
+    assert started[0] == "big"
+    # big (80) + medium (40) exceeds the budget, so at most two projects overlapped.
+    assert peak <= 2
+
+
+def test_run_projects_serialises_writes_on_one_thread():
+    writer_threads = set()
+
+    def record(item):
+        writer_threads.add(threading.current_thread().name)
+        return item
+
+    def work(item, writer):
+        return write_through(writer, record, item)
+
+    assert run_projects([1, 2, 3, 4], work, max_concurrency=4, estimate=lambda item: 1) == [1, 2, 3, 4]
+    assert len(writer_threads) == 1
+    assert next(iter(writer_threads)).startswith("db-writer")
+
+
+def test_run_projects_reraises_first_failure():
+    def work(item, writer):
+        if item == 2:
+            raise ValueError("boom")
+        return item
+
+    with pytest.raises(ValueError, match="boom"):
+        run_projects([1, 2, 3], work, max_concurrency=2, estimate=lambda item: 1)
+
+
+def test_database_writer_runs_nested_writes_inline():
+    writer = DatabaseWriter()
+    try:
+        assert writer.run(lambda: writer.run(lambda: 7)) == 7
+    finally:
+        writer.close()
@@ -0,0 +1,135 @@
+"""
+Tests for per-stage analysis timing (stage_timing.py), the metrics registry
+(metrics.py) and the /metrics endpoint.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes.metrics import router as metrics_router
+from app.client import llm_cache
+from app.client.llm_client import GeminiLLMClient
+from app.utils import metrics, stage_timing
+from app.utils.stage_timing import STAGE_SECONDS, StageTimer, merge_breakdowns, span
+from tests.fixtures.fake_gemini import fake_gemini_backend
+
+
+def test_nested_spans_count_their_own_time():
+    timer = StageTimer()
+    with timer.activate():
+        with span("analysis", files=3):
+            time.sleep(0.02)
+            with span("llm", requests=1):
+                time.sleep(0.2)
+        with span("analysis") as counts:
+            counts["files"] = 2
+    breakdown = timer.finish("analyzed")
+
+    analysis, llm = breakdown["stages"]["analysis"], breakdown["stages"]["llm"]
+    assert (analysis["calls"], analysis["files"], llm["requests"]) == (2, 5, 1)
+    assert llm["seconds"] >= 0.2
+    assert 0.02 <= analysis["seconds"] < 0.2  # the nested llm span is not counted twice
+    assert breakdown["total_seconds"] >= analysis["seconds"] + llm["seconds"]
+
+
+def test_spans_are_recorded_even_when_the_stage_fails():
+    timer = StageTimer()
+    before = STAGE_SECONDS.count(stage="scan")
+    with timer.activate(), pytest.raises(ValueError):
+        with span("scan", files=4):
+            raise ValueError("boom")
+    assert timer.breakdown()["stages"]["scan"]["files"] == 4
+    assert STAGE_SECONDS.count(stage="scan") == before + 1
+
+    # Without an active timer only the process-wide metrics see the span.
+    with span("scan"):
+        pass
+    assert timer.breakdown()["stages"]["scan"]["calls"] == 1
+
+
+def test_merge_breakdowns_sums_projects():
+    a = {"total_seconds": 1.0, "stages": {"scan": {"seconds": 0.25, "calls": 1, "files": 10}}}
+    b = {"total_seconds": 2.0, "stages": {"scan": {"seconds": 0.5, "calls": 1, "files": 5}, "llm": {"seconds": 1.0, "calls": 2}}}
+    assert merge_breakdowns(a, None, b) == {
+        "total_seconds": 3.0,
+        "stages": {"scan": {"seconds": 0.75, "calls": 2, "files": 15}, "llm": {"seconds": 1.0, "calls": 2}},
+    }
+
+
+def test_parallel_llm_prompts_are_attributed_to_the_callers_timer(monkeypatch):
+    monkeypatch.setenv(llm_cache.LLM_CACHE_MAX_BYTES_ENV, "0")
+    with fake_gemini_backend(monkeypatch, latency=0.02):
+        timer = StageTimer()
+        with timer.activate(), span("analysis"):
+            GeminiLLMClient(api_key="key").generate_many(["a", "b", "c"])
+    assert timer.breakdown()["stages"]["llm"]["requests"] == 3
+
+
+class _Elapsed(float):
+    """A duration whose addition yields to other threads, as a badly timed thread switch would."""
+
+    def __radd__(self, other):
+        total = float(other) + float(self)
+        time.sleep(0.001)
+        return total
+
+
+class _Instant(float):
+    def __sub__(self, other):
+        return _Elapsed(float(self) - float(other))
+
+
+def test_children_ending_on_other_threads_all_reach_the_parent(monkeypatch):
+    monkeypatch.setattr(stage_timing, "time", SimpleNamespace(perf_counter=lambda: _Instant(time.perf_counter())))
+    monkeypatch.setattr(stage_timing, "STAGE_SECONDS", metrics.Histogram("test_stage_seconds", ""))
+
+    def children():
+        for _ in range(25):
+            with span("llm"):
+                pass
+
+    timer = StageTimer()
+    with timer.activate(), span("analysis"):
+        parent = stage_timing._current.get()[1]
+        contexts = [contextvars.copy_context() for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda ctx: ctx.run(children), contexts))
+        child_seconds = parent.child_seconds
+
+    assert timer.stages["llm"]["calls"] == 100
+    assert child_seconds == pytest.approx(timer.stages["llm"]["seconds"])
+
+
+def test_prometheus_text_format():
+    hist = metrics.histogram("test_stage_timing_seconds", "A test histogram.", buckets=(0.1, 1.0))
+    hist.observe(0.5, stage='say "hi"')
+    count = metrics.counter("test_stage_timing_total", "A test counter.")
+    count.inc(2, unit="files")
+
+    text = metrics.render_prometheus()
+    assert "# TYPE test_stage_timing_seconds histogram" in text
+    assert 'test_stage_timing_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 0' in text
+    assert 'test_stage_timing_seconds_bucket{stage="say \\"hi\\"",le="1"} 1' in text
+    assert 'test_stage_timing_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 1' in text
+    assert 'test_stage_timing_seconds_count{stage="say \\"hi\\""} 1' in text
+    assert 'test_stage_timing_total{unit="files"} 2' in text
+    # Registering the same name again returns the existing metric.
+    assert metrics.counter("test_stage_timing_total", "A test counter.") is count
+
+
+def test_metrics_endpoint_exposes_stage_timings():
+    with span("merge"):
+        pass
+    app = FastAPI()
+    app.include_router(metrics_router)
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'analysis_stage_duration_seconds_count{stage="merge"}' in response.text
+    assert "# TYPE analysis_projects_total counter" in response.text